@@ -43,6 +43,9 @@ _RUNAWAY_CEILING = 50
 # a fat-fingered 0/negative from making every run time out instantly.
 _MIN_AGENT_TIMEOUT = 1
 _MAX_AGENT_TIMEOUT = 3600
+# How long a queued run waits for its Ollama model to finish preloading before
+# it takes a slot anyway (and pays whatever load remains inside the run).
+_WARM_WAIT_SECONDS = 120
 
 
 def _preview(task: str) -> str | None:
@@ -114,6 +117,7 @@ class AgentRegistry:
         max_concurrent_agents: int = 5,
         on_progress: Callable[[int, str, str, Any], None] | None = None,
         on_complete: Callable[[int, AgentRun], None] | None = None,
+        residency: Any = None,
     ) -> None:
         self.agents = agents
         self._parent_config = parent_config
@@ -125,6 +129,7 @@ class AgentRegistry:
         self._semaphore = asyncio.Semaphore(max_concurrent_agents)
         self._on_progress = on_progress
         self._on_complete = on_complete
+        self._residency = residency  # ModelResidencyManager for the parent's Ollama host
         self._loop: asyncio.AbstractEventLoop | None = None
         self._active: dict[int, AgentRunner] = {}  # run_id -> runner
         self._run_counter: int = 0
@@ -141,6 +146,11 @@ class AgentRegistry:
         """
         self._loop = loop
 
+    def set_residency(self, residency: Any) -> None:
+        """Track residency with the manager of the new Ollama host (or None)
+        after a provider switch."""
+        self._residency = residency
+
     @property
     def active_count(self) -> int:
         """Number of currently running (working) agents."""
@@ -207,6 +217,25 @@ class AgentRegistry:
             })
         return agents
 
+    def resident_model(self, name: str) -> str | None:
+        """Model agent `name` runs on the parent's Ollama host, or None.
+
+        None when residency tracking is off or the agent targets another
+        endpoint (its own provider profile, base_url or non-Ollama driver).
+        """
+        cfg = self.agents.get(name)
+        if self._residency is None or cfg is None:
+            return None
+        if cfg.provider or cfg.base_url or cfg.driver not in (None, "ollama"):
+            return None
+        model = cfg.model or getattr(self._parent_config, "model", None)
+        return model if isinstance(model, str) and model else None
+
+    def warm_models(self) -> list[str]:
+        """Distinct models of configured agents that share the parent's Ollama host."""
+        models = (self.resident_model(name) for name in self.agents)
+        return list(dict.fromkeys(m for m in models if m))
+
     def get_capability_prompts(self) -> str:
         """Generate generic agent capability guidance for the system prompt."""
         if not self.agents:
@@ -341,6 +370,12 @@ class AgentRegistry:
         worktree_path: str | None = None
         head_before: str | None = None  # branch tip before the run (commit check)
         try:
+            model = self.resident_model(name)
+            if model is not None and run.status != "cancelled":
+                # Load a cold model while still queued, outside a slot: runs whose
+                # model is already resident take free slots first, and the load
+                # is not billed to this run's working time.
+                await self._residency.wait_until_resident(model, _WARM_WAIT_SECONDS)
             async with self._semaphore:
                 if run.status == "cancelled":
                     outcome = AgentRunOutcome(
@@ -376,7 +411,10 @@ class AgentRegistry:
                                 worktree_path = wt_dir
                                 self._session_worktrees.add(wt_dir)
                                 run.worktree_path = wt_dir
-                                project_ctx = ProjectContext(wt_dir)
+                                project_ctx = ProjectContext(
+                                    wt_dir,
+                                    search_index=getattr(project_ctx, "search_index", False),
+                                )
                                 head_before = await asyncio.to_thread(
                                     branch_head, repo_root, run.branch_name
                                 )
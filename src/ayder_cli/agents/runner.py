@@ -17,6 +17,7 @@ from ayder_cli.agents.callbacks import AgentCallbacks
 from ayder_cli.agents.config import AgentConfig
 from ayder_cli.application.runtime_factory import create_agent_runtime
 from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.loops.reasoning_budget import configured_efforts
 
 logger = logging.getLogger(__name__)
 
@@ -145,6 +146,7 @@ class AgentRunner:
                 {"role": "user", "content": task},
             ]
 
+            user_turn_effort, tool_turn_effort = configured_efforts(rt.config)
             loop_config = ChatLoopConfig(
                 model=rt.config.model,
                 provider=rt.config.provider,
@@ -154,6 +156,10 @@ class AgentRunner:
                 permissions=self._permissions,
                 tool_tags=frozenset(rt.config.tool_tags) if getattr(rt.config, "tool_tags", None) else None,
                 max_history=getattr(rt.config, "max_history_messages", 30),
+                pipelined_turns=getattr(rt.config, "pipelined_turns", True),
+                adaptive_output_tokens=getattr(rt.config, "adaptive_output_tokens", True),
+                user_turn_effort=user_turn_effort,
+                tool_turn_effort=tool_turn_effort,
             )
 
             chat_loop = ChatLoop(
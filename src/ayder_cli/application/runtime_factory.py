@@ -6,16 +6,29 @@ eliminating the duplicate `_build_services()` / `AyderApp.__init__()` wiring.
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
-from ayder_cli.core.config import Config, load_config, load_config_for_provider
+from ayder_cli.core.config import (
+    Config,
+    list_provider_profiles,
+    load_config,
+    load_config_for_provider,
+)
 from ayder_cli.core.context_manager_factory import context_manager_factory
 
 if TYPE_CHECKING:
     from ayder_cli.agents.config import AgentConfig
 from ayder_cli.core.context import ProjectContext
 from ayder_cli.providers import AIProvider, provider_orchestrator
+from ayder_cli.providers.governor import GovernedProvider, GovernorConfig, get_governor
+from ayder_cli.providers.hedging import (
+    HedgeConfig,
+    HedgedProvider,
+    HedgeTarget,
+    endpoint_health,
+)
 from ayder_cli.providers.retry import RetryConfig, RetryingProvider
 from ayder_cli.tools.registry import ToolRegistry, create_default_registry
 from ayder_cli.process_manager import ProcessManager
@@ -24,6 +37,8 @@ from ayder_cli.prompts import (
     PROJECT_STRUCTURE_MACRO_TEMPLATE,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class RuntimeComponents:
@@ -36,6 +51,7 @@ class RuntimeComponents:
     tool_registry: ToolRegistry
     system_prompt: str
     context_manager: Any = field(default=None)  # ContextManagerProtocol
+    residency: Any = field(default=None)  # ModelResidencyManager (Ollama only)
 
 
 def create_runtime(
@@ -70,7 +86,7 @@ def create_runtime(
         cfg = cfg.model_copy(update={"prompt": prompt_tier})
 
     llm_provider: AIProvider = provider_orchestrator.create(cfg)
-    project_ctx = ProjectContext(project_root)
+    project_ctx = ProjectContext(project_root, search_index=cfg.search_index)
     process_manager = ProcessManager(max_processes=cfg.max_background_processes)
 
     # Create context manager before registry so tools can receive it via DI.
@@ -100,7 +116,9 @@ def create_runtime(
     tool_schemas = tool_registry.get_schemas(tags=tool_tags)
     context_mgr.freeze_system_prompt(system_prompt, tool_schemas)
 
+    llm_provider = _maybe_wrap_with_governor(llm_provider, cfg, "main")
     llm_provider = _maybe_wrap_with_retry(llm_provider, cfg, context_mgr)
+    llm_provider = _maybe_wrap_with_hedging(llm_provider, cfg, "main")
 
     return RuntimeComponents(
         config=cfg,
@@ -110,9 +128,25 @@ def create_runtime(
         tool_registry=tool_registry,
         system_prompt=system_prompt,
         context_manager=context_mgr,
+        residency=residency_for(cfg),
     )
 
 
+def residency_for(cfg: Config) -> Any:
+    """Return the shared ModelResidencyManager for cfg's Ollama host, or None.
+
+    None unless the driver is native Ollama and ``warm_models`` is enabled.
+    """
+    if getattr(cfg, "driver", None) != "ollama" or not getattr(cfg, "warm_models", True):
+        return None
+    from ayder_cli.providers.impl.ollama_residency import (
+        get_residency_manager,
+        ollama_host,
+    )
+
+    return get_residency_manager(ollama_host(cfg.base_url))
+
+
 def _maybe_wrap_with_retry(
     provider: AIProvider, cfg: Config, context_mgr: Any
 ) -> AIProvider:
@@ -139,6 +173,86 @@ def _maybe_wrap_with_retry(
     return RetryingProvider(provider, retry_cfg, on_reconnect=on_reconnect)
 
 
+def _maybe_wrap_with_governor(provider: AIProvider, cfg: Config, lane: str) -> AIProvider:
+    """Admit provider's requests through the shared RateGovernor for its endpoint.
+
+    Applied inside RetryingProvider so every retry attempt waits out the
+    endpoint-wide cooldown. ``lane`` ("main", "agent:<name>") is the fairness
+    queue the requests wait in.
+    """
+    if not cfg.rate_limit.enabled:
+        return provider
+    governor = get_governor(
+        _endpoint_key(cfg),
+        GovernorConfig(
+            requests_per_minute=cfg.rate_limit.requests_per_minute,
+            initial_concurrency=cfg.rate_limit.initial_concurrency,
+            min_concurrency=cfg.rate_limit.min_concurrency,
+            max_concurrency=cfg.rate_limit.max_concurrency,
+        ),
+    )
+    return GovernedProvider(provider, governor, lane)
+
+
+def _maybe_wrap_with_hedging(provider: AIProvider, cfg: Config, lane: str) -> AIProvider:
+    """Wrap provider with HedgedProvider when cfg.hedge.enabled.
+
+    Each usable entry of ``hedge.fallback_profiles`` is built from its own
+    [llm.<name>] profile (and governed / retry-wrapped like the primary). Unknown
+    profiles, the active profile itself, and profiles whose driver cannot be
+    created are skipped with a warning; with none left, provider is returned
+    unchanged.
+    """
+    if not cfg.hedge.enabled or not cfg.hedge.fallback_profiles:
+        return provider
+    hedge_cfg = HedgeConfig(
+        enabled=True,
+        percentile=cfg.hedge.percentile,
+        initial_delay_seconds=cfg.hedge.initial_delay_seconds,
+        min_delay_seconds=cfg.hedge.min_delay_seconds,
+        max_delay_seconds=cfg.hedge.max_delay_seconds,
+        min_samples=cfg.hedge.min_samples,
+        window=max(HedgeConfig.window, cfg.hedge.min_samples),
+        failure_threshold=cfg.hedge.failure_threshold,
+        cooldown_seconds=cfg.hedge.cooldown_seconds,
+        retry_on_names=cfg.retry.retry_on_names,
+    )
+    known = set(list_provider_profiles())
+    fallbacks: list[HedgeTarget] = []
+    for name in dict.fromkeys(cfg.hedge.fallback_profiles):
+        if name == cfg.provider or name not in known:
+            logger.warning("Ignoring hedge fallback profile %r (unknown or active profile)", name)
+            continue
+        try:
+            fb_cfg = load_config_for_provider(name)
+            fb_provider = provider_orchestrator.create(fb_cfg)
+        except Exception as e:  # noqa: BLE001 — a bad fallback must not block startup
+            logger.warning("Ignoring hedge fallback profile %r: %s", name, e)
+            continue
+        fallbacks.append(
+            HedgeTarget(
+                name=name,
+                provider=_maybe_wrap_with_retry(
+                    _maybe_wrap_with_governor(fb_provider, fb_cfg, lane), fb_cfg, None
+                ),
+                health=endpoint_health(_endpoint_key(fb_cfg), hedge_cfg),
+                model=fb_cfg.model,
+            )
+        )
+    if not fallbacks:
+        return provider
+    primary = HedgeTarget(
+        name=cfg.provider,
+        provider=provider,
+        health=endpoint_health(_endpoint_key(cfg), hedge_cfg),
+    )
+    return HedgedProvider(primary, fallbacks, hedge_cfg)
+
+
+def _endpoint_key(cfg: Config) -> tuple[str, str]:
+    return (cfg.driver, cfg.base_url or "")
+
+
 def create_agent_runtime(
     *,
     agent_config: "AgentConfig",
@@ -214,7 +328,10 @@ def create_agent_runtime(
     tool_schemas = tool_registry.get_schemas(tags=tool_tags)
     context_mgr.freeze_system_prompt(system_prompt, tool_schemas)
 
+    lane = f"agent:{agent_config.name}"
+    llm_provider = _maybe_wrap_with_governor(llm_provider, cfg, lane)
     llm_provider = _maybe_wrap_with_retry(llm_provider, cfg, context_mgr)
+    llm_provider = _maybe_wrap_with_hedging(llm_provider, cfg, lane)
 
     return RuntimeComponents(
         config=cfg,
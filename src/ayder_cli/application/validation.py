@@ -60,54 +60,22 @@ class SchemaValidator:
     """Validates tool name, required argument presence, and argument types."""
 
     def validate(self, request: ToolRequest) -> tuple[bool, Any]:
-        from ayder_cli.tools.definition import TOOL_DEFINITIONS_BY_NAME
+        from ayder_cli.tools.definition import get_validator
 
-        if request.name not in TOOL_DEFINITIONS_BY_NAME:
+        validator = get_validator(request.name)
+        if validator is None:
             return False, ValidationError(
                 tool_name=request.name,
                 message=f"unknown tool: '{request.name}' not found in registry",
             )
-        td = TOOL_DEFINITIONS_BY_NAME[request.name]
-        params = td.parameters
-
-        # Required parameter check
-        required = params.get("required", [])
-        for arg in required:
-            if arg not in request.arguments or request.arguments[arg] is None:
-                return False, ValidationError(
-                    tool_name=request.name,
-                    field=arg,
-                    message=f"required argument '{arg}' is missing or empty",
-                )
-
-        # Type validation (moved from validate_tool_call in execution.py)
-        properties = params.get("properties", {})
-        for param_name, value in list(request.arguments.items()):
-            if param_name not in properties:
-                continue
-            expected_type = properties[param_name].get("type")
-            
-            # Coerce string to integer if expected
-            if expected_type == "integer" and isinstance(value, str):
-                try:
-                    value = int(value)
-                    request.arguments[param_name] = value
-                except ValueError:
-                    pass  # Let it fail the type check below
-
-            if expected_type == "integer" and not isinstance(value, int):
-                return False, ValidationError(
-                    tool_name=request.name,
-                    field=param_name,
-                    message=f"'{param_name}' must be integer, got {type(value).__name__}",
-                )
-            if expected_type == "string" and not isinstance(value, str):
-                return False, ValidationError(
-                    tool_name=request.name,
-                    field=param_name,
-                    message=f"'{param_name}' must be string, got {type(value).__name__}",
-                )
 
+        # Required presence, integer coercion and type checks in one pass
+        problem = validator.check(request.arguments)
+        if problem is not None:
+            field, message = problem
+            return False, ValidationError(
+                tool_name=request.name, field=field, message=message
+            )
         return True, None
 
 
@@ -107,6 +107,13 @@ def _add_common_args(parser: argparse.ArgumentParser) -> None:
         "main LLM drives the configured agents (spec -> plan -> build -> QA -> review -> gate). "
         "Implies write+execute+http permissions (the agents run unattended)",
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Headless batch mode: request each turn without streaming and print only "
+        "final answers. With --implement-all, run pending tasks as independent prompts "
+        "([app] batch_concurrency at a time)",
+    )
 
     parser.add_argument(
         "--verbose",
@@ -353,6 +360,8 @@ def main():
             _conflicts.append("--implement-all")
         if getattr(args, "tasks", False):
             _conflicts.append("--tasks")
+        if getattr(args, "batch", False):
+            _conflicts.append("--batch")
         if getattr(args, "temporal_task_queue", None):
             _conflicts.append("--temporal-task-queue")
         if getattr(args, "temporal_prompt", None):
@@ -430,11 +439,11 @@ def main():
     if args.implement:
         sys.exit(
             _run_implement_cli(
-                args.implement, permissions=granted
+                args.implement, permissions=granted, batch=args.batch
             )
         )
     if args.implement_all:
-        sys.exit(_run_implement_all_cli(permissions=granted))
+        sys.exit(_run_implement_all_cli(permissions=granted, batch=args.batch))
     if getattr(args, "temporal_task_queue", None):
         sys.exit(
             _run_temporal_queue_cli(
@@ -505,6 +514,7 @@ def main():
             permissions=granted,
             agent_mode=args.agent,
             system_prompt_override=system_prompt_override,
+            batch=args.batch,
         )
     )
 
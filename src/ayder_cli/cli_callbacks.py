@@ -71,3 +71,36 @@ class CliCallbacks:
 
     def is_cancelled(self) -> bool:
         return self._cancelled
+
+
+class BatchCallbacks(CliCallbacks):
+    """CliCallbacks for one prompt of a headless batch run.
+
+    Several loops run concurrently, so nothing is written while they work:
+    assistant text is buffered and printed as one block by the batch runner
+    when the prompt finishes. System messages go to stderr at once, prefixed
+    with the prompt's label.
+    """
+
+    def __init__(self, label: str, *, verbose: bool = False) -> None:
+        super().__init__(verbose=verbose)
+        self.label = label
+        self._turns: list[str] = []
+
+    def on_assistant_content(self, text: str) -> None:
+        self._turns.append(text)
+
+    def on_token_usage(self, total_tokens: int) -> None:
+        pass
+
+    def on_tool_start(self, call_id: str, name: str, arguments: dict) -> None:
+        if self.verbose:
+            print(f"[{self.label}] [tool] {name}", file=sys.stderr, flush=True)
+
+    def on_system_message(self, text: str) -> None:
+        print(f"[{self.label}] {text}", file=sys.stderr)
+
+    def render(self) -> str:
+        """The prompt's final assistant message under a header line."""
+        final = self._turns[-1].strip() if self._turns else "(no response)"
+        return f"=== {self.label} ===\n{final}\n"
@@ -5,7 +5,9 @@ This module contains the logic for running the CLI in different modes:
 - Task management commands (_run_tasks_cli, _run_implement_cli, _run_implement_all_cli)
 
 All CLI paths drive ChatLoop via CliCallbacks, sharing the same async
-execution engine used by the TUI.
+execution engine used by the TUI. In batch mode (``--batch``) the loop
+requests each turn without streaming, and ``--implement-all`` queues every
+pending task as an independent prompt (see _run_batch).
 """
 
 import asyncio
@@ -20,8 +22,9 @@ from ayder_cli.agents.tool import (
 )
 from ayder_cli.application.runtime_factory import create_runtime
 from ayder_cli.providers import ProviderUnavailableError
-from ayder_cli.cli_callbacks import CliCallbacks
+from ayder_cli.cli_callbacks import BatchCallbacks, CliCallbacks
 from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.loops.reasoning_budget import configured_efforts
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,7 @@ def _run_loop(
     permissions: set | None = None,
     agent_mode: bool = False,
     system_prompt_override: str | None = None,
+    batch: bool = False,
 ) -> int:
     """Create a ChatLoop with CliCallbacks and run it.
 
@@ -44,10 +48,36 @@ def _run_loop(
             (ayder-cli --agent) so the main LLM drives the multi-agent harness.
         system_prompt_override: When set, use this text as the system prompt base
             instead of the built-in prompts.py prompt (ayder --system-prompt FILE).
+        batch: When True, request each turn without streaming (ayder --batch).
 
     Returns:
         Exit code (0 for success, 1 for error).
     """
+    drive = _build_loop(
+        prompt,
+        permissions=permissions,
+        agent_mode=agent_mode,
+        system_prompt_override=system_prompt_override,
+        batch=batch,
+    )
+    asyncio.run(drive())
+    print()  # Ensure terminal prompt starts on a new line after streaming output
+    return 0
+
+
+def _build_loop(
+    prompt: str,
+    permissions: set | None = None,
+    agent_mode: bool = False,
+    system_prompt_override: str | None = None,
+    batch: bool = False,
+    callbacks: CliCallbacks | None = None,
+):
+    """Assemble the runtime and ChatLoop for one prompt.
+
+    Returns an async callable that runs the loop to completion; the caller
+    owns the event loop (asyncio.run for a single prompt, _run_batch for many).
+    """
     rt = create_runtime(
         prompt_tier="AGENTIC" if agent_mode else None,
         system_prompt_override=system_prompt_override,
@@ -68,6 +98,7 @@ def _run_loop(
             permissions=set(permissions or {"r"}),
             agent_timeout=getattr(rt.config, "agent_timeout", 600),
             max_concurrent_agents=getattr(rt.config, "max_concurrent_agents", 5),
+            residency=rt.residency,
         )
         rt.tool_registry.register_dynamic_tool(
             AGENT_TOOL_DEFINITION, create_agent_handler(agent_registry)
@@ -78,6 +109,7 @@ def _run_loop(
             messages[0]["content"] += cap_prompts
             logger.info(f"Registered {len(rt.config.agents)} agent(s): {', '.join(rt.config.agents.keys())}")
 
+    user_turn_effort, tool_turn_effort = configured_efforts(rt.config)
     config = ChatLoopConfig(
         model=rt.config.model,
         provider=rt.config.provider,
@@ -87,9 +119,14 @@ def _run_loop(
         permissions=set(permissions or {"r"}),
         tool_tags=frozenset(rt.config.tool_tags) if rt.config.tool_tags else None,
         max_history=rt.config.max_history_messages,
+        stream=not batch,
+        pipelined_turns=rt.config.pipelined_turns,
+        adaptive_output_tokens=rt.config.adaptive_output_tokens,
+        user_turn_effort=user_turn_effort,
+        tool_turn_effort=tool_turn_effort,
     )
 
-    cb = CliCallbacks(verbose=rt.config.verbose)
+    cb = callbacks or CliCallbacks(verbose=rt.config.verbose)
     loop = ChatLoop(
         llm=rt.llm_provider,
         registry=rt.tool_registry,
@@ -105,22 +142,61 @@ def _run_loop(
         # so agent(action="call") works in single-shot CLI mode too.
         if agent_registry is not None:
             agent_registry.set_loop(asyncio.get_running_loop())
+            if rt.residency is not None:
+                # The main model loads on the first request anyway; warm only
+                # the agent models so dispatches do not start cold.
+                rt.residency.warm_in_background(agent_registry.warm_models())
         await loop.run()
 
-    asyncio.run(_drive())
-    print()  # Ensure terminal prompt starts on a new line after streaming output
-    return 0
+    return _drive
+
+
+def _run_batch(
+    prompts: list[tuple[str, str]],
+    permissions: set | None = None,
+    concurrency: int = 1,
+) -> int:
+    """Run independent (label, prompt) pairs as non-streaming loops.
+
+    Up to ``concurrency`` loops run at once on one event loop, each with its
+    own runtime and history; per-token output is suppressed and each prompt's
+    final answer is printed as one block when it finishes.
+
+    Returns:
+        Exit code: 1 if any prompt raised, else 0.
+    """
+
+    async def _one(label: str, prompt: str, slots: asyncio.Semaphore) -> int:
+        cb = BatchCallbacks(label)
+        async with slots:
+            try:
+                drive = _build_loop(prompt, permissions=permissions, batch=True, callbacks=cb)
+                await drive()
+            except Exception as e:
+                logger.exception(f"Batch prompt {label!r} failed")
+                cb.on_system_message(f"Error: {e}")
+                return 1
+        print(cb.render(), flush=True)
+        return 0
+
+    async def _run_all() -> int:
+        slots = asyncio.Semaphore(max(1, concurrency))
+        codes = await asyncio.gather(*(_one(label, p, slots) for label, p in prompts))
+        return max(codes, default=0)
+
+    return asyncio.run(_run_all())
 
 
 class CommandRunner:
     """Runner for single command execution mode."""
 
     def __init__(self, prompt: str, permissions=None, agent_mode: bool = False,
-                 system_prompt_override: str | None = None):
+                 system_prompt_override: str | None = None, batch: bool = False):
         self.prompt = prompt
         self.permissions = permissions
         self.agent_mode = agent_mode
         self.system_prompt_override = system_prompt_override
+        self.batch = batch
 
     def run(self) -> int:
         """Execute the command and return exit code.
@@ -134,6 +210,7 @@ class CommandRunner:
                 permissions=self.permissions,
                 agent_mode=self.agent_mode,
                 system_prompt_override=self.system_prompt_override,
+                batch=self.batch,
             )
         except ProviderUnavailableError as e:
             print(str(e), file=sys.stderr)   # message already starts with "Error:"
@@ -144,7 +221,7 @@ class CommandRunner:
 
 
 def run_command(prompt: str, permissions=None, agent_mode: bool = False,
-                system_prompt_override: str | None = None) -> int:
+                system_prompt_override: str | None = None, batch: bool = False) -> int:
     """Execute a single command and return exit code.
 
     Args:
@@ -153,13 +230,14 @@ def run_command(prompt: str, permissions=None, agent_mode: bool = False,
         agent_mode: When True, inject the AGENTIC orchestrator system prompt (ayder-cli --agent).
         system_prompt_override: When set, use this text as the system prompt base
             instead of the built-in prompts.py prompt (ayder --system-prompt FILE).
+        batch: When True, request each turn without streaming (ayder --batch).
 
     Returns:
         Exit code (0 for success, 1 for error)
     """
     runner = CommandRunner(
         prompt, permissions=permissions, agent_mode=agent_mode,
-        system_prompt_override=system_prompt_override,
+        system_prompt_override=system_prompt_override, batch=batch,
     )
     return runner.run()
 
@@ -186,12 +264,13 @@ class TaskRunner:
             return 1
 
     @staticmethod
-    def implement_task(task_query: str, permissions=None) -> int:
+    def implement_task(task_query: str, permissions=None, batch: bool = False) -> int:
         """Implement a specific task by ID or name.
 
         Args:
             task_query: Task ID or name pattern to search for
             permissions: Set of granted permission categories
+            batch: When True, request each turn without streaming
 
         Returns:
             Exit code (0 for success, 1 for error/not found)
@@ -214,7 +293,7 @@ class TaskRunner:
                 task_path = _get_task_path_by_id(project_ctx, task_id)
                 if task_path:
                     return TaskRunner._execute_task(
-                        task_path, project_ctx, permissions
+                        task_path, project_ctx, permissions, batch=batch
                     )
             except ValueError:
                 pass
@@ -228,7 +307,7 @@ class TaskRunner:
                 title = _parse_title(task_file)
                 if query_lower in title.lower():
                     return TaskRunner._execute_task(
-                        task_file, project_ctx, permissions
+                        task_file, project_ctx, permissions, batch=batch
                     )
 
             print(f"No tasks found matching: {task_query}", file=sys.stderr)
@@ -242,6 +321,7 @@ class TaskRunner:
         task_path: Path,
         project_ctx,
         permissions,
+        batch: bool = False,
     ) -> int:
         """Execute a single task file.
 
@@ -249,6 +329,7 @@ class TaskRunner:
             task_path: Path to the task markdown file
             project_ctx: ProjectContext instance
             permissions: Set of granted permission categories
+            batch: When True, request each turn without streaming
 
         Returns:
             Exit code (0 for success, 1 for error)
@@ -257,19 +338,26 @@ class TaskRunner:
 
         rel_path = project_ctx.to_relative(task_path)
         prompt = TASK_EXECUTION_PROMPT_TEMPLATE.format(task_path=rel_path)
-        return _run_loop(prompt, permissions=permissions)
+        return _run_loop(prompt, permissions=permissions, batch=batch)
 
     @staticmethod
-    def implement_all(permissions=None) -> int:
+    def implement_all(permissions=None, batch: bool = False) -> int:
         """Implement all pending tasks sequentially.
 
+        In batch mode each pending task is queued as its own non-streaming
+        prompt instead of one long conversation working through the list.
+
         Args:
             permissions: Set of granted permission categories
+            batch: When True, run each pending task as an independent prompt
 
         Returns:
             Exit code (0 for success, 1 for error)
         """
         try:
+            if batch:
+                return TaskRunner._implement_all_batch(permissions)
+
             from ayder_cli.prompts import TASK_EXECUTION_ALL_PROMPT_TEMPLATE
 
             return _run_loop(
@@ -280,22 +368,59 @@ class TaskRunner:
             print(f"Error: {e}", file=sys.stderr)
             return 1
 
+    @staticmethod
+    def _implement_all_batch(permissions) -> int:
+        """Queue one TASK_EXECUTION_PROMPT_TEMPLATE prompt per pending task."""
+        from ayder_cli.core.config import load_config
+        from ayder_cli.core.context import ProjectContext
+        from ayder_cli.prompts import TASK_EXECUTION_PROMPT_TEMPLATE
+        from ayder_cli.tools.builtins.tasks import (
+            _extract_id,
+            _get_tasks_dir,
+            _parse_status,
+        )
+
+        project_ctx = ProjectContext(".")
+        tasks_dir = _get_tasks_dir(project_ctx)
+        pending = sorted(
+            (task_id, path)
+            for path in (tasks_dir.glob("*.md") if tasks_dir.exists() else ())
+            if (task_id := _extract_id(path.name)) is not None
+            and _parse_status(path).lower() == "pending"
+        )
+        if not pending:
+            print("No pending tasks.")
+            return 0
+
+        prompts = [
+            (
+                f"TASK-{task_id:03d}",
+                TASK_EXECUTION_PROMPT_TEMPLATE.format(task_path=project_ctx.to_relative(path)),
+            )
+            for task_id, path in pending
+        ]
+        return _run_batch(
+            prompts,
+            permissions=permissions,
+            concurrency=load_config().batch_concurrency,
+        )
+
 
 def _run_tasks_cli() -> int:
     """List all tasks and exit."""
     return TaskRunner.list_tasks()
 
 
-def _run_implement_cli(task_query: str, permissions=None) -> int:
+def _run_implement_cli(task_query: str, permissions=None, batch: bool = False) -> int:
     """Implement a specific task by ID or name."""
     return TaskRunner.implement_task(
-        task_query, permissions=permissions
+        task_query, permissions=permissions, batch=batch
     )
 
 
-def _run_implement_all_cli(permissions=None) -> int:
-    """Implement all pending tasks sequentially."""
-    return TaskRunner.implement_all(permissions=permissions)
+def _run_implement_all_cli(permissions=None, batch: bool = False) -> int:
+    """Implement all pending tasks (sequentially, or as a batch queue)."""
+    return TaskRunner.implement_all(permissions=permissions, batch=batch)
 
 
 def _run_temporal_queue_cli(
@@ -261,6 +261,94 @@ class RetryConfigSection(BaseModel):
         return v
 
 
+class RateLimitConfigSection(BaseModel):
+    """Shared client-side rate limiting / adaptive concurrency per endpoint."""
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = Field(default=True)
+    requests_per_minute: float = Field(default=0.0)
+    initial_concurrency: int = Field(default=8)
+    min_concurrency: int = Field(default=1)
+    max_concurrency: int = Field(default=16)
+
+    @field_validator("requests_per_minute")
+    @classmethod
+    def validate_requests_per_minute(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("requests_per_minute must be non-negative (0 = unlimited)")
+        return v
+
+    @model_validator(mode="after")
+    def validate_concurrency_bounds(self) -> "RateLimitConfigSection":
+        if not 1 <= self.min_concurrency <= self.initial_concurrency <= self.max_concurrency:
+            raise ValueError(
+                "rate_limit concurrency must satisfy 1 <= min_concurrency "
+                "<= initial_concurrency <= max_concurrency"
+            )
+        return self
+
+
+class HedgeConfigSection(BaseModel):
+    """Hedged requests / failover to other [llm.<name>] profiles."""
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = Field(default=False)
+    fallback_profiles: tuple[str, ...] = Field(default_factory=tuple)
+    percentile: float = Field(default=0.95)
+    initial_delay_seconds: float = Field(default=5.0)
+    min_delay_seconds: float = Field(default=1.0)
+    max_delay_seconds: float = Field(default=30.0)
+    min_samples: int = Field(default=5)
+    failure_threshold: int = Field(default=3)
+    cooldown_seconds: float = Field(default=30.0)
+
+    @field_validator("percentile")
+    @classmethod
+    def validate_percentile(cls, v: float) -> float:
+        if not 0.0 < v <= 1.0:
+            raise ValueError("percentile must be in (0, 1]")
+        return v
+
+    @field_validator(
+        "initial_delay_seconds", "min_delay_seconds", "max_delay_seconds", "cooldown_seconds"
+    )
+    @classmethod
+    def validate_non_negative(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("seconds must be non-negative")
+        return v
+
+    @field_validator("min_samples", "failure_threshold")
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        if v <= 0:
+            raise ValueError("min_samples and failure_threshold must be positive")
+        return v
+
+    @model_validator(mode="after")
+    def validate_delay_bounds(self) -> "HedgeConfigSection":
+        if self.max_delay_seconds < self.min_delay_seconds:
+            raise ValueError("max_delay_seconds must be >= min_delay_seconds")
+        return self
+
+    @field_validator("fallback_profiles", mode="before")
+    @classmethod
+    def coerce_tuple(cls, v: Any) -> Any:
+        if isinstance(v, list):
+            return tuple(v)
+        return v
+
+
+class ReasoningConfigSection(BaseModel):
+    """Per-turn reasoning effort: deep thinking after a user message, little
+    after routine tool results. Mapped onto each provider's thinking knob."""
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = Field(default=False)
+    user_turn_effort: Literal["off", "low", "medium", "high"] = Field(default="high")
+    tool_turn_effort: Literal["off", "low", "medium", "high"] = Field(default="low")
+
+
 class TemporalConfig(BaseModel):
     """Optional Temporal runtime configuration."""
 
@@ -323,13 +411,35 @@ class Config(BaseModel):
     # primary path support it; set ``think = false`` in an [llm.*] profile for
     # models that do not. Ollama also accepts "low", "medium", and "high".
     think: bool | Literal["low", "medium", "high"] | None = Field(default=True)
+    # OpenAI-compatible drivers: the model accepts ``reasoning_effort``
+    # (OpenAI o-series / gpt-5 style). Off by default, since non-reasoning
+    # models and many local servers reject the parameter.
+    supports_reasoning_effort: bool = Field(default=False)
     stop_sequences: list[str] = Field(default_factory=list)
+    # Ollama only: preload the main and agent models in the background at
+    # startup (and on /model) so the first request does not pay the load.
+    warm_models: bool = Field(default=True)
+    # Prepare the next request (tool schemas, history conversion, connection)
+    # while a turn's tools are still running.
+    pipelined_turns: bool = Field(default=True)
+    # Lower each request's max_output_tokens to the context room left;
+    # max_output_tokens stays the upper bound.
+    adaptive_output_tokens: bool = Field(default=True)
+    # Keep a trigram index of the project in .ayder/index/ and run
+    # search_codebase only over the files that can match.
+    search_index: bool = Field(default=False)
     tool_tags: list[str] = Field(default_factory=lambda: ["core", "metadata"])
     temporal: TemporalConfig = Field(default_factory=TemporalConfig)
     context_manager: ContextManagerConfigSection = Field(default_factory=ContextManagerConfigSection)
     retry: RetryConfigSection = Field(default_factory=RetryConfigSection)
+    hedge: HedgeConfigSection = Field(default_factory=HedgeConfigSection)
+    rate_limit: RateLimitConfigSection = Field(default_factory=RateLimitConfigSection)
+    reasoning: ReasoningConfigSection = Field(default_factory=ReasoningConfigSection)
     agent_timeout: int = Field(default=600)
     max_concurrent_agents: int = Field(default=5)
+    # --batch --implement-all: pending tasks run as independent prompts, this
+    # many at a time (they share one working tree, so 1 unless tasks are disjoint).
+    batch_concurrency: int = Field(default=1)
     agents: dict[str, Any] = Field(default_factory=dict)  # dict[str, AgentConfig] — Any to avoid circular import
 
     @model_validator(mode="before")
@@ -496,6 +606,13 @@ class Config(BaseModel):
             raise ValueError("max_concurrent_agents must be between 1 and 20")
         return v
 
+    @field_validator("batch_concurrency")
+    @classmethod
+    def validate_batch_concurrency(cls, v: int) -> int:
+        if v < 1 or v > 20:
+            raise ValueError("batch_concurrency must be between 1 and 20")
+        return v
+
     @field_validator("base_url")
     @classmethod
     def validate_base_url(cls, v: str | None) -> str | None:
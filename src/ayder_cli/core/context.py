@@ -9,14 +9,17 @@ class ProjectContext:
     macOS ~ paths.
     """
 
-    def __init__(self, root_dir: str = "."):
+    def __init__(self, root_dir: str = ".", search_index: bool = False):
         """Initialize ProjectContext with a root directory.
 
         Args:
             root_dir: Root directory path (defaults to current directory)
+            search_index: Narrow search_codebase with the on-disk trigram
+                index under .ayder/index/
         """
         expanded_root = os.path.expanduser(root_dir)
         self.root = Path(expanded_root).resolve()
+        self.search_index = search_index
 
     def validate_path(self, file_path: str) -> Path:
         """Validate and resolve a file path, ensuring it stays within the project root.
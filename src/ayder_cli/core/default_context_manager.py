@@ -271,6 +271,11 @@ class DefaultContextManager:
 
     # -- Core logic ----------------------------------------------------------
 
+    @property
+    def context_window(self) -> int:
+        """Effective context budget in tokens."""
+        return self._max_context_tokens
+
     @property
     def reserve(self) -> int:
         return int(self._max_context_tokens * self._config.reserve_ratio)
@@ -0,0 +1,260 @@
+"""Streaming display filter shared by in-content drivers and the TUI.
+
+Fed the streamed content one chunk at a time, it removes a model family's
+tool-call markup and moves ``<think>`` bodies to the reasoning channel. Only
+text that might still turn out to be the start of a tag is held back between
+chunks (a trailing ``<too``, ``</thi``, ``]~b]``), so the work per chunk is
+proportional to the chunk, not to the message streamed so far.
+
+Each family describes its markup as a DisplayTags table of literal tag
+prefixes; tables combine with ``|``. Whole-message cleanup that needs to see
+the full text (JSON tool arrays, blank-line collapsing) stays with
+``ContentProcessor.strip_for_display``.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+_DSML_VARIANTS = ("", "\uff5c\uff24\uff33\uff2d\uff2c\uff5c", "|DSML|")
+
+# A stray tag is hidden through its ">"; one this long without a ">" is
+# released as prose.
+_MAX_TAG_LEN = 256
+
+
+def _unique(items: tuple) -> tuple:
+    return tuple(dict.fromkeys(items))
+
+
+@dataclass(frozen=True)
+class DisplayTags:
+    """One model family's display markup, as literal tag prefixes.
+
+    think:   (opener, closer) around reasoning written into the content.
+    blocks:  (opener, closers) of blocks hidden entirely, closer included.
+    tags:    stray tag prefixes, hidden through the next ">".
+    markers: literal tokens hidden as they are.
+    """
+
+    think: tuple[str, str] | None = ("<think>", "</think>")
+    blocks: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    tags: tuple[str, ...] = ()
+    markers: tuple[str, ...] = ()
+
+    def __or__(self, other: DisplayTags) -> DisplayTags:
+        closers: dict[str, tuple[str, ...]] = {}
+        for opener, ends in self.blocks + other.blocks:
+            closers[opener] = _unique(closers.get(opener, ()) + ends)
+        return DisplayTags(
+            think=self.think or other.think,
+            blocks=tuple(closers.items()),
+            tags=_unique(self.tags + other.tags),
+            markers=_unique(self.markers + other.markers),
+        )
+
+
+THINK_DISPLAY_TAGS = DisplayTags()
+
+XML_DISPLAY_TAGS = DisplayTags(
+    blocks=(
+        ("<tool_call>", ("</tool_call>",)),
+        ("<function=", ("</function>", "</tool_call>")),
+    ),
+    tags=("</tool_call>", "<function", "</function", "<parameter", "</parameter"),
+)
+
+QWEN3_DISPLAY_TAGS = DisplayTags(
+    blocks=(("<tool_call>", ("</tool_call>",)),),
+    tags=("</tool_call>",),
+)
+
+_DEEPSEEK_LIST_CLOSERS = tuple(
+    f"</{dsml}{name}_calls>" for dsml in _DSML_VARIANTS for name in ("function", "tool")
+)
+DEEPSEEK_DISPLAY_TAGS = DisplayTags(
+    blocks=tuple(
+        (f"<{dsml}{name}_calls>", _DEEPSEEK_LIST_CLOSERS)
+        for dsml in _DSML_VARIANTS
+        for name in ("function", "tool")
+    )
+    + tuple((f"<{dsml}invoke", (f"</{dsml}invoke>",)) for dsml in _DSML_VARIANTS),
+    tags=tuple(
+        tag
+        for dsml in _DSML_VARIANTS
+        for tag in (
+            f"</{dsml}function_calls",
+            f"</{dsml}tool_calls",
+            f"</{dsml}invoke",
+            f"<{dsml}parameter",
+            f"</{dsml}parameter",
+        )
+    ),
+)
+
+# MiniMax models use special structural tokens that can leak into
+# msg.content when an IN_CONTENT driver is used on a multi-turn request
+# (observed empirically on minimax-m3:cloud as ]<]minimax[>[ ). Older M2
+# builds documented the ]~b]<role> / [e~[ role markers.
+MINIMAX_DISPLAY_TAGS = DisplayTags(
+    blocks=(
+        ("<minimax:tool_call>", ("</minimax:tool_call>",)),
+        ("<invoke", ("</invoke>",)),
+    ),
+    tags=("</minimax:tool_call>", "</invoke", "<parameter", "</parameter"),
+    markers=(
+        "]<]minimax[>[",
+        "]~b]system",
+        "]~b]user",
+        "]~b]ai",
+        "]~b]tool",
+        "]~b]",
+        "[e~[",
+    ),
+)
+
+# Everything any family is known to leak; used where the family is unknown.
+ALL_DISPLAY_TAGS = (
+    XML_DISPLAY_TAGS | QWEN3_DISPLAY_TAGS | DEEPSEEK_DISPLAY_TAGS | MINIMAX_DISPLAY_TAGS
+)
+
+# What a literal found outside any block starts.
+_THINK, _BLOCK, _TAG, _MARKER = range(4)
+
+
+class _Literals:
+    """Alternation of literals (longest first) plus their proper prefixes."""
+
+    def __init__(self, literals: tuple[str, ...]) -> None:
+        ordered = sorted(set(literals), key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(lit) for lit in ordered))
+        self.prefixes = frozenset(lit[:i] for lit in ordered for i in range(1, len(lit)))
+        self.first_chars = frozenset(lit[0] for lit in ordered)
+        self.longest = len(ordered[0])
+
+    def held(self, text: str, pos: int) -> int:
+        """Index where the longest tail of ``text[pos:]`` that could still
+        grow into a literal starts (``len(text)`` when there is none)."""
+        for start in range(max(pos, len(text) - self.longest + 1), len(text)):
+            if text[start] in self.first_chars and text[start:] in self.prefixes:
+                return start
+        return len(text)
+
+
+class StreamingDisplayFilter:
+    """Stateful per-stream markup filter; create one per message.
+
+    ``feed(content, thinking)`` returns the ``(content, thinking)`` to show
+    for one chunk; ``flush()`` returns whatever was held back once the stream
+    ends.
+
+    With ``max_hidden``, a block whose closer has not arrived within that
+    many characters of its opener (or by the end of the stream) is shown as
+    text after all: an unclosed ``<function=`` then costs a few lines, not
+    the rest of the message.
+    """
+
+    def __init__(self, tags: DisplayTags, max_hidden: int | None = None) -> None:
+        self._starts: dict[str, tuple[int, tuple[str, ...]]] = {}
+        for marker in tags.markers:
+            self._starts[marker] = (_MARKER, ())
+        for tag in tags.tags:
+            self._starts[tag] = (_TAG, ())
+        for opener, closers in tags.blocks:
+            self._starts[opener] = (_BLOCK, closers)
+        if tags.think is not None:
+            self._starts[tags.think[0]] = (_THINK, (tags.think[1],))
+        self._openers = _Literals(tuple(self._starts)) if self._starts else None
+        self._closers = {
+            closers: _Literals(closers) for _, closers in self._starts.values() if closers
+        }
+        self._inside: tuple[int, _Literals] | None = None
+        self._held = ""
+        self._max_hidden = max_hidden
+        # Opener and body so far of the block being hidden, kept to be
+        # shown if the block never closes (max_hidden only).
+        self._opener = ""
+        self._hidden = ""
+
+    def feed(self, content: str, thinking: str = "") -> tuple[str, str]:
+        """Filter one chunk of content; reasoning passes through."""
+        visible, reasoning = self._run(content, final=False)
+        return visible, thinking + reasoning
+
+    def flush(self) -> tuple[str, str]:
+        """End of stream: release held text that never became a tag."""
+        return self._run("", final=True)
+
+    def _run(self, text: str, final: bool) -> tuple[str, str]:
+        if self._openers is None:
+            return text, ""
+        buf = self._held + text
+        self._held = ""
+        content: list[str] = []
+        reasoning: list[str] = []
+        pos = 0
+        while pos < len(buf) or (final and self._opener):
+            if self._inside is not None:
+                kind, closers = self._inside
+                out = reasoning if kind == _THINK else None
+                match = closers.pattern.search(buf, pos)
+                if out is None and self._opener:
+                    body = buf[pos:match.start()] if match else buf[pos:]
+                    if len(self._hidden) + len(body) > self._max_hidden or (
+                        match is None and final
+                    ):
+                        # Never closed: show the opener as text and rescan
+                        # what followed it.
+                        content.append(self._opener)
+                        buf = self._hidden + buf[pos:]
+                        pos = 0
+                        self._inside = None
+                        self._opener = self._hidden = ""
+                        continue
+                if match is None:
+                    hold = len(buf) if final else closers.held(buf, pos)
+                    if out is not None:
+                        out.append(buf[pos:hold])
+                    elif self._opener:
+                        self._hidden += buf[pos:hold]
+                    self._held = buf[hold:]
+                    break
+                if out is not None:
+                    out.append(buf[pos:match.start()])
+                self._inside = None
+                self._opener = self._hidden = ""
+                pos = match.end()
+                continue
+
+            match = self._openers.pattern.search(buf, pos)
+            if match is None:
+                hold = len(buf) if final else self._openers.held(buf, pos)
+                content.append(buf[pos:hold])
+                self._held = buf[hold:]
+                break
+            start, end = match.span()
+            content.append(buf[pos:start])
+            if (
+                not final
+                and len(buf) - start < self._openers.longest
+                and buf[start:] in self._openers.prefixes
+            ):
+                self._held = buf[start:]  # "]~b]a" may still become "]~b]ai"
+                break
+            kind, closers = self._starts[match.group()]
+            if kind == _TAG:
+                gt = buf.find(">", end, start + _MAX_TAG_LEN)
+                if gt != -1:
+                    end = gt + 1
+                elif not final and len(buf) - start < _MAX_TAG_LEN:
+                    self._held = buf[start:]  # wait for the ">"
+                    break
+                else:
+                    content.append(match.group())  # never closed: prose
+            elif kind != _MARKER:
+                self._inside = (kind, self._closers[closers])
+                if kind == _BLOCK and self._max_hidden is not None:
+                    self._opener = match.group()
+            pos = end
+        return "".join(content), "".join(reasoning)
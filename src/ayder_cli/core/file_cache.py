@@ -0,0 +1,111 @@
+"""Process-wide cache of decoded text file contents.
+
+read_file, file_editor and the TUI diff preview read the same few files over
+and over during a read-edit-read cycle. FileContentCache keeps their decoded
+text, validated on every lookup against the file's mtime_ns, size and inode
+(one ``stat`` instead of a read and a UTF-8 decode), and bounded by total
+size with least-recently-used eviction. Writers hand the new text over with
+``store()`` so the next read of a file just written is a hit.
+
+Text is as ``open(path, "r", encoding="utf-8").read()`` returns it: universal
+newlines, strict decoding.
+"""
+from __future__ import annotations
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+# Total characters kept, and the largest file that is cached at all.
+DEFAULT_MAX_CHARS = 32 * 1024 * 1024
+DEFAULT_MAX_ENTRY_CHARS = 1024 * 1024
+
+
+class _Version(NamedTuple):
+    mtime_ns: int
+    size: int
+    inode: int
+
+    @classmethod
+    def of(cls, st: os.stat_result) -> "_Version":
+        return cls(st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileContentCache:
+    """Decoded file contents keyed by absolute path."""
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        max_entry_chars: int = DEFAULT_MAX_ENTRY_CHARS,
+    ) -> None:
+        self.max_chars = max_chars
+        self.max_entry_chars = max_entry_chars
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[_Version, str]] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def read_text(self, path, stat: Optional[os.stat_result] = None) -> str:
+        """Contents of ``path``; raises like ``Path.read_text`` would."""
+        key = os.path.abspath(path)
+        st = stat if stat is not None else os.stat(key)
+        version = _Version.of(st)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        with open(key, "r", encoding="utf-8") as f:
+            text = f.read()
+        self._put(key, version, text)
+        return text
+
+    def read_lines(self, path, stat: Optional[os.stat_result] = None) -> list[str]:
+        """Contents of ``path`` split like ``readlines()``."""
+        return io.StringIO(self.read_text(path, stat)).readlines()
+
+    def store(self, path, text: str) -> None:
+        """Record ``text`` as just written to ``path`` (in text mode)."""
+        key = os.path.abspath(path)
+        try:
+            version = _Version.of(os.stat(key))
+        except OSError:
+            self.invalidate(key)
+            return
+        # What reading the file back returns: universal newlines.
+        self._put(key, version, text.replace("\r\n", "\n").replace("\r", "\n"))
+
+    def invalidate(self, path) -> None:
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._chars -= len(entry[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.hits = self.misses = 0
+
+    def _put(self, key: str, version: _Version, text: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._chars -= len(old[1])
+            if len(text) > self.max_entry_chars:
+                return
+            self._entries[key] = (version, text)
+            self._chars += len(text)
+            while self._chars > self.max_chars:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+
+file_cache = FileContentCache()
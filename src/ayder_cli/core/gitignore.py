@@ -0,0 +1,251 @@
+"""Gitignore-style filtering for the built-in file walkers.
+
+The built-in search engine (used when ripgrep is not installed) walks the
+project itself, and must skip the same files rg would: entries matched by
+``.gitignore``, ``.ignore`` and ``.rgignore`` files in the directory being
+walked and every directory above it up to the project root, the root's
+``.git/info/exclude``, hidden entries, and any extra rules the caller adds.
+
+Patterns follow gitignore(5): a pattern with a slash before its end is
+anchored to the directory of the file that holds it, otherwise it matches a
+name at any depth; ``*`` and ``?`` stop at slashes, ``**`` spans them; a
+trailing slash matches directories only; ``!`` re-includes; and the last
+matching pattern wins, deeper files overriding shallower ones. As in git, a
+file inside an excluded directory cannot be re-included: the walk never
+enters that directory.
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterable, Iterator, Optional
+
+IGNORE_FILES = (".gitignore", ".ignore", ".rgignore")
+ROOT_FILES = (".git/info/exclude",)
+
+
+def glob_to_regex(glob: str) -> str:
+    """Regex source for a slash-separated glob, matched against whole paths."""
+    out = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            j = i
+            while j < n and glob[j] == "*":
+                j += 1
+            component = (i == 0 or glob[i - 1] == "/") and (j == n or glob[j] == "/")
+            if j - i >= 2 and component:
+                if j == n:
+                    out.append(".*")
+                    i = j
+                else:
+                    out.append("(?:.*/)?")
+                    i = j + 1
+                continue
+            out.append("[^/]*")
+            i = j
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and glob[j] in "!^":
+                j += 1
+            if j < n and glob[j] == "]":
+                j += 1
+            while j < n and glob[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1 : j].replace("\\", "\\\\")
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _compile_rule(line: str):
+    """(regex, negate, dir_only) for one ignore-file line, or None."""
+    line = line.rstrip("\r\n")
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    source = glob_to_regex(line.lstrip("/"))
+    if not anchored:
+        source = "(?:.*/)?" + source
+    return re.compile(source + r"\Z", re.DOTALL), negate, dir_only
+
+
+class IgnoreRules:
+    """The patterns of one directory's ignore files, in precedence order."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._rules = [rule for rule in map(_compile_rule, patterns) if rule]
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    @classmethod
+    def from_directory(
+        cls, directory, extra_files: Iterable[str] = ()
+    ) -> Optional["IgnoreRules"]:
+        """Rules read from ``directory``'s ignore files; None when there are none."""
+        patterns: list[str] = []
+        for name in (*extra_files, *IGNORE_FILES):
+            try:
+                path = os.path.join(directory, name)
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    patterns.extend(f.read().splitlines())
+            except OSError:
+                continue
+        rules = cls(patterns)
+        return rules or None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """True if the last matching rule ignores ``path`` (relative to the
+        rules' directory, '/'-separated), False if it re-includes it, None
+        if no rule matches."""
+        for regex, negate, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negate
+        return None
+
+
+def is_ignored(stack, path: str, is_dir: bool) -> bool:
+    """Whether ``path`` is ignored by a stack of ``(base, IgnoreRules)``,
+    outermost first, where ``path`` and each base are relative to the
+    project root."""
+    for base, rules in reversed(stack):
+        if base:
+            if not path.startswith(base + "/"):
+                continue
+            sub = path[len(base) + 1 :]
+        else:
+            sub = path
+        verdict = rules.match(sub, is_dir)
+        if verdict is not None:
+            return verdict
+    return False
+
+
+def load_rules(directory, at_root: bool = False) -> Optional[IgnoreRules]:
+    """The ignore rules a directory adds for its own entries; the project
+    root also contributes ``.git/info/exclude``."""
+    extra_files = ROOT_FILES if at_root else ()
+    return IgnoreRules.from_directory(directory, extra_files=extra_files)
+
+
+def list_directory(
+    dirpath,
+    rel: str,
+    stack,
+    rules: Optional[IgnoreRules] = None,
+    hidden: bool = False,
+) -> Optional[tuple[list[str], list[str]]]:
+    """Sorted ``(dirnames, filenames)`` of the entries of ``dirpath`` (at
+    ``rel`` from the project root) that ``stack``, which must include the
+    directory's own rules, and ``rules`` leave visible. None when the
+    directory cannot be read."""
+    try:
+        with os.scandir(dirpath) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return None
+
+    dirnames, filenames = [], []
+    for entry in entries:
+        name = entry.name
+        if not hidden and name.startswith("."):
+            continue
+        try:
+            if entry.is_symlink():
+                continue
+            is_dir = entry.is_dir()
+            if not is_dir and not entry.is_file():
+                continue  # sockets, FIFOs, devices
+        except OSError:
+            continue
+        child = f"{rel}/{name}" if rel else name
+        verdict = rules.match(child, is_dir) if rules else None
+        if verdict is None:
+            verdict = bool(stack) and is_ignored(stack, child, is_dir)
+        if verdict:
+            continue
+        (dirnames if is_dir else filenames).append(name)
+    return dirnames, filenames
+
+
+def walk(
+    root,
+    start=None,
+    rules: Optional[IgnoreRules] = None,
+    hidden: bool = False,
+) -> Iterator[tuple[str, list[str], list[str]]]:
+    """``os.walk`` of ``start`` (default ``root``) minus ignored entries.
+
+    Yields ``(dirpath, dirnames, filenames)`` top-down with names sorted;
+    removing names from ``dirnames`` prunes them, as with ``os.walk``.
+    ``rules`` apply relative to ``root`` and take precedence over every
+    ignore file, like rg's ``--glob`` overrides. Only regular files are
+    listed; symlinks are not followed and unreadable directories are
+    skipped silently.
+    """
+    root = os.path.abspath(root)
+    start = os.path.abspath(start) if start is not None else root
+    if start != root and not start.startswith(root + os.sep):
+        root = start
+
+    stack = []
+    rel_start = ""
+    if start != root:
+        rel_start = os.path.relpath(start, root).replace(os.sep, "/")
+    parts = rel_start.split("/") if rel_start else []
+    for depth in range(len(parts)):
+        local = load_rules(os.path.join(root, *parts[:depth]), at_root=depth == 0)
+        if local:
+            stack.append(("/".join(parts[:depth]), local))
+
+    yield from _walk(start, rel_start, stack, rules, hidden, at_root=start == root)
+
+
+def _walk(dirpath, rel, stack, rules, hidden, at_root=False):
+    local = load_rules(dirpath, at_root=at_root)
+    if local:
+        stack = [*stack, (rel, local)]
+    listing = list_directory(dirpath, rel, stack, rules, hidden)
+    if listing is None:
+        return
+    dirnames, filenames = listing
+    yield dirpath, dirnames, filenames
+    for name in dirnames:
+        yield from _walk(
+            os.path.join(dirpath, name),
+            f"{rel}/{name}" if rel else name,
+            stack,
+            rules,
+            hidden,
+        )
@@ -0,0 +1,235 @@
+"""JSON encoding/decoding with an optional fast backend, plus truncation repair.
+
+Tool-call arguments are the largest JSON the CLI handles (a ``file_editor``
+write carries the whole file), and they are decoded and encoded several times
+per turn. ``loads``/``dumps`` use orjson or msgspec when one is installed and
+the stdlib ``json`` module otherwise; ``use_backend`` switches explicitly.
+
+All backends agree on what they accept: input a fast backend rejects (NaN,
+lone surrogates) is retried with the stdlib, so ``loads`` raises
+``json.JSONDecodeError`` exactly when ``json.loads`` would. ``dumps`` never
+escapes non-ASCII; separators may differ between backends, so compare decoded
+values, not strings.
+
+``repair_json`` completes JSON that was cut off mid-stream (the model hit its
+output limit) in a single pass.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Optional, Tuple
+
+Loads = Callable[[Any], Any]
+Dumps = Callable[[Any, Optional[int]], str]
+
+
+def _stdlib_loads(data: Any) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int]) -> str:
+    return json.dumps(obj, ensure_ascii=False, indent=indent)
+
+
+def _stdlib_codec() -> Tuple[Loads, Dumps]:
+    return _stdlib_loads, _stdlib_dumps
+
+
+def _orjson_codec() -> Tuple[Loads, Dumps]:
+    import orjson
+
+    def loads(data: Any) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+    def dumps(obj: Any, indent: Optional[int]) -> str:
+        if indent not in (None, 2):
+            return _stdlib_dumps(obj, indent)
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:  # integers beyond 64 bits, unsupported subclasses
+            return _stdlib_dumps(obj, indent)
+
+    return loads, dumps
+
+
+def _msgspec_codec() -> Tuple[Loads, Dumps]:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def loads(data: Any) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError:
+            return json.loads(data)
+
+    def dumps(obj: Any, indent: Optional[int]) -> str:
+        try:
+            encoded = encoder.encode(obj)
+        except (TypeError, ValueError, OverflowError, msgspec.EncodeError):
+            return _stdlib_dumps(obj, indent)
+        if indent is not None:
+            encoded = msgspec.json.format(encoded, indent=indent)
+        return encoded.decode()
+
+    return loads, dumps
+
+
+# Fastest first; "json" always loads.
+_BACKENDS: dict[str, Callable[[], Tuple[Loads, Dumps]]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+BACKEND = "json"
+_loads: Loads = _stdlib_loads
+_dumps: Dumps = _stdlib_dumps
+
+
+def use_backend(name: Optional[str] = None) -> str:
+    """Switch the JSON backend and return the name of the one in use.
+
+    Args:
+        name: ``"orjson"``, ``"msgspec"`` or ``"json"``; ``None`` picks the
+            fastest one installed.
+
+    Raises:
+        ValueError: If ``name`` is not a known backend.
+        ImportError: If the named backend is not installed.
+    """
+    global BACKEND, _loads, _dumps
+
+    if name is not None and name not in _BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name!r}")
+    for candidate in [name] if name else list(_BACKENDS):
+        try:
+            _loads, _dumps = _BACKENDS[candidate]()
+        except ImportError:
+            if name:
+                raise
+            continue
+        BACKEND = candidate
+        break
+    return BACKEND
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode JSON text.
+
+    Raises:
+        json.JSONDecodeError: If ``data`` is not valid JSON.
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any, *, indent: Optional[int] = None, ensure_ascii: bool = False) -> str:
+    """Encode ``obj`` as JSON text (non-ASCII characters are kept as is).
+
+    ``ensure_ascii`` escapes them instead, with the stdlib encoder; use it
+    for text written to files, which must encode even when a string holds a
+    lone surrogate (decoded binary, a broken paste).
+    """
+    if ensure_ascii:
+        return json.dumps(obj, indent=indent)
+    return _dumps(obj, indent)
+
+
+use_backend()
+
+
+# ---------------------------------------------------------------------------
+# Truncation repair
+# ---------------------------------------------------------------------------
+
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\(?:u[0-9a-fA-F]{4}|[^u])[^"\\]*)*')
+_SCALAR = re.compile(r'[^\s,:\[\]{}"]+')
+_COMPLETE_SCALAR = re.compile(
+    r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null"
+)
+
+
+def repair_json(text: str) -> Any:
+    """Decode ``text``, completing it first if it was cut off.
+
+    One left-to-right pass tracks the open containers and the last point
+    where the document could be closed: after an opening bracket or a
+    complete value. A truncated string value is kept and closed (minus any
+    half-written escape); a truncated key, number or literal, or a key still
+    waiting for its value, is dropped back to that point. Everything after a
+    complete top-level value is ignored.
+
+    Returns:
+        The decoded value, or None when no prefix closes into valid JSON.
+    """
+    closers: list[str] = []  # closing bracket of each open container
+    expect_key: list[bool] = []  # per container: next string is an object key
+    best: Optional[Tuple[int, str]] = None  # (prefix end, closing suffix)
+    tail: Optional[Tuple[int, str]] = None  # truncated string value, closed
+    n = len(text)
+    i = 0
+
+    def closing() -> str:
+        return "".join(reversed(closers))
+
+    while i < n:
+        c = text[i]
+        if c == '"':
+            is_key = bool(expect_key) and expect_key[-1]
+            # Stops at the closing quote, the end, or a half-written escape.
+            e = _STRING_BODY.match(text, i + 1).end()
+            if e == n or text[e] != '"':
+                if not is_key:
+                    tail = (e, '"' + closing())
+                break
+            i = e + 1
+            if not is_key:
+                best = (i, closing())
+        elif c in "{[":
+            closers.append("}" if c == "{" else "]")
+            expect_key.append(c == "{")
+            i += 1
+            best = (i, closing())
+        elif c in "}]":
+            if not closers:
+                break
+            closers.pop()
+            expect_key.pop()
+            i += 1
+            best = (i, closing())
+            if not closers:
+                break
+        elif c == ",":
+            if closers and closers[-1] == "}":
+                expect_key[-1] = True
+            i += 1
+        elif c == ":":
+            if expect_key:
+                expect_key[-1] = False
+            i += 1
+        elif c in " \t\r\n":
+            i += 1
+        else:
+            m = _SCALAR.match(text, i)
+            i = m.end()
+            if _COMPLETE_SCALAR.fullmatch(m.group()) and not (expect_key and expect_key[-1]):
+                best = (i, closing())
+            if not closers:
+                break
+
+    for candidate in (tail, best):
+        if candidate is None:
+            continue
+        end, suffix = candidate
+        try:
+            return loads(text[:end] + suffix)
+        except json.JSONDecodeError:
+            continue
+    return None
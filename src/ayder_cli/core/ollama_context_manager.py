@@ -87,6 +87,11 @@ class OllamaContextManager:
 
         self._cache_monitor: CacheMonitor = CacheMonitor()
 
+    @property
+    def context_window(self) -> int:
+        """Model context length (detected, or the provisional num_ctx)."""
+        return self._actual_context_length
+
     # ------------------------------------------------------------------
     # Protocol: freeze_system_prompt
     # ------------------------------------------------------------------
@@ -0,0 +1,253 @@
+"""Fuzzy path index behind the TUI's @ file picker.
+
+The picker used to prefix-match the names of a single directory, so a file
+could only be reached by typing its path from the root. PathIndex keeps
+every visible path of the project (``ProjectTree``'s entries, hidden ones
+left out) and ranks them against a query the way fzf does: the query's
+characters must appear in the path in order, and matches score higher at
+the start of a name or path segment, in camelCase humps, in runs of
+consecutive characters and inside the file name itself, lower across gaps.
+A query in lower case matches case-insensitively, one with an upper-case
+letter exactly.
+
+Paths are kept as text blobs of ``_CHUNK_PATHS`` paths, each preceded by a
+newline. One compiled regex pass over a blob (a possessive
+``\\n[^a]*+a[^b]*+b...`` scan, linear in the blob) picks the candidate
+lines, and only those are scored in Python. A query that extends the
+previous one only rescans the previous candidates. Blobs are scanned one at
+a time so a long search can be cancelled and can report its best matches
+so far.
+
+A refresh walks the cached tree, which stats each directory but reads only
+changed ones, and rebuilds the path list only when a listing changed.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from ayder_cli.core.project_tree import ProjectTree, tree_for
+
+_CHUNK_PATHS = 4096
+
+# Seconds between interim results reported by a long search.
+_STREAM_INTERVAL = 0.05
+
+# fzf's scoring constants.
+_SCORE_MATCH = 16
+_GAP_START = 3
+_GAP_EXTENSION = 1
+_BONUS_BOUNDARY = 8
+_BONUS_DELIMITER = _BONUS_BOUNDARY + 1  # after "/", as fzf's path scheme
+_BONUS_CAMEL = 7
+_BONUS_CONSECUTIVE = _GAP_START + _GAP_EXTENSION
+_BONUS_FIRST_CHAR = 2  # multiplier for the first query character's bonus
+_BONUS_NAME = _SCORE_MATCH  # whole query matched within the file name
+
+_SEPARATORS = frozenset("_-. ")
+
+
+class PathIndex:
+    """Every visible file and directory path of one project tree."""
+
+    def __init__(self, tree: ProjectTree) -> None:
+        self.tree = tree
+        self.version = 0  # bumped whenever the path list changes
+        self._dirs: dict[str, tuple] = {}
+        self._chunks: Optional[tuple[str, ...]] = None
+        self._refreshed = 0.0
+        self._refresh_lock = threading.Lock()
+        self._last: Optional[tuple] = None  # (chunks, query, candidate chunks)
+
+    @property
+    def ready(self) -> bool:
+        """True once the index has been built."""
+        return self._chunks is not None
+
+    def refresh(
+        self,
+        max_age: float = 0.0,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """Bring the index up to date; True if the path list changed.
+
+        Skipped when the last refresh is less than ``max_age`` seconds old,
+        or when another thread is refreshing an index that is already built.
+        """
+        if self.ready and time.monotonic() - self._refreshed < max_age:
+            return False
+        if not self._refresh_lock.acquire(blocking=not self.ready):
+            return False
+        try:
+            return self._refresh(cancelled)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self, cancelled) -> bool:
+        dirs = {}
+        changed = self._chunks is None
+        for rel, dirnames, filenames in self.tree.walk():
+            if cancelled is not None and cancelled():
+                return False
+            entry = self._dirs.get(rel)
+            # The tree yields the same list objects while a directory is
+            # unchanged, so its paths can be reused.
+            if (
+                entry is None
+                or entry[0] is not dirnames
+                or entry[1] is not filenames
+            ):
+                prefix = f"{rel}/" if rel else ""
+                paths = [f"{prefix}{d}/" for d in dirnames if not d.startswith(".")]
+                paths.extend(
+                    f"{prefix}{f}" for f in filenames if not f.startswith(".")
+                )
+                entry = (dirnames, filenames, paths)
+                changed = True
+            dirs[rel] = entry
+        changed = changed or dirs.keys() != self._dirs.keys()
+        self._dirs = dirs
+        if changed:
+            paths = [path for entry in dirs.values() for path in entry[2]]
+            self._chunks = tuple(
+                "\n" + "\n".join(paths[i : i + _CHUNK_PATHS])
+                for i in range(0, len(paths), _CHUNK_PATHS)
+            )
+            self.version += 1
+        self._refreshed = time.monotonic()
+        return changed
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        on_results: Optional[Callable[[list[str]], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Optional[list[str]]:
+        """The ``limit`` best paths for ``query``, best first.
+
+        A search running longer than ``_STREAM_INTERVAL`` passes its best
+        matches so far to ``on_results`` as it goes. Returns None if
+        ``cancelled`` reports True before it finishes.
+        """
+        chunks = self._chunks
+        if not chunks or not query:
+            return []
+        folded = query == query.lower()
+        needle = query.lower() if folded else query
+        regex = _query_regex(needle, folded)
+
+        candidates = chunks
+        last = self._last
+        if last is not None and last[0] is chunks and query.startswith(last[1]):
+            candidates = last[2]
+
+        matched = []
+        best: list[tuple[int, int, str]] = []
+        reported = time.monotonic()
+        for blob in candidates:
+            if cancelled is not None and cancelled():
+                return None
+            found = regex.findall(blob)
+            if not found:
+                continue
+            matched.append("\n" + "\n".join(found))
+            ranked = []
+            for path in found:
+                score = _score(path, needle, folded)
+                if score is not None:
+                    ranked.append((-score, len(path), path))
+            best = heapq.nsmallest(limit, best + ranked)
+            now = time.monotonic()
+            if on_results is not None and now - reported > _STREAM_INTERVAL:
+                on_results([path for *_, path in best])
+                reported = time.monotonic()
+
+        self._last = (chunks, query, tuple(matched))
+        return [path for *_, path in best]
+
+
+def _query_regex(query: str, folded: bool) -> re.Pattern:
+    """A regex whose group is each whole line having ``query`` as a
+    subsequence. Lines are found by their leading newline, a literal the
+    regex engine scans for quickly; case folding uses explicit classes,
+    which are faster than ``re.IGNORECASE``."""
+    parts = ["\\n("]
+    for char in query:
+        variants = {char}
+        if folded and len(char.upper()) == 1:
+            variants.add(char.upper())
+        chars = "".join(re.escape(c) for c in sorted(variants))
+        parts.append(f"[^{chars}\\n]*+[{chars}]")
+    parts.append("[^\\n]*)")
+    return re.compile("".join(parts))
+
+
+def _positions(text: str, query: str, start: int) -> Optional[list[int]]:
+    """Positions of ``query`` in ``text[start:]``: the first match found
+    left to right, then tightened right to left to its shortest span."""
+    pos = start - 1
+    for char in query:
+        pos = text.find(char, pos + 1)
+        if pos == -1:
+            return None
+    positions = [0] * len(query)
+    for i in range(len(query) - 1, -1, -1):
+        pos = text.rfind(query[i], start, pos + 1)
+        positions[i] = pos
+        pos -= 1
+    return positions
+
+
+def _score(path: str, query: str, folded: bool) -> Optional[int]:
+    """fzf-style score of ``query`` against ``path``; None if no match."""
+    text = path.lower() if folded else path
+    if len(text) != len(path):
+        path = text  # lower() changed the length; bonuses read the folded text
+    end = len(text) - 1 if text.endswith("/") else len(text)
+    name_start = text.rfind("/", 0, end) + 1
+    positions = _positions(text, query, name_start)
+    in_name = positions is not None
+    if not in_name:
+        positions = _positions(text, query, 0)
+        if positions is None:
+            return None
+
+    score = _BONUS_NAME if in_name else 0
+    prev = -1
+    for i, pos in enumerate(positions):
+        if pos == 0 or path[pos - 1] == "/":
+            bonus = _BONUS_DELIMITER
+        elif path[pos - 1] in _SEPARATORS:
+            bonus = _BONUS_BOUNDARY
+        elif path[pos - 1].islower() and path[pos].isupper():
+            bonus = _BONUS_CAMEL
+        else:
+            bonus = 0
+        if i == 0:
+            bonus *= _BONUS_FIRST_CHAR
+        elif pos == prev + 1:
+            bonus = max(bonus, _BONUS_CONSECUTIVE)
+        else:
+            score -= _GAP_START + (pos - prev - 2) * _GAP_EXTENSION
+        score += _SCORE_MATCH + bonus
+        prev = pos
+    return score
+
+
+_INDEXES: dict[str, PathIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_for(root) -> PathIndex:
+    """The shared path index of project ``root``, built on first refresh."""
+    key = str(Path(root).resolve())
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = PathIndex(tree_for(key))
+        return index
@@ -0,0 +1,283 @@
+"""Cached, gitignore-aware model of a project's directory tree.
+
+get_project_structure used to run ``tree`` (or a full recursive ``iterdir``)
+on every call, and it runs to fill the project-structure macro of every
+runtime, each agent's included; the TUI's @ file picker listed directories
+with ``iterdir`` plus an ``is_dir`` per entry on every keystroke.
+ProjectTree keeps each directory's visible entries — what
+``ayder_cli.core.gitignore.walk`` would list — and revalidates a directory
+with a stat of it and of its ignore files: a listing is read again only
+when the directory's mtime changed (an entry was added, removed or renamed)
+or the ignore rules that apply to it did. Directories are read on first use.
+
+A directory modified within two seconds of being read is read again on its
+next use, since a change in the same mtime tick would go unnoticed.
+
+The @ file picker lets the user name any file, including ignored ones and
+symlinks that stay inside the project, so it uses ``entries``: the same
+mtime-validated cache over every entry of a directory, unfiltered.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ayder_cli.core.gitignore import (
+    IGNORE_FILES,
+    ROOT_FILES,
+    IgnoreRules,
+    list_directory,
+    load_rules,
+)
+
+# Excluded from the tree whatever the ignore files say.
+DEFAULT_RULES = IgnoreRules(
+    [
+        ".git/",
+        "__pycache__/",
+        "*.pyc",
+        "*.egg-info/",
+        ".venv/",
+        ".ayder/",
+        ".claude/",
+        "htmlcov/",
+        "dist/",
+        "build/",
+        "node_modules/",
+    ]
+)
+
+_RACY_NS = 2_000_000_000
+
+
+class _Dir:
+    __slots__ = ("mtime_ns", "racy", "key", "stack", "dirnames", "filenames")
+
+    def __init__(self, mtime_ns, racy, key, stack, dirnames, filenames):
+        self.mtime_ns = mtime_ns
+        self.racy = racy
+        self.key = key
+        self.stack = stack
+        self.dirnames = dirnames
+        self.filenames = filenames
+
+
+class ProjectTree:
+    """The directory tree of one project root."""
+
+    def __init__(self, root, rules: IgnoreRules = DEFAULT_RULES) -> None:
+        self.root = str(Path(root).resolve())
+        self.rules = rules
+        self.reads = 0  # directory listings read from disk
+        self._dirs: dict[str, _Dir] = {}
+        self._all: dict[str, _Dir] = {}  # unfiltered listings, for entries()
+        self._lock = threading.Lock()
+
+    def listing(self, rel: str = "") -> Optional[tuple[list[str], list[str]]]:
+        """Sorted ``(dirnames, filenames)`` of project directory ``rel``,
+        hidden names included; None if it is missing or ignored."""
+        parts = [part for part in rel.replace(os.sep, "/").split("/") if part]
+        with self._lock:
+            entry = self._get("", None)
+            for depth, name in enumerate(parts):
+                if entry is None or name not in entry.dirnames:
+                    return None
+                entry = self._get("/".join(parts[: depth + 1]), entry)
+            if entry is None:
+                return None
+            return list(entry.dirnames), list(entry.filenames)
+
+    def entries(self, rel: str = "") -> Optional[tuple[list[str], list[str]]]:
+        """Sorted ``(dirnames, filenames)`` of every entry of directory
+        ``rel``, ignored and hidden ones included.
+
+        A symlink is listed as what it points to, and left out when that is
+        outside the root. None if ``rel`` is missing or outside the root.
+        """
+        path = os.path.join(self.root, rel) if rel else self.root
+        if not _within(self.root, os.path.realpath(path)):
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._all.pop(rel, None)
+            return None
+        with self._lock:
+            entry = self._all.get(rel)
+            if entry is None or entry.racy or entry.mtime_ns != st.st_mtime_ns:
+                listing = _list_all(self.root, path)
+                if listing is None:
+                    self._all.pop(rel, None)
+                    return None
+                racy = time.time_ns() - st.st_mtime_ns < _RACY_NS
+                entry = _Dir(st.st_mtime_ns, racy, None, None, *listing)
+                self._all[rel] = entry
+                self.reads += 1
+            return list(entry.dirnames), list(entry.filenames)
+
+    def walk(self, hidden: bool = False):
+        """Yield ``(rel, dirnames, filenames)`` for each directory, top-down.
+
+        The lists include hidden names but hidden directories are only
+        descended into when ``hidden``. They are the cached listings
+        themselves, not copies: the same objects are yielded for as long as
+        the directory is unchanged, and they must not be modified. The tree
+        is locked per directory, not for the whole walk.
+        """
+        with self._lock:
+            root = self._get("", None)
+        pending = [("", root)] if root is not None else []
+        while pending:
+            rel, entry = pending.pop()
+            yield rel, entry.dirnames, entry.filenames
+            for name in reversed(entry.dirnames):
+                if name.startswith(".") and not hidden:
+                    continue
+                child_rel = f"{rel}/{name}" if rel else name
+                with self._lock:
+                    child = self._get(child_rel, entry)
+                if child is not None:
+                    pending.append((child_rel, child))
+
+    def render(
+        self,
+        max_depth: int = 3,
+        max_files: Optional[int] = None,
+        hidden: bool = False,
+    ) -> str:
+        """The tree as text, directories first, ``max_depth`` levels deep.
+
+        A directory with more than ``max_files`` files is summarized as a
+        file count; hidden entries are left out unless ``hidden``.
+        """
+        lines = ["."]
+        with self._lock:
+            root = self._get("", None)
+            if root is not None:
+                self._render(root, "", "", 1, max_depth, max_files, hidden, lines)
+        return "\n".join(lines)
+
+    def _render(self, entry, rel, prefix, depth, max_depth, max_files, hidden, lines):
+        if depth > max_depth:
+            return
+        dirs = [d for d in entry.dirnames if hidden or not d.startswith(".")]
+        files = [f for f in entry.filenames if hidden or not f.startswith(".")]
+        collapsed = max_files is not None and len(files) > max_files
+        rows = [(name, True) for name in dirs]
+        if collapsed:
+            rows.append((f"({len(files)} files)", False))
+        else:
+            rows.extend((name, False) for name in files)
+
+        for i, (name, is_dir) in enumerate(rows):
+            last = i == len(rows) - 1
+            connector = "`-- " if last else "|-- "
+            if not is_dir:
+                lines.append(f"{prefix}{connector}{name}")
+                continue
+            lines.append(f"{prefix}{connector}{name}/")
+            if depth < max_depth:
+                child_rel = f"{rel}/{name}" if rel else name
+                child = self._get(child_rel, entry)
+                if child is not None:
+                    self._render(
+                        child,
+                        child_rel,
+                        prefix + ("    " if last else "|   "),
+                        depth + 1,
+                        max_depth,
+                        max_files,
+                        hidden,
+                        lines,
+                    )
+
+    def _get(self, rel: str, parent: Optional[_Dir]) -> Optional[_Dir]:
+        """The current listing of ``rel``, read again if anything changed."""
+        path = os.path.join(self.root, rel) if rel else self.root
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._dirs.pop(rel, None)
+            return None
+        at_root = not rel
+        # Identifies every ignore file that applies to this directory's
+        # entries: the parent's key plus this directory's own files.
+        key = parent.key if parent is not None else ()
+        signature = _rules_signature(path, at_root)
+        if any(signature):
+            key = (*key, (rel, signature))
+        entry = self._dirs.get(rel)
+        if (
+            entry is not None
+            and not entry.racy
+            and entry.mtime_ns == st.st_mtime_ns
+            and entry.key == key
+        ):
+            return entry
+
+        stack = parent.stack if parent is not None else ()
+        local = load_rules(path, at_root=at_root)
+        if local:
+            stack = (*stack, (rel, local))
+        listing = list_directory(path, rel, stack, self.rules, hidden=True)
+        dirnames, filenames = listing if listing is not None else ([], [])
+        racy = time.time_ns() - st.st_mtime_ns < _RACY_NS
+        entry = _Dir(st.st_mtime_ns, racy, key, stack, dirnames, filenames)
+        self._dirs[rel] = entry
+        self.reads += 1
+        return entry
+
+
+def _list_all(root: str, path: str) -> Optional[tuple[list[str], list[str]]]:
+    """Sorted ``(dirnames, filenames)`` of ``path``, unfiltered but for
+    symlinks leading outside ``root``."""
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return None
+    dirnames, filenames = [], []
+    for entry in entries:
+        try:
+            if entry.is_symlink() and not _within(root, os.path.realpath(entry.path)):
+                continue
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+        (dirnames if is_dir else filenames).append(entry.name)
+    return dirnames, filenames
+
+
+def _within(root: str, path: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def _rules_signature(path: str, at_root: bool) -> tuple:
+    """mtime and size of each ignore file a directory may hold."""
+    names = (*ROOT_FILES, *IGNORE_FILES) if at_root else IGNORE_FILES
+    signature = []
+    for name in names:
+        try:
+            st = os.stat(os.path.join(path, name))
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+_TREES: dict[str, ProjectTree] = {}
+_TREES_LOCK = threading.Lock()
+
+
+def tree_for(root) -> ProjectTree:
+    """The shared tree model of project ``root``."""
+    key = str(Path(root).resolve())
+    with _TREES_LOCK:
+        tree = _TREES.get(key)
+        if tree is None:
+            tree = _TREES[key] = ProjectTree(key)
+        return tree
@@ -14,6 +14,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+from ayder_cli.core import json_codec
+
 
 class SessionError(Exception):
     """Base error for session save/load problems."""
@@ -89,7 +91,7 @@ def save_session(
     created_at = now
     if path.exists():
         try:
-            created_at = json.loads(path.read_text(encoding="utf-8")).get(
+            created_at = json_codec.loads(path.read_text(encoding="utf-8")).get(
                 "created_at", now
             )
         except (OSError, json.JSONDecodeError):
@@ -109,7 +111,9 @@ def save_session(
         "message_count": len(messages),
         "messages": messages,
     }
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_text(
+        json_codec.dumps(payload, indent=2, ensure_ascii=True), encoding="utf-8"
+    )
     return session_id
 
 
@@ -141,7 +145,7 @@ def load_session(token: str, root: Path | None = None) -> SessionData:
     sid = resolve_session_id(token, root)
     path = sessions_dir(root) / f"{sid}.json"
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json_codec.loads(path.read_text(encoding="utf-8"))
     except (OSError, json.JSONDecodeError) as exc:
         raise SessionError(f"could not read session {sid}: {exc}") from exc
     return SessionData(
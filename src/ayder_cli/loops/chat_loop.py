@@ -14,11 +14,15 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, List, Protocol, runtime_checkable
 
 from ayder_cli.application.execution_policy import ExecutionPolicy, ToolRequest
+from ayder_cli.core import json_codec
 from ayder_cli.core.context_manager import ContextManager, truncate_tool_result
+from ayder_cli.loops.output_budget import OutputBudget
+from ayder_cli.loops.reasoning_budget import ReasoningBudget
 from ayder_cli.providers.base import _FunctionCall, _ToolCall
 
 logger = logging.getLogger(__name__)
@@ -43,6 +47,20 @@ class ChatLoopConfig:
     )
     max_history: int = 0
     verbose: bool = False
+    # False: one non-streaming AIProvider.chat call per turn (headless batch
+    # runs) — the response arrives as a single complete chunk.
+    stream: bool = True
+    # Build the next request (tool schemas, provider prewarm) while the last
+    # tools of a turn are still running.
+    pipelined_turns: bool = True
+    # Per-turn reasoning effort ("off", "low", "medium", "high") for the turn
+    # answering a user message and for turns following tool results. None
+    # leaves the provider's configured thinking in place for that turn kind.
+    user_turn_effort: str | None = None
+    tool_turn_effort: str | None = None
+    # Lower max_output_tokens per request to the room left in the context
+    # window (capped at max_output_tokens).
+    adaptive_output_tokens: bool = True
     pre_iteration_hook: Any | None = None  # async callable(messages) -> None
 
 
@@ -87,6 +105,15 @@ class ChatLoop:
         self.config = config
         self.cb = callbacks
         self._total_tokens = 0
+        self._next_turn: asyncio.Task | None = None
+        self.reasoning_budget: ReasoningBudget | None = None
+        if config.user_turn_effort is not None or config.tool_turn_effort is not None:
+            self.reasoning_budget = ReasoningBudget(
+                config.user_turn_effort, config.tool_turn_effort
+            )
+        self.output_budget: OutputBudget | None = None
+        if config.adaptive_output_tokens and config.max_output_tokens:
+            self.output_budget = OutputBudget(config.max_output_tokens)
         if context_manager is not None:
             self.context_manager = context_manager
         else:
@@ -101,6 +128,13 @@ class ChatLoop:
 
     async def run(self, *, no_tools: bool = False) -> None:
         """Main loop: call LLM, handle tools, repeat until text-only or cancel."""
+        try:
+            await self._run(no_tools=no_tools)
+        finally:
+            self._discard_next_turn()
+            self._report_reasoning_savings()
+
+    async def _run(self, *, no_tools: bool) -> None:
         # Lazy init: detect real context length for Ollama models
         if hasattr(self.context_manager, "detect_context_length"):
             await self.context_manager.detect_context_length()
@@ -114,11 +148,7 @@ class ChatLoop:
                 await self.config.pre_iteration_hook(self.messages)
 
             # 1. Prepare schemas and messages
-            tool_schemas = (
-                []
-                if no_tools
-                else self.registry.get_schemas(tags=self.config.tool_tags)
-            )
+            tool_schemas = await self._tool_schemas(no_tools)
 
             # Use ContextManager to trim history based on token budget
             llm_messages = self.context_manager.prepare_messages(
@@ -143,7 +173,7 @@ class ChatLoop:
                         f"  Message {i} [{m.get('role')}]: {repr(m.get('content'))[:200]}..."
                     )
 
-            # 2. Call LLM (Streaming)
+            # 2. Call LLM
             self.cb.on_thinking_start()
 
             usage_obj = None
@@ -153,24 +183,36 @@ class ChatLoop:
             # (Raw is kept for appending to history exactly as it arrived)
             normalized_tool_calls = []
             raw_tool_calls_for_history: list[dict] = []
+            streamed_calls = _StreamedToolCalls()
             thinking_stopped = False
 
+            effort = (
+                self.reasoning_budget.effort_for(self.messages)
+                if self.reasoning_budget is not None
+                else None
+            )
+
             try:
-                options: dict[str, Any] = {}
-                if getattr(self.config, "num_ctx", None):
-                    options["num_ctx"] = self.config.num_ctx
-                if getattr(self.config, "max_output_tokens", None):
-                    options["max_output_tokens"] = self.config.max_output_tokens
-                if getattr(self.config, "stop_sequences", None):
-                    options["stop_sequences"] = self.config.stop_sequences
-
-                async_stream = self.llm.stream_with_tools(
-                    llm_messages,
-                    self.config.model,
-                    tools=tool_schemas,
-                    options=options,
-                    verbose=self.config.verbose,
-                )
+                options = self._request_options()
+                if effort is not None:
+                    options["reasoning_effort"] = effort
+                if self.output_budget is not None:
+                    prompt_tokens = self.output_budget.prompt_tokens(
+                        llm_messages, tool_schemas
+                    )
+                    options["max_output_tokens"] = self.output_budget.limit_for(
+                        prompt_tokens, self._context_window()
+                    )
+                if self.config.stream:
+                    async_stream = self.llm.stream_with_tools(
+                        llm_messages,
+                        self.config.model,
+                        tools=tool_schemas,
+                        options=options,
+                        verbose=self.config.verbose,
+                    )
+                else:
+                    async_stream = self._complete_once(llm_messages, tool_schemas, options)
 
                 async for chunk in async_stream:
                     if chunk.usage:
@@ -192,58 +234,11 @@ class ChatLoop:
                             thinking_stopped = True
                             self.cb.on_thinking_stop()
                         for tc in chunk.tool_calls:
-                            # We use `_stream_index` if available, otherwise fallback to `len()` positioning
-                            stream_idx = getattr(tc, "_stream_index", None)
-                            
-                            # Find if we are already building this tool call
-                            existing_tc = None
-                            
-                            if stream_idx is not None:
-                                # We have a strict index to match against (OpenAI/Deepseek/Ollama streams)
-                                if stream_idx < len(raw_tool_calls_for_history):
-                                    existing_tc = raw_tool_calls_for_history[stream_idx]
-                            else:
-                                # Fallback: try matching by ID
-                                existing_tc = next(
-                                    (x for x in raw_tool_calls_for_history if x["id"] == tc.id), 
-                                    None
-                                )
-                            
-                            if existing_tc is None:
-                                # New tool call start
-                                new_tc = {
-                                    "id": tc.id,
-                                    "type": "function",
-                                    "function": {
-                                        "name": tc.name, 
-                                        "arguments": tc.arguments
-                                    },
-                                }
-                                
-                                # If we have a stream_index, ensure our array grows to that size
-                                if stream_idx is not None:
-                                    while len(raw_tool_calls_for_history) < stream_idx:
-                                        raw_tool_calls_for_history.append({"id": f"dummy_{len(raw_tool_calls_for_history)}", "type": "function", "function": {"name": "", "arguments": ""}})
-                                    raw_tool_calls_for_history.append(new_tc)
-                                else:
-                                    raw_tool_calls_for_history.append(new_tc)
-                                    
-                                # Only trigger UI start if we have a name
-                                if tc.name:
-                                    self.cb.on_tool_start(tc.id, tc.name, {})
-                            else:
-                                # Update ID if the existing one was a dummy or fallback ID, and the new one is real
-                                if tc.id and not tc.id.startswith("idx_") and existing_tc["id"].startswith("idx_"):
-                                    existing_tc["id"] = tc.id
-                                    
-                                # Append arguments to existing tool call
-                                # Deepseek sends name ONLY on the first chunk, so we must catch it whenever it arrives
-                                if tc.name and not existing_tc["function"]["name"]:
-                                    existing_tc["function"]["name"] = tc.name
-                                    self.cb.on_tool_start(existing_tc["id"], tc.name, {})
-                                    
-                                if tc.arguments:
-                                    existing_tc["function"]["arguments"] += tc.arguments
+                            started = streamed_calls.add(tc)
+                            if started is not None:
+                                self.cb.on_tool_start(*started, {})
+
+                raw_tool_calls_for_history = streamed_calls.calls()
 
                 # Some models pack multiple parallel tool calls into one entry
                 # with concatenated JSON args (e.g. '{...}{...}{...}'). Expand
@@ -300,6 +295,21 @@ class ChatLoop:
                 self._total_tokens += len(str(final_content)) // 4 + len(str(final_reasoning)) // 4
             self.cb.on_token_usage(self._total_tokens)
 
+            limit = options.get("max_output_tokens")
+            if limit and normalized_tool_calls:
+                completion = _completion_tokens(
+                    usage_obj, final_content, final_reasoning, raw_tool_calls_for_history
+                )
+                if completion >= limit:
+                    _refuse_cut_off_calls(normalized_tool_calls, limit)
+
+            if self.reasoning_budget is not None:
+                saved = self.reasoning_budget.record(effort, len(final_reasoning) // 4)
+                logger.debug(
+                    f"Reasoning effort={effort}: ~{len(final_reasoning) // 4} tokens"
+                    + (f", ~{saved} saved" if saved else "")
+                )
+
             logger.debug(f"LLM Response Content Length: {len(final_content)}")
             if final_reasoning:
                 logger.debug(f"LLM Reasoning Length: {len(final_reasoning)}")
@@ -330,16 +340,13 @@ class ChatLoop:
             if raw_tool_calls_for_history:
                 for tc_entry in raw_tool_calls_for_history:
                     raw_args = tc_entry["function"].get("arguments", "")
-                    if isinstance(raw_args, str):
-                        try:
-                            json.loads(raw_args)
-                        except (json.JSONDecodeError, ValueError):
-                            logger.warning(
-                                f"Malformed tool arguments for '{tc_entry['function'].get('name', '?')}': "
-                                f"{raw_args!r:.200s} — repairing before storing in history"
-                            )
-                            parsed = _parse_arguments(raw_args)
-                            tc_entry["function"]["arguments"] = json.dumps(parsed)
+                    if isinstance(raw_args, str) and not _decode_arguments(raw_args)[1]:
+                        logger.warning(
+                            f"Malformed tool arguments for '{tc_entry['function'].get('name', '?')}': "
+                            f"{raw_args!r:.200s} — repairing before storing in history"
+                        )
+                        parsed = _parse_arguments(raw_args)
+                        tc_entry["function"]["arguments"] = json_codec.dumps(parsed)
 
             msg_dict: dict = {"role": "assistant", "content": final_content}
             if raw_tool_calls_for_history:
@@ -348,6 +355,8 @@ class ChatLoop:
                 msg_dict["reasoning_content"] = final_reasoning
 
             self.messages.append(msg_dict)
+            if self.output_budget is not None:
+                self.output_budget.observe([*llm_messages, msg_dict], usage_obj)
 
             # 4. Handle tool execution
             if normalized_tool_calls:
@@ -364,13 +373,97 @@ class ChatLoop:
             # Text-only response — loop finished
             return
 
+    def _request_options(self) -> dict[str, Any]:
+        options: dict[str, Any] = {}
+        if getattr(self.config, "num_ctx", None):
+            options["num_ctx"] = self.config.num_ctx
+        if getattr(self.config, "max_output_tokens", None):
+            options["max_output_tokens"] = self.config.max_output_tokens
+        if getattr(self.config, "stop_sequences", None):
+            options["stop_sequences"] = self.config.stop_sequences
+        return options
+
+    def _context_window(self) -> int | None:
+        return getattr(self.context_manager, "context_window", None) or self.config.num_ctx
+
+    # -- Pipelined turns -----------------------------------------------------
+
+    async def _tool_schemas(self, no_tools: bool) -> list[dict]:
+        """Schemas for this turn, from the pipelined prefetch when one ran."""
+        task, self._next_turn = self._next_turn, None
+        if no_tools:
+            if task is not None:
+                task.cancel()
+            return []
+        if task is not None:
+            return await task
+        return self.registry.get_schemas(tags=self.config.tool_tags)
+
+    def _start_next_turn(self) -> None:
+        """Start preparing the follow-up request while tools are still running.
+
+        The history already ends with the assistant's tool calls; only the
+        tool results are missing. Building the schemas and letting the
+        provider prewarm (convert that history into its wire format) now means
+        the next call starts as soon as the last result is appended.
+        """
+        if self.config.pipelined_turns and self._next_turn is None:
+            self._next_turn = asyncio.create_task(self._prepare_next_turn(list(self.messages)))
+
+    async def _prepare_next_turn(self, messages: list[dict]) -> list[dict]:
+        tool_schemas = self.registry.get_schemas(tags=self.config.tool_tags)
+        try:
+            await self.llm.prewarm(
+                messages, self.config.model, tools=tool_schemas, options=self._request_options()
+            )
+        except Exception as e:  # a hint only; the real request reports errors
+            logger.debug(f"Provider prewarm failed: {e}")
+        return tool_schemas
+
+    def _report_reasoning_savings(self) -> None:
+        if self.reasoning_budget is None:
+            return
+        stats = self.reasoning_budget.stats
+        if stats.saved_tokens:
+            turns = ", ".join(f"{effort}={n}" for effort, n in stats.turns.items())
+            logger.info(
+                f"Reasoning budget saved ~{stats.saved_tokens} reasoning tokens "
+                f"(~{stats.reasoning_tokens} spent; turns {turns})"
+            )
+
+    def _discard_next_turn(self) -> None:
+        if self._next_turn is not None:
+            self._next_turn.cancel()
+            self._next_turn = None
+
+    async def _complete_once(
+        self, messages: list[dict], tools: list[dict], options: dict[str, Any]
+    ):
+        """Non-streaming turn, shaped as a one-chunk stream for the accumulator.
+
+        Each tool call in the complete response gets its position as
+        ``index``, so every call is its own entry whatever its id.
+        """
+        response = await self.llm.chat(
+            messages,
+            self.config.model,
+            tools=tools,
+            options=options,
+            verbose=self.config.verbose,
+        )
+        for i, tc in enumerate(response.tool_calls):
+            tc.index = i
+        yield response
+
     # -- Tool execution ------------------------------------------------------
 
     async def _execute_tool_calls(self, tool_calls: List[_ToolCall]) -> bool:
         """Split auto-approved (parallel) vs needs-confirmation (sequential)."""
         tool_results_map = {}
-        auto_approved = []
-        needs_confirmation = []
+        # (tool call, arguments) pairs; arguments are parsed once per call
+        runnable: list[tuple[_ToolCall, dict]] = []
+        auto_approved: list[tuple[_ToolCall, dict]] = []
+        needs_confirmation: list[tuple[_ToolCall, dict]] = []
 
         for tc in tool_calls:
             # Check for parsing errors injected by XML/JSON fallback protocols
@@ -422,26 +515,27 @@ class ChatLoop:
                 )
                 continue
 
+            runnable.append((tc, args))
             if self._tool_needs_confirmation(tc.function.name):
-                needs_confirmation.append(tc)
+                needs_confirmation.append((tc, args))
             else:
-                auto_approved.append(tc)
+                auto_approved.append((tc, args))
 
         # Show non-empty tools as running
-        for tc in tool_calls:
-            if tc.id in tool_results_map:
-                continue
-            args = _parse_arguments(tc.function.arguments)
+        for tc, args in runnable:
             self.cb.on_tool_start(tc.id, tc.function.name, args)
 
+        if not needs_confirmation:
+            self._start_next_turn()
+
         escalated = False
 
         # Auto-approved in parallel via asyncio.as_completed for speculative background execution
         if auto_approved:
 
-            async def _safe_exec(tc_obj):
+            async def _safe_exec(tc_obj, tc_args):
                 try:
-                    return tc_obj, await self._exec_tool_async(tc_obj)
+                    return tc_obj, await self._exec_tool_async(tc_obj, tc_args)
                 except asyncio.CancelledError:
                     logger.warning(f"Tool execution cancelled: {tc_obj.function.name}")
                     return tc_obj, RuntimeError("Tool execution cancelled")
@@ -449,7 +543,7 @@ class ChatLoop:
                     logger.warning(f"Tool execution failed for '{tc_obj.function.name}': {e}")
                     return tc_obj, e
 
-            tasks = [asyncio.create_task(_safe_exec(tc)) for tc in auto_approved]
+            tasks = [asyncio.create_task(_safe_exec(tc, args)) for tc, args in auto_approved]
 
             for completed_task in asyncio.as_completed(tasks):
                 tc, rd = await completed_task
@@ -469,13 +563,14 @@ class ChatLoop:
 
         # Needs-confirmation sequentially
         custom_instructions = None
-        for tc in needs_confirmation:
+        for tc, args in needs_confirmation:
             name = tc.function.name
-            args = _parse_arguments(tc.function.arguments)
 
             confirm = await self.cb.request_confirmation(name, args)
 
             if confirm is not None and getattr(confirm, "action", None) == "approve":
+                if tc is needs_confirmation[-1][0]:
+                    self._start_next_turn()
                 policy = ExecutionPolicy(self.config.permissions)
                 exec_result = await asyncio.to_thread(
                     policy.execute_with_registry,
@@ -559,10 +654,14 @@ class ChatLoop:
         self.cb.on_tools_cleanup()
         return escalated
 
-    async def _exec_tool_async(self, tc) -> dict:
-        """Execute a single tool call through the shared execution policy path."""
+    async def _exec_tool_async(self, tc, args: dict | None = None) -> dict:
+        """Execute a single tool call through the shared execution policy path.
+
+        ``args`` are the already-parsed arguments; parsed here when omitted.
+        """
         name = tc.function.name
-        args = _parse_arguments(tc.function.arguments)
+        if args is None:
+            args = _parse_arguments(tc.function.arguments)
         policy = ExecutionPolicy(self.config.permissions)
         exec_result = await asyncio.to_thread(
             policy.execute_with_registry,
@@ -581,6 +680,57 @@ class ChatLoop:
         return policy.get_confirmation_requirement(tool_name).requires_confirmation
 
 
+class _StreamedToolCalls:
+    """Assembles streamed tool-call deltas into history-format tool calls.
+
+    Deltas of one call share its ``index`` (see ToolCallDef): the first one
+    opens the call, later ones fill in a late id or name and append argument
+    text. A call without an index is complete on arrival and becomes its own
+    entry. Calls keep the order in which they were opened.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Any, dict] = {}
+        self._arguments: dict[Any, list[str]] = {}
+        self._complete = 0
+
+    def add(self, tc: Any) -> tuple[str, str] | None:
+        """Merge one delta; return ``(id, name)`` once the call's name is known."""
+        index = getattr(tc, "index", None)
+        if not isinstance(index, int):
+            index = getattr(tc, "_stream_index", None)  # duck-typed chunks
+        if not isinstance(index, int):
+            index = ("complete", self._complete)
+            self._complete += 1
+
+        entry = self._calls.get(index)
+        if entry is None:
+            self._calls[index] = {
+                "id": tc.id,
+                "type": "function",
+                "function": {"name": tc.name, "arguments": ""},
+            }
+            self._arguments[index] = [tc.arguments] if tc.arguments else []
+            return (tc.id, tc.name) if tc.name else None
+
+        # OpenAI-style streams may send a placeholder id before the real one
+        if tc.id and not tc.id.startswith("idx_") and entry["id"].startswith("idx_"):
+            entry["id"] = tc.id
+        if tc.arguments:
+            self._arguments[index].append(tc.arguments)
+        # DeepSeek sends the name only on one chunk, not necessarily the first
+        if tc.name and not entry["function"]["name"]:
+            entry["function"]["name"] = tc.name
+            return entry["id"], tc.name
+        return None
+
+    def calls(self) -> list[dict]:
+        """The assembled calls, arguments joined."""
+        for index, entry in self._calls.items():
+            entry["function"]["arguments"] = "".join(self._arguments[index])
+        return list(self._calls.values())
+
+
 def _truncate_for_tool(tool_name: str, content: str) -> str:
     """Truncate a tool result, honoring the per-tool ``max_result_chars`` override.
 
@@ -598,78 +748,119 @@ def _truncate_for_tool(tool_name: str, content: str) -> str:
     return truncate_tool_result(content, max_chars=override)
 
 
+# Recently decoded argument strings. One tool call's arguments are looked at
+# by the concatenation split, the history check and execution; they all see
+# the same str object, whose hash Python caches, so repeat lookups are O(1).
+_DECODED_ARGUMENTS: OrderedDict[str, tuple[Any, bool]] = OrderedDict()
+_DECODED_ARGUMENTS_MAX = 64
+
+
+def _decode_arguments(arguments: str) -> tuple[Any, bool]:
+    """Return ``(value, True)`` for valid JSON, ``(None, False)`` otherwise.
+
+    The value is shared between callers; copy it before mutating.
+    """
+    cached = _DECODED_ARGUMENTS.get(arguments)
+    if cached is not None:
+        _DECODED_ARGUMENTS.move_to_end(arguments)
+        return cached
+    try:
+        cached = (json_codec.loads(arguments), True)
+    except (json.JSONDecodeError, ValueError):
+        cached = (None, False)
+    _DECODED_ARGUMENTS[arguments] = cached
+    if len(_DECODED_ARGUMENTS) > _DECODED_ARGUMENTS_MAX:
+        _DECODED_ARGUMENTS.popitem(last=False)
+    return cached
+
+
 def _parse_arguments(arguments) -> dict:
     """Safely parse tool call arguments (str or dict).
 
     When the LLM hits its output token limit, the streamed JSON may be
     truncated (e.g. ``{"file_path": "foo", "content": "abc...``).
-    We attempt ``json.loads`` first; on failure we try to repair the
+    We attempt a plain decode first; on failure we try to repair the
     truncated JSON by closing open strings/braces before giving up.
     """
     if isinstance(arguments, dict):
         return arguments
     if isinstance(arguments, str):
+        value, valid = _decode_arguments(arguments)
+        if valid:
+            return dict(value) if isinstance(value, dict) else value
+        logger.warning(f"Tool arguments JSON parse failed: {arguments!r:.200s}")
+        # Try extracting just the first JSON object (handles concatenated
+        # JSON like '{...}{...}' that slipped past expansion).
         try:
-            return json.loads(arguments)
+            obj, _ = json.JSONDecoder().raw_decode(arguments.strip())
+            if isinstance(obj, dict):
+                logger.warning("Recovered tool arguments via raw_decode")
+                return obj
         except (json.JSONDecodeError, ValueError):
-            logger.warning(f"Tool arguments JSON parse failed: {arguments!r:.200s}")
-            # Try extracting just the first JSON object (handles concatenated
-            # JSON like '{...}{...}' that slipped past expansion).
-            try:
-                obj, _ = json.JSONDecoder().raw_decode(arguments.strip())
-                if isinstance(obj, dict):
-                    logger.warning("Recovered tool arguments via raw_decode")
-                    return obj
-            except (json.JSONDecodeError, ValueError):
-                pass
-            repaired = _repair_truncated_json(arguments)
-            if repaired is not None:
-                logger.warning("Recovered tool arguments via truncated JSON repair")
-                return repaired
-            logger.warning("Could not recover tool arguments — using empty dict")
-            return {}
+            pass
+        repaired = _repair_truncated_json(arguments)
+        if repaired is not None:
+            logger.warning("Recovered tool arguments via truncated JSON repair")
+            return repaired
+        logger.warning("Could not recover tool arguments — using empty dict")
+        return {}
     return {}
 
 
+def _completion_tokens(
+    usage: dict | None, content: str, reasoning: str, tool_calls: list[dict]
+) -> int:
+    """Reported completion tokens, or an estimate when the provider sent none."""
+    if usage and usage.get("completion_tokens"):
+        return usage["completion_tokens"]
+    arguments = sum(len(str(tc["function"].get("arguments") or "")) for tc in tool_calls)
+    return (len(content) + len(reasoning) + arguments) // 4
+
+
+def _refuse_cut_off_calls(tool_calls: List[_ToolCall], limit: int) -> None:
+    """Mark calls whose arguments the output limit cut off as errors.
+
+    Repairing such arguments closes the cut JSON, which for a file write
+    means writing a truncated file; the model is asked to retry in smaller
+    pieces instead.
+    """
+    for tc in tool_calls:
+        arguments = tc.function.arguments
+        if not isinstance(arguments, str) or _decode_arguments(arguments)[1]:
+            continue
+        logger.warning(
+            f"Tool '{tc.function.name}' arguments cut off at the output limit "
+            f"({limit} tokens) — not running it"
+        )
+        tc.error = (  # type: ignore[attr-defined]
+            f"the response reached the output limit of {limit} tokens and the "
+            f"arguments of '{tc.function.name}' were cut off, so the call was not "
+            f"run. Retry with smaller pieces, e.g. split a large write into "
+            f"several edits."
+        )
+
+
 def _repair_truncated_json(raw: str) -> dict | None:
     """Best-effort repair of a truncated JSON object.
 
     Handles the common case where the model's output was cut off mid-value,
-    e.g. ``{"file_path": "x.py", "operation": "write", "content": "hel``
-    We try progressively trimming from the end and closing brackets.
+    e.g. ``{"file_path": "x.py", "operation": "write", "content": "hel``.
+    See ``json_codec.repair_json`` for how the cut is closed.
     """
     if not raw or not raw.lstrip().startswith("{"):
         return None
-
-    # Try closing increasingly shorter prefixes
-    for trim in range(0, min(len(raw), 200), 1):
-        candidate = raw if trim == 0 else raw[:-trim]
-        # Try closing with various suffixes
-        for suffix in ['"}', '"}]}', '"}}', '}', ']}', '"]:}', '"}']:
-            try:
-                result = json.loads(candidate + suffix)
-                if isinstance(result, dict):
-                    return result
-            except (json.JSONDecodeError, ValueError):
-                continue  # Expected: trying multiple repair suffixes
-    return None
+    result = json_codec.repair_json(raw)
+    return result if isinstance(result, dict) else None
 
 
 def _check_required_args(tool_name: str, parsed_args: dict) -> list[str]:
     """Return list of missing or empty required arguments for a tool."""
-    from ayder_cli.tools.definition import TOOL_DEFINITIONS_BY_NAME
+    from ayder_cli.tools.definition import get_validator
 
-    tool_def = TOOL_DEFINITIONS_BY_NAME.get(tool_name)
-    if not tool_def or not tool_def.parameters:
+    validator = get_validator(tool_name)
+    if validator is None:
         return []
-    required = tool_def.parameters.get("required", [])
-    # Check both missing keys and empty-string values
-    missing = []
-    for r in required:
-        val = parsed_args.get(r)
-        if val is None or (isinstance(val, str) and not val.strip()):
-            missing.append(r)
-    return missing
+    return validator.missing(parsed_args)
 
 
 def _unwrap_exec_result(exec_result) -> str:
@@ -691,7 +882,8 @@ def _expand_concatenated_tool_calls(raw_tool_calls: list[dict]) -> list[dict]:
     decoder = json.JSONDecoder()
     for raw_tc in raw_tool_calls:
         args_str = raw_tc["function"].get("arguments", "")
-        if not isinstance(args_str, str):
+        # A string that decodes as a whole holds a single value.
+        if not isinstance(args_str, str) or _decode_arguments(args_str)[1]:
             result.append(raw_tc)
             continue
         objects: list[str] = []
@@ -700,7 +892,7 @@ def _expand_concatenated_tool_calls(raw_tool_calls: list[dict]) -> list[dict]:
         while pos < len(stripped):
             try:
                 obj, end_pos = decoder.raw_decode(stripped, pos)
-                objects.append(json.dumps(obj))
+                objects.append(json_codec.dumps(obj))
                 pos = end_pos
                 while pos < len(stripped) and stripped[pos] in " \t\n\r":
                     pos += 1
@@ -729,7 +921,7 @@ def _expand_concatenated_tool_calls(raw_tool_calls: list[dict]) -> list[dict]:
 def _is_escalation_result(result_text: str) -> bool:
     """Detect escalation directive in tool result payload."""
     try:
-        payload = json.loads(result_text)
+        payload = json_codec.loads(result_text)
     except (json.JSONDecodeError, TypeError, ValueError):
         return False  # Not JSON — normal for most tool results, not an error
     if not isinstance(payload, dict):
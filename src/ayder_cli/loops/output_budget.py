@@ -0,0 +1,95 @@
+"""Per-request max_output_tokens for ChatLoop.
+
+A single static ``max_output_tokens`` is wrong near the end of the context
+window: a completion of that size no longer fits next to the prompt (Ollama
+shifts the window, OpenAI-compatible servers reject or cut the request, and
+a tool call truncated mid-JSON costs a repair and a retry). OutputBudget
+lowers the limit to the room left in the window, and only then; a short
+reply is no evidence that the next one will be short too.
+
+The prompt size is a running count over the messages actually sent (the
+context manager's trimmed list, not the full history): the prompt and
+completion tokens the provider reported for the last response, plus an
+estimate for the messages appended since (the tool results). The whole
+prompt is only estimated when no response has reported its usage yet, or
+when the sent history was rewritten (compaction, trimming).
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from ayder_cli.core import json_codec
+
+# Prompt characters per token until provider-reported prompt sizes calibrate
+# it; deliberately low (code and JSON tokenize densely) so the room left is
+# under- rather than over-estimated.
+_DEFAULT_CHARS_PER_TOKEN = 3.0
+
+
+class OutputBudget:
+    """Chooses ``max_output_tokens`` for each request.
+
+    Args:
+        max_output_tokens: The configured cap; never exceeded.
+        floor: Smallest limit sent, even when the window is nearly full
+            (the request would not fit anyway; compaction is the fix there).
+    """
+
+    def __init__(self, max_output_tokens: int, *, floor: int = 512) -> None:
+        self.max_output_tokens = max_output_tokens
+        self.floor = min(floor, max_output_tokens)
+        self.chars_per_token = _DEFAULT_CHARS_PER_TOKEN
+        # (message count, last message, tokens) as of the last reported usage
+        self._anchor: Optional[tuple[int, dict, int]] = None
+        # Characters of the last full estimate, calibrated against the
+        # prompt_tokens its response reports.
+        self._estimated_chars: Optional[int] = None
+
+    def prompt_tokens(self, messages: list[dict], tools: list[dict]) -> int:
+        """Estimated prompt tokens of a request sending ``messages``."""
+        self._estimated_chars = None
+        anchor = self._anchor
+        if anchor is not None:
+            count, last, tokens = anchor
+            # Context managers may copy the messages they prepare; an equal
+            # message in the same position is the same history.
+            if count <= len(messages) and messages[count - 1] == last:
+                return tokens + int(_chars(messages[count:]) / self.chars_per_token)
+        chars = _chars(messages) + len(json_codec.dumps(tools))
+        self._estimated_chars = chars
+        return int(chars / self.chars_per_token)
+
+    def limit_for(self, prompt_tokens: int, context_window: Optional[int]) -> int:
+        """Output token limit for a request of ``prompt_tokens``."""
+        limit = self.max_output_tokens
+        if context_window:
+            margin = max(256, context_window // 50)
+            limit = min(limit, context_window - prompt_tokens - margin)
+        return max(self.floor, limit)
+
+    def observe(self, messages: list[dict], usage: Optional[dict]) -> None:
+        """Account the response just appended to ``messages``."""
+        usage = usage or {}
+        prompt = usage.get("prompt_tokens") or 0
+        if prompt <= 0:
+            return
+        if self._estimated_chars and not usage.get("estimated"):
+            observed = self._estimated_chars / prompt
+            self.chars_per_token = 0.7 * self.chars_per_token + 0.3 * observed
+            self._estimated_chars = None
+        tokens = prompt + (usage.get("completion_tokens") or 0)
+        self._anchor = (len(messages), messages[-1], tokens)
+
+
+def _chars(messages: list[dict]) -> int:
+    """Characters of the text ``messages`` carry, tool call arguments included."""
+    total = 0
+    for message in messages:
+        total += len(str(message.get("content") or ""))
+        total += len(message.get("reasoning_content") or "")
+        for call in message.get("tool_calls") or ():
+            function = call.get("function") or {}
+            total += len(str(function.get("arguments") or ""))
+            total += len(function.get("name") or "")
+    return total
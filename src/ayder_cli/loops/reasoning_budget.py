@@ -0,0 +1,98 @@
+"""Per-turn reasoning effort for ChatLoop.
+
+Thinking pays off on the turn that answers a user message; the turns that
+follow a tool result are mostly mechanical (read the next file, run the next
+command) and rarely need the same depth. ReasoningBudget picks an effort for
+each turn from the tail of the history and estimates how many reasoning
+tokens the reduced-effort turns saved.
+
+Efforts are provider-neutral — "off", "low", "medium", "high" — and reach
+the provider as ``options["reasoning_effort"]``; each provider maps them onto
+its own knob (Ollama ``think``, Anthropic thinking budget, OpenAI
+``reasoning_effort``, Gemini thinking budget).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+EFFORTS = ("off", "low", "medium", "high")
+
+
+@dataclass
+class ReasoningStats:
+    """Running totals; reasoning tokens are estimated at 4 chars per token."""
+
+    turns: Dict[str, int] = field(default_factory=dict)  # effort -> turn count
+    reasoning_tokens: int = 0
+    saved_tokens: int = 0
+
+
+class ReasoningBudget:
+    """Chooses the reasoning effort of each turn and tallies the savings.
+
+    Args:
+        user_turn: Effort for a turn answering a user message, and for a tool
+            follow-up whose results include an error.
+        tool_turn: Effort for a turn that follows successful tool results.
+
+    Either may be None to leave the provider's own setting for that kind of
+    turn untouched.
+    """
+
+    def __init__(self, user_turn: Optional[str] = "high", tool_turn: Optional[str] = "low") -> None:
+        for effort in (user_turn, tool_turn):
+            if effort is not None and effort not in EFFORTS:
+                raise ValueError(f"Unknown reasoning effort {effort!r}; expected one of {EFFORTS}")
+        self.user_turn = user_turn
+        self.tool_turn = tool_turn
+        self.stats = ReasoningStats()
+        # Baseline for the savings estimate: reasoning spent at user_turn effort.
+        self._full_tokens = 0
+        self._full_turns = 0
+
+    def effort_for(self, messages: list[dict]) -> Optional[str]:
+        """Effort for the request that continues ``messages``."""
+        results = []
+        for message in reversed(messages):
+            if message.get("role") != "tool":
+                break
+            results.append(str(message.get("content") or ""))
+        if not results or any(r.startswith("Error") for r in results):
+            return self.user_turn
+        return self.tool_turn
+
+    def record(self, effort: Optional[str], reasoning_tokens: int) -> int:
+        """Account one finished turn; returns the tokens it is estimated to have saved."""
+        stats = self.stats
+        key = effort or "default"
+        stats.turns[key] = stats.turns.get(key, 0) + 1
+        stats.reasoning_tokens += reasoning_tokens
+        if effort == self.user_turn:
+            self._full_tokens += reasoning_tokens
+            self._full_turns += 1
+            return 0
+        if not self._full_turns or not _below(effort, self.user_turn):
+            return 0
+        saved = max(0, self._full_tokens // self._full_turns - reasoning_tokens)
+        stats.saved_tokens += saved
+        return saved
+
+
+def _below(effort: Optional[str], reference: Optional[str]) -> bool:
+    if effort is None or reference is None:
+        return False
+    return EFFORTS.index(effort) < EFFORTS.index(reference)
+
+
+def configured_efforts(config: Any) -> Tuple[Optional[str], Optional[str]]:
+    """``(user_turn, tool_turn)`` efforts from ``Config.reasoning``.
+
+    Both are None when the section is disabled, so providers keep their
+    configured thinking.
+    """
+    section = getattr(config, "reasoning", None)
+    if getattr(section, "enabled", False) is not True:
+        return None, None
+    return section.user_turn_effort, section.tool_turn_effort
@@ -10,7 +10,8 @@ Responsibilities:
 
 import json
 import re
-from typing import Any
+from bisect import bisect_right
+from typing import Any, Callable
 
 
 def _build_single_param_map() -> dict[str, str]:
@@ -36,14 +37,187 @@ def _build_single_param_map() -> dict[str, str]:
 _SINGLE_PARAM_TOOLS = _build_single_param_map()
 
 
+# =============================================================================
+# Markup scanner
+# =============================================================================
+
+# Optional ｜ＤＳＭＬ｜ prefix characters, each independently optional.
+_DSML_PREFIX = "\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?"
+
+# Every tag ContentProcessor understands, recognized in one left-to-right
+# scan. Each alternative is anchored at "<" and bounded, so the scan stays
+# linear however many tags are left unclosed; pairing and "up to the next >"
+# spans are resolved afterwards over the tag list.
+_RE_TAG = re.compile(
+    r"<(?P<slash>/?)(?:"
+    r"(?P<think>think>)"
+    r"|(?P<ns>\w+:)?(?P<tc>tool_call>)"
+    r"|(?P<dsml>" + _DSML_PREFIX + r")(?:"
+    r"(?P<fc>(?:function|tool)_calls)\s*>|(?P<inv>invoke)|(?P<param>parameter))"
+    r"|(?P<fn>function)(?P<fnx>[=>])?"
+    r")"
+)
+# MiniMax models use special structural tokens that can leak into
+# msg.content when an IN_CONTENT driver is used on a multi-turn request
+# (observed empirically on minimax-m3:cloud as ]<]minimax[>[ ). Older M2
+# builds documented the ]~b]<role> / [e~[ role markers. Kept out of _RE_TAG
+# so its literal "<" prefix lets the regex engine skip plain prose quickly.
+_RE_MINIMAX_MARKER = re.compile(r"\]<\]minimax\[>\[|\]~b\](?:system|user|ai|tool)?|\[e~\[")
+
+# Tag kinds
+_THINK, _TC, _FC, _INV, _PARAM, _FN, _MM = range(7)
+
+# Tag flags
+_PLAIN = 1  # _TC: no namespace (<tool_call>, not <minimax:tool_call>)
+_DSML = 1  # _FC/_INV/_PARAM: carries a DSML-style prefix
+_BARE = 2  # _FC: no whitespace before ">"
+_FUNC = 4  # _FC: function_calls rather than tool_calls
+_GT = 2  # _INV/_PARAM/_FN: ">" follows the tag name directly (and ends the tag)
+_EQ = 1  # _FN: <function=
+
+# A tag is (start, end, kind, closing, flags).
+_Tag = tuple[int, int, int, bool, int]
+
+# Above this many "<" times characters the regex chain gives way to the
+# scanner. Each lazy ``open.*?close`` pattern of the chain rescans at most
+# the rest of the text per opener, so below it the chain is bounded; above
+# it, dangling tags can make it quadratic. Typical model output, including
+# single well-formed calls with long arguments, stays below and takes the
+# chain, which is faster there: the scanner's per-tag work is Python code.
+_CHAIN_MAX_COST = 1 << 18
+
+
+def _use_chain(text: str) -> bool:
+    return text.count("<") * len(text) <= _CHAIN_MAX_COST
+
+
+def _scan(text: str) -> list[_Tag]:
+    """Return every markup tag in ``text``, in order."""
+    tags: list[_Tag] = []
+    append = tags.append
+    for m in _RE_TAG.finditer(text):
+        start, end = m.span()
+        group = m.lastgroup
+        closing = m.group("slash") == "/"
+        if group == "think":
+            append((start, end, _THINK, closing, 0))
+        elif group == "tc":
+            append((start, end, _TC, closing, _PLAIN if m.group("ns") is None else 0))
+        elif group == "fc":
+            flags = _DSML if m.group("dsml") else 0
+            if end - m.end("fc") == 1:
+                flags |= _BARE
+            if m.group("fc")[0] == "f":
+                flags |= _FUNC
+            append((start, end, _FC, closing, flags))
+        elif group == "inv" or group == "param":
+            flags = _DSML if m.group("dsml") else 0
+            if text.startswith(">", end):
+                flags |= _GT
+                end += 1
+            append((start, end, _INV if group == "inv" else _PARAM, closing, flags))
+        else:
+            fnx = m.group("fnx")
+            flags = _EQ if fnx == "=" else _GT if fnx == ">" else 0
+            append((start, end, _FN, closing, flags))
+    if "~" in text or "]<]" in text:
+        markers = [(m.start(), m.end(), _MM, False, 0) for m in _RE_MINIMAX_MARKER.finditer(text)]
+        if markers:
+            tags = sorted(tags + markers)
+    return tags
+
+
+def _pair_blocks(
+    tags: list[_Tag],
+    dead: bytearray,
+    is_open: Callable[[_Tag], bool],
+    is_close: Callable[[_Tag], bool],
+    to_end: int | None = None,
+) -> list[tuple[int, int]]:
+    """Pair each live opener with the next live closer, leftmost first.
+
+    Mirrors a lazy ``open.*?close`` substitution: once an opener has no
+    closer after it, no later opener can have one either. With ``to_end``,
+    that unclosed opener swallows the rest of the text instead.
+    """
+    spans: list[tuple[int, int]] = []
+    n = len(tags)
+    i = 0
+    while i < n:
+        if dead[i] or not is_open(tags[i]):
+            i += 1
+            continue
+        k = i + 1
+        while k < n and (dead[k] or not is_close(tags[k])):
+            k += 1
+        if k == n:
+            if to_end is not None:
+                spans.append((tags[i][0], to_end))
+                dead[i:] = b"\x01" * (n - i)
+            break
+        spans.append((tags[i][0], tags[k][1]))
+        dead[i:k + 1] = b"\x01" * (k + 1 - i)
+        i = k + 1
+    return spans
+
+
+def _after_name(tag: _Tag) -> int:
+    """Position just past an _INV/_PARAM tag name, where ``[^>]*>`` starts."""
+    return tag[1] - 1 if tag[4] & _GT else tag[1]
+
+
+class _Removed:
+    """Sorted, merged character ranges already stripped from the text."""
+
+    def __init__(self) -> None:
+        self.spans: list[tuple[int, int]] = []
+        self._starts: list[int] = []
+
+    def add(self, spans: list[tuple[int, int]]) -> None:
+        if not spans:
+            return
+        merged: list[tuple[int, int]] = []
+        for start, end in sorted(self.spans + spans):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        self.spans = merged
+        self._starts = [start for start, _ in merged]
+
+    def next_gt(self, text: str, pos: int) -> int:
+        """Index of the first ">" at or after ``pos`` still in the text, or -1."""
+        gt = text.find(">", pos)
+        while gt != -1:
+            idx = bisect_right(self._starts, gt) - 1
+            if idx < 0 or self.spans[idx][1] <= gt:
+                return gt
+            gt = text.find(">", self.spans[idx][1])
+        return -1
+
+    def apply(self, text: str) -> str:
+        pieces = []
+        pos = 0
+        for start, end in self.spans:
+            pieces.append(text[pos:start])
+            pos = end
+        pieces.append(text[pos:])
+        return "".join(pieces)
+
+
 class ContentProcessor:
     """Single parser for all LLM output processing.
 
-    Why regex instead of an XML parser?  Model output is *not* valid XML —
-    tags are often unclosed, interleaved with prose, or malformed.  A small
-    set of compiled patterns is the most reliable (and fastest) approach.
+    Why not an XML parser?  Model output is *not* valid XML — tags are often
+    unclosed, interleaved with prose, or malformed.  Typical output goes
+    through a chain of compiled substitutions.  Output where that chain could
+    go quadratic (see ``_CHAIN_MAX_COST``) goes through one regex scan
+    (``_scan``) that finds every tag the processor knows about instead; each
+    operation then resolves its blocks over that tag list, pairing an opener
+    with the next closer or a tag with the next ``>``, so nothing re-scans
+    the text from every unclosed opener.
 
-    All patterns are compiled once at class-body evaluation time.
     Use the module-level ``content_processor`` singleton for zero-cost reuse.
 
     Public API:
@@ -54,57 +228,36 @@ class ContentProcessor:
         parse_json_tool_calls(content) → list[dict]
     """
 
-    # -- Think blocks --------------------------------------------------------
+    # -- Regex chain (for typical output, see _use_chain) --------------------
     _RE_THINK_CLOSED = re.compile(r"<think>(.*?)</think>", re.DOTALL)
     _RE_THINK_UNCLOSED = re.compile(r"<think>(.*)", re.DOTALL)
-    _RE_THINK_STRIP = re.compile(r"<think>.*?</think>", re.DOTALL)
-    _RE_THINK_STRIP_UNCLOSED = re.compile(r"<think>.*", re.DOTALL)
-
-    # -- Tool call blocks (for stripping display) ----------------------------
-    # Support namespaced tool calls like <minimax:tool_call>...</minimax:tool_call>
-    _RE_TOOL_CALL_BLOCK = re.compile(
-        r"<(\w+:)?tool_call>.*?</(\w+:)?tool_call>", re.DOTALL
-    )
-    _RE_FUNCTION_BLOCK = re.compile(
-        r"<function=.*?(?:</function>|</tool_call>)", re.DOTALL
-    )
-    # DeepSeek format: <function_calls><invoke>...</invoke></function_calls>
-    # Also covers DSML-prefixed variants (｜DSML｜function_calls, ｜DSML｜tool_calls).
-    # deepseek-v4-pro:cloud uses <｜DSML｜tool_calls> (plural) — same shape,
-    # different outer tag name. Match both function_calls and tool_calls.
-    _RE_FUNCTION_CALLS_BLOCK = re.compile(
-        r"<\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?(?:function|tool)_calls>.*?"
-        r"</\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?(?:function|tool)_calls>",
-        re.DOTALL,
-    )
-    _RE_INVOKE_BLOCK = re.compile(
-        r"<\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?invoke.*?"
-        r"</\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?invoke>",
-        re.DOTALL,
-    )
-
-    # -- Orphaned tags (for stripping display) -------------------------------
-    _RE_ORPHAN_TOOL_CALL = re.compile(r"</?(\w+:)?tool_call>")
-    _RE_ORPHAN_FUNCTION = re.compile(r"</?function[^>]*>")
-    _RE_ORPHAN_FUNCTION_CALLS = re.compile(
-        r"</?\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?(?:function|tool)_calls\s*>"
-    )
-    _RE_ORPHAN_INVOKE = re.compile(
-        r"</?\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?invoke[^>]*>"
-    )
-    _RE_ORPHAN_PARAMETER = re.compile(
-        r"</?\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?parameter[^>]*>"
-    )
-    # MiniMax models use special structural tokens that can leak into
-    # msg.content when an IN_CONTENT driver is used on a multi-turn request
-    # (observed empirically on minimax-m3:cloud as ]<]minimax[>[ ). Older M2
-    # builds documented the ]~b]<role> / [e~[ role markers. Strip all variants.
-    _RE_ORPHAN_MINIMAX_MARKER = re.compile(
-        r"\]<\]minimax\[>\[|\]~b\](?:system|user|ai|tool)?|\[e~\["
+    # Applied in order by _strip_markup_chain.
+    _RE_STRIP_CHAIN = tuple(
+        re.compile(pattern, re.DOTALL)
+        for pattern in (
+            r"<think>.*?</think>",
+            r"<think>.*",
+            r"<(\w+:)?tool_call>.*?</(\w+:)?tool_call>",
+            r"<function=.*?(?:</function>|</tool_call>)",
+            r"<" + _DSML_PREFIX + r"(?:function|tool)_calls>.*?"
+            r"</" + _DSML_PREFIX + r"(?:function|tool)_calls>",
+            r"<" + _DSML_PREFIX + r"invoke.*?</" + _DSML_PREFIX + r"invoke>",
+            r"</?(\w+:)?tool_call>",
+            r"</?function[^>]*>",
+            r"</?" + _DSML_PREFIX + r"(?:function|tool)_calls\s*>",
+            r"</?" + _DSML_PREFIX + r"invoke[^>]*>",
+            r"</?" + _DSML_PREFIX + r"parameter[^>]*>",
+            _RE_MINIMAX_MARKER.pattern,
+        )
     )
+    _RE_TOOL_CALL_WRAPPER = re.compile(r"<(\w+:)?tool_call>(.*?)</(\w+:)?tool_call>", re.DOTALL)
+    _RE_INVOKE = re.compile(r'<invoke\s+name="([^"]+)"\s*>(.*?)</invoke>', re.DOTALL)
+    _RE_DS_PARAM = re.compile(r'<parameter\s+name="([^"]+)"[^>]*>(.*?)</parameter>', re.DOTALL)
 
     # -- JSON tool arrays (for stripping and parsing) ------------------------
-    _RE_JSON_TOOL_ARRAY = re.compile(r'\[\s*\{[^}]*"function"\s*:.*?\}\s*\]', re.DOTALL)
+    _RE_JSON_ARRAY_OPEN = re.compile(r"\[\s*\{")
+    _RE_JSON_FUNCTION_KEY = re.compile(r'"function"\s*:')
+    _RE_JSON_ARRAY_CLOSE = re.compile(r"\}\s*\]")
     _RE_JSON_NAME = re.compile(r'"name"\s*:\s*"([^"]+)"')
     _RE_JSON_ARGS = re.compile(
         r'"arguments"\s*:\s*["\{](.*?)["\}](?:\s*[,}])', re.DOTALL
@@ -115,30 +268,14 @@ class ContentProcessor:
     _RE_BLANK_LINES = re.compile(r"\n{3,}")
 
     # -- XML extraction (for parse_tool_calls) -------------------------------
-    # Standard function tag pattern. 
-    # Accepts </function> or </tool_call> as closer.
-    _RE_FUNC = re.compile(
-        r"<function=(.*?)>(.*?)(?:</function>|</tool_call>)", 
-        re.DOTALL
-    )
-    _RE_PARAM = re.compile(r"<parameter=(.*?)>(.*?)</parameter>", re.DOTALL)
-    _RE_PARAM_UNCLOSED = re.compile(r"<parameter=(.*?)>(.*)", re.DOTALL)
+    _RE_FUNCTION_TAG = re.compile(r"<function=|</function>|</tool_call>")
 
     # -- Markup normalization (for _normalize_markup) -----------------------
-    # Unwrap <tool_call> wrappers (including namespaced variants)
-    _RE_TOOL_CALL_WRAPPER = re.compile(
-        r"<(\w+:)?tool_call>(.*?)</(\w+:)?tool_call>",
-        re.DOTALL,
-    )
-    # DeepSeek <invoke> extraction
-    _RE_INVOKE = re.compile(
-        r'<invoke\s+name="([^"]+)"\s*>(.*?)</invoke>', re.DOTALL
-    )
-    # DeepSeek <parameter name="..."> extraction
-    _RE_DS_PARAM = re.compile(
-        r'<parameter\s+name="([^"]+)"[^>]*>(.*?)</parameter>', re.DOTALL
-    )
-    # Strip outer <function_calls> / <tool_calls> tags after _convert_deepseek
+    # DeepSeek <invoke name="..."> opener
+    _RE_INVOKE_OPEN = re.compile(r'<invoke\s+name="([^"]+)"\s*>')
+    # DeepSeek <parameter name="..."> opener
+    _RE_DS_PARAM_OPEN = re.compile(r'<parameter\s+name="([^"]+)"[^>]*>')
+    # Strip outer <function_calls> / <tool_calls> tags after _convert_invoke
     _RE_FUNCTION_CALLS_STRIP = re.compile(r"</?(?:function|tool)_calls\s*>", re.DOTALL)
     # DSML fullwidth prefix: ｜DSML｜
     _RE_DSML_FULLWIDTH = re.compile(r"<(/?)\uff5c\uff24\uff33\uff2d\uff2c\uff5c")
@@ -151,19 +288,35 @@ class ContentProcessor:
 
     def extract_think_blocks(self, content: str) -> list[str]:
         """Return a list of non-empty ``<think>`` block texts."""
-        blocks = self._RE_THINK_CLOSED.findall(content)
-        remaining = self._RE_THINK_CLOSED.sub("", content)
-        unclosed = self._RE_THINK_UNCLOSED.findall(remaining)
-        blocks.extend(unclosed)
+        if _use_chain(content):
+            blocks = self._RE_THINK_CLOSED.findall(content)
+            remaining = self._RE_THINK_CLOSED.sub("", content)
+            blocks.extend(self._RE_THINK_UNCLOSED.findall(remaining))
+            return [b.strip() for b in blocks if b.strip()]
+        tags = [t for t in _scan(content) if t[2] == _THINK]
+        blocks = []
+        n = len(tags)
+        i = 0
+        while i < n:
+            if tags[i][3]:
+                i += 1
+                continue
+            k = i + 1
+            while k < n and not tags[k][3]:
+                k += 1
+            if k == n:
+                blocks.append(content[tags[i][1]:])  # unclosed: runs to the end
+                break
+            blocks.append(content[tags[i][1]:tags[k][0]])
+            i = k + 1
         return [b.strip() for b in blocks if b.strip()]
 
     def strip_for_display(self, content: str) -> str:
         """Strip all tool/think markup, returning clean display text."""
-        text = self._strip_think_blocks(content)
-        text = self._strip_tool_call_blocks(text)
-        text = self._strip_function_blocks(text)
-        text = self._strip_deepseek_blocks(text)
-        text = self._strip_orphaned_tags(text)
+        if _use_chain(content):
+            text = self._strip_markup_chain(content)
+        else:
+            text = self._strip_markup(content)
         text = self._strip_json_tool_arrays(text)
         text = self._collapse_blank_lines(text)
         return text
@@ -205,12 +358,15 @@ class ContentProcessor:
         """
         if not content:
             return []
-        
+
         # We need to know if it was explicitly wrapped to allow lazy parsing
-        is_explicitly_wrapped = "<tool_call>" in content.lower() or "<function_calls>" in content.lower()
-        
-        normalized = self._normalize_markup(content)
-        results = self._parse_xml_tool_calls(normalized, is_wrapped=is_explicitly_wrapped)
+        lowered = content.lower()
+        is_explicitly_wrapped = "<tool_call>" in lowered or "<function_calls>" in lowered
+
+        normalized, function_tags = self._normalize(content)
+        results = self._parse_xml_tool_calls(
+            normalized, is_wrapped=is_explicitly_wrapped, function_tags=function_tags
+        )
         if not results:
             results = self.parse_json_tool_calls(content)
         return results
@@ -265,18 +421,116 @@ class ContentProcessor:
         3. Add missing </function> when block ends with </tool_call>.
         4. Convert DeepSeek <function_calls>/<invoke> to standard format.
         """
-        content = self._normalize_dsml(content)
+        return self._normalize(content)[0]
+
+    def _normalize(self, content: str) -> tuple[str, list[tuple[int, bool, int]] | None]:
+        """Normalize markup, resolving blocks over the scanned tags.
 
-        def _unwrap_tool_call(match: re.Match) -> str:
+        Returns the normalized text together with the positions of its
+        ``<function=``, ``</function>`` and ``</tool_call>`` tags as
+        ``(offset, is_opener, length)``, so ``_parse_xml_tool_calls`` does not
+        have to scan the text again; None for the positions when the regex
+        chain normalized it.
+        """
+        text = self._normalize_dsml(content)
+        if _use_chain(text):
+            return self._normalize_chain(text), None
+        tags = _scan(text)
+        if not tags:
+            return text, []
+        unwrapped = self._unwrap_tool_calls(text, tags)
+        if unwrapped is not text:
+            text = unwrapped
+            tags = _scan(text)
+        n = len(tags)
+
+        pieces: list[str] = []
+        function_tags: list[tuple[int, bool, int]] = []
+        length = 0  # length of the normalized text emitted so far
+        pos = 0  # next input character not yet emitted
+        invoke_search = 0  # first tag that may still open an <invoke> block
+
+        i = 0
+        while i < n:
+            start, end, kind, closing, flags = tags[i]
+            if kind == _INV and not closing and not flags & _DSML and i >= invoke_search:
+                converted, close = self._convert_invoke(text, tags, i)
+                if close == -1:
+                    invoke_search = n  # no later <invoke> can be closed either
+                elif converted is not None:
+                    pieces.append(text[pos:start])
+                    length += start - pos
+                    for m in self._RE_FUNCTION_TAG.finditer(converted):
+                        function_tags.append((length + m.start(), m.group() == "<function=", len(m.group())))
+                    pieces.append(converted)
+                    length += len(converted)
+                    pos = tags[close][1]
+                    i = close + 1
+                    continue
+            elif kind == _FC and not flags & _DSML:
+                # Strip outer <function_calls> / <tool_calls> tags
+                pieces.append(text[pos:start])
+                length += start - pos
+                pos = end
+            elif kind == _FN and (flags & _EQ and not closing or flags & _GT and closing):
+                function_tags.append((length + start - pos, not closing, end - start))
+            elif kind == _TC and closing and flags & _PLAIN:
+                function_tags.append((length + start - pos, False, end - start))
+            i += 1
+        pieces.append(text[pos:])
+        return "".join(pieces), function_tags
+
+    def _normalize_chain(self, content: str) -> str:
+        """The regex chain form of ``_normalize`` (DSML already stripped)."""
+
+        def unwrap_tool_call(match: re.Match) -> str:
             inner = match.group(2).strip()
             # Ensure </function> exists if it looks like a function call and is missing one
             if "<function=" in inner and "</function>" not in inner:
                 inner += "</function>"
             return inner
 
-        content = self._RE_TOOL_CALL_WRAPPER.sub(_unwrap_tool_call, content)
-        content = self._convert_deepseek(content)
-        return content
+        def convert_invoke(match: re.Match) -> str:
+            params = [
+                f"<parameter={pm.group(1)}>{pm.group(2).strip()}</parameter>"
+                for pm in self._RE_DS_PARAM.finditer(match.group(2))
+            ]
+            return f"<function={match.group(1)}>{''.join(params)}</function>"
+
+        content = self._RE_TOOL_CALL_WRAPPER.sub(unwrap_tool_call, content)
+        content = self._RE_INVOKE.sub(convert_invoke, content)
+        return self._RE_FUNCTION_CALLS_STRIP.sub("", content)
+
+    @staticmethod
+    def _unwrap_tool_calls(text: str, tags: list[_Tag]) -> str:
+        """Strip outer <tool_call> wrappers (including namespaced variants).
+
+        Adds a missing </function> when the wrapped block opens one.
+        """
+        pieces: list[str] = []
+        pos = 0
+        n = len(tags)
+        i = 0
+        while i < n:
+            if tags[i][2] != _TC or tags[i][3]:
+                i += 1
+                continue
+            k = i + 1
+            while k < n and not (tags[k][2] == _TC and tags[k][3]):
+                k += 1
+            if k == n:
+                break
+            inner = text[tags[i][1]:tags[k][0]].strip()
+            if "<function=" in inner and "</function>" not in inner:
+                inner += "</function>"
+            pieces.append(text[pos:tags[i][0]])
+            pieces.append(inner)
+            pos = tags[k][1]
+            i = k + 1
+        if not pieces:
+            return text
+        pieces.append(text[pos:])
+        return "".join(pieces)
 
     def _normalize_dsml(self, content: str) -> str:
         """Strip ｜DSML｜ prefix from tags (fullwidth and ASCII variants)."""
@@ -286,8 +540,8 @@ class ContentProcessor:
         content = self._RE_DSML_ASCII.sub(r"<\1", content)
         return content
 
-    def _convert_deepseek(self, content: str) -> str:
-        """Convert DeepSeek <function_calls>/<invoke> to standard format.
+    def _convert_invoke(self, text: str, tags: list[_Tag], i: int) -> tuple[str | None, int]:
+        """Convert the DeepSeek <invoke> block opened by ``tags[i]``.
 
         DeepSeek format:
             <function_calls>
@@ -298,37 +552,87 @@ class ContentProcessor:
 
         Converts to:
             <function=func_name><parameter=param>value</parameter></function>
+
+        Returns the converted text and the index of the closing tag; the text
+        is None if the opener is malformed, and the index -1 if it is unclosed.
         """
-        def convert_invoke(match: re.Match) -> str:
-            func_name = match.group(1)
-            params_block = match.group(2)
-            params = []
-            for pm in self._RE_DS_PARAM.finditer(params_block):
-                param_name = pm.group(1)
-                param_value = pm.group(2).strip()
-                params.append(f"<parameter={param_name}>{param_value}</parameter>")
-            return f"<function={func_name}>{''.join(params)}</function>"
-
-        result = self._RE_INVOKE.sub(convert_invoke, content)
-        result = self._RE_FUNCTION_CALLS_STRIP.sub("", result)
-        return result
+        m = self._RE_INVOKE_OPEN.match(text, tags[i][0])
+        if m is None:
+            return None, i
+        close = i + 1
+        while close < len(tags) and not (
+            tags[close][2] == _INV and tags[close][3] and tags[close][4] & (_DSML | _GT) == _GT
+            and tags[close][0] >= m.end()
+        ):
+            close += 1
+        if close == len(tags):
+            return None, -1
+        func_name = m.group(1)
+        params_block = text[m.end():tags[close][0]]
+        params = []
+        pos = 0
+        while True:
+            pm = self._RE_DS_PARAM_OPEN.search(params_block, pos)
+            if pm is None:
+                break
+            param_close = params_block.find("</parameter>", pm.end())
+            if param_close == -1:
+                break
+            param_value = params_block[pm.end():param_close].strip()
+            params.append(f"<parameter={pm.group(1)}>{param_value}</parameter>")
+            pos = param_close + len("</parameter>")
+        converted = f"<function={func_name}>{''.join(params)}</function>"
+        if "_calls" in converted:
+            converted = self._RE_FUNCTION_CALLS_STRIP.sub("", converted)
+        return converted, close
 
     # =========================================================================
     # Private: XML tool call extraction
     # =========================================================================
 
-    def _parse_xml_tool_calls(self, content: str, is_wrapped: bool = False) -> list[dict[str, Any]]:
+    def _parse_xml_tool_calls(
+        self,
+        content: str,
+        is_wrapped: bool = False,
+        function_tags: list[tuple[int, bool, int]] | None = None,
+    ) -> list[dict[str, Any]]:
         """Extract tool calls from <function=name>...</function> patterns.
 
         Handles:
         - Standard: <function=name><parameter=key>value</parameter></function>
         - Unclosed parameters: <parameter=key>value (no closing tag)
         - Lazy: <function=name>value</function> (only if wrapped or single-param tools)
+
+        Accepts </function> or </tool_call> as closer. ``function_tags`` are
+        the tag positions from ``_normalize``; they are found here if omitted.
         """
+        if function_tags is None:
+            function_tags = [
+                (m.start(), m.group() == "<function=", len(m.group()))
+                for m in self._RE_FUNCTION_TAG.finditer(content)
+            ]
+        closers = [(offset, size) for offset, is_opener, size in function_tags if not is_opener]
+        next_closer = 0
+        cursor = 0
+        name_end = -1
+
         calls = []
-        for func_match in self._RE_FUNC.finditer(content):
-            func_name = func_match.group(1).strip()
-            body = func_match.group(2).strip()
+        for offset, is_opener, _ in function_tags:
+            if not is_opener or offset < cursor:
+                continue
+            if name_end < offset + len("<function="):
+                name_end = content.find(">", offset + len("<function="))
+                if name_end == -1:
+                    break
+            while next_closer < len(closers) and closers[next_closer][0] <= name_end:
+                next_closer += 1
+            if next_closer == len(closers):
+                break
+            close_offset, close_size = closers[next_closer]
+            cursor = close_offset + close_size
+
+            func_name = content[offset + len("<function="):name_end].strip()
+            body = content[name_end + 1:close_offset].strip()
 
             if not func_name:
                 calls.append({
@@ -338,39 +642,35 @@ class ContentProcessor:
                 })
                 continue
 
-            param_matches = list(self._RE_PARAM.finditer(body))
+            param_matches = self._closed_params(body)
 
             if param_matches:
                 # Standard format: closed <parameter=key>value</parameter>
                 args = {}
-                for pm in param_matches:
-                    key = pm.group(1).strip()
-                    value = pm.group(2).strip()
+                for key, value in param_matches:
+                    key = key.strip()
                     if key:
-                        args[key] = value
+                        args[key] = value.strip()
                 calls.append({"name": func_name, "arguments": args})
 
             elif "<parameter=" in body:
                 # Unclosed parameters: <parameter=key>value (no closing tag)
-                unclosed = list(self._RE_PARAM_UNCLOSED.finditer(body))
-                if unclosed:
-                    args = {}
-                    for um in unclosed:
-                        key = um.group(1).strip()
-                        value = um.group(2).strip()
-                        if key:
-                            args[key] = value
-                    calls.append({"name": func_name, "arguments": args})
+                unclosed = self._unclosed_param(body)
+                if unclosed and unclosed[0].strip():
+                    calls.append({
+                        "name": func_name,
+                        "arguments": {unclosed[0].strip(): unclosed[1].strip()},
+                    })
                 else:
                     calls.append({"name": func_name, "arguments": {}})
 
             elif body and "<parameter" not in body:
                 # Lazy format — infer single parameter name from schema.
                 inferred = self._infer_parameter_name(func_name)
-                
+
                 # Heuristic: if not wrapped, the body shouldn't look like prose (e.g. no spaces or short)
                 is_prose = " " in body and len(body) > 30
-                
+
                 if inferred and (is_wrapped or not is_prose):
                     calls.append({"name": func_name, "arguments": {inferred: body}})
                 elif is_wrapped:
@@ -403,6 +703,36 @@ class ContentProcessor:
 
         return calls
 
+    @staticmethod
+    def _closed_params(body: str) -> list[tuple[str, str]]:
+        """Return (key, value) for each <parameter=key>value</parameter>."""
+        params = []
+        pos = 0
+        while True:
+            start = body.find("<parameter=", pos)
+            if start == -1:
+                break
+            key_end = body.find(">", start + len("<parameter="))
+            if key_end == -1:
+                break
+            close = body.find("</parameter>", key_end + 1)
+            if close == -1:
+                break
+            params.append((body[start + len("<parameter="):key_end], body[key_end + 1:close]))
+            pos = close + len("</parameter>")
+        return params
+
+    @staticmethod
+    def _unclosed_param(body: str) -> tuple[str, str] | None:
+        """Return (key, rest of body) for the first unclosed <parameter=key>."""
+        start = body.find("<parameter=")
+        if start == -1:
+            return None
+        key_end = body.find(">", start + len("<parameter="))
+        if key_end == -1:
+            return None
+        return body[start + len("<parameter="):key_end], body[key_end + 1:]
+
     def _infer_parameter_name(self, func_name: str) -> str:
         """Return the single required parameter for single-param tools."""
         return _SINGLE_PARAM_TOOLS.get(func_name, "")
@@ -411,36 +741,162 @@ class ContentProcessor:
     # Private: display stripping helpers
     # =========================================================================
 
-    def _strip_think_blocks(self, text: str) -> str:
-        text = self._RE_THINK_STRIP.sub("", text)
-        text = self._RE_THINK_STRIP_UNCLOSED.sub("", text)
+    def _strip_markup_chain(self, text: str) -> str:
+        """Remove think/tool blocks, then orphaned tags, one pattern at a time."""
+        if "<" not in text and "]" not in text and "[" not in text:
+            return text
+        for pattern in self._RE_STRIP_CHAIN:
+            text = pattern.sub("", text)
         return text
 
-    def _strip_tool_call_blocks(self, text: str) -> str:
-        return self._RE_TOOL_CALL_BLOCK.sub("", text)
-
-    def _strip_function_blocks(self, text: str) -> str:
-        return self._RE_FUNCTION_BLOCK.sub("", text)
+    def _strip_markup(self, text: str) -> str:
+        """Remove think/tool blocks and orphaned tags, in the historical order.
 
-    def _strip_deepseek_blocks(self, text: str) -> str:
-        """Strip DeepSeek <function_calls> and <invoke> blocks."""
-        text = self._RE_FUNCTION_CALLS_BLOCK.sub("", text)
-        text = self._RE_INVOKE_BLOCK.sub("", text)
-        return text
-
-    def _strip_orphaned_tags(self, text: str) -> str:
-        text = self._RE_ORPHAN_TOOL_CALL.sub("", text)
-        text = self._RE_ORPHAN_FUNCTION.sub("", text)
-        text = self._RE_ORPHAN_FUNCTION_CALLS.sub("", text)
-        text = self._RE_ORPHAN_INVOKE.sub("", text)
-        text = self._RE_ORPHAN_PARAMETER.sub("", text)
-        text = self._RE_ORPHAN_MINIMAX_MARKER.sub("", text)
-        return text
+        Blocks go first — think (unclosed runs to the end), <tool_call>
+        wrappers, <function=...> blocks, DeepSeek call lists and invokes —
+        then whatever tags are left over. Each stage only sees tags that
+        earlier stages did not already remove.
+        """
+        tags = _scan(text)
+        if not tags:
+            return text
+        kinds = {t[2] for t in tags}
+        dead = bytearray(len(tags))
+        removed = _Removed()
+
+        if _THINK in kinds:
+            removed.add(_pair_blocks(
+                tags, dead,
+                lambda t: t[2] == _THINK and not t[3],
+                lambda t: t[2] == _THINK and t[3],
+                to_end=len(text),
+            ))
+        if _TC in kinds:
+            removed.add(_pair_blocks(
+                tags, dead,
+                lambda t: t[2] == _TC and not t[3],
+                lambda t: t[2] == _TC and t[3],
+            ))
+        if _FN in kinds:
+            removed.add(_pair_blocks(
+                tags, dead,
+                lambda t: t[2] == _FN and not t[3] and t[4] & _EQ,
+                lambda t: t[3] and (t[2] == _FN and t[4] & _GT or t[2] == _TC and t[4] & _PLAIN),
+            ))
+        # DeepSeek format: <function_calls><invoke>...</invoke></function_calls>,
+        # also <tool_calls> and the ｜DSML｜-prefixed variants.
+        if _FC in kinds:
+            removed.add(_pair_blocks(
+                tags, dead,
+                lambda t: t[2] == _FC and not t[3] and t[4] & _BARE,
+                lambda t: t[2] == _FC and t[3] and t[4] & _BARE,
+            ))
+        if _INV in kinds:
+            removed.add(_pair_blocks(
+                tags, dead,
+                lambda t: t[2] == _INV and not t[3],
+                lambda t: t[2] == _INV and t[3] and t[4] & _GT,
+            ))
+
+        # Orphaned tags
+        if _TC in kinds:
+            self._strip_orphans(text, tags, dead, removed, lambda t: t[2] == _TC)
+        if _FN in kinds or _FC in kinds:
+            self._strip_orphans(
+                text, tags, dead, removed,
+                lambda t: t[2] == _FN or t[2] == _FC and t[4] & (_DSML | _FUNC) == _FUNC,
+                to_gt=lambda t: t[0] + (10 if t[3] else 9),  # </?function[^>]*>
+            )
+        if _FC in kinds:
+            self._strip_orphans(text, tags, dead, removed, lambda t: t[2] == _FC)
+        if _INV in kinds:
+            self._strip_orphans(
+                text, tags, dead, removed, lambda t: t[2] == _INV, to_gt=_after_name
+            )
+        if _PARAM in kinds:
+            self._strip_orphans(
+                text, tags, dead, removed, lambda t: t[2] == _PARAM, to_gt=_after_name
+            )
+        # MiniMax structural markers, see _RE_MINIMAX_MARKER
+        if _MM in kinds:
+            self._strip_orphans(text, tags, dead, removed, lambda t: t[2] == _MM)
+
+        return removed.apply(text)
+
+    @staticmethod
+    def _strip_orphans(
+        text: str,
+        tags: list[_Tag],
+        dead: bytearray,
+        removed: _Removed,
+        select: Callable[[_Tag], bool],
+        to_gt: Callable[[_Tag], int] | None = None,
+    ) -> None:
+        """Remove each live selected tag, through the next ">" when ``to_gt``
+        gives the position to search from."""
+        spans = []
+        n = len(tags)
+        for i in range(n):
+            if dead[i] or not select(tags[i]):
+                continue
+            if to_gt is None:
+                end = tags[i][1]
+            else:
+                gt = removed.next_gt(text, to_gt(tags[i]))
+                if gt == -1:
+                    break  # no later tag can reach a ">" either
+                end = gt + 1
+            spans.append((tags[i][0], end))
+            j = i
+            while j < n and tags[j][0] < end:
+                dead[j] = 1
+                j += 1
+        removed.add(spans)
 
     def _strip_json_tool_arrays(self, text: str) -> str:
-        return self._RE_JSON_TOOL_ARRAY.sub("", text)
+        """Remove ``[{... "function": ...}]`` tool arrays from display text.
+
+        An array starts at ``[{``, must name ``"function"`` before the first
+        ``}``, and runs to the next ``}]``.
+        """
+        if '"function"' not in text:
+            return text
+        pieces = []
+        pos = search = 0
+        # Each lookahead below is cached and only moves forward.
+        key = self._RE_JSON_FUNCTION_KEY.search(text)
+        close = self._RE_JSON_ARRAY_CLOSE.search(text)
+        first_brace_close = -1
+        while key is not None and close is not None:
+            opener = self._RE_JSON_ARRAY_OPEN.search(text, search)
+            if opener is None:
+                break
+            brace = opener.end() - 1
+            if key.start() <= brace:
+                key = self._RE_JSON_FUNCTION_KEY.search(text, brace + 1)
+                if key is None:
+                    break
+            if first_brace_close <= brace:
+                first_brace_close = text.find("}", brace + 1)
+                if first_brace_close == -1:
+                    break
+            if key.end() > first_brace_close:
+                search = opener.end()
+                continue
+            if close.start() < key.end():
+                close = self._RE_JSON_ARRAY_CLOSE.search(text, key.end())
+                if close is None:
+                    break
+            pieces.append(text[pos:opener.start()])
+            pos = search = close.end()
+        if not pieces:
+            return text
+        pieces.append(text[pos:])
+        return "".join(pieces)
 
     def _collapse_blank_lines(self, text: str) -> str:
+        if "\n\n\n" not in text:
+            return text.strip()
         return self._RE_BLANK_LINES.sub("\n\n", text).strip()
 
     # =========================================================================
@@ -473,5 +929,3 @@ class ContentProcessor:
 # =============================================================================
 
 content_processor = ContentProcessor()
-
-
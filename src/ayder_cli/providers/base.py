@@ -28,6 +28,10 @@ class ToolCallDef:
     id: str
     name: str
     arguments: str  # Always a JSON string representing the arguments
+    # Position of the call within the response. Streamed deltas of one call
+    # all carry it (with the id/name possibly only on the first), so ChatLoop
+    # stitches them by index; None marks a call that arrived complete.
+    index: Optional[int] = None
 
 
 @dataclass
@@ -96,6 +100,22 @@ class AIProvider(ABC):
         """
         pass
 
+    async def prewarm(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Hint that a request for ``messages`` is about to be made.
+
+        Called by the chat loop while tools are still running. Providers may
+        convert the history to their wire format (filling their caches) or
+        open a connection so the real request starts without setup cost.
+        Must not send a completion request. Errors are the caller's to ignore.
+        """
+        return None
+
 
 class ProviderUnavailableError(RuntimeError):
     """Raised when a driver's optional dependency is not installed.
@@ -0,0 +1,418 @@
+"""Client-side rate limiting and adaptive concurrency per endpoint.
+
+RetryingProvider backs off per call with no shared state, so when the main
+chat and several agents hit one endpoint, a 429 on one call does nothing to
+stop the others — they all retry into the same wall. RateGovernor is the
+shared state: one per (driver, base_url), combining
+
+- an AIMD concurrency limit: +1/limit per successful request, x0.5 on a 429;
+- an optional token bucket (``requests_per_minute``), tightened by the
+  server's rate-limit headers;
+- a cooldown set from ``Retry-After`` (or reset headers when the server says
+  no requests remain) that holds every caller, not just the one that got 429.
+
+Waiting requests are queued per lane ("main", "agent:<name>") and granted
+least-served-group first — the main chat versus all agents — then
+least-served lane within the group, so a burst of agent runs cannot starve
+the interactive session or each other.
+
+GovernedProvider sits *inside* RetryingProvider: each retry attempt re-acquires
+a slot and therefore waits out the shared cooldown instead of its own backoff.
+"""
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import re
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Callable, Dict, List, Mapping, Optional
+
+from ayder_cli.providers.base import AIProvider, NormalizedStreamChunk
+
+logger = logging.getLogger(__name__)
+
+# Cooldown applied to a 429 that carries no Retry-After / reset hint.
+_DEFAULT_COOLDOWN_SECONDS = 1.0
+# Concurrent 429s from one overload are one congestion signal, not many.
+_DECREASE_HOLDOFF_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class GovernorConfig:
+    """Config for RateGovernor. Kept separate from the pydantic Config
+    section so governor.py has zero dependencies on core.config."""
+
+    enabled: bool = True
+    requests_per_minute: float = 0.0  # 0 = no static cap
+    initial_concurrency: int = 8
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+    decrease_factor: float = 0.5
+    max_cooldown_seconds: float = 120.0
+
+    def __post_init__(self) -> None:
+        if self.requests_per_minute < 0:
+            raise ValueError("requests_per_minute must be >= 0")
+        if not 1 <= self.min_concurrency <= self.initial_concurrency <= self.max_concurrency:
+            raise ValueError(
+                "concurrency bounds must satisfy 1 <= min <= initial <= max"
+            )
+        if not 0.0 < self.decrease_factor < 1.0:
+            raise ValueError("decrease_factor must be in (0, 1)")
+
+
+# ---------------------------------------------------------------------------
+# Header parsing
+# ---------------------------------------------------------------------------
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse OpenAI-style reset durations ("1s", "6m0s", "20ms") or plain seconds."""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+
+def _parse_timestamp(value: str) -> Optional[float]:
+    """Seconds from now until an RFC 3339 or HTTP date, or None."""
+    value = value.strip()
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            value = headers.get(name.title())
+        if value is not None:
+            return str(value)
+    return None
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After / retry-after-ms)."""
+    ms = _header(headers, "retry-after-ms")
+    if ms is not None:
+        try:
+            return max(0.0, float(ms) / 1000.0)
+        except ValueError:
+            pass
+    value = _header(headers, "retry-after")
+    if value is None:
+        return None
+    seconds = _parse_duration(value)
+    return seconds if seconds is not None else _parse_timestamp(value)
+
+
+@dataclass(frozen=True)
+class RateLimitHint:
+    """Request-quota facts read from one response's headers."""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_seconds: Optional[float] = None
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str]) -> RateLimitHint:
+    """Read request-quota headers (OpenAI-compatible and Anthropic styles)."""
+
+    def _int(value: Optional[str]) -> Optional[int]:
+        try:
+            return int(float(value)) if value is not None else None
+        except ValueError:
+            return None
+
+    limit = _int(_header(headers, "x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit"))
+    remaining = _int(
+        _header(headers, "x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining")
+    )
+    reset: Optional[float] = None
+    raw = _header(headers, "x-ratelimit-reset-requests")
+    if raw is not None:
+        reset = _parse_duration(raw)
+    raw = _header(headers, "anthropic-ratelimit-requests-reset")
+    if raw is not None and reset is None:
+        reset = _parse_timestamp(raw)
+    return RateLimitHint(limit=limit, remaining=remaining, reset_seconds=reset)
+
+
+def _response_headers(exc: BaseException) -> Mapping[str, str]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    return headers if headers is not None else {}
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True for an HTTP 429 from any SDK (status_code on the error or its response)."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429 or type(exc).__name__ == "RateLimitError"
+
+
+# ---------------------------------------------------------------------------
+# Governor
+# ---------------------------------------------------------------------------
+
+
+class RateGovernor:
+    """Shared admission control for one endpoint. See module docstring."""
+
+    def __init__(
+        self,
+        config: GovernorConfig = GovernorConfig(),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._cfg = config
+        self._clock = clock
+        self.limit = float(config.initial_concurrency)
+        self.in_flight = 0
+        self._rate = config.requests_per_minute / 60.0  # tokens per second; 0 = unlimited
+        self._burst = max(1.0, float(config.initial_concurrency))
+        self._tokens = self._burst
+        self._refilled_at = clock()
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._queues: dict[str, deque[asyncio.Future[None]]] = {}
+        self._served: Counter[str] = Counter()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.granted = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    # -- admission ---------------------------------------------------------
+
+    async def acquire(self, lane: str = "main") -> None:
+        """Wait for a slot. Every acquire must be paired with one release()."""
+        if not any(self._queues.values()) and self._try_grant(lane):
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(lane, deque()).append(future)
+        started = self._clock()
+        try:
+            self._dispatch()
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # granted just as we were cancelled
+            else:
+                self._queues[lane].remove(future)
+            raise
+        finally:
+            self.wait_seconds += self._clock() - started
+
+    def release(self, *, success: bool | None = None) -> None:
+        """Return a slot. success=True grows the limit; False (a 429) is handled
+        by on_rate_limited(); None (other errors, cancellation) is neutral."""
+        self.in_flight = max(0, self.in_flight - 1)
+        if success:
+            self.limit = min(float(self._cfg.max_concurrency), self.limit + 1.0 / self.limit)
+        self._dispatch()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """A 429: shrink the limit (once per burst) and hold everyone for the cooldown."""
+        now = self._clock()
+        self.throttled += 1
+        if now - self._last_decrease >= _DECREASE_HOLDOFF_SECONDS:
+            self.limit = max(float(self._cfg.min_concurrency), self.limit * self._cfg.decrease_factor)
+            self._last_decrease = now
+        self._block_for(_DEFAULT_COOLDOWN_SECONDS if retry_after is None else retry_after)
+        logger.info(
+            f"Rate limited; concurrency limit {self.limit:.1f}, "
+            f"cooling down {max(0.0, self._blocked_until - now):.1f}s"
+        )
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Adopt the server's view of our quota from a successful response."""
+        hint = parse_rate_limit_headers(headers)
+        if hint.limit and not self._cfg.requests_per_minute:
+            # OpenAI-compatible and Anthropic request limits are per minute.
+            self._rate = hint.limit / 60.0
+        if hint.remaining is not None:
+            self._refill()
+            self._tokens = min(self._tokens, float(hint.remaining))
+            if hint.remaining <= 0 and hint.reset_seconds:
+                self._block_for(hint.reset_seconds)
+
+    def _block_for(self, seconds: float) -> None:
+        seconds = min(max(0.0, seconds), self._cfg.max_cooldown_seconds)
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self._rate:
+            self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+    def _delay(self) -> float:
+        """Seconds until a slot could open on time alone (0 = now)."""
+        now = self._clock()
+        delay = max(0.0, self._blocked_until - now)
+        if self._rate:
+            self._refill()
+            if self._tokens < 1.0:
+                delay = max(delay, (1.0 - self._tokens) / self._rate)
+        return delay
+
+    def _try_grant(self, lane: str) -> bool:
+        if self.in_flight >= int(self.limit) or self._delay() > 0:
+            return False
+        self.in_flight += 1
+        if self._rate:
+            self._tokens -= 1.0
+        self._served[lane] += 1
+        self._served[_group(lane)] += 1
+        self.granted += 1
+        return True
+
+    def _next_lane(self) -> Optional[str]:
+        waiting = [lane for lane, q in self._queues.items() if q]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda lane: (self._served[_group(lane)], self._served[lane]))
+
+    def _dispatch(self) -> None:
+        while (lane := self._next_lane()) is not None:
+            if not self._try_grant(lane):
+                break
+            self._queues[lane].popleft().set_result(None)
+        if any(self._queues.values()) and self.in_flight < int(self.limit):
+            self._schedule(self._delay())
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None or delay <= 0:
+            return
+        loop = asyncio.get_running_loop()
+
+        def _fire() -> None:
+            self._timer = None
+            self._dispatch()
+
+        self._timer = loop.call_later(delay, _fire)
+
+    # -- metrics -----------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for metrics / stats output."""
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": {lane: len(q) for lane, q in self._queues.items() if q},
+            "requests_per_minute": round(self._rate * 60.0, 2) if self._rate else None,
+            "cooldown_seconds": round(max(0.0, self._blocked_until - self._clock()), 2),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 2),
+        }
+
+
+def _group(lane: str) -> str:
+    return "group:" + lane.split(":", 1)[0]
+
+
+_governors: dict[tuple[str, str], RateGovernor] = {}
+
+
+def get_governor(key: tuple[str, str], config: GovernorConfig = GovernorConfig()) -> RateGovernor:
+    """Return the process-wide RateGovernor for (driver, base_url)."""
+    governor = _governors.get(key)
+    if governor is None:
+        governor = RateGovernor(config)
+        _governors[key] = governor
+    return governor
+
+
+def observe_rate_limit_headers(key: tuple[str, str], headers: Any) -> None:
+    """Feed response headers to `key`'s governor, if one is active."""
+    governor = _governors.get(key)
+    if governor is not None and headers is not None:
+        governor.observe_headers(headers)
+
+
+def governor_metrics() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every active governor, keyed "driver base_url"."""
+    return {
+        f"{driver} {base_url}".strip(): governor.snapshot()
+        for (driver, base_url), governor in _governors.items()
+    }
+
+
+class GovernedProvider(AIProvider):
+    """Decorator that admits each request through a shared RateGovernor.
+
+    A slot is held for the whole stream. 429s feed the governor's cooldown and
+    are re-raised, so an outer RetryingProvider still decides whether to retry.
+    """
+
+    def __init__(self, inner: AIProvider, governor: RateGovernor, lane: str = "main") -> None:
+        # Deliberately bypass AIProvider.__init__ — we delegate to `inner`.
+        self._inner = inner
+        self._governor = governor
+        self._lane = lane
+
+    async def list_models(self) -> List[str]:
+        return await self._inner.list_models()
+
+    async def prewarm(self, *args, **kwargs) -> None:
+        # Not a completion request: no slot is taken.
+        await self._inner.prewarm(*args, **kwargs)
+
+    def _settle(self, exc: Optional[BaseException]) -> None:
+        if exc is None:
+            self._governor.release(success=True)
+        elif isinstance(exc, Exception) and is_rate_limited(exc):
+            self._governor.on_rate_limited(parse_retry_after(_response_headers(exc)))
+            self._governor.release(success=False)
+        else:
+            self._governor.release()
+
+    async def chat(self, *args, **kwargs) -> NormalizedStreamChunk:
+        await self._governor.acquire(self._lane)
+        try:
+            result = await self._inner.chat(*args, **kwargs)
+        except BaseException as exc:
+            self._settle(exc)
+            raise
+        self._settle(None)
+        return result
+
+    async def stream_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        verbose: bool = False,
+    ) -> AsyncGenerator[NormalizedStreamChunk, None]:
+        await self._governor.acquire(self._lane)
+        try:
+            async for chunk in self._inner.stream_with_tools(
+                messages, model, tools=tools, options=options, verbose=verbose
+            ):
+                yield chunk
+        except BaseException as exc:
+            self._settle(exc)
+            raise
+        self._settle(None)
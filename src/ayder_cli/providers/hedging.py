@@ -0,0 +1,400 @@
+"""Hedged requests and failover across provider profiles.
+
+RetryingProvider retries the same endpoint after it fails. HedgedProvider
+bounds tail latency instead: when the primary has not produced its first
+token within a percentile of its recent time-to-first-token, a second request
+is fired at a fallback profile. Whichever stream commits first (yields a
+meaningful chunk) wins; the other is cancelled. A per-endpoint circuit breaker
+sends traffic straight to a fallback while an endpoint keeps failing.
+
+Endpoint statistics are process-wide and keyed by (driver, base_url), so the
+main session and every agent share one view of an overloaded box.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import enum
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Sequence
+
+from ayder_cli.providers.base import AIProvider, NormalizedStreamChunk
+from ayder_cli.providers.retry import RetryVerdict, _is_meaningful, classify_error
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HedgeConfig:
+    """Config for HedgedProvider. Kept separate from the pydantic Config
+    section so hedging.py has zero dependencies on core.config."""
+
+    enabled: bool = False
+    percentile: float = 0.95
+    initial_delay_seconds: float = 5.0
+    min_delay_seconds: float = 1.0
+    max_delay_seconds: float = 30.0
+    min_samples: int = 5
+    window: int = 50
+    failure_threshold: int = 3
+    cooldown_seconds: float = 30.0
+    retry_on_names: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.percentile <= 1.0:
+            raise ValueError("percentile must be in (0, 1]")
+        if self.min_delay_seconds < 0:
+            raise ValueError("min_delay_seconds must be >= 0")
+        if self.max_delay_seconds < self.min_delay_seconds:
+            raise ValueError("max_delay_seconds must be >= min_delay_seconds")
+        if self.min_samples <= 0 or self.window < self.min_samples:
+            raise ValueError("window must be >= min_samples > 0")
+        if self.failure_threshold <= 0:
+            raise ValueError("failure_threshold must be positive")
+        if self.cooldown_seconds < 0:
+            raise ValueError("cooldown_seconds must be >= 0")
+
+
+class BreakerState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one endpoint.
+
+    CLOSED passes traffic. ``failure_threshold`` consecutive failures OPEN it
+    for ``cooldown_seconds``; after that a single probe request is allowed
+    (HALF_OPEN). The probe's success closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> BreakerState:
+        if self._opened_at is None:
+            return BreakerState.CLOSED
+        if self._clock() - self._opened_at >= self.cooldown_seconds:
+            return BreakerState.HALF_OPEN
+        return BreakerState.OPEN
+
+    def allow(self) -> bool:
+        """True if a request may be sent now. Claims the probe when HALF_OPEN."""
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return True
+        if state is BreakerState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+        self._probing = False
+
+    def release(self) -> None:
+        """Give back an unused probe (the request was cancelled, not failed)."""
+        self._probing = False
+
+
+class TTFTTracker:
+    """Sliding window of time-to-first-token samples for one endpoint."""
+
+    def __init__(self, window: int = 50) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None when empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(q * len(ordered)))
+        return ordered[rank - 1]
+
+
+@dataclass
+class EndpointHealth:
+    """Shared latency and failure state for one (driver, base_url)."""
+
+    ttft: TTFTTracker
+    breaker: CircuitBreaker
+
+
+_health: dict[tuple[str, str], EndpointHealth] = {}
+
+
+def endpoint_health(key: tuple[str, str], cfg: HedgeConfig) -> EndpointHealth:
+    """Return the process-wide EndpointHealth for `key`, creating it on first use."""
+    health = _health.get(key)
+    if health is None:
+        health = EndpointHealth(
+            ttft=TTFTTracker(cfg.window),
+            breaker=CircuitBreaker(cfg.failure_threshold, cfg.cooldown_seconds),
+        )
+        _health[key] = health
+    return health
+
+
+@dataclass
+class HedgeTarget:
+    """One endpoint HedgedProvider can send a request to.
+
+    ``model`` is the profile's own model; None means "the model the caller
+    asked for" (the primary).
+    """
+
+    name: str
+    provider: AIProvider
+    health: EndpointHealth
+    model: Optional[str] = None
+
+
+class _Leg:
+    """One in-flight request, pumping its stream into the shared event queue."""
+
+    def __init__(
+        self,
+        target: HedgeTarget,
+        events: asyncio.Queue,
+        stream: AsyncGenerator[NormalizedStreamChunk, None],
+    ) -> None:
+        self.target = target
+        self.started = time.monotonic()
+        self.prelude: List[NormalizedStreamChunk] = []
+        self.task = asyncio.create_task(self._pump(events, stream))
+
+    async def _pump(self, events: asyncio.Queue, stream: AsyncGenerator) -> None:
+        try:
+            async with contextlib.aclosing(stream):
+                async for chunk in stream:
+                    await events.put((self, "chunk", chunk))
+        except Exception as exc:  # noqa: BLE001 — surfaced through the queue
+            await events.put((self, "error", exc))
+        else:
+            await events.put((self, "done", None))
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+class HedgedProvider(AIProvider):
+    """Decorator that races a primary provider against fallback profiles.
+
+    Commit invariant (shared with RetryingProvider): nothing reaches the
+    consumer until some leg yields a meaningful chunk. That leg wins, every
+    other leg is cancelled, and from then on the winner's stream — including
+    its errors — passes through unchanged.
+    """
+
+    def __init__(
+        self,
+        primary: HedgeTarget,
+        fallbacks: Sequence[HedgeTarget],
+        hedge_config: HedgeConfig,
+    ) -> None:
+        # Deliberately bypass AIProvider.__init__ — we delegate to the targets.
+        self._primary = primary
+        self._fallbacks = list(fallbacks)
+        self._hedge = hedge_config
+
+    async def list_models(self) -> List[str]:
+        return await self._primary.provider.list_models()
+
+    async def prewarm(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Warm the primary only; fallbacks are raced on demand."""
+        target = self._primary
+        await target.provider.prewarm(messages, target.model or model, tools=tools, options=options)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary's first token before hedging."""
+        ttft = self._primary.health.ttft
+        delay = None
+        if len(ttft) >= self._hedge.min_samples:
+            delay = ttft.percentile(self._hedge.percentile)
+        if delay is None:
+            delay = self._hedge.initial_delay_seconds
+        return min(max(delay, self._hedge.min_delay_seconds), self._hedge.max_delay_seconds)
+
+    def _next_target(self, used: List[HedgeTarget]) -> Optional[HedgeTarget]:
+        for target in [self._primary, *self._fallbacks]:
+            if target not in used and target.health.breaker.allow():
+                return target
+        return None
+
+    def _is_transient(self, exc: BaseException) -> bool:
+        return classify_error(exc, self._hedge.retry_on_names) is RetryVerdict.RETRYABLE
+
+    async def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        verbose: bool = False,
+    ) -> NormalizedStreamChunk:
+        """Non-streaming call: no hedging, but fail over on transient errors."""
+        used: List[HedgeTarget] = []
+        target = self._next_target(used) or self._primary
+        while True:
+            used.append(target)
+            try:
+                result = await target.provider.chat(
+                    messages, target.model or model, tools=tools, options=options, verbose=verbose
+                )
+            except Exception as exc:
+                if not self._is_transient(exc):
+                    target.health.breaker.release()
+                    raise
+                target.health.breaker.record_failure()
+                target = self._next_target(used)
+                if target is None:
+                    raise
+                logger.info(f"Provider failed ({type(exc).__name__}); failing over to {target.name!r}")
+                continue
+            target.health.breaker.record_success()
+            return result
+
+    async def stream_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        verbose: bool = False,
+    ) -> AsyncGenerator[NormalizedStreamChunk, None]:
+        events: asyncio.Queue = asyncio.Queue()
+        used: List[HedgeTarget] = []
+        legs: List[_Leg] = []
+
+        def launch() -> bool:
+            target = self._next_target(used)
+            if target is None and not used:
+                # Every breaker is open: still try the primary rather than fail.
+                target = self._primary
+            if target is None:
+                return False
+            used.append(target)
+            stream = target.provider.stream_with_tools(
+                messages, target.model or model, tools=tools, options=options, verbose=verbose
+            )
+            legs.append(_Leg(target, events, stream))
+            if len(legs) > 1:
+                logger.info(f"Hedging request to provider {target.name!r}")
+            return True
+
+        launch()
+        hedge_at = time.monotonic() + self.hedge_delay()
+        winner: Optional[_Leg] = None
+        live = set(legs)
+        last_error: Optional[BaseException] = None
+        empty: Optional[_Leg] = None
+
+        try:
+            while winner is None:
+                if not live:
+                    if last_error is not None and empty is None:
+                        raise last_error
+                    if empty is not None and empty.prelude:
+                        yield empty.prelude[-1]  # keep token accounting for empty responses
+                    return
+                can_hedge = len(used) < 1 + len(self._fallbacks)
+                timeout = max(0.0, hedge_at - time.monotonic()) if can_hedge else None
+                try:
+                    leg, kind, payload = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    hedge_at = float("inf")
+                    if launch():
+                        live.add(legs[-1])
+                    continue
+                if leg not in live:
+                    continue
+                if kind == "chunk":
+                    if not _is_meaningful(payload):
+                        leg.prelude.append(payload)
+                        continue
+                    winner = leg
+                    leg.target.health.ttft.record(leg.elapsed)
+                    leg.target.health.breaker.record_success()
+                    for pending in leg.prelude:
+                        yield pending
+                    yield payload
+                elif kind == "done":
+                    live.discard(leg)
+                    leg.target.health.breaker.record_success()
+                    empty = empty or leg
+                else:
+                    live.discard(leg)
+                    if not self._is_transient(payload):
+                        leg.target.health.breaker.release()
+                        if not live:
+                            raise payload
+                        last_error = payload
+                        continue
+                    leg.target.health.breaker.record_failure()
+                    last_error = payload
+                    logger.info(
+                        f"Provider {leg.target.name!r} failed before first token "
+                        f"({type(payload).__name__}: {payload})"
+                    )
+                    if launch():  # fail over now rather than at the hedge deadline
+                        live.add(legs[-1])
+
+            for leg in live - {winner}:
+                leg.task.cancel()
+                leg.target.health.breaker.release()
+                if leg.target is self._primary:
+                    # A lower bound on the primary's TTFT; keeps the percentile
+                    # from locking onto fast samples while the box is overloaded.
+                    leg.target.health.ttft.record(leg.elapsed)
+
+            while True:
+                leg, kind, payload = await events.get()
+                if leg is not winner:
+                    continue
+                if kind == "chunk":
+                    yield payload
+                elif kind == "done":
+                    return
+                else:
+                    winner.target.health.breaker.record_failure()
+                    raise payload
+        finally:
+            for leg in legs:
+                leg.task.cancel()
+            await asyncio.gather(*(leg.task for leg in legs), return_exceptions=True)
@@ -6,12 +6,19 @@ import json
 from typing import Any, AsyncGenerator, Dict, List, Optional
 from loguru import logger
 
+from ayder_cli.core import json_codec
 from ayder_cli.core.config import Config
 from ayder_cli.providers.base import (
     AIProvider,
     NormalizedStreamChunk,
     ToolCallDef,
 )
+from ayder_cli.providers.governor import observe_rate_limit_headers
+from ayder_cli.providers.wire_cache import MessageWireCache
+
+
+# Extended-thinking budget per reasoning effort; 1024 is the API minimum.
+_THINKING_BUDGETS = {"low": 1024, "medium": 4096, "high": 16384}
 
 
 class ClaudeProvider(AIProvider):
@@ -37,14 +44,17 @@ class ClaudeProvider(AIProvider):
         kwargs: Dict[str, Any] = {
             "model": model,
             "messages": anthropic_messages,
-            "max_tokens": getattr(self.config, "max_output_tokens", 4096),
+            "max_tokens": _max_tokens(self.config, options),
             "stream": False,
         }
         if system_prompt:
             kwargs["system"] = system_prompt
         if tools:
             kwargs["tools"] = self._convert_tools(tools)
-            
+        if options and (stop := options.get("stop_sequences")):
+            kwargs["stop_sequences"] = stop
+        self._apply_thinking(kwargs, messages, options)
+
         try:
             response = await self.client.messages.create(**kwargs)
             return self._normalize_response(response)
@@ -52,26 +62,50 @@ class ClaudeProvider(AIProvider):
             logger.error(f"Claude chat failed: {e}")
             raise
 
+    @staticmethod
+    def _apply_thinking(
+        kwargs: Dict[str, Any],
+        messages: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]],
+    ) -> None:
+        """Map the per-turn reasoning effort onto an extended-thinking budget.
+
+        Only a turn answering a user message thinks: continuing a tool-use
+        turn with thinking on requires the earlier signed thinking blocks,
+        which the history does not keep. The budget is added to max_tokens,
+        which must exceed it.
+        """
+        budget = _THINKING_BUDGETS.get((options or {}).get("reasoning_effort"))
+        if budget is None or (messages and messages[-1].get("role") == "tool"):
+            return
+        kwargs["thinking"] = {"type": "enabled", "budget_tokens": budget}
+        kwargs["max_tokens"] += budget
+
     def _normalize_response(self, response: Any) -> NormalizedStreamChunk:
         """Map Anthropic Message response to normalized format."""
         content = ""
+        reasoning = ""
         tool_calls = []
         
         for block in response.content:
             if block.type == "text":
                 content += block.text
+            elif block.type == "thinking":
+                reasoning += block.thinking
             elif block.type == "tool_use":
                 tool_calls.append(
                     ToolCallDef(
                         id=block.id,
                         name=block.name,
-                        arguments=json.dumps(block.input)
+                        arguments=json_codec.dumps(block.input),
+                        index=len(tool_calls),
                     )
                 )
         
         usage = {"total_tokens": response.usage.output_tokens + response.usage.input_tokens}
         return NormalizedStreamChunk(
             content=content,
+            reasoning=reasoning,
             tool_calls=tool_calls,
             raw_chunk=response,
             usage=usage
@@ -91,7 +125,7 @@ class ClaudeProvider(AIProvider):
         kwargs: Dict[str, Any] = {
             "model": model,
             "messages": anthropic_messages,
-            "max_tokens": getattr(self.config, "max_output_tokens", 4096),
+            "max_tokens": _max_tokens(self.config, options),
         }
         if system_prompt:
             kwargs["system"] = system_prompt
@@ -101,6 +135,7 @@ class ClaudeProvider(AIProvider):
             
         if options and (stop := options.get("stop_sequences")):
             kwargs["stop_sequences"] = stop
+        self._apply_thinking(kwargs, messages, options)
 
         if verbose:
             logger.debug(f"Claude Stream Request: model={model}, tools={len(tools) if tools else 0}")
@@ -109,6 +144,10 @@ class ClaudeProvider(AIProvider):
 
         try:
             async with self.client.messages.stream(**kwargs) as stream:
+                observe_rate_limit_headers(
+                    (self.config.driver, self.config.base_url or ""),
+                    getattr(getattr(stream, "response", None), "headers", None),
+                )
                 async for chunk in stream:
                     if verbose:
                         logger.debug(f"Claude Chunk: type={chunk.type}")
@@ -118,18 +157,31 @@ class ClaudeProvider(AIProvider):
             raise
 
     def _normalize_chunk(self, chunk: Any) -> NormalizedStreamChunk:
-        """Map Anthropic stream events to our normalized format."""
+        """Map Anthropic stream events to our normalized format.
+
+        A tool_use block arrives as a start event (id, name) followed by
+        ``input_json_delta`` fragments; all carry the content block's index,
+        which becomes the ToolCallDef index.
+        """
         content = ""
+        reasoning = ""
         tool_calls = []
         usage = None
 
         if chunk.type == "content_block_delta":
             if chunk.delta.type == "text_delta":
                 content = chunk.delta.text
+            elif chunk.delta.type == "thinking_delta":
+                reasoning = chunk.delta.thinking
             elif chunk.delta.type == "input_json_delta":
                 # Anthropic sends tool arguments as a continuous JSON string delta
                 tool_calls.append(
-                    ToolCallDef(id="", name="", arguments=chunk.delta.partial_json)
+                    ToolCallDef(
+                        id="",
+                        name="",
+                        arguments=chunk.delta.partial_json,
+                        index=chunk.index,
+                    )
                 )
                 
         elif chunk.type == "content_block_start":
@@ -139,7 +191,8 @@ class ClaudeProvider(AIProvider):
                     ToolCallDef(
                         id=chunk.content_block.id,
                         name=chunk.content_block.name,
-                        arguments=""
+                        arguments="",
+                        index=chunk.index,
                     )
                 )
                 
@@ -151,60 +204,37 @@ class ClaudeProvider(AIProvider):
 
         return NormalizedStreamChunk(
             content=content,
+            reasoning=reasoning,
             tool_calls=tool_calls,
             raw_chunk=chunk,
             usage=usage
         )
 
+    async def prewarm(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Convert ``messages`` into the wire cache ahead of the next request."""
+        self._convert_messages(messages)
+
     @staticmethod
     def _convert_messages(messages: List[Dict[str, Any]]) -> tuple[str, List[Dict[str, Any]]]:
-        """Extract system prompt and format messages for Anthropic."""
+        """Extract system prompt and format messages for Anthropic.
+
+        Non-system messages are converted once and memoized (see wire_cache).
+        """
         system_prompt = ""
         anthropic_messages = []
-        
+
         for msg in messages:
-            role = msg.get("role", "")
-            content = msg.get("content", "") or ""
-            tool_calls_raw = msg.get("tool_calls")
-            
-            if role == "system":
-                system_prompt += content + "\n"
+            if msg.get("role", "") == "system":
+                system_prompt += (msg.get("content", "") or "") + "\n"
                 continue
-                
-            # Handle tool calls (Anthropic expects them in the content array)
-            if tool_calls_raw:
-                content_blocks = []
-                if content:
-                    content_blocks.append({"type": "text", "text": content})
-                for tc in tool_calls_raw:
-                    args = tc["function"]["arguments"]
-                    import json
-                    if isinstance(args, str):
-                        try:
-                            args = json.loads(args)
-                        except json.JSONDecodeError:
-                            args = {}
-                    content_blocks.append({
-                        "type": "tool_use",
-                        "id": tc["id"],
-                        "name": tc["function"]["name"],
-                        "input": args,
-                    })
-                anthropic_messages.append({"role": "assistant", "content": content_blocks})
-            elif role == "tool":
-                # Anthropic expects tool results wrapped in a 'user' message
-                tool_id = msg.get("tool_call_id", "")
-                anthropic_messages.append({
-                    "role": "user",
-                    "content": [{
-                        "type": "tool_result",
-                        "tool_use_id": tool_id,
-                        "content": content,
-                    }]
-                })
-            else:
-                anthropic_messages.append({"role": role, "content": content})
-                
+            anthropic_messages.append(_WIRE_CACHE.convert(msg))
+
         return system_prompt.strip(), anthropic_messages
 
     @staticmethod
@@ -219,3 +249,49 @@ class ClaudeProvider(AIProvider):
                 "input_schema": func.get("parameters", {"type": "object", "properties": {}}),
             })
         return anthropic_tools
+
+
+def _max_tokens(config: Any, options: Optional[Dict[str, Any]]) -> int:
+    """Per-request output limit from the chat loop, else the configured one."""
+    return (options or {}).get("max_output_tokens") or getattr(config, "max_output_tokens", 4096)
+
+
+def _convert_message(msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Format one non-system OpenAI-format message for Anthropic."""
+    role = msg.get("role", "")
+    content = msg.get("content", "") or ""
+    tool_calls_raw = msg.get("tool_calls")
+
+    # Handle tool calls (Anthropic expects them in the content array)
+    if tool_calls_raw:
+        content_blocks = []
+        if content:
+            content_blocks.append({"type": "text", "text": content})
+        for tc in tool_calls_raw:
+            args = tc["function"]["arguments"]
+            if isinstance(args, str):
+                try:
+                    args = json_codec.loads(args)
+                except json.JSONDecodeError:
+                    args = {}
+            content_blocks.append({
+                "type": "tool_use",
+                "id": tc["id"],
+                "name": tc["function"]["name"],
+                "input": args,
+            })
+        return {"role": "assistant", "content": content_blocks}
+    if role == "tool":
+        # Anthropic expects tool results wrapped in a 'user' message
+        return {
+            "role": "user",
+            "content": [{
+                "type": "tool_result",
+                "tool_use_id": msg.get("tool_call_id", ""),
+                "content": content,
+            }]
+        }
+    return {"role": role, "content": content}
+
+
+_WIRE_CACHE: MessageWireCache[Dict[str, Any]] = MessageWireCache(_convert_message)
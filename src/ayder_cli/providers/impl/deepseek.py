@@ -5,6 +5,10 @@ DeepSeek Provider implementation.
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from ayder_cli.core.config import Config
+from ayder_cli.core.display_filter import (
+    THINK_DISPLAY_TAGS,
+    StreamingDisplayFilter,
+)
 from ayder_cli.providers.base import (
     AIProvider,
     NormalizedStreamChunk,
@@ -24,6 +28,8 @@ class DeepSeekProvider(AIProvider):
         # DeepSeek uses OpenAI-compatible API with legacy max_tokens
         self.base_provider = OpenAIProvider(config, interaction_sink=interaction_sink)
         self.base_provider.MAX_TOKENS_PARAM = "max_tokens"
+        # deepseek-reasoner always reasons; there is no effort parameter.
+        self.base_provider.REASONING_EFFORT_PARAM = None
 
     async def chat(
         self,
@@ -35,6 +41,9 @@ class DeepSeekProvider(AIProvider):
     ) -> NormalizedStreamChunk:
         return await self.base_provider.chat(messages, model, tools, options, verbose)
 
+    async def prewarm(self, *args, **kwargs) -> None:
+        await self.base_provider.prewarm(*args, **kwargs)
+
     async def stream_with_tools(
         self,
         messages: List[Dict[str, Any]],
@@ -48,9 +57,15 @@ class DeepSeekProvider(AIProvider):
             messages, model, tools, options, verbose
         )
 
+        # DeepSeek might put reasoning in reasoning_content or within <think> tags in content.
+        # OpenAIProvider already captures reasoning_content; <think> bodies in
+        # the content are moved over to reasoning as they stream.
+        think_filter = StreamingDisplayFilter(THINK_DISPLAY_TAGS)
         async for chunk in async_stream:
-            # DeepSeek might put reasoning in reasoning_content or within <think> tags in content.
-            # OpenAIProvider already captures reasoning_content.
-            # If it's in <think> tags, we might want to split it here or let the UI handle it.
-            # For now, we trust the OpenAIProvider's base normalization.
+            if chunk.content:
+                chunk.content, chunk.reasoning = think_filter.feed(chunk.content, chunk.reasoning)
             yield chunk
+
+        held_content, held_reasoning = think_filter.flush()
+        if held_content or held_reasoning:
+            yield NormalizedStreamChunk(content=held_content, reasoning=held_reasoning)
@@ -6,12 +6,14 @@ import json
 from typing import Any, AsyncGenerator, Dict, List, Optional
 from loguru import logger
 
+from ayder_cli.core import json_codec
 from ayder_cli.core.config import Config
 from ayder_cli.providers.base import (
     AIProvider,
     NormalizedStreamChunk,
     ToolCallDef,
 )
+from ayder_cli.providers.wire_cache import MessageWireCache
 
 class GeminiProvider(AIProvider):
     """Provider for Google Gemini models."""
@@ -38,6 +40,13 @@ class GeminiProvider(AIProvider):
             gen_config.system_instruction = system_prompt
         if tools:
             gen_config.tools = self._convert_tools(tools)  # type: ignore[assignment]
+        if options and (
+            max_tokens := options.get("max_output_tokens")
+            or getattr(self.config, "max_output_tokens", None)
+        ):
+            gen_config.max_output_tokens = max_tokens
+        if thinking := _thinking_config(options, model):
+            gen_config.thinking_config = thinking
 
         try:
             response = await self.client.aio.models.generate_content(
@@ -62,14 +71,7 @@ class GeminiProvider(AIProvider):
             if part.text:
                 content += part.text
             elif part.function_call:
-                args_dict = type(part.function_call.args).to_dict(part.function_call.args)
-                tool_calls.append(
-                    ToolCallDef(
-                        id=part.function_call.name,
-                        name=part.function_call.name,
-                        arguments=json.dumps(args_dict)
-                    )
-                )
+                tool_calls.append(_tool_call(part.function_call, len(tool_calls)))
                 
         usage = {"total_tokens": getattr(response.usage_metadata, "total_token_count", 0)}
         return NormalizedStreamChunk(
@@ -100,8 +102,13 @@ class GeminiProvider(AIProvider):
         if tools:
             gen_config.tools = self._convert_tools(tools)  # type: ignore[assignment]
 
-        if options and getattr(self.config, "max_output_tokens", None):
-            gen_config.max_output_tokens = self.config.max_output_tokens
+        if options and (
+            max_tokens := options.get("max_output_tokens")
+            or getattr(self.config, "max_output_tokens", None)
+        ):
+            gen_config.max_output_tokens = max_tokens
+        if thinking := _thinking_config(options, model):
+            gen_config.thinking_config = thinking
 
         if verbose:
             logger.debug(f"Gemini Stream Request: model={model}, tools={len(tools) if tools else 0}")
@@ -115,17 +122,25 @@ class GeminiProvider(AIProvider):
                 config=gen_config,
             )
             
+            calls = 0
             async for chunk in async_stream:
                 if verbose:
                     logger.debug("Gemini Chunk Received")
-                yield self._normalize_chunk(chunk)
+                normalized = self._normalize_chunk(chunk, first_index=calls)
+                calls += len(normalized.tool_calls)
+                yield normalized
                 
         except Exception as e:
             logger.error(f"Gemini streaming failed: {e}")
             raise
 
-    def _normalize_chunk(self, chunk: Any) -> NormalizedStreamChunk:
-        """Map Gemini stream chunk to normalized format."""
+    def _normalize_chunk(self, chunk: Any, first_index: int = 0) -> NormalizedStreamChunk:
+        """Map Gemini stream chunk to normalized format.
+
+        Gemini emits complete function calls, not deltas, possibly several
+        per chunk; ``first_index`` is the number of calls earlier chunks of
+        the stream carried, so indices run on across the stream.
+        """
         content = ""
         tool_calls = []
         usage = None
@@ -133,20 +148,12 @@ class GeminiProvider(AIProvider):
         if not chunk.candidates:
             return NormalizedStreamChunk(raw_chunk=chunk)
 
-        part = chunk.candidates[0].content.parts[0] if chunk.candidates[0].content.parts else None
-        
-        if part:
+        for part in chunk.candidates[0].content.parts or ():
             if part.text:
-                content = part.text
+                content += part.text
             elif part.function_call:
-                # Gemini emits complete function calls, not deltas
-                args_dict = type(part.function_call.args).to_dict(part.function_call.args)
                 tool_calls.append(
-                    ToolCallDef(
-                        id=part.function_call.name,  # Gemini doesn't use unique IDs per call
-                        name=part.function_call.name,
-                        arguments=json.dumps(args_dict)
-                    )
+                    _tool_call(part.function_call, first_index + len(tool_calls))
                 )
 
         # Usage info is often attached to the final chunk
@@ -162,56 +169,32 @@ class GeminiProvider(AIProvider):
             usage=usage
         )
 
+    async def prewarm(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Convert ``messages`` into the wire cache ahead of the next request."""
+        self._convert_messages(messages)
+
     @staticmethod
     def _convert_messages(messages: List[Dict[str, Any]]) -> tuple[str, List[Dict[str, Any]]]:
-        """Extract system prompt and convert messages to Gemini's format."""
+        """Extract system prompt and convert messages to Gemini's format.
+
+        Non-system messages are converted once and memoized (see wire_cache).
+        """
         system_prompt = ""
         gemini_messages = []
-        
-        for msg in messages:
-            role = msg.get("role", "")
-            content = msg.get("content", "") or ""
-            tool_calls_raw = msg.get("tool_calls")
 
-            if role == "system":
-                system_prompt += content + "\n"
+        for msg in messages:
+            if msg.get("role", "") == "system":
+                system_prompt += (msg.get("content", "") or "") + "\n"
                 continue
-
-            # Gemini uses "user" and "model"
-            gemini_role = "model" if role == "assistant" else "user"
-            
-            parts = []
-            if content:
-                parts.append({"text": content})
-                
-            if tool_calls_raw:
-                # Format previous function calls generated by the model
-                for tc in tool_calls_raw:
-                    args = tc["function"]["arguments"]
-                    if isinstance(args, str):
-                        try:
-                            args = json.loads(args)
-                        except json.JSONDecodeError:
-                            args = {}
-                    parts.append({
-                        "function_call": {
-                            "name": tc["function"]["name"],
-                            "args": args
-                        }
-                    })
-            elif role == "tool":
-                # Tool result returned by user
-                tool_name = msg.get("name", "unknown")
-                # Gemini requires function responses to be structured
-                parts.append({
-                    "function_response": {
-                        "name": tool_name,
-                        "response": {"result": content}
-                    }
-                })
-
-            if parts:
-                gemini_messages.append({"role": gemini_role, "parts": parts})
+            converted = _WIRE_CACHE.convert(msg)
+            if converted is not None:
+                gemini_messages.append(converted)
 
         return system_prompt.strip(), gemini_messages
 
@@ -229,3 +212,94 @@ class GeminiProvider(AIProvider):
                 }]
             })
         return gemini_tools
+
+
+def _tool_call(function_call: Any, index: int) -> ToolCallDef:
+    """ToolCallDef for one complete Gemini function call.
+
+    Older API versions give calls no id; the name plus position keeps ids
+    unique when one function is called twice in a response.
+    """
+    args_dict = type(function_call.args).to_dict(function_call.args)
+    call_id = getattr(function_call, "id", None)
+    return ToolCallDef(
+        id=call_id if isinstance(call_id, str) and call_id else f"{function_call.name}_{index}",
+        name=function_call.name,
+        arguments=json_codec.dumps(args_dict),
+        index=index,
+    )
+
+
+def _convert_message(msg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert one non-system message to Gemini's format (None if empty)."""
+    role = msg.get("role", "")
+    content = msg.get("content", "") or ""
+    tool_calls_raw = msg.get("tool_calls")
+
+    # Gemini uses "user" and "model"
+    gemini_role = "model" if role == "assistant" else "user"
+
+    parts = []
+    if content:
+        parts.append({"text": content})
+
+    if tool_calls_raw:
+        # Format previous function calls generated by the model
+        for tc in tool_calls_raw:
+            args = tc["function"]["arguments"]
+            if isinstance(args, str):
+                try:
+                    args = json_codec.loads(args)
+                except json.JSONDecodeError:
+                    args = {}
+            parts.append({
+                "function_call": {
+                    "name": tc["function"]["name"],
+                    "args": args
+                }
+            })
+    elif role == "tool":
+        # Tool result returned by user
+        tool_name = msg.get("name", "unknown")
+        # Gemini requires function responses to be structured
+        parts.append({
+            "function_response": {
+                "name": tool_name,
+                "response": {"result": content}
+            }
+        })
+
+    if not parts:
+        return None
+    return {"role": gemini_role, "parts": parts}
+
+
+_WIRE_CACHE: MessageWireCache[Optional[Dict[str, Any]]] = MessageWireCache(_convert_message)
+
+
+# Thinking budget per reasoning effort; -1 lets the model size it itself.
+_THINKING_BUDGETS = {"off": 0, "low": 1024, "medium": 8192, "high": -1}
+
+# Models that cannot turn thinking off reject a budget of 0; "off" sends
+# their smallest budget instead.
+_MIN_THINKING_BUDGETS = {"gemini-2.5-pro": 128, "gemini-3-pro": 128}
+
+
+def _thinking_budget(options: Optional[Dict[str, Any]], model: str) -> Optional[int]:
+    """Thinking budget for the per-turn reasoning effort, or None to keep the default."""
+    budget = _THINKING_BUDGETS.get((options or {}).get("reasoning_effort"))
+    if budget == 0:
+        name = model.rsplit("/", 1)[-1]
+        for family, minimum in _MIN_THINKING_BUDGETS.items():
+            if name.startswith(family):
+                return minimum
+    return budget
+
+
+def _thinking_config(options: Optional[Dict[str, Any]], model: str) -> Any:
+    """ThinkingConfig for the per-turn reasoning effort, or None to keep the default."""
+    budget = _thinking_budget(options, model)
+    if budget is None:
+        return None
+    from google.genai.types import ThinkingConfig
+    return ThinkingConfig(thinking_budget=budget)
@@ -71,12 +71,13 @@ class GLMNativeProvider(AIProvider):
         tool_calls = []
         
         if msg.tool_calls:
-            for tc in msg.tool_calls:
+            for i, tc in enumerate(msg.tool_calls):
                 tool_calls.append(
                     ToolCallDef(
                         id=tc.id,
                         name=tc.function.name,
-                        arguments=tc.function.arguments
+                        arguments=tc.function.arguments,
+                        index=i,
                     )
                 )
         
@@ -101,11 +102,14 @@ class GLMNativeProvider(AIProvider):
             
         if delta.tool_calls:
             for tc in delta.tool_calls:
+                # OpenAI-style deltas: the index ties a call's fragments together
+                index = getattr(tc, "index", None)
                 tool_calls.append(
                     ToolCallDef(
                         id=tc.id or "",
                         name=tc.function.name or "",
-                        arguments=tc.function.arguments or ""
+                        arguments=tc.function.arguments or "",
+                        index=index if isinstance(index, int) else None,
                     )
                 )
                 
@@ -6,6 +6,7 @@ from typing import Any, AsyncGenerator, Dict, List, Literal, Optional
 from loguru import logger
 from ollama import AsyncClient
 
+from ayder_cli.core import json_codec
 from ayder_cli.providers.base import (
     AIProvider,
     NormalizedStreamChunk,
@@ -18,6 +19,8 @@ from ayder_cli.providers.impl.ollama_drivers._errors import (
 from ayder_cli.providers.impl.ollama_drivers.base import ChatDriver, DriverMode
 from ayder_cli.providers.impl.ollama_drivers.registry import DriverRegistry
 from ayder_cli.providers.impl.ollama_inspector import OllamaInspector
+from ayder_cli.providers.impl.ollama_residency import DEFAULT_HOST, ollama_host
+from ayder_cli.providers.wire_cache import MessageWireCache
 
 ThinkOption = bool | Literal["low", "medium", "high"] | None
 
@@ -35,10 +38,8 @@ class OllamaProvider(AIProvider):
     def __init__(self, config: Any, interaction_sink: Any = None) -> None:
         super().__init__(config, interaction_sink)
         self.config = config
-        host = getattr(config, "base_url", "http://localhost:11434")
         # Strip /v1 suffix if present (legacy config)
-        if host.rstrip("/").endswith("/v1"):
-            host = host.rstrip("/")[:-3]
+        host = ollama_host(getattr(config, "base_url", DEFAULT_HOST))
         self._host = host
         self._client = AsyncClient(host=host)
         self._registry: DriverRegistry | None = None
@@ -64,8 +65,8 @@ class OllamaProvider(AIProvider):
         async for chunk in self.stream_with_tools(messages, model, tools, options, verbose):
             final.content += chunk.content
             final.reasoning += chunk.reasoning
-            if chunk.tool_calls:
-                final.tool_calls = chunk.tool_calls
+            # In-content drivers emit each call as soon as its block closes.
+            final.tool_calls.extend(chunk.tool_calls)
             if chunk.usage:
                 final.usage = chunk.usage
         return final
@@ -78,23 +79,13 @@ class OllamaProvider(AIProvider):
         options: Optional[Dict[str, Any]] = None,
         verbose: bool = False,
     ) -> AsyncGenerator[NormalizedStreamChunk, None]:
-        if self._registry is None:
-            inspector = OllamaInspector(host=self._host)
-            self._registry = DriverRegistry(inspector)
-
-        driver_override_name = (
-            None if self.config.chat_protocol == "ollama" else "generic_xml"
-        )
-        if (
-            driver_override_name is not None
-            and self.config.chat_protocol not in {"ollama", "xml"}
-        ):
+        if self.config.chat_protocol not in {"ollama", "xml"}:
             logger.warning(
                 f"Ollama chat_protocol={self.config.chat_protocol!r} is not "
                 "recognized; forcing generic_xml fallback"
             )
 
-        driver = await self._registry.resolve(model, override=driver_override_name)
+        driver = await self._resolve_driver(model)
         logger.debug(f"Ollama driver={driver.name} mode={driver.mode.value} for {model!r}")
 
         committed = False
@@ -118,6 +109,30 @@ class OllamaProvider(AIProvider):
             ):
                 yield chunk
 
+    async def prewarm(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Resolve the driver and convert ``messages`` into the wire cache.
+
+        The next request then only converts the tool results that land after
+        this call. The model itself is kept loaded by ``keep_alive=-1``.
+        """
+        driver = await self._resolve_driver(model)
+        if driver.mode is DriverMode.IN_CONTENT:
+            messages = driver.render_tools_into_messages(messages, tools or [])
+        self._convert_messages(messages)
+
+    async def _resolve_driver(self, model: str) -> ChatDriver:
+        if self._registry is None:
+            inspector = OllamaInspector(host=self._host)
+            self._registry = DriverRegistry(inspector)
+        override = None if self.config.chat_protocol == "ollama" else "generic_xml"
+        return await self._registry.resolve(model, override=override)
+
     def _configured_think(self) -> ThinkOption:
         """Return the configured Ollama think option.
 
@@ -141,6 +156,36 @@ class OllamaProvider(AIProvider):
                 return "high"
         return True
 
+    def _think_for(self, options: dict[str, Any] | None) -> ThinkOption:
+        """The configured think option, adjusted by a per-turn reasoning effort.
+
+        ``"off"`` disables thinking. Levels are sent only when the profile
+        already uses levels, i.e. the model is known to accept them; a boolean
+        profile keeps thinking on for any other effort. A profile with
+        thinking off is never switched on.
+        """
+        think = self._configured_think()
+        effort = (options or {}).get("reasoning_effort")
+        if effort is None or think is False:
+            return think
+        if effort == "off":
+            return False
+        return effort if isinstance(think, str) else think
+
+    def _generation_options(self, options: dict[str, Any] | None) -> dict[str, Any] | None:
+        """Ollama options for a request; only the output length is ever set.
+
+        Ollama generates without a cap by default, and that stays so unless
+        the chat loop narrows ``max_output_tokens`` below the configured value
+        because the context window is nearly full — then it becomes
+        ``num_predict``.
+        """
+        limit = (options or {}).get("max_output_tokens")
+        configured = getattr(self.config, "max_output_tokens", None)
+        if isinstance(limit, int) and isinstance(configured, int) and limit < configured:
+            return {"num_predict": limit}
+        return None
+
     @staticmethod
     def _is_unsupported_thinking_error(exc: BaseException) -> bool:
         """Return True when Ollama rejected the requested thinking mode."""
@@ -192,7 +237,7 @@ class OllamaProvider(AIProvider):
         tools: list[dict[str, Any]] | None,
         options: dict[str, Any] | None,
     ) -> AsyncGenerator[NormalizedStreamChunk, None]:
-        think = self._configured_think()
+        think = self._think_for(options)
         committed = False
         try:
             async for chunk in self._stream_native_once(
@@ -231,9 +276,13 @@ class OllamaProvider(AIProvider):
             tools=ollama_tools,
             keep_alive=-1,
             think=think,
+            options=self._generation_options(options),
             stream=True,
         )
 
+        # Ollama sends each call complete, numbered per chunk; number them
+        # across the whole stream instead.
+        calls = 0
         async for chunk in stream:
             msg = chunk.message
             usage = None
@@ -250,16 +299,18 @@ class OllamaProvider(AIProvider):
 
             tool_calls = []
             if msg.tool_calls:
-                for i, tc in enumerate(msg.tool_calls):
+                for tc in msg.tool_calls:
                     raw_args = tc.function.arguments
-                    args = raw_args if isinstance(raw_args, str) else json.dumps(raw_args)
+                    args = raw_args if isinstance(raw_args, str) else json_codec.dumps(raw_args)
                     tool_calls.append(
                         ToolCallDef(
-                            id=f"call_{i}",
+                            id=f"call_{calls}",
                             name=tc.function.name,
                             arguments=args,
+                            index=calls,
                         )
                     )
+                    calls += 1
 
             yield NormalizedStreamChunk(
                 content=msg.content or "",
@@ -277,7 +328,7 @@ class OllamaProvider(AIProvider):
         tools: list[dict[str, Any]] | None,
         options: dict[str, Any] | None,
     ) -> AsyncGenerator[NormalizedStreamChunk, None]:
-        think = self._configured_think()
+        think = self._think_for(options)
         committed = False
         try:
             async for chunk in self._stream_in_content_once(
@@ -317,12 +368,14 @@ class OllamaProvider(AIProvider):
             tools=None,
             keep_alive=-1,
             think=think,
+            options=self._generation_options(options),
             stream=True,
         )
 
         raw_content = ""
         raw_thinking = ""
         display_filter = driver.display_filter()
+        tool_parser = driver.tool_call_parser()
 
         async for chunk in stream:
             msg = chunk.message
@@ -360,6 +413,38 @@ class OllamaProvider(AIProvider):
                     usage=usage,
                 )
 
+            if tool_parser is not None and content_text:
+                # Dispatch each call as soon as its closing tag arrives.
+                calls = tool_parser.feed(content_text)
+                if calls:
+                    yield NormalizedStreamChunk(tool_calls=calls)
+                if tool_parser.finished:
+                    logger.debug(
+                        f"{driver.name}: model began writing tool results after "
+                        f"{tool_parser.emitted} call(s); stopping generation early"
+                    )
+                    # The final chunk carrying the real counts never arrives,
+                    # and draining the stream would let the model keep
+                    # generating; report an estimate instead.
+                    yield NormalizedStreamChunk(
+                        usage=_estimated_usage(ollama_messages, raw_content, raw_thinking)
+                    )
+                    aclose = getattr(stream, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+                    break
+
+        if display_filter is not None and not (tool_parser is not None and tool_parser.finished):
+            held_content, held_thinking = display_filter.flush()
+            if held_content or held_thinking:
+                yield NormalizedStreamChunk(content=held_content, reasoning=held_thinking)
+
+        if tool_parser is not None:
+            trailing = tool_parser.flush()
+            if trailing:
+                yield NormalizedStreamChunk(tool_calls=trailing)
+            if tool_parser.emitted:
+                return
         final_calls = driver.parse_tool_calls(raw_content, raw_thinking)
         if final_calls:
             yield NormalizedStreamChunk(tool_calls=final_calls)
@@ -367,69 +452,101 @@ class OllamaProvider(AIProvider):
     def _convert_messages(self, messages: List[Dict[str, Any]]) -> list:
         """Convert OpenAI-format messages to ollama SDK-compatible format.
 
-        The ollama SDK's _copy_messages() runs each dict through:
-            {k: v for k, v in dict(msg).items() if v}  → Message.model_validate()
-
-        This means:
-        - Falsy values (empty string, None, empty list) are DROPPED before validation
-        - Message.tool_calls[].function.arguments must be dict, not JSON string
-        - Tool result messages use 'tool_name' (not 'name')
-        - Extra fields (tool_call_id, type, reasoning_content) are silently ignored
+        Each message is converted once and memoized (see wire_cache), so a
+        turn only pays for the messages added since the previous one.
         """
-        converted = []
-        for msg in messages:
-            role = msg["role"]
-            content = msg.get("content") or None  # Normalize "" → None (SDK drops "" anyway)
-
-            entry: Dict[str, Any] = {"role": role}
-
-            # Only set content if non-empty (SDK drops falsy values anyway)
-            if content:
-                entry["content"] = content
-
-            if role == "assistant" and msg.get("tool_calls"):
-                tool_calls = []
-                for tc in msg["tool_calls"]:
-                    func = tc.get("function", {})
-                    name = func.get("name", "").strip()
-
-                    # Skip dummy/placeholder tool calls from streaming gaps
-                    if not name:
-                        continue
-
-                    args = func.get("arguments", {})
-                    # SDK requires arguments as dict (Mapping[str, Any]), not JSON string
-                    if isinstance(args, str):
-                        try:
-                            args = json.loads(args)
-                        except (json.JSONDecodeError, ValueError):
-                            logger.warning(
-                                f"Malformed tool arguments for '{name}': "
-                                f"{args!r:.200} — replacing with empty dict"
-                            )
-                            args = {}
-                    if not isinstance(args, dict):
-                        args = {}
-
-                    tool_calls.append({
-                        "function": {
-                            "name": name,
-                            "arguments": args,
-                        }
-                    })
-
-                if tool_calls:
-                    entry["tool_calls"] = tool_calls
-
-            elif role == "tool":
-                # SDK uses 'tool_name' not 'name' for tool result correlation
-                tool_name = msg.get("name") or msg.get("tool_name") or ""
-                if tool_name:
-                    entry["tool_name"] = tool_name
-
-            converted.append(entry)
-        return converted
+        return [_WIRE_CACHE.convert(msg) for msg in messages]
 
     def _convert_tools(self, tools: List[Dict[str, Any]]) -> list:
         """Convert OpenAI-format tool schemas to ollama format."""
         return tools
+
+
+def _convert_message(msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one OpenAI-format message to ollama SDK-compatible format.
+
+    The ollama SDK's _copy_messages() runs each dict through:
+        {k: v for k, v in dict(msg).items() if v}  → Message.model_validate()
+
+    This means:
+    - Falsy values (empty string, None, empty list) are DROPPED before validation
+    - Message.tool_calls[].function.arguments must be dict, not JSON string
+    - Tool result messages use 'tool_name' (not 'name')
+    - Extra fields (tool_call_id, type, reasoning_content) are silently ignored
+    """
+    role = msg["role"]
+    content = msg.get("content") or None  # Normalize "" → None (SDK drops "" anyway)
+
+    entry: Dict[str, Any] = {"role": role}
+
+    # Only set content if non-empty (SDK drops falsy values anyway)
+    if content:
+        entry["content"] = content
+
+    if role == "assistant" and msg.get("tool_calls"):
+        tool_calls = []
+        for tc in msg["tool_calls"]:
+            func = tc.get("function", {})
+            name = func.get("name", "").strip()
+
+            # Skip dummy/placeholder tool calls from streaming gaps
+            if not name:
+                continue
+
+            args = func.get("arguments", {})
+            # SDK requires arguments as dict (Mapping[str, Any]), not JSON string
+            if isinstance(args, str):
+                try:
+                    args = json_codec.loads(args)
+                except (json.JSONDecodeError, ValueError):
+                    logger.warning(
+                        f"Malformed tool arguments for '{name}': "
+                        f"{args!r:.200} — replacing with empty dict"
+                    )
+                    args = {}
+            if not isinstance(args, dict):
+                args = {}
+
+            tool_calls.append({
+                "function": {
+                    "name": name,
+                    "arguments": args,
+                }
+            })
+
+        if tool_calls:
+            entry["tool_calls"] = tool_calls
+
+    elif role == "tool":
+        # SDK uses 'tool_name' not 'name' for tool result correlation
+        tool_name = msg.get("name") or msg.get("tool_name") or ""
+        if tool_name:
+            entry["tool_name"] = tool_name
+
+    return entry
+
+
+def _estimated_usage(
+    messages: List[Dict[str, Any]], content: str, thinking: str
+) -> Dict[str, int]:
+    """Usage of a stream stopped before its final chunk, at ~4 chars/token.
+
+    Marked ``estimated`` so consumers that calibrate against reported
+    counts can tell it apart.
+    """
+    prompt_chars = 0
+    for msg in messages:
+        prompt_chars += len(msg.get("content") or "")
+        if msg.get("tool_calls"):
+            prompt_chars += len(json_codec.dumps(msg["tool_calls"]))
+    prompt = prompt_chars // 4
+    completion = (len(content) + len(thinking)) // 4
+    return {
+        "total_tokens": prompt + completion,
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "estimated": True,
+    }
+
+
+_WIRE_CACHE: MessageWireCache[Dict[str, Any]] = MessageWireCache(_convert_message)
@@ -13,7 +13,9 @@ from abc import ABC
 from enum import Enum
 from typing import Any, ClassVar
 
+from ayder_cli.core.display_filter import DisplayTags, StreamingDisplayFilter
 from ayder_cli.providers.base import ToolCallDef
+from ayder_cli.providers.impl.ollama_drivers.incremental import IncrementalToolCallParser
 from ayder_cli.providers.impl.ollama_inspector import ModelInfo
 
 
@@ -31,6 +33,8 @@ class ChatDriver(ABC):
     abstract: ClassVar[bool] = False
     supports_families: ClassVar[tuple[str, ...]] = ()
     fallback_driver: ClassVar[str | None] = None
+    # Markup this family leaks into content; see core/display_filter.py.
+    display_tags: ClassVar[DisplayTags | None] = None
 
     @classmethod
     def supports(cls, model_info: ModelInfo) -> bool:
@@ -48,6 +52,20 @@ class ChatDriver(ABC):
         """Extract tool calls from model output for in-content drivers."""
         return []
 
-    def display_filter(self) -> Any:
+    def display_filter(self) -> StreamingDisplayFilter | None:
         """Return a fresh stateful display filter, or None when unused."""
-        return None
+        if self.display_tags is None:
+            return None
+        return StreamingDisplayFilter(self.display_tags)
+
+    def tool_call_parser(self) -> IncrementalToolCallParser | None:
+        """Return a fresh incremental tool-call parser, or None when unused.
+
+        IN_CONTENT drivers get one that feeds each completed block through
+        parse_tool_calls(), so a driver's format is handled by its existing
+        parser. The provider still runs parse_tool_calls() on the full output
+        when the incremental parser found nothing (e.g. calls in reasoning).
+        """
+        if self.mode is not DriverMode.IN_CONTENT:
+            return None
+        return IncrementalToolCallParser(lambda block: self.parse_tool_calls(block, ""))
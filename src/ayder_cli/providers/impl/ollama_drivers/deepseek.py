@@ -16,6 +16,8 @@ from __future__ import annotations
 import json
 from typing import Any
 
+from ayder_cli.core import json_codec
+from ayder_cli.core.display_filter import DEEPSEEK_DISPLAY_TAGS
 from ayder_cli.parser import content_processor
 from ayder_cli.providers.base import ToolCallDef
 from ayder_cli.providers.impl.ollama_drivers.base import ChatDriver, DriverMode
@@ -48,6 +50,7 @@ class DeepSeekDriver(ChatDriver):
     mode = DriverMode.IN_CONTENT
     priority = 50
     fallback_driver = "generic_xml"
+    display_tags = DEEPSEEK_DISPLAY_TAGS
     # Empty: not auto-claimed via supports(). Reachable only via explicit
     # matrix rule or driver-name override. See module docstring.
     supports_families = ()
@@ -83,7 +86,8 @@ class DeepSeekDriver(ChatDriver):
             ToolCallDef(
                 id=f"call_{i}",
                 name=call.get("name", "unknown"),
-                arguments=json.dumps(call.get("arguments", {}), ensure_ascii=False),
+                arguments=json_codec.dumps(call.get("arguments", {})),
+                index=i,
             )
             for i, call in enumerate(calls)
             if call.get("name")
@@ -7,6 +7,8 @@ from typing import Any
 
 from loguru import logger
 
+from ayder_cli.core import json_codec
+from ayder_cli.core.display_filter import XML_DISPLAY_TAGS
 from ayder_cli.parser import content_processor
 from ayder_cli.providers.base import ToolCallDef
 from ayder_cli.providers.impl.ollama_drivers.base import ChatDriver, DriverMode
@@ -38,6 +40,7 @@ class GenericXMLDriver(ChatDriver):
     mode = DriverMode.IN_CONTENT
     priority = 950
     fallback_driver = None
+    display_tags = XML_DISPLAY_TAGS
     supports_families = ()
 
     def render_tools_into_messages(
@@ -80,7 +83,8 @@ class GenericXMLDriver(ChatDriver):
             ToolCallDef(
                 id=f"call_{i}",
                 name=call.get("name", "unknown"),
-                arguments=json.dumps(call.get("arguments", {})),
+                arguments=json_codec.dumps(call.get("arguments", {})),
+                index=i,
             )
             for i, call in enumerate(calls)
         ]
@@ -0,0 +1,138 @@
+"""Incremental tool-call parser for IN_CONTENT drivers.
+
+Fed the streamed content one chunk at a time (like a display filter), it
+tracks whether the stream is inside a tool-call block and hands each block to
+the driver's own parser the moment its closing tag arrives. The provider can
+dispatch each ToolCallDef before the model finishes generating, and stop the
+stream once the model starts fabricating a tool-result block after a call.
+
+States:
+    OUTSIDE — scanning prose for a block opener; only a possible partial
+              opener (a trailing ``<...`` with no ``>``) is buffered.
+    INSIDE  — buffering one block and searching for its closing tag, resuming
+              each search where the previous one stopped.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable
+
+from ayder_cli.providers.base import ToolCallDef
+
+_DSML = r"(?:\uff5c\uff24\uff33\uff2d\uff2c\uff5c|\|DSML\|)?"
+
+# (opener, closer) pairs, tried in order at each "<" outside a block.
+_BLOCK_TAGS: tuple[tuple[re.Pattern[str], re.Pattern[str]], ...] = (
+    (re.compile(r"<(?:\w+:)?tool_call>"), re.compile(r"</(?:\w+:)?tool_call>")),
+    (
+        re.compile(rf"<{_DSML}(?:function|tool)_calls\s*>"),
+        re.compile(rf"</{_DSML}(?:function|tool)_calls\s*>"),
+    ),
+    (re.compile(r"<function="), re.compile(r"</function>|</tool_call>")),
+    (re.compile(rf"<{_DSML}invoke\s"), re.compile(rf"</{_DSML}invoke>")),
+)
+# The model writing the system's reply itself: nothing after this is useful.
+_RESULT_OPENER = re.compile(r"<(?:\w+:)?tool_(?:results?|response)>")
+
+# Longest text that can still turn out to be an opener; a "<" followed by
+# this much text without a ">" is prose.
+_MAX_OPENER_LEN = 64
+# Longest closing tag; a failed closer search resumes this far back.
+_MAX_CLOSER_LEN = 32
+
+
+class IncrementalToolCallParser:
+    """Stateful per-stream tool-call extractor; create one per request.
+
+    ``parse_block`` turns one complete block into ToolCallDefs (drivers pass
+    their whole-content parser). Emitted calls are renumbered ``call_0``,
+    ``call_1``, … across the stream, matching the ids a single parse of the
+    full content would assign.
+    """
+
+    def __init__(self, parse_block: Callable[[str], list[ToolCallDef]]) -> None:
+        self._parse_block = parse_block
+        self._buf = ""
+        self._closer: re.Pattern[str] | None = None
+        self._scan_from = 0
+        self.emitted = 0
+        self.finished = False
+
+    def feed(self, text: str) -> list[ToolCallDef]:
+        """Consume one content chunk; return the tool calls it completed."""
+        if not text or self.finished:
+            return []
+        self._buf += text
+        calls: list[ToolCallDef] = []
+        while not self.finished:
+            if self._closer is None:
+                if not self._advance_outside():
+                    break
+            else:
+                block = self._take_block()
+                if block is None:
+                    break
+                calls.extend(self._emit(block))
+        return calls
+
+    def flush(self) -> list[ToolCallDef]:
+        """End of stream: parse a block whose closing tag never arrived.
+
+        The whole-content parsers accept some unterminated shapes (e.g. a
+        ``<tool_call>`` wrapper missing its closer around a complete
+        ``<function=…>…</function>``), so the leftover is offered to them.
+        """
+        if self._closer is None or self.finished:
+            return []
+        block, self._buf, self._closer = self._buf, "", None
+        return self._emit(block)
+
+    def _advance_outside(self) -> bool:
+        """Drop prose up to the next opener. False when more input is needed."""
+        buf = self._buf
+        start = buf.find("<")
+        while start != -1:
+            for opener, closer in _BLOCK_TAGS:
+                if opener.match(buf, start):
+                    self._buf = buf[start:]
+                    self._closer = closer
+                    self._scan_from = 0
+                    return True
+            if self.emitted and _RESULT_OPENER.match(buf, start):
+                self.finished = True
+                self._buf = ""
+                return False
+            tail = buf[start:start + _MAX_OPENER_LEN]
+            if ">" not in tail and len(tail) < _MAX_OPENER_LEN:
+                self._buf = buf[start:]  # possible opener split across chunks
+                return False
+            start = buf.find("<", start + 1)
+        self._buf = ""
+        return False
+
+    def _take_block(self) -> str | None:
+        """Cut the current block off the buffer once its closer has arrived."""
+        assert self._closer is not None
+        match = self._closer.search(self._buf, self._scan_from)
+        if match is None:
+            self._scan_from = max(0, len(self._buf) - _MAX_CLOSER_LEN)
+            return None
+        block = self._buf[: match.end()]
+        self._buf = self._buf[match.end():]
+        self._closer = None
+        return block
+
+    def _emit(self, block: str) -> list[ToolCallDef]:
+        calls = []
+        for call in self._parse_block(block):
+            calls.append(
+                ToolCallDef(
+                    id=f"call_{self.emitted}",
+                    name=call.name,
+                    arguments=call.arguments,
+                    index=self.emitted,
+                )
+            )
+            self.emitted += 1
+        return calls
@@ -5,6 +5,8 @@ from __future__ import annotations
 import json
 from typing import Any
 
+from ayder_cli.core import json_codec
+from ayder_cli.core.display_filter import MINIMAX_DISPLAY_TAGS
 from ayder_cli.parser import content_processor
 from ayder_cli.providers.base import ToolCallDef
 from ayder_cli.providers.impl.ollama_drivers.base import ChatDriver, DriverMode
@@ -33,6 +35,7 @@ class MiniMaxDriver(ChatDriver):
     mode = DriverMode.IN_CONTENT
     priority = 50
     fallback_driver = "generic_xml"
+    display_tags = MINIMAX_DISPLAY_TAGS
     # Dormant by default: the resolution matrix routes the minimax family to
     # generic_native (Ollama parses tool calls natively). This IN_CONTENT driver
     # stays available via explicit override / reactive fallback only, mirroring
@@ -70,7 +73,8 @@ class MiniMaxDriver(ChatDriver):
             ToolCallDef(
                 id=f"call_{i}",
                 name=call.get("name", "unknown"),
-                arguments=json.dumps(call.get("arguments", {}), ensure_ascii=False),
+                arguments=json_codec.dumps(call.get("arguments", {})),
+                index=i,
             )
             for i, call in enumerate(calls)
             if call.get("name")
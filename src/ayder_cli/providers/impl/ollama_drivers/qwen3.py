@@ -16,6 +16,8 @@ import json
 import re
 from typing import Any
 
+from ayder_cli.core import json_codec
+from ayder_cli.core.display_filter import QWEN3_DISPLAY_TAGS
 from ayder_cli.parser import content_processor
 from ayder_cli.providers.base import ToolCallDef
 from ayder_cli.providers.impl.ollama_drivers.base import ChatDriver, DriverMode
@@ -44,6 +46,7 @@ class Qwen3Driver(ChatDriver):
     mode = DriverMode.IN_CONTENT
     priority = 50
     fallback_driver = "generic_xml"
+    display_tags = QWEN3_DISPLAY_TAGS
     # Empty: not auto-claimed via supports(). Reachable only via explicit
     # matrix rule or driver-name override. See module docstring.
     supports_families = ()
@@ -87,7 +90,8 @@ class Qwen3Driver(ChatDriver):
             ToolCallDef(
                 id=f"call_{i}",
                 name=call["name"],
-                arguments=json.dumps(call["arguments"], ensure_ascii=False),
+                arguments=json_codec.dumps(call["arguments"]),
+                index=i,
             )
             for i, call in enumerate(calls)
         ]
@@ -98,7 +102,7 @@ class Qwen3Driver(ChatDriver):
         results: list[dict[str, Any]] = []
         for match in self._RE_TOOL_CALL_JSON.finditer(text):
             try:
-                obj = json.loads(match.group(1))
+                obj = json_codec.loads(match.group(1))
             except (json.JSONDecodeError, ValueError):
                 continue
             if not isinstance(obj, dict):
@@ -109,7 +113,7 @@ class Qwen3Driver(ChatDriver):
             arguments = obj.get("arguments", {})
             if isinstance(arguments, str):
                 try:
-                    arguments = json.loads(arguments)
+                    arguments = json_codec.loads(arguments)
                 except (json.JSONDecodeError, ValueError):
                     arguments = {}
             if not isinstance(arguments, dict):
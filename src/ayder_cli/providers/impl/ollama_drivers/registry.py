@@ -11,7 +11,9 @@ from loguru import logger
 from ayder_cli.providers.impl.ollama_drivers.base import ChatDriver
 from ayder_cli.providers.impl.ollama_drivers.matrix import RESOLUTION_MATRIX
 
-_SKIP_MODULES: frozenset[str] = frozenset({"base", "registry", "matrix", "_errors"})
+_SKIP_MODULES: frozenset[str] = frozenset(
+    {"base", "registry", "matrix", "_errors", "incremental"}
+)
 
 
 class DriverRegistry:
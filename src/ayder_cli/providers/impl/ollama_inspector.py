@@ -1,7 +1,9 @@
 """Ollama model introspection via native SDK.
 
 Wraps ollama.AsyncClient for /api/show and /api/ps calls.
-Used by OllamaContextManager to auto-detect context length and cache TTL.
+Used by OllamaContextManager to auto-detect context length and cache TTL,
+and by ModelResidencyManager to see which models are loaded and to preload
+them ahead of first use.
 Also exposes a probe_native_tool_calling() helper that empirically tests
 whether a given model returns clean msg.tool_calls (native works) or leaks
 XML/DSML markup into msg.content (needs IN_CONTENT driver).
@@ -31,6 +33,8 @@ class RuntimeState:
     active_context_length: int = 0
     expires_at: Optional[datetime] = None
     vram_used: int = 0
+    name: str = ""
+    size: int = 0
 
 
 @dataclass
@@ -196,9 +200,31 @@ class OllamaInspector:
         if not response.models:
             return RuntimeState()
 
-        model = response.models[0]
+        return self._runtime_state(response.models[0])
+
+    async def get_running_models(self) -> list[RuntimeState]:
+        """Call /api/ps and return the state of every loaded model."""
+        response = await self._client.ps()
+        return [self._runtime_state(m) for m in (response.models or [])]
+
+    async def preload_model(self, model: str, keep_alive: float | str = -1) -> int:
+        """Load `model` into memory without generating, via an empty /api/generate.
+
+        Returns the server-reported load duration in nanoseconds (0 when the
+        model was already resident).
+        """
+        response = await self._client.generate(model=model, keep_alive=keep_alive)
+        return int(getattr(response, "load_duration", 0) or 0)
+
+    @staticmethod
+    def _runtime_state(model: object) -> RuntimeState:
+        size_vram = getattr(model, "size_vram", 0)
+        size = getattr(model, "size", 0)
+        name = getattr(model, "model", None) or getattr(model, "name", None)
         return RuntimeState(
-            active_context_length=model.context_length or 0,
-            expires_at=model.expires_at,
-            vram_used=int(model.size_vram) if model.size_vram else 0,
+            active_context_length=getattr(model, "context_length", 0) or 0,
+            expires_at=getattr(model, "expires_at", None),
+            vram_used=int(size_vram) if size_vram else 0,
+            name=name if isinstance(name, str) else "",
+            size=int(size) if isinstance(size, int) else 0,
         )
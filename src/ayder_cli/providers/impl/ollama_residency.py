@@ -0,0 +1,161 @@
+"""Ollama model residency: preload models and track what is loaded.
+
+Ollama loads a model on its first request, so the first turn after startup,
+a /model switch, or an agent dispatched on a different model pays the full
+load (reported as ``load_ns``). ModelResidencyManager preloads models in the
+background, keeps a view of /api/ps (loaded models and their VRAM), and lets
+the agent registry hold a cold run back until its model is warm, so runs on
+already-resident models take free slots first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Iterable
+
+from loguru import logger
+
+from ayder_cli.providers.impl.ollama_inspector import OllamaInspector, RuntimeState
+
+DEFAULT_HOST = "http://localhost:11434"
+
+_managers: dict[str, "ModelResidencyManager"] = {}
+
+
+def ollama_host(base_url: str | None) -> str:
+    """Return the native Ollama host for a configured base_url (drops a legacy /v1)."""
+    host = base_url or DEFAULT_HOST
+    if host.rstrip("/").endswith("/v1"):
+        host = host.rstrip("/")[:-3]
+    return host
+
+
+def _model_key(model: str) -> str:
+    """Normalize a model name the way Ollama does: an untagged name is ':latest'."""
+    model = model.strip()
+    return model if ":" in model else f"{model}:latest"
+
+
+def _is_cloud(model: str) -> bool:
+    """Ollama ':cloud' models run remotely; there is nothing to load locally."""
+    return _model_key(model).rsplit(":", 1)[1].endswith("cloud")
+
+
+class ModelResidencyManager:
+    """Keeps models warm on one Ollama host.
+
+    One instance per host (see get_residency_manager) so the main session and
+    every agent share a single view of what is loaded and never preload the
+    same model twice concurrently.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        inspector: OllamaInspector | None = None,
+    ) -> None:
+        self.host = host
+        self._inspector = inspector or OllamaInspector(host=host)
+        self._resident: dict[str, RuntimeState] = {}
+        self._loading: dict[str, asyncio.Task[bool]] = {}
+        self._background: set[asyncio.Task[None]] = set()
+
+    @property
+    def vram_used(self) -> int:
+        """Total VRAM (bytes) held by loaded models as of the last refresh."""
+        return sum(state.vram_used for state in self._resident.values())
+
+    def resident_models(self) -> list[str]:
+        """Names of the models loaded as of the last refresh."""
+        return sorted(self._resident)
+
+    def is_resident(self, model: str) -> bool:
+        """True if `model` was loaded as of the last refresh."""
+        return bool(model) and _model_key(model) in self._resident
+
+    async def refresh(self) -> list[RuntimeState]:
+        """Re-read /api/ps. Keeps the previous view if Ollama is unreachable."""
+        try:
+            states = await self._inspector.get_running_models()
+        except Exception as e:  # noqa: BLE001 — residency is best-effort
+            logger.debug(f"Ollama /api/ps failed on {self.host}: {e}")
+            return list(self._resident.values())
+        self._resident = {_model_key(s.name): s for s in states if s.name}
+        return states
+
+    async def ensure_loaded(self, model: str) -> bool:
+        """Load `model` unless it is already resident. Returns True when warm.
+
+        Concurrent callers for the same model share one preload. The preload
+        runs in its own task, so cancelling a waiter does not abort the load.
+        """
+        if not model:
+            return False
+        if _is_cloud(model):
+            return True
+        key = _model_key(model)
+        task = self._loading.get(key)
+        if task is None:
+            await self.refresh()
+            if key in self._resident:
+                return True
+            task = self._loading.get(key)
+            if task is None:
+                task = asyncio.create_task(self._load(model))
+                self._loading[key] = task
+                task.add_done_callback(lambda _t, k=key: self._loading.pop(k, None))
+        return await asyncio.shield(task)
+
+    async def wait_until_resident(self, model: str, timeout: float) -> bool:
+        """ensure_loaded() bounded by `timeout` seconds; False on timeout or failure."""
+        try:
+            return await asyncio.wait_for(self.ensure_loaded(model), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.info(f"Ollama model {model!r} still loading after {timeout:.0f}s")
+            return False
+
+    async def warm(self, models: Iterable[str]) -> None:
+        """Preload `models` one at a time, in order.
+
+        Loads are sequential so they do not compete for VRAM. Ollama evicts the
+        least recently used model under memory pressure, so callers should list
+        the model they need most (the main session model) last.
+        """
+        for model in dict.fromkeys(m for m in models if m):
+            await self.ensure_loaded(model)
+
+    def warm_in_background(self, models: Iterable[str]) -> asyncio.Task[None] | None:
+        """Schedule warm() on the running loop; returns None when no loop is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        task = loop.create_task(self.warm(list(models)))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def _load(self, model: str) -> bool:
+        try:
+            load_ns = await self._inspector.preload_model(model)
+        except Exception as e:  # noqa: BLE001 — a failed preload just means a cold first call
+            logger.warning(f"Failed to preload Ollama model {model!r}: {e}")
+            return False
+        await self.refresh()
+        if _model_key(model) not in self._resident:
+            # /api/ps unavailable or slow to reflect the load; trust the preload.
+            self._resident[_model_key(model)] = RuntimeState(name=_model_key(model))
+        logger.info(
+            f"Ollama model {model!r} resident (load {load_ns / 1e9:.1f}s, "
+            f"{len(self._resident)} loaded, {self.vram_used / 2**30:.1f} GiB VRAM)"
+        )
+        return True
+
+
+def get_residency_manager(host: str) -> ModelResidencyManager:
+    """Return the process-wide ModelResidencyManager for `host`."""
+    manager = _managers.get(host)
+    if manager is None:
+        manager = ModelResidencyManager(host=host)
+        _managers[host] = manager
+    return manager
@@ -12,6 +12,12 @@ from ayder_cli.providers.base import (
     NormalizedStreamChunk,
     ToolCallDef,
 )
+from ayder_cli.providers.governor import observe_rate_limit_headers
+
+
+# "off" has no equivalent accepted by every reasoning model; the parameter is
+# left out for it.
+_REASONING_EFFORTS = {"low": "low", "medium": "medium", "high": "high"}
 
 
 class OpenAIProvider(AIProvider):
@@ -22,6 +28,12 @@ class OpenAIProvider(AIProvider):
     # still expect the legacy name can override this to "max_tokens".
     MAX_TOKENS_PARAM = "max_completion_tokens"
 
+    # Per-turn reasoning effort from the chat loop's reasoning budget, sent
+    # only for profiles with ``supports_reasoning_effort``: non-reasoning
+    # models and many OpenAI-compatible servers reject the parameter.
+    # Subclasses for APIs that never accept it set this to None.
+    REASONING_EFFORT_PARAM: Optional[str] = "reasoning_effort"
+
     def __init__(self, config: Config, interaction_sink=None):
         self.config = config
         self.interaction_sink = interaction_sink
@@ -64,6 +76,7 @@ class OpenAIProvider(AIProvider):
                 kwargs["stop"] = stop
             if max_tokens := options.get("max_output_tokens"):
                 kwargs[self.MAX_TOKENS_PARAM] = max_tokens
+            kwargs.update(self._reasoning_kwargs(options))
             extra = self._build_extra_body(options)
             if extra:
                 kwargs["extra_body"] = extra
@@ -88,12 +101,13 @@ class OpenAIProvider(AIProvider):
         reasoning = getattr(msg, "reasoning_content", "") or getattr(msg, "reasoning", "") or ""
         tool_calls = []
         if msg.tool_calls:
-            for tc in msg.tool_calls:
+            for i, tc in enumerate(msg.tool_calls):
                 tool_calls.append(
                     ToolCallDef(
                         id=tc.id,
                         name=tc.function.name,
-                        arguments=tc.function.arguments
+                        arguments=tc.function.arguments,
+                        index=i,
                     )
                 )
         usage = {"total_tokens": response.usage.total_tokens} if response.usage else None
@@ -132,6 +146,7 @@ class OpenAIProvider(AIProvider):
                 kwargs["stop"] = stop
             if max_tokens := options.get("max_output_tokens"):
                 kwargs[self.MAX_TOKENS_PARAM] = max_tokens
+            kwargs.update(self._reasoning_kwargs(options))
             extra = self._build_extra_body(options)
             if extra:
                 kwargs["extra_body"] = extra
@@ -144,6 +159,10 @@ class OpenAIProvider(AIProvider):
         try:
             logger.debug(f"Stream kwargs: {', '.join(f'{k}={v!r}' for k, v in kwargs.items() if k != 'messages')}")
             async_stream = await self.client.chat.completions.create(**kwargs)
+            observe_rate_limit_headers(
+                (self.config.driver, self.config.base_url or ""),
+                getattr(getattr(async_stream, "response", None), "headers", None),
+            )
 
             chunk_count = 0
             async for chunk in async_stream:
@@ -160,6 +179,15 @@ class OpenAIProvider(AIProvider):
             logger.error(f"OpenAI streaming failed: {e}")
             raise
 
+    def _reasoning_kwargs(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """The reasoning-effort parameter for this request, if it is sent."""
+        effort = _REASONING_EFFORTS.get(options.get("reasoning_effort"))
+        if effort is None or not self.REASONING_EFFORT_PARAM:
+            return {}
+        if getattr(self.config, "supports_reasoning_effort", False) is not True:
+            return {}
+        return {self.REASONING_EFFORT_PARAM: effort}
+
     def _build_extra_body(self, options: Dict[str, Any]) -> Dict[str, Any] | None:
         """Build extra_body dict for provider-specific options. Override in subclasses."""
         return None
@@ -202,17 +230,16 @@ class OpenAIProvider(AIProvider):
                     name = getattr(func, "name", "") or ""
                     args = getattr(func, "arguments", "") or ""
                     
-                    # We pass the index back as an ID if none is provided yet,
-                    # so the ChatLoop buffer can stitch streaming arguments together
+                    # Placeholder id until the real one arrives; ChatLoop
+                    # stitches the deltas together by index
                     tool_calls.append(
                         ToolCallDef(
                             id=call_id or f"idx_{call_index}", 
                             name=name, 
                             arguments=args,
+                            index=call_index,
                         )
                     )
-                    # We dynamically patch the index onto the definition object for the accumulator
-                    setattr(tool_calls[-1], "_stream_index", call_index)
 
         return NormalizedStreamChunk(
             content=content,
@@ -87,12 +87,13 @@ class QwenNativeProvider(AIProvider):
         
         raw_calls = msg.get("tool_calls", [])
         if raw_calls:
-            for tc in raw_calls:
+            for i, tc in enumerate(raw_calls):
                 tool_calls.append(
                     ToolCallDef(
                         id=tc.get("id", ""),
                         name=tc["function"]["name"],
-                        arguments=tc["function"]["arguments"]
+                        arguments=tc["function"]["arguments"],
+                        index=i,
                     )
                 )
         
@@ -111,11 +112,14 @@ class QwenNativeProvider(AIProvider):
         raw_calls = msg.get("tool_calls", [])
         if raw_calls:
             for tc in raw_calls:
+                # Incremental output: the index ties a call's fragments together
+                index = tc.get("index")
                 tool_calls.append(
                     ToolCallDef(
                         id=tc.get("id", ""),
                         name=tc["function"].get("name", ""),
-                        arguments=tc["function"].get("arguments", "")
+                        arguments=tc["function"].get("arguments", ""),
+                        index=index if isinstance(index, int) else None,
                     )
                 )
                 
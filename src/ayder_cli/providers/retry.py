@@ -140,8 +140,37 @@ class RetryingProvider(AIProvider):
     async def list_models(self) -> List[str]:
         return await self._inner.list_models()
 
+    async def prewarm(self, *args, **kwargs) -> None:
+        await self._inner.prewarm(*args, **kwargs)
+
     async def chat(self, *args, **kwargs) -> NormalizedStreamChunk:
-        return await self._inner.chat(*args, **kwargs)
+        """Non-streaming call: the whole response is one attempt, so any
+        retryable failure is retried (there is nothing committed to protect)."""
+        if not self._retry.enabled:
+            return await self._inner.chat(*args, **kwargs)
+        for attempt in range(self._retry.max_attempts):
+            try:
+                return await self._inner.chat(*args, **kwargs)
+            except Exception as exc:  # noqa: BLE001 — we re-classify below
+                verdict = classify_error(exc, self._retry.retry_on_names)
+                remaining = self._retry.max_attempts - attempt - 1
+                if verdict is RetryVerdict.FATAL or remaining <= 0:
+                    raise
+                delay = compute_delay(self._retry, attempt)
+                logger.info(
+                    f"Provider chat failed ({type(exc).__name__}: {exc}); "
+                    f"retrying in {delay:.2f}s ({remaining} attempts left)"
+                )
+                await self._sleep(delay)
+                self._reconnected()
+        raise AssertionError("unreachable: max_attempts is positive")
+
+    def _reconnected(self) -> None:
+        if self._on_reconnect is not None:
+            try:
+                self._on_reconnect()
+            except Exception as hook_exc:  # noqa: BLE001
+                logger.debug(f"on_reconnect hook raised: {hook_exc}")
 
     async def stream_with_tools(
         self,
@@ -200,11 +229,7 @@ class RetryingProvider(AIProvider):
                     f"({remaining} attempts left)"
                 )
                 await self._sleep(delay)
-                if self._on_reconnect is not None:
-                    try:
-                        self._on_reconnect()
-                    except Exception as hook_exc:  # noqa: BLE001
-                        logger.debug(f"on_reconnect hook raised: {hook_exc}")
+                self._reconnected()
                 continue
 
             except BaseException as exc:  # noqa: BLE001 — we re-classify below
@@ -227,11 +252,7 @@ class RetryingProvider(AIProvider):
                     f"retrying in {delay:.2f}s ({remaining} attempts left)"
                 )
                 await self._sleep(delay)
-                if self._on_reconnect is not None:
-                    try:
-                        self._on_reconnect()
-                    except Exception as hook_exc:  # noqa: BLE001
-                        logger.debug(f"on_reconnect hook raised: {hook_exc}")
+                self._reconnected()
                 continue
 
         if last_error is not None:
@@ -0,0 +1,79 @@
+"""Memoized per-message conversion to a provider's wire format.
+
+Ollama, Claude and Gemini rebuild the whole history into their native shape
+on every turn, re-parsing each historical tool-call argument string. Past
+messages never change, so MessageWireCache keeps each message's converted
+form and only messages added (or edited) since the last turn are converted.
+
+The key is the message's content, not its identity: context managers hand
+the provider fresh dict copies each turn, but the copies share the same
+string objects, whose hashes Python caches — so keying a long history costs
+a few tuple operations per message. An in-place edit (compaction, tool
+result truncation) changes the key and the message is converted again.
+
+Converted values are shared between calls and must be treated as read-only.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DICT = object()  # marks a frozen dict so {"a": 1} and [("a", 1)] never collide
+
+
+def _freeze(value: Any) -> Hashable:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return (_DICT, tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    raise TypeError(f"unhashable message value: {type(value).__name__}")
+
+
+def message_key(message: Dict[str, Any]) -> Optional[Hashable]:
+    """Hashable snapshot of `message`, or None if it holds exotic values."""
+    try:
+        return _freeze(message)
+    except TypeError:
+        return None
+
+
+class MessageWireCache(Generic[T]):
+    """Bounded LRU of ``convert(message)`` results keyed by message content."""
+
+    def __init__(self, convert: Callable[[Dict[str, Any]], T], maxsize: int = 4096) -> None:
+        self._convert = convert
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, T] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def convert(self, message: Dict[str, Any]) -> T:
+        key = message_key(message)
+        if key is None:
+            return self._convert(message)
+        try:
+            value = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = self._convert(message)
+        self._entries[key] = value
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
@@ -15,6 +15,7 @@ from typing import Any
 
 from ayder_cli.core.context import ProjectContext
 from ayder_cli.core.result import ToolError, ToolSuccess
+from ayder_cli.providers.governor import governor_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -232,6 +233,7 @@ def _stats(project_ctx: ProjectContext, context_manager: Any) -> str:
         "cache_state": cache_state,
         "cache_hit_ratio": cache_hit_ratio,
         "saved_contexts_count": len(_current_slot_names(_get_context_dir(project_ctx))),
+        "rate_limits": governor_metrics(),
     }
     return ToolSuccess(json.dumps(payload, indent=2))
 
@@ -11,7 +11,7 @@ TOOL_DEFINITIONS: Tuple[ToolDefinition, ...] = (
         description=(
             "Session context. action=save snapshots state by name; "
             "load restores by name; list enumerates slots; "
-            "stats reports token + cache usage; "
+            "stats reports token, cache and rate-limit usage; "
             "clear auto-saves the caller-provided summary and deferred-wipes."
         ),
         description_template="Context action `{action}` will run",
@@ -3,6 +3,7 @@ Filesystem tools for ayder-cli.
 """
 
 import contextlib
+import io
 import json
 import logging
 import os
@@ -10,9 +11,14 @@ import re
 import difflib
 import tempfile
 import threading
+import time
+from collections import Counter
 
 from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.file_cache import file_cache
 from ayder_cli.core.result import ToolSuccess, ToolError
+from ayder_cli.tools.builtins import search_index
+from ayder_cli.tools.builtins.line_index import line_index_for
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +75,8 @@ def read_file(
             rel_path = project_ctx.to_relative(abs_path)
             return ToolError(f"Error: File '{rel_path}' does not exist.")
 
-        file_size = os.path.getsize(abs_path)
+        stat = abs_path.stat()
+        file_size = stat.st_size
         if file_size > MAX_FILE_SIZE:
             rel_path = project_ctx.to_relative(abs_path)
             return ToolError(
@@ -78,10 +85,18 @@ def read_file(
                 f"Maximum allowed size is {MAX_FILE_SIZE / (1024 * 1024):.0f}MB."
             )
 
-        with open(abs_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        total_lines = len(lines)
+        # Files small enough for the shared content cache are read whole (and
+        # stay cached for the edits that usually follow). Beyond that only the
+        # requested lines are read; the line index says where they start and
+        # how many lines there are in total.
+        index = None
+        if file_size > file_cache.max_entry_chars:
+            index = line_index_for(abs_path, stat)
+        if index is not None:
+            total_lines = index.line_count
+        else:
+            lines = file_cache.read_lines(abs_path, stat)
+            total_lines = len(lines)
         rel_path = str(project_ctx.to_relative(abs_path))
 
         explicit_range = start_line is not None or end_line is not None
@@ -95,7 +110,10 @@ def read_file(
 
         start_idx = max(0, start - 1)
         end_idx = min(total_lines, end)
-        selected = lines[start_idx:end_idx]
+        if index is not None:
+            selected = index.read_lines(start_idx, end_idx)
+        else:
+            selected = lines[start_idx:end_idx]
 
         body = "".join(f"{start + i}: {line}" for i, line in enumerate(selected))
 
@@ -216,13 +234,20 @@ def _finalize(
     except BaseException:
         with contextlib.suppress(OSError):
             os.unlink(tmp_name)
+        file_cache.invalidate(abs_path)
         raise
+    file_cache.store(abs_path, new_content)
+    search_index.note_write(abs_path)
     return ToolSuccess(success_msg)
 
 
 _HINT_MIN_RATIO = 0.6
 _HINT_MAX_FILE_CHARS = 1_000_000
 _HINT_MAX_PREVIEW_CHARS = 300
+# Wall-clock cap on the search; the best window found so far is used after it.
+_HINT_TIME_BUDGET = 0.25
+# Windows suggested by matching (whitespace-stripped) lines, scored first.
+_HINT_MAX_SEEDS = 32
 
 
 def _closest_match_hint(file_content: str, old_string: str) -> str:
@@ -231,41 +256,268 @@ def _closest_match_hint(file_content: str, old_string: str) -> str:
     Returns a hint naming the line and a repr() of the region (so tabs,
     trailing spaces, and other invisible mismatches become visible), or ''
     when nothing is similar enough to be worth suggesting.
+
+    The region is the window of as many lines as ``old_string`` with the
+    highest ``SequenceMatcher`` ratio (the first one on ties). Scoring every
+    window is quadratic in practice, so windows are visited best-first by an
+    upper bound on their ratio — from per-line character counts, O(1) per
+    window — after a few seeds found by matching stripped lines, and the
+    search stops once no remaining window can beat the best one.
     """
     if len(file_content) > _HINT_MAX_FILE_CHARS:
         return ""
     lines = file_content.splitlines()
     if not lines:
         return ""
-    window_size = max(1, len(old_string.splitlines()))
+    deadline = time.monotonic() + _HINT_TIME_BUDGET
+    target_lines = old_string.splitlines()
+    window_size = max(1, len(target_lines))
+    n_windows = max(1, len(lines) - window_size + 1)
+    target_len = len(old_string)
+    target_counts = Counter(old_string)
+    target_newlines = target_counts.get("\n", 0)
+
+    # Prefix sums of line lengths and of each line's character overlap with
+    # old_string (a window's overlap is at most the sum of its lines').
+    length_sums = [0]
+    overlap_sums = [0]
+    overlaps: dict[str, int] = {}  # source files repeat lines a lot
+    for line in lines:
+        length_sums.append(length_sums[-1] + len(line))
+        overlap = overlaps.get(line)
+        if overlap is None:
+            overlap = overlaps[line] = sum(
+                min(n, target_counts[c]) for c, n in Counter(line).items() if c in target_counts
+            )
+        overlap_sums.append(overlap_sums[-1] + overlap)
+
+    def bound(i: int) -> float:
+        j = min(i + window_size, len(lines))
+        joins = j - i - 1
+        window_len = length_sums[j] - length_sums[i] + joins
+        matches = min(
+            overlap_sums[j] - overlap_sums[i] + min(joins, target_newlines),
+            window_len,
+            target_len,
+        )
+        total = window_len + target_len
+        return 2.0 * matches / total if total else 1.0
+
     matcher = difflib.SequenceMatcher(autojunk=False)
     matcher.set_seq2(old_string)
     best_ratio = 0.0
-    best_line = 0
-    best_window = ""
-    for i in range(max(1, len(lines) - window_size + 1)):
-        window = "\n".join(lines[i : i + window_size])
-        matcher.set_seq1(window)
-        if (
-            matcher.real_quick_ratio() <= best_ratio
-            or matcher.quick_ratio() <= best_ratio
-        ):
-            continue
+    best_index = -1
+
+    def beaten(limit: float, i: int) -> bool:
+        """Whether a window whose ratio is at most ``limit`` cannot win."""
+        return limit < best_ratio or (limit == best_ratio and i > best_index)
+
+    def score(i: int) -> None:
+        nonlocal best_ratio, best_index
+        matcher.set_seq1("\n".join(lines[i : i + window_size]))
+        if beaten(matcher.quick_ratio(), i):
+            return
         ratio = matcher.ratio()
-        if ratio > best_ratio:
-            best_ratio, best_line, best_window = ratio, i + 1, window
-    if best_ratio < _HINT_MIN_RATIO:
+        if ratio > best_ratio or (ratio == best_ratio and i < best_index):
+            best_ratio, best_index = ratio, i
+
+    seeds = _hint_seeds(lines, target_lines, n_windows)
+    for i in seeds:
+        if not beaten(bound(i), i):
+            score(i)
+    candidates = [(ub, i) for i in range(n_windows) if not beaten(ub := bound(i), i)]
+    candidates.sort(key=lambda t: (-t[0], t[1]))
+    for ub, i in candidates:
+        if beaten(ub, i):
+            break
+        if time.monotonic() > deadline:
+            logger.debug("closest-match search hit its time budget")
+            break
+        if i not in seeds:
+            score(i)
+
+    if best_index < 0 or best_ratio < _HINT_MIN_RATIO:
         return ""
-    preview = repr(best_window)
+    preview = repr("\n".join(lines[best_index : best_index + window_size]))
     if len(preview) > _HINT_MAX_PREVIEW_CHARS:
         preview = preview[:_HINT_MAX_PREVIEW_CHARS] + "…"
     return (
-        f" Closest match at line {best_line} ({best_ratio:.0%} similar): "
+        f" Closest match at line {best_index + 1} ({best_ratio:.0%} similar): "
         f"{preview}. old_string must match the file byte-for-byte (repr shown: "
         f"\\t = tab). Retry with the exact text, or dry_run=true to preview."
     )
 
 
+def _hint_seeds(lines: list[str], target_lines: list[str], n_windows: int) -> list[int]:
+    """Window starts where most of old_string's lines match once stripped."""
+    wanted: dict[str, list[int]] = {}
+    for offset, line in enumerate(target_lines):
+        key = line.strip()
+        if key:
+            wanted.setdefault(key, []).append(offset)
+    votes: Counter = Counter()
+    for k, line in enumerate(lines):
+        for offset in wanted.get(line.strip(), ()):
+            if 0 <= k - offset < n_windows:
+                votes[k - offset] += 1
+    return [i for i, _ in votes.most_common(_HINT_MAX_SEEDS)]
+
+
+class _EditError(Exception):
+    """An edit that cannot be applied; nothing has been written."""
+
+    def __init__(self, message: str, category: str = "general") -> None:
+        super().__init__(message)
+        self.message = message
+        self.category = category
+
+
+_EDIT_OPERATIONS = ("replace", "insert", "delete")
+
+
+def _edit_params_error(
+    operation: str,
+    content: str | None,
+    old_string: str | None,
+    new_string: str | None,
+    line_number: int | None,
+) -> str | None:
+    """The missing-parameter message for a replace/insert/delete edit, if any."""
+    if operation == "replace" and (old_string is None or new_string is None):
+        return "'old_string' and 'new_string' are required for 'replace' operation."
+    if operation == "insert" and (line_number is None or content is None):
+        return "'line_number' and 'content' are required for 'insert' operation."
+    if operation == "delete" and line_number is None:
+        return "'line_number' is required for 'delete' operation."
+    return None
+
+
+def _apply_edit(
+    file_content: str,
+    rel_path,
+    operation: str,
+    content: str | None = None,
+    old_string: str | None = None,
+    new_string: str | None = None,
+    line_number: int | None = None,
+    replace_all: bool = False,
+    regex: bool = False,
+) -> tuple[str, str]:
+    """Apply one replace/insert/delete edit to *file_content* in memory.
+
+    Returns the new content and a short summary of the change; raises
+    ``_EditError`` when the edit does not apply.
+    """
+    if operation == "replace":
+        if regex:
+            try:
+                pattern = re.compile(old_string)
+            except re.error as e:
+                raise _EditError(f"Invalid regex pattern: {e}", "validation")
+            count = sum(1 for _ in pattern.finditer(file_content))
+        else:
+            count = file_content.count(old_string)
+        if count == 0:
+            hint = "" if regex else _closest_match_hint(file_content, old_string)
+            raise _EditError(f"'old_string' not found in {rel_path}. No changes made.{hint}")
+        if count > 1 and not replace_all:
+            raise _EditError(
+                f"'old_string' is not unique (found {count} matches) in {rel_path}. "
+                f"Pass replace_all=true to replace all occurrences, or add surrounding "
+                f"context to make it unique. No changes made.",
+                "validation",
+            )
+        if regex:
+            new_content = pattern.sub(new_string, file_content, count=0 if replace_all else 1)
+        else:
+            new_content = (
+                file_content.replace(old_string, new_string)
+                if replace_all
+                else file_content.replace(old_string, new_string, 1)
+            )
+        noun = "occurrence" if count == 1 else "occurrences"
+        return new_content, f"replaced {count} {noun} in {rel_path}"
+
+    lines = io.StringIO(file_content).readlines()
+    if operation == "insert":
+        if line_number < 1:
+            raise _EditError("line_number must be >= 1.", "validation")
+        idx = min(line_number - 1, len(lines))
+        ins = content
+        if ins and not ins.endswith("\n"):
+            ins += "\n"
+        return "".join(lines[:idx] + [ins] + lines[idx:]), f"inserted content at line {line_number} in {rel_path}"
+
+    if line_number < 1 or line_number > len(lines):
+        raise _EditError(
+            f"line_number {line_number} is out of range (1-{len(lines)}).", "validation"
+        )
+    preview = lines[line_number - 1].rstrip("\n")[:80]
+    new_content = "".join(lines[: line_number - 1] + lines[line_number:])
+    return new_content, f"deleted line {line_number} from {rel_path}: '{preview}'"
+
+
+def apply_edits(file_content: str, rel_path, edits: list[dict]) -> tuple[str, list[str]]:
+    """Apply an ordered list of replace/insert/delete edits in memory.
+
+    Each edit sees the content left by the ones before it (so its
+    line_number counts lines after earlier inserts/deletes). Returns the new
+    content and one summary line per edit; raises ``_EditError`` naming the
+    first edit that does not apply.
+    """
+    total = len(edits)
+    summaries = []
+    for number, edit in enumerate(edits, 1):
+        op = edit.get("operation", "replace")
+        line_number = edit.get("line_number")
+        try:
+            # The argument validator coerces top-level integers only.
+            if isinstance(line_number, str):
+                try:
+                    line_number = int(line_number)
+                except ValueError:
+                    raise _EditError(
+                        f"line_number must be an integer, got {line_number!r}.", "validation"
+                    ) from None
+            file_content, summary = _apply_edit(
+                file_content, rel_path, op,
+                content=edit.get("content"),
+                old_string=edit.get("old_string"),
+                new_string=edit.get("new_string"),
+                line_number=line_number,
+                replace_all=bool(edit.get("replace_all", False)),
+                regex=bool(edit.get("regex", False)),
+            )
+        except _EditError as e:
+            raise _EditError(
+                f"edit {number} of {total} ({op}) failed, nothing was written: {e.message}",
+                e.category,
+            ) from None
+        summaries.append(f"  {number}. {summary}")
+    return file_content, summaries
+
+
+def _edits_error(edits) -> str | None:
+    """Why *edits* is not a usable multi_edit list, if it is not."""
+    if not isinstance(edits, list) or not edits:
+        return "'edits' (a non-empty list) is required for 'multi_edit' operation."
+    total = len(edits)
+    for number, edit in enumerate(edits, 1):
+        op = edit.get("operation", "replace") if isinstance(edit, dict) else None
+        if op not in _EDIT_OPERATIONS:
+            return (
+                f"edit {number} of {total} must be an object with operation "
+                f"'replace', 'insert' or 'delete'."
+            )
+        missing = _edit_params_error(
+            op, edit.get("content"), edit.get("old_string"),
+            edit.get("new_string"), edit.get("line_number"),
+        )
+        if missing:
+            return f"edit {number} of {total}: {missing}"
+    return None
+
+
 def file_editor(
     project_ctx: ProjectContext,
     file_path: str,
@@ -277,6 +529,7 @@ def file_editor(
     replace_all: bool = False,
     regex: bool = False,
     dry_run: bool = False,
+    edits: list | None = None,
 ) -> str:
     """Modify files with specific operations."""
     try:
@@ -287,7 +540,7 @@ def file_editor(
             if operation == "write":
                 if content is None:
                     return ToolError("Error: 'content' parameter is required for 'write' operation.", "validation")
-                old_content = abs_path.read_text(encoding="utf-8") if abs_path.exists() else ""
+                old_content = file_cache.read_text(abs_path) if abs_path.exists() else ""
                 if not dry_run:
                     abs_path.parent.mkdir(parents=True, exist_ok=True)
                 return _finalize(
@@ -295,83 +548,53 @@ def file_editor(
                     f"Successfully wrote to {rel_path}", dry_run,
                 )
 
-            elif operation == "replace":
-                if old_string is None or new_string is None:
-                    return ToolError("Error: 'old_string' and 'new_string' are required for 'replace' operation.", "validation")
+            elif operation in _EDIT_OPERATIONS:
+                missing = _edit_params_error(operation, content, old_string, new_string, line_number)
+                if missing:
+                    return ToolError(f"Error: {missing}", "validation")
                 if not abs_path.exists():
                     return ToolError(f"Error: File '{rel_path}' does not exist.")
-                with open(abs_path, "r", encoding="utf-8") as f:
-                    file_content = f.read()
-                if regex:
-                    try:
-                        pattern = re.compile(old_string)
-                    except re.error as e:
-                        return ToolError(f"Invalid regex pattern: {e}", "validation")
-                    count = sum(1 for _ in pattern.finditer(file_content))
-                else:
-                    count = file_content.count(old_string)
-                if count == 0:
-                    hint = "" if regex else _closest_match_hint(file_content, old_string)
-                    return ToolError(
-                        f"Error: 'old_string' not found in {rel_path}. No changes made.{hint}"
-                    )
-                if count > 1 and not replace_all:
-                    return ToolError(
-                        f"Error: 'old_string' is not unique (found {count} matches) in {rel_path}. "
-                        f"Pass replace_all=true to replace all occurrences, or add surrounding "
-                        f"context to make it unique. No changes made.",
-                        "validation",
+                file_content = file_cache.read_text(abs_path)
+                try:
+                    new_content, summary = _apply_edit(
+                        file_content, rel_path, operation,
+                        content=content,
+                        old_string=old_string,
+                        new_string=new_string,
+                        line_number=line_number,
+                        replace_all=replace_all,
+                        regex=regex,
                     )
-                if regex:
-                    new_content = pattern.sub(new_string, file_content, count=0 if replace_all else 1)
+                except _EditError as e:
+                    return ToolError(f"Error: {e.message}", e.category)
+                if operation == "delete":
+                    message = summary[0].upper() + summary[1:]
                 else:
-                    new_content = (
-                        file_content.replace(old_string, new_string)
-                        if replace_all
-                        else file_content.replace(old_string, new_string, 1)
-                    )
-                noun = "occurrence" if count == 1 else "occurrences"
-                return _finalize(
-                    abs_path, rel_path, file_content, new_content,
-                    f"Successfully replaced {count} {noun} in {rel_path}", dry_run,
-                )
-
-            elif operation == "insert":
-                if line_number is None or content is None:
-                    return ToolError("Error: 'line_number' and 'content' are required for 'insert' operation.", "validation")
+                    message = f"Successfully {summary}"
+                return _finalize(abs_path, rel_path, file_content, new_content, message, dry_run)
+
+            elif operation == "multi_edit":
+                # One read, one write and one diff for the whole batch; if any
+                # edit does not apply, nothing is written.
+                if isinstance(edits, str):  # some models send the list as JSON text
+                    with contextlib.suppress(ValueError):
+                        edits = json.loads(edits)
+                invalid = _edits_error(edits)
+                if invalid:
+                    return ToolError(f"Error: {invalid} No changes made.", "validation")
                 if not abs_path.exists():
                     return ToolError(f"Error: File '{rel_path}' does not exist.")
-                with open(abs_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                if line_number < 1:
-                    return ToolError("Error: line_number must be >= 1.", "validation")
-                old_content = "".join(lines)
-                idx = min(line_number - 1, len(lines))
-                ins = content
-                if ins and not ins.endswith("\n"):
-                    ins += "\n"
-                new_content = "".join(lines[:idx] + [ins] + lines[idx:])
-                return _finalize(
-                    abs_path, rel_path, old_content, new_content,
-                    f"Successfully inserted content at line {line_number} in {rel_path}", dry_run,
-                )
-
-            elif operation == "delete":
-                if line_number is None:
-                    return ToolError("Error: 'line_number' is required for 'delete' operation.", "validation")
-                if not abs_path.exists():
-                    return ToolError(f"Error: File '{rel_path}' does not exist.")
-                with open(abs_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                if line_number < 1 or line_number > len(lines):
-                    return ToolError(f"Error: line_number {line_number} is out of range (1-{len(lines)}).", "validation")
-                old_content = "".join(lines)
-                deleted = lines[line_number - 1]
-                new_content = "".join(lines[: line_number - 1] + lines[line_number:])
-                preview = deleted.rstrip("\n")[:80]
+                file_content = file_cache.read_text(abs_path)
+                try:
+                    new_content, summaries = apply_edits(file_content, rel_path, edits)
+                except _EditError as e:
+                    return ToolError(f"Error: {e.message}", e.category)
                 return _finalize(
-                    abs_path, rel_path, old_content, new_content,
-                    f"Deleted line {line_number} from {rel_path}: '{preview}'", dry_run,
+                    abs_path, rel_path, file_content, new_content,
+                    f"Successfully applied {len(edits)} "
+                    f"{'edit' if len(edits) == 1 else 'edits'} to {rel_path}:\n"
+                    + "\n".join(summaries),
+                    dry_run,
                 )
 
             else:
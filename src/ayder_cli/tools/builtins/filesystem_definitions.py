@@ -88,8 +88,10 @@ TOOL_DEFINITIONS: Tuple[ToolDefinition, ...] = (
             "old_string matches inside a longer line and leaves the surrounding whitespace "
             "untouched, while an old_string containing whitespace the file lacks fails to "
             "match; unique by default, pass replace_all=true for multiple matches or "
-            "regex=true for pattern mode), 'insert' (add a line), and 'delete' (remove a "
-            "line). Pass dry_run=true on any operation to preview a unified diff without "
+            "regex=true for pattern mode), 'insert' (add a line), 'delete' (remove a "
+            "line), and 'multi_edit' (apply an ordered 'edits' list of replace/insert/"
+            "delete edits to one file in a single call; all-or-nothing: if any edit "
+            "fails, nothing is written). Pass dry_run=true on any operation to preview a unified diff without "
             "writing (recommended when whitespace is ambiguous)."
         ),
         description_template="File {file_path} will be modified ({operation})",
@@ -104,7 +106,7 @@ TOOL_DEFINITIONS: Tuple[ToolDefinition, ...] = (
                 },
                 "operation": {
                     "type": "string",
-                    "enum": ["write", "replace", "insert", "delete"],
+                    "enum": ["write", "replace", "insert", "delete", "multi_edit"],
                     "description": (
                         "The edit operation. insert: content becomes the new line N "
                         "(existing line N and below shift down); line_number past EOF appends."
@@ -138,6 +140,26 @@ TOOL_DEFINITIONS: Tuple[ToolDefinition, ...] = (
                     "type": "boolean",
                     "description": "Preview the change as a unified diff without writing. Works for all operations.",
                 },
+                "edits": {
+                    "type": "array",
+                    "description": (
+                        "For 'multi_edit': edits applied in order, each to the result of "
+                        "the previous one (line numbers count lines after earlier edits)."
+                    ),
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "operation": {"type": "string", "enum": ["replace", "insert", "delete"]},
+                            "old_string": {"type": "string"},
+                            "new_string": {"type": "string"},
+                            "replace_all": {"type": "boolean"},
+                            "regex": {"type": "boolean"},
+                            "content": {"type": "string"},
+                            "line_number": {"type": "integer"},
+                        },
+                        "required": ["operation"],
+                    },
+                },
             },
             "required": ["file_path", "operation"],
         },
@@ -0,0 +1,107 @@
+"""
+Line-offset index for paging through large text files.
+
+``read_file`` used to read and split a whole file to return one page of it.
+A LineIndex records where every line starts — built once with a newline scan
+over an ``mmap`` and cached per path until the file's mtime or size changes —
+so a ranged read seeks straight to the requested bytes and decodes only those
+lines.
+"""
+
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+
+# Indexed files kept; an index costs 8 bytes per line.
+_MAX_CACHED = 32
+
+_BARE_CR = re.compile(rb"\r(?!\n)")
+
+_CACHE: "OrderedDict[str, LineIndex]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+class LineIndex:
+    """Byte offsets of the lines of one file version.
+
+    Lines follow ``open(..., "r").readlines()``: split after each ``\\n``,
+    with ``\\r\\n`` read as ``\\n``.
+    """
+
+    def __init__(self, path: str, mtime_ns: int, size: int, offsets: array) -> None:
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self._offsets = offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets)
+
+    def read_lines(self, start: int, end: int, encoding: str = "utf-8") -> list[str]:
+        """Lines ``[start, end)`` (0-based), decoded, with their line endings."""
+        start = max(0, start)
+        end = min(end, self.line_count)
+        if start >= end:
+            return []
+        offsets = self._offsets
+        first = offsets[start]
+        last = offsets[end] if end < self.line_count else self.size
+        with open(self.path, "rb") as f:
+            f.seek(first)
+            data = f.read(last - first)
+        bounds = [offsets[i] - first for i in range(start, end)] + [last - first]
+        lines = []
+        for a, b in zip(bounds, bounds[1:]):
+            line = data[a:b].decode(encoding)
+            if line.endswith("\r\n"):
+                line = line[:-2] + "\n"
+            lines.append(line)
+        return lines
+
+
+def line_index_for(path, stat: os.stat_result | None = None) -> LineIndex | None:
+    """The cached index of ``path``, rebuilt when its mtime or size changed.
+
+    Returns None for files whose lines cannot be mapped to byte offsets this
+    way (a bare ``\\r`` line ending); callers fall back to reading the file.
+    """
+    key = str(path)
+    st = stat if stat is not None else os.stat(key)
+    with _CACHE_LOCK:
+        index = _CACHE.get(key)
+        if index is not None and (index.mtime_ns, index.size) == (st.st_mtime_ns, st.st_size):
+            _CACHE.move_to_end(key)
+            return index
+
+    offsets = _scan(key, st.st_size)
+    if offsets is None:
+        return None
+    index = LineIndex(key, st.st_mtime_ns, st.st_size, offsets)
+    with _CACHE_LOCK:
+        _CACHE[key] = index
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _MAX_CACHED:
+            _CACHE.popitem(last=False)
+    return index
+
+
+def _scan(path: str, size: int) -> array | None:
+    offsets = array("q")
+    if size == 0:
+        return offsets
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if _BARE_CR.search(mm):
+            return None
+        offsets.append(0)
+        find = mm.find
+        pos = find(b"\n")
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = find(b"\n", pos + 1)
+    if offsets[-1] == size:  # trailing newline: no empty last line
+        offsets.pop()
+    return offsets
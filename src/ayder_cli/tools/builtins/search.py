@@ -2,14 +2,20 @@
 Codebase search tools for ayder-cli.
 """
 
+import base64
 import logging
+import os
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
 from pathlib import Path
 
+from ayder_cli.core import gitignore, json_codec
 from ayder_cli.core.context import ProjectContext
 from ayder_cli.core.result import ToolSuccess, ToolError
+from ayder_cli.tools.builtins import search_engine, search_index
 
 logger = logging.getLogger(__name__)
 
@@ -26,17 +32,20 @@ _RG_IGNORE_GLOBS = (
     "!*.egg-info/",
     "!htmlcov/",
 )
-_GREP_EXCLUDE_DIRS = (
-    ".git",
-    "__pycache__",
-    ".venv",
-    ".ayder",
-    ".claude",
-    "dist",
-    "build",
-    "htmlcov",
+# The same exclusions for the built-in engine's walk.
+_BUILTIN_IGNORE_RULES = gitignore.IgnoreRules(
+    glob.removeprefix("!") for glob in _RG_IGNORE_GLOBS
 )
 
+_SEARCH_TIMEOUT = 60  # seconds
+
+# Past this many candidate files the index saves little; search the tree.
+_MAX_INDEXED_CANDIDATES = 1000
+
+# Seconds a search may spend re-indexing changed files; past it the index
+# catches up in the background and this search runs without it.
+_INDEX_BUDGET = 1.0
+
 _TRUNCATION_HINT = (
     "Use output_format='count' for the true total, "
     "or narrow the search with file_pattern."
@@ -54,7 +63,8 @@ def search_codebase(
     output_format: str = "full",
 ) -> str:
     """
-    Search for a pattern across the codebase using ripgrep (or grep fallback).
+    Search for a pattern across the codebase using ripgrep, or the built-in
+    engine when rg is not installed.
     Returns matching lines with file paths and line numbers.
     The 'directory' scope may be a directory or a single file.
     Supports output_format: 'full' (default), 'files_only', 'count', 'locations'.
@@ -76,6 +86,11 @@ def search_codebase(
             )
 
         if shutil.which("rg"):
+            candidates = None
+            if getattr(project_ctx, "search_index", False) and not target_is_file:
+                candidates = _indexed_candidates(
+                    pattern, file_pattern, case_sensitive, abs_target, project_ctx
+                )
             return _search_with_ripgrep(
                 pattern,
                 file_pattern,
@@ -86,9 +101,10 @@ def search_codebase(
                 project_ctx,
                 output_format,
                 target_is_file=target_is_file,
+                candidates=candidates,
             )
         else:
-            return _search_with_grep(
+            return _search_with_builtin(
                 pattern,
                 file_pattern,
                 case_sensitive,
@@ -105,6 +121,64 @@ def search_codebase(
         return ToolError(f"Error during search: {str(e)}", "execution")
 
 
+def _normalize_file_pattern(file_pattern):
+    """file_pattern as an rg glob.
+
+    rg matches globs against the full path under the (absolute) search
+    root, so a bare 'src/core.py' would never match. '**/' makes path globs
+    suffix-anchored, which is what "search this file" means here.
+    """
+    if "/" in file_pattern and not file_pattern.startswith(("**/", "/", "!")):
+        return f"**/{file_pattern}"
+    return file_pattern
+
+
+def _rg_glob_args(file_pattern):
+    """rg --glob arguments for file_pattern plus the standard exclusions."""
+    args = []
+    if file_pattern:
+        args.extend(["--glob", _normalize_file_pattern(file_pattern)])
+    for ignore in _RG_IGNORE_GLOBS:
+        args.extend(["--glob", ignore])
+    return args
+
+
+def _indexed_candidates(pattern, file_pattern, case_sensitive, abs_directory, project_ctx):
+    """Files under abs_directory that may match, per the trigram index.
+
+    Returns None — search the directory as usual — when the pattern has no
+    indexable literal, the index is still being built, the candidates are
+    too many to be worth listing, or anything about the index fails.
+    """
+    query = search_index.query_for(pattern, ignore_case=not case_sensitive)
+    if query is None:
+        return None
+    try:
+        cmd = [shutil.which("rg"), "--files", "--no-messages"]
+        cmd.extend(_rg_glob_args(file_pattern))
+        cmd.append(str(abs_directory))
+        result = subprocess.run(
+            cmd, capture_output=True, text=True, timeout=_SEARCH_TIMEOUT
+        )
+        if result.returncode not in (0, 1):
+            return None
+        paths = [line for line in result.stdout.split("\n") if line]
+        index = search_index.index_for(project_ctx.root)
+        whole_tree = abs_directory == project_ctx.root and not file_pattern
+        candidates = index.candidates(
+            paths, query, prune=whole_tree, budget=_INDEX_BUDGET
+        )
+        if candidates is None:
+            return None
+        index.save()
+    except Exception as e:
+        logger.debug(f"Search index unavailable, searching the tree: {e}")
+        return None
+    if len(candidates) > _MAX_INDEXED_CANDIDATES:
+        return None
+    return candidates
+
+
 def _search_with_ripgrep(
     pattern,
     file_pattern,
@@ -115,8 +189,15 @@ def _search_with_ripgrep(
     project_ctx,
     output_format="full",
     target_is_file=False,
+    candidates=None,
 ):
-    """Implementation using ripgrep."""
+    """Implementation using ripgrep.
+
+    candidates, when given, replaces abs_directory with the explicit files
+    the search index narrowed it to.
+    """
+    if candidates is not None and not candidates:
+        return ToolSuccess(_no_matches_message(pattern))
     cmd = [shutil.which("rg"), "--color", "never", "--no-messages"]
 
     if output_format == "files_only":
@@ -125,50 +206,49 @@ def _search_with_ripgrep(
         # --with-filename keeps 'path:count' shape for single-file targets.
         cmd.extend(["--count", "--with-filename"])
     else:  # full, locations
-        # One extra match lets the formatter tell "exactly max_results"
-        # from "more were available" and say so instead of lying.
-        cmd.extend(["--line-number", "--heading", "--max-count", str(max_results + 1)])
+        # Streamed and cut off once enough matches are in; see
+        # _stream_rg_matches. --max-count bounds the work inside one file.
+        cmd.extend(["--json", "--max-count", str(max_results + 1)])
 
     if not case_sensitive:
         cmd.append("--ignore-case")
     if context_lines > 0 and output_format == "full":
         cmd.extend(["--context", str(context_lines)])
-    if file_pattern:
-        # rg matches globs against the full path under the (absolute) search
-        # root, so a bare 'src/core.py' would never match. '**/' makes path
-        # globs suffix-anchored, which is what "search this file" means here.
-        if "/" in file_pattern and not file_pattern.startswith(("**/", "/", "!")):
-            file_pattern = f"**/{file_pattern}"
-        cmd.extend(["--glob", file_pattern])
-
-    for ignore in _RG_IGNORE_GLOBS:
-        cmd.extend(["--glob", ignore])
+    cmd.extend(_rg_glob_args(file_pattern))
 
     # -e keeps patterns that start with '-' (e.g. '-> str') from being
     # parsed as flags.
-    cmd.extend(["-e", pattern, str(abs_directory)])
+    cmd.extend(["-e", pattern])
+    if candidates is not None:
+        cmd.extend(candidates)
+    else:
+        cmd.append(str(abs_directory))
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0:
+        if output_format in ("files_only", "count"):
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=_SEARCH_TIMEOUT
+            )
+            returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+        else:
+            files, returncode, stderr = _stream_rg_matches(
+                cmd,
+                max_results + 1,
+                separators=context_lines > 0 and output_format == "full",
+            )
+        if returncode == 0:
             if output_format == "files_only":
-                return ToolSuccess(
-                    _format_files_only(result.stdout, pattern, project_ctx)
-                )
+                return ToolSuccess(_format_files_only(stdout, pattern, project_ctx))
             if output_format == "count":
                 known = (
                     project_ctx.to_relative(abs_directory) if target_is_file else None
                 )
                 return ToolSuccess(
                     _format_count_results(
-                        result.stdout, pattern, project_ctx, known_file=known
+                        stdout, pattern, project_ctx, known_file=known
                     )
                 )
-            # rg omits the filename heading when given one explicit file, so
-            # tell the parser what it searched.
-            known = project_ctx.to_relative(abs_directory) if target_is_file else None
-            files = _parse_rg_heading_output(result.stdout, known_file=known)
-            # The per-file --max-count cap means totals are a floor, not exact.
+            # Collection stops at max_results + 1, so totals are a floor.
             if output_format == "locations":
                 return ToolSuccess(
                     _render_locations(
@@ -180,20 +260,91 @@ def _search_with_ripgrep(
                     files, pattern, max_results, project_ctx, approximate=True
                 )
             )
-        elif result.returncode == 1:
+        elif returncode == 1:
             return ToolSuccess(_no_matches_message(pattern))
         else:
             return ToolError(
-                f"Error: ripgrep failed with exit code {result.returncode}\n{result.stderr}",
+                f"Error: ripgrep failed with exit code {returncode}\n{stderr}",
                 "execution",
             )
     except subprocess.TimeoutExpired:
-        return ToolError("Error: Search timed out after 60 seconds.", "execution")
+        return ToolError(
+            f"Error: Search timed out after {_SEARCH_TIMEOUT} seconds.", "execution"
+        )
     except Exception as e:
         return ToolError(f"Error executing ripgrep: {str(e)}", "execution")
 
 
-def _search_with_grep(
+def _stream_rg_matches(cmd, limit, separators=False):
+    """Run an `rg --json` command, collecting matches until `limit` are in.
+
+    rg's events are read as they arrive and rg is killed as soon as the
+    limit is reached, so a broad pattern costs `limit` matches of output,
+    not the whole tree's. Returns (files, returncode, stderr) with files as
+    [(file_path, entries)], each entry (line_no, kind, text) with kind in
+    'match' | 'context' | 'separator'; the returncode is 0 when collection
+    stopped at the limit. With separators, a 'separator' entry marks each
+    gap between context groups, where rg's text output prints '--'.
+    """
+    files = []
+    entries = None
+    last_line = None
+    matches = 0
+    timed_out = threading.Event()
+
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err)
+
+        def expire():
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(_SEARCH_TIMEOUT, expire)
+        watchdog.start()
+        try:
+            for raw in proc.stdout:
+                event = json_codec.loads(raw)
+                kind = event.get("type")
+                if kind == "begin":
+                    entries = []
+                    files.append((_rg_text(event["data"]["path"]), entries))
+                    last_line = None
+                elif kind in ("match", "context") and entries is not None:
+                    data = event["data"]
+                    line_no = data["line_number"]
+                    if separators and last_line is not None and line_no > last_line + 1:
+                        entries.append((None, "separator", ""))
+                    last_line = line_no
+                    text = _rg_text(data["lines"]).rstrip("\n").rstrip("\r")
+                    entries.append((str(line_no), kind, text))
+                    if kind == "match":
+                        matches += 1
+                        if matches >= limit:
+                            break
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, _SEARCH_TIMEOUT)
+        err.seek(0)
+        stderr = err.read().decode("utf-8", "replace")
+
+    returncode = 0 if matches >= limit else proc.returncode
+    return files, returncode, stderr
+
+
+def _rg_text(value):
+    """Text of an rg --json data object: 'text', or base64 'bytes' for
+    content that is not valid UTF-8."""
+    if "text" in value:
+        return value["text"]
+    return base64.b64decode(value["bytes"]).decode("utf-8", "replace")
+
+
+def _search_with_builtin(
     pattern,
     file_pattern,
     case_sensitive,
@@ -204,168 +355,86 @@ def _search_with_grep(
     output_format="full",
     target_is_file=False,
 ):
-    """Fallback implementation using grep."""
-    notes = []
-    # -H forces 'path:...' prefixes even for single-file targets.
-    cmd = ["grep", "-r", "-E", "-H"]
+    """Fallback implementation using the built-in engine (search_engine.py).
 
+    Python's re stands in for rg's regex syntax; the two agree on the
+    patterns this tool is normally given.
+    """
     if output_format == "files_only":
-        cmd.append("-l")
+        mode = search_engine.FILES
     elif output_format == "count":
-        cmd.append("-c")
+        mode = search_engine.COUNT
     else:  # full, locations
-        cmd.append("-n")
-
-    if not case_sensitive:
-        cmd.append("-i")
-    if context_lines > 0 and output_format == "full":
-        cmd.extend(["-C", str(context_lines)])
-
-    if file_pattern:
-        # grep's --include has no path-glob support; degrade loudly, not silently.
-        include_pattern = file_pattern.split("/")[-1]
-        if "/" in file_pattern:
-            notes.append(
-                f"Note: grep fallback approximates the path glob '{file_pattern}' "
-                f"to basename '{include_pattern}' (matches that name in any "
-                f"directory)."
-            )
-        # --include must precede the --exclude options: GNU grep >= 3.6
-        # searches glob-unmatched files unless the FIRST filter option is an
-        # --include, so exclude-first ordering disables the filter entirely.
-        cmd.extend(["--include", include_pattern])
-
-    for exclude_dir in _GREP_EXCLUDE_DIRS:
-        cmd.append(f"--exclude-dir={exclude_dir}")
-    cmd.append("--exclude=*.pyc")
-
-    # -e keeps patterns that start with '-' from being parsed as flags.
-    cmd.extend(["-e", pattern, str(abs_directory)])
+        mode = search_engine.LINES
+    if target_is_file:
+        paths = [str(abs_directory)]
+    else:
+        paths = _builtin_files(abs_directory, file_pattern, project_ctx)
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0:
-            if output_format == "files_only":
-                return ToolSuccess(
-                    _format_files_only(result.stdout, pattern, project_ctx, notes)
-                )
-            if output_format == "count":
-                return ToolSuccess(
-                    _format_count_results(result.stdout, pattern, project_ctx, notes)
-                )
-            files = _parse_grep_output(
-                result.stdout, abs_target=abs_directory, target_is_file=target_is_file
-            )
-            if output_format == "locations":
-                return ToolSuccess(
-                    _render_locations(
-                        files, pattern, max_results, project_ctx, notes=notes
-                    )
-                )
-            return ToolSuccess(
-                _render_full(files, pattern, max_results, project_ctx, notes=notes)
-            )
-        elif result.returncode == 1:
-            return ToolSuccess(_no_matches_message(pattern, notes))
-        else:
-            return ToolError(
-                f"Error: grep failed with exit code {result.returncode}\n{result.stderr}",
-                "execution",
-            )
-    except subprocess.TimeoutExpired:
-        return ToolError("Error: Search timed out after 60 seconds.", "execution")
+        results, complete = search_engine.search(
+            paths,
+            pattern,
+            flags=0 if case_sensitive else re.IGNORECASE,
+            mode=mode,
+            context_lines=context_lines if output_format == "full" else 0,
+            limit=max_results + 1,
+            timeout=_SEARCH_TIMEOUT,
+        )
+    except re.error as e:
+        return ToolError(f"Error: invalid search pattern: {e}", "validation")
+    except TimeoutError:
+        return ToolError(
+            f"Error: Search timed out after {_SEARCH_TIMEOUT} seconds.", "execution"
+        )
     except Exception as e:
-        return ToolError(f"Error executing grep: {str(e)}", "execution")
-
-
-def _parse_rg_heading_output(raw_output, known_file=None):
-    """Parse rg --heading output into [(file_path, entries)].
+        return ToolError(f"Error executing search: {str(e)}", "execution")
 
-    Each entry is (line_no, kind, text) with kind in 'match' | 'context' |
-    'separator'. In heading mode a block starts with the file path and blank
-    lines separate blocks, so headers are identified by position — never by
-    guessing from content (which broke on context lines like '294-' and on
-    '--' group separators). known_file covers single-file targets, where rg
-    omits the heading entirely.
-    """
-    files = []
-    entries = None
-    in_block = False
-    if known_file is not None:
-        entries = []
-        files.append((known_file, entries))
-        in_block = True
-
-    for line in raw_output.split("\n"):
-        if line == "":
-            if known_file is None:
-                in_block = False
-            continue
-        if not in_block:
-            entries = []
-            files.append((line, entries))
-            in_block = True
-            continue
-        if line == "--":
-            entries.append((None, "separator", ""))
-            continue
-        m = re.match(r"^(\d+)([:-])(.*)$", line)
-        if m:
-            kind = "match" if m.group(2) == ":" else "context"
-            entries.append((m.group(1), kind, m.group(3)))
-        else:
-            # Unexpected shape inside a block; keep it visible rather than drop it.
-            entries.append((None, "context", line))
-    return files
+    if not results:
+        return ToolSuccess(_no_matches_message(pattern))
+    if output_format == "files_only":
+        raw = "\n".join(path for path, _ in results)
+        return ToolSuccess(_format_files_only(raw, pattern, project_ctx))
+    if output_format == "count":
+        raw = "\n".join(f"{path}:{count}" for path, count in results)
+        return ToolSuccess(_format_count_results(raw, pattern, project_ctx))
+    # An incomplete search stopped at max_results + 1, so totals are a floor.
+    if output_format == "locations":
+        return ToolSuccess(
+            _render_locations(
+                results, pattern, max_results, project_ctx, approximate=not complete
+            )
+        )
+    return ToolSuccess(
+        _render_full(
+            results, pattern, max_results, project_ctx, approximate=not complete
+        )
+    )
 
 
-def _parse_grep_output(raw_output, abs_target=None, target_is_file=False):
-    """Parse grep -H output ('path:line:content', context 'path-line-content')
-    into the same [(file_path, entries)] structure as the rg parser.
+def _builtin_files(abs_directory, file_pattern, project_ctx):
+    """The files under abs_directory rg would search, in walk order.
 
-    The ':' form is tried before the '-' form so directory names containing
-    '-<digits>-' can't steal a match line; context lines in such paths remain
-    a best-effort parse on this fallback engine.
+    Honors ignore files from the project root down, skips hidden entries
+    and _RG_IGNORE_GLOBS, and applies file_pattern as rg applies --glob:
+    against the path relative to the search directory.
     """
-    by_path = {}
-    order = []
-    prefix = str(abs_target) if target_is_file and abs_target is not None else None
-
-    def entry_list(path):
-        if path not in by_path:
-            by_path[path] = []
-            order.append(path)
-        return by_path[path]
-
-    for line in raw_output.split("\n"):
-        if not line:
-            continue
-        if line == "--":
-            if order:
-                by_path[order[-1]].append((None, "separator", ""))
-            continue
-        if prefix is not None and line.startswith(prefix):
-            rest = line[len(prefix) :]
-            m = re.match(r"^([:-])(\d+)\1(.*)$", rest)
-            if not m:
-                continue
-            sep, line_no, text = m.group(1), m.group(2), m.group(3)
-            path = prefix
-        else:
-            m = re.match(r"^(.*?):(\d+):(.*)$", line)
-            if m:
-                path, line_no, text = m.groups()
-                sep = ":"
-            else:
-                m = re.match(r"^(.*?)-(\d+)-(.*)$", line)
-                if not m:
+    glob = negate = None
+    if file_pattern:
+        file_pattern = _normalize_file_pattern(file_pattern)
+        negate = file_pattern.startswith("!")
+        glob = gitignore.IgnoreRules([file_pattern.removeprefix("!")])
+    top = str(abs_directory)
+    for dirpath, _, filenames in gitignore.walk(
+        project_ctx.root, top, rules=_BUILTIN_IGNORE_RULES
+    ):
+        rel_dir = os.path.relpath(dirpath, top).replace(os.sep, "/")
+        for name in filenames:
+            if glob is not None:
+                rel = name if rel_dir == "." else f"{rel_dir}/{name}"
+                if bool(glob.match(rel, is_dir=False)) == negate:
                     continue
-                path, line_no, text = m.groups()
-                sep = "-"
-        kind = "match" if sep == ":" else "context"
-        entry_list(path).append((line_no, kind, text))
-
-    return [(path, by_path[path]) for path in order]
+            yield os.path.join(dirpath, name)
 
 
 def _render_full(files, pattern, max_results, project_ctx, approximate=False, notes=()):
@@ -480,7 +549,7 @@ def _format_files_only(raw_output, pattern, project_ctx, notes=()):
 def _format_count_results(raw_output, pattern, project_ctx, notes=(), known_file=None):
     """Format count output (file:count per line) for LLM consumption.
 
-    Files with zero matches (grep -c lists every file scanned) are omitted.
+    Files with zero matches are omitted.
     known_file names the target when the engine printed a bare count for a
     single-file search.
     """
@@ -512,18 +581,6 @@ def _format_count_results(raw_output, pattern, project_ctx, notes=(), known_file
     return "\n".join(formatted)
 
 
-def _format_search_results(raw_output, pattern, max_results, project_ctx):
-    """Format raw rg --heading output as a full result block."""
-    files = _parse_rg_heading_output(raw_output)
-    return _render_full(files, pattern, max_results, project_ctx, approximate=True)
-
-
-def _format_grep_results(raw_output, pattern, max_results, project_ctx):
-    """Format raw grep output (file:line:content) as a full result block."""
-    files = _parse_grep_output(raw_output)
-    return _render_full(files, pattern, max_results, project_ctx)
-
-
 def _to_rel(path_str, project_ctx):
     """Best-effort conversion to a project-relative path for display."""
     try:
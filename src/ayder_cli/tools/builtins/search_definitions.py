@@ -1,7 +1,7 @@
 """
 Tool definitions for search operations.
 
-Tools: search_codebase, get_project_structure
+Tools: search_codebase, find_symbol, get_project_structure
 """
 
 from typing import Tuple
@@ -65,6 +65,50 @@ TOOL_DEFINITIONS: Tuple[ToolDefinition, ...] = (
         permission="r",
         path_parameters=("directory",),
     ),
+    ToolDefinition(
+        name="find_symbol",
+        tags=("core",),
+        func_ref="ayder_cli.tools.builtins.symbols:find_symbol",
+        description=(
+            "Look up code symbols from a parsed index instead of a regex: "
+            "'definition' lists where a name is defined (with signature and "
+            "line span), 'references' lists the lines that use it, 'outline' "
+            "lists the definitions in a file or directory. Covers Python, and "
+            "other languages when tree-sitter grammars are installed."
+        ),
+        description_template="Symbol {action} lookup",
+        parameters={
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["definition", "references", "outline"],
+                    "description": "Query to answer.",
+                },
+                "name": {
+                    "type": "string",
+                    "description": (
+                        "Symbol name, required for definition/references. A dotted "
+                        "name ('ChatLoop.run') matches the qualified name."
+                    ),
+                },
+                "path": {
+                    "type": "string",
+                    "description": (
+                        "File or directory (default: '.'). Scopes definition/"
+                        "references; for outline, the file or directory to outline."
+                    ),
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum entries shown (default: 50). The output says so when results are truncated.",
+                },
+            },
+            "required": ["action"],
+        },
+        permission="r",
+        path_parameters=("path",),
+    ),
     ToolDefinition(
         name="get_project_structure",
         description="Generate a tree-style project structure summary.",
@@ -78,6 +122,13 @@ TOOL_DEFINITIONS: Tuple[ToolDefinition, ...] = (
                     "type": "integer",
                     "description": "Maximum directory depth to display (default: 3)",
                 },
+                "max_files_per_dir": {
+                    "type": "integer",
+                    "description": (
+                        "Summarize directories holding more files than this "
+                        "as a file count (default: list every file)"
+                    ),
+                },
             },
         },
         permission="r",
@@ -0,0 +1,276 @@
+"""
+Built-in parallel search engine behind ``search_codebase`` when ripgrep is
+not installed.
+
+The caller lists the files to search (``ayder_cli.core.gitignore.walk``
+applies rg's ignore semantics); ``search`` scans them in chunks on a shared
+process pool. Each file is memory-mapped and skipped when it contains a NUL
+byte (binary, as rg treats it), decoded as UTF-8, and searched with one
+compiled regex pass over the whole text; each hit is then confirmed against
+its own line, so matching is line-oriented like rg's. Chunks are submitted
+as the walk produces them and results are collected in walk order, so a
+search that only needs its first ``limit`` matches stops walking and
+scanning once they are in.
+
+A small file list is scanned in-process: starting and feeding workers costs
+more than it saves there. So does a single-CPU machine.
+"""
+
+import itertools
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Search modes: matching lines (with context), matching files, match counts.
+LINES, FILES, COUNT = "lines", "files", "count"
+
+_WORKERS = min(8, os.cpu_count() or 1)
+
+# Files per task, and the file count below which the pool is not used.
+_CHUNK_FILES = 64
+_IN_PROCESS_FILES = 256
+
+_UTF16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_failed = False
+
+
+def search(
+    paths,
+    pattern: str,
+    flags: int = 0,
+    mode: str = LINES,
+    context_lines: int = 0,
+    limit: int | None = None,
+    timeout: float | None = None,
+):
+    """Search ``paths`` (an iterable of file paths) for ``pattern``.
+
+    Returns ``(results, complete)``: ``results`` lists ``(path, value)`` in
+    input order for files that match, where value is the file's entries in
+    the ``(line_no, kind, text)`` shape of search.py's parsers for LINES,
+    True for FILES and the number of matching lines for COUNT. With a
+    ``limit``, LINES searches stop once that many matches are in, each file
+    contributing at most ``limit``, and ``complete`` is then False.
+
+    Raises ``re.error`` for an invalid pattern and ``TimeoutError`` once
+    ``timeout`` seconds have passed.
+    """
+    flags |= re.MULTILINE
+    regex = re.compile(pattern, flags)
+    if mode != LINES:
+        limit = None
+    deadline = time.monotonic() + timeout if timeout else None
+    paths = iter(paths)
+    head = list(itertools.islice(paths, _IN_PROCESS_FILES))
+    job = (pattern, flags, mode, context_lines, limit)
+
+    pool = _get_pool() if len(head) == _IN_PROCESS_FILES else None
+    if pool is not None:
+        chunks = _chunked(itertools.chain(head, paths), _CHUNK_FILES)
+        first = next(chunks)
+        try:
+            future = pool.submit(_scan_chunk, first, *job)
+        except (OSError, RuntimeError, BrokenProcessPool) as e:
+            _disable_pool(e)
+        else:
+            return _collect(pool, future, chunks, job, limit, deadline)
+        paths = itertools.chain(first, *chunks)
+    else:
+        paths = itertools.chain(head, paths)
+
+    results = []
+    found = 0
+    for path in paths:
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError
+        value = _scan_file(path, regex, mode, context_lines, limit)
+        if value:
+            results.append((path, value))
+            found += _match_count(value, mode)
+            if limit is not None and found >= limit:
+                return results, False
+    return results, True
+
+
+def _collect(pool, first, chunks, job, limit, deadline):
+    """Feed chunks to the pool, keeping a bounded window in flight, and
+    gather their results in submission order."""
+    results = []
+    found = 0
+    pending = deque([first])
+    window = 2 * _WORKERS
+    mode = job[2]
+
+    def take(future):
+        nonlocal found
+        remaining = None
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.monotonic())
+        try:
+            chunk_results = future.result(timeout=remaining)
+        except FutureTimeout:
+            raise TimeoutError from None
+        for path, value in chunk_results:
+            results.append((path, value))
+            found += _match_count(value, mode)
+            if limit is not None and found >= limit:
+                return True
+        return False
+
+    try:
+        for chunk in chunks:
+            if len(pending) >= window and take(pending.popleft()):
+                return results, False
+            pending.append(pool.submit(_scan_chunk, chunk, *job))
+        while pending:
+            if take(pending.popleft()):
+                return results, False
+        return results, True
+    except BrokenProcessPool:
+        _reset_pool()
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _match_count(value, mode) -> int:
+    if mode == LINES:
+        return sum(1 for entry in value if entry[1] == "match")
+    return 1
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _scan_chunk(paths, pattern, flags, mode, context_lines, limit):
+    """Pool task: scan a list of files. ``re`` caches the compiled pattern
+    across tasks in the worker."""
+    regex = re.compile(pattern, flags)
+    results = []
+    found = 0
+    for path in paths:
+        value = _scan_file(path, regex, mode, context_lines, limit)
+        if value:
+            results.append((path, value))
+            found += _match_count(value, mode)
+            if limit is not None and found >= limit:
+                break
+    return results
+
+
+def _scan_file(path, regex, mode, context_lines, limit):
+    """The search result for one file, or None (no match, binary, unreadable)."""
+    text = _read_text(path)
+    if text is None:
+        return None
+    hit = regex.search(text)
+    if hit is None:
+        return None
+    if mode == FILES:
+        return True
+
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+    hits = []
+    line_no = text.count("\n", 0, hit.start())
+    while hit is not None and line_no < len(lines):
+        # The whole-text pass can straddle lines; rg matches within one.
+        if regex.search(lines[line_no]):
+            hits.append(line_no)
+            if limit is not None and len(hits) >= limit:
+                break
+        next_start = text.find("\n", hit.start())
+        if next_start == -1:
+            break
+        hit = regex.search(text, next_start + 1)
+        if hit is not None:
+            line_no += 1 + text.count("\n", next_start + 1, hit.start())
+
+    if mode == COUNT:
+        return len(hits) or None
+    return _entries(lines, hits, context_lines) if hits else None
+
+
+def _read_text(path):
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:2] in _UTF16_BOMS:
+                    return str(data, "utf-16", "replace")
+                if data.find(b"\0") != -1:
+                    return None
+                return str(data, "utf-8", "replace").removeprefix("\ufeff")
+    except (OSError, ValueError):
+        return None
+
+
+def _entries(lines, hits, context_lines):
+    """Match and context entries, with a separator between context groups."""
+    entries = []
+    hit_set = set(hits)
+    last = None
+    for hit in hits:
+        start = max(0, hit - context_lines)
+        if last is not None:
+            if context_lines and start > last + 1:
+                entries.append((None, "separator", ""))
+            start = max(start, last + 1)
+        for i in range(start, min(len(lines), hit + context_lines + 1)):
+            if i > hit and i in hit_set:
+                break
+            kind = "match" if i in hit_set else "context"
+            entries.append((str(i + 1), kind, lines[i].rstrip("\r")))
+            last = i
+    return entries
+
+
+def _get_pool():
+    global _pool
+    if _WORKERS < 2 or _pool_failed:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            # Never fork: the TUI and agents run threads.
+            if "forkserver" in methods:
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=_WORKERS, mp_context=context)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _disable_pool(error):
+    global _pool_failed
+    logger.debug(f"Search process pool unavailable, scanning in-process: {error}")
+    _pool_failed = True
+    _reset_pool()
@@ -0,0 +1,414 @@
+"""
+Persistent trigram index that narrows ``search_codebase`` to candidate files.
+
+Every search used to make ripgrep read the whole tree. With the index enabled
+(``search_index = true`` in ``[app]``) a search first lists the files rg
+would visit (``rg --files``, which is cheap: no file contents are read),
+keeps only the files that contain every trigram the pattern requires, and
+runs the regex over those.
+
+The index stores, per file, the sorted set of byte trigrams of its
+ASCII-lowercased contents, so one index serves case-sensitive and
+case-insensitive searches. Entries are keyed by project-relative path and
+validated against mtime_ns and size on every search, so only files that
+changed since the last search are read again; ``file_editor`` refreshes the
+files it writes straight away. The index lives in ``.ayder/index/`` and
+survives restarts.
+
+A search only spends a bounded time bringing the index up to date. Building
+it for a large tree, or catching up after a checkout changed many files,
+goes on in a background thread, and searches run the plain way until it is
+done.
+
+Patterns the index cannot reason about — no literal run of three or more
+bytes, or syntax that Python's ``re`` parser reads differently from rg —
+yield no query, and the caller runs the plain search.
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from array import array
+from pathlib import Path
+from re import _constants as _sre
+from re import _parser as _sre_parse
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = Path(".ayder") / "index"
+INDEX_FILE = "trigrams.bin"
+_MAGIC = b"AYDER-TRIGRAMS 1\n"
+
+# Larger files are never read for indexing; they stay search candidates.
+_MAX_INDEXED_BYTES = 8 * 1024 * 1024
+
+# Entry kinds: indexed text, binary (rg skips these), and files the index
+# cannot vouch for (too large, UTF-16/32 encoded, unreadable).
+_TEXT, _BINARY, _RAW = "t", "b", "r"
+
+_UNICODE_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+# rg syntax that Python's parser reads as literal text: \< \> and \b{...}
+# word boundaries. Nested and set-operation classes are caught through the
+# parser's FutureWarnings instead.
+_FOREIGN_SYNTAX = re.compile(r"\\[<>]|\\[bB]\{")
+
+_REPEATS = (_sre.MAX_REPEAT, _sre.MIN_REPEAT, _sre.POSSESSIVE_REPEAT)
+
+
+class _Entry:
+    __slots__ = ("mtime_ns", "size", "kind", "trigrams")
+
+    def __init__(self, mtime_ns: int, size: int, kind: str, trigrams: array) -> None:
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.kind = kind
+        self.trigrams = trigrams
+
+
+def trigrams_of(data: bytes) -> array:
+    """Sorted distinct trigrams of ``data``, ASCII-lowercased, within lines."""
+    grams = set()
+    for line in set(data.lower().split(b"\n")):
+        grams.update(line[i : i + 3] for i in range(len(line) - 2))
+    return array("I", sorted(int.from_bytes(g, "big") for g in grams))
+
+
+def query_for(pattern: str, ignore_case: bool = False):
+    """The trigram query a file must satisfy to possibly match ``pattern``.
+
+    The query is a tuple of clauses that must all hold; a clause holds when
+    any of its literals occurs; a literal occurs when the file has all of its
+    trigrams. Returns None when the pattern requires nothing indexable.
+    """
+    if _FOREIGN_SYNTAX.search(pattern):
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return None
+    ignore_case = ignore_case or bool(parsed.state.flags & re.IGNORECASE)
+    clauses = _required(parsed, ignore_case)
+    return tuple(clauses) or None
+
+
+def _required(items, ignore_case: bool) -> list:
+    clauses = []
+    run = bytearray()
+
+    def flush():
+        literal = _literal(bytes(run), ignore_case)
+        if literal:
+            clauses.append((literal,))
+        run.clear()
+
+    for op, av in items:
+        if op is _sre.LITERAL:
+            run.extend(chr(av).encode("utf-8"))
+        elif op is _sre.AT:
+            continue  # zero-width: the literals around it stay adjacent
+        elif op is _sre.SUBPATTERN:
+            flush()
+            _, add_flags, _, sub = av
+            clauses.extend(_required(sub, ignore_case or bool(add_flags & re.IGNORECASE)))
+        elif op in _REPEATS:
+            min_count, max_count, sub = av
+            if min_count >= 1 and len(sub) == 1 and sub[0][0] is _sre.LITERAL:
+                # 'xo{2,}y' needs both 'xoo' and 'ooy'.
+                repeated = chr(sub[0][1]).encode("utf-8") * min_count
+                run.extend(repeated)
+                if max_count != min_count:
+                    flush()
+                    run.extend(repeated)
+                continue
+            flush()
+            if min_count >= 1:
+                clauses.extend(_required(sub, ignore_case))
+        elif op is _sre.BRANCH:
+            flush()
+            clause = _either(av[1], ignore_case)
+            if clause:
+                clauses.append(clause)
+        else:
+            flush()
+    flush()
+    return clauses
+
+
+def _either(alternatives, ignore_case: bool):
+    """One clause implied by every alternative of a branch, or None."""
+    literals = []
+    for alternative in alternatives:
+        clauses = _required(alternative, ignore_case)
+        if not clauses:
+            return None
+        best = min(clauses, key=lambda c: (len(c), -sum(len(lit) for lit in c)))
+        literals.extend(best)
+    return tuple(dict.fromkeys(literals))
+
+
+def _literal(text: bytes, ignore_case: bool):
+    """The trigrams a file needs to contain ``text``, or None."""
+    grams = set()
+    for line in text.lower().split(b"\n"):
+        for i in range(len(line) - 2):
+            gram = line[i : i + 3]
+            # Case-insensitive matching folds non-ASCII letters, which the
+            # ASCII-lowercased index does not.
+            if ignore_case and max(gram) >= 0x80:
+                continue
+            grams.add(int.from_bytes(gram, "big"))
+    return tuple(sorted(grams)) or None
+
+
+def _contains(trigrams: array, gram: int) -> bool:
+    i = bisect.bisect_left(trigrams, gram)
+    return i < len(trigrams) and trigrams[i] == gram
+
+
+def _satisfies(trigrams: array, query) -> bool:
+    return all(
+        any(all(_contains(trigrams, g) for g in literal) for literal in clause)
+        for clause in query
+    )
+
+
+class TrigramIndex:
+    """The trigram index of one project root."""
+
+    def __init__(self, root) -> None:
+        self.root = str(Path(root).resolve())
+        self.path = Path(self.root) / INDEX_DIR / INDEX_FILE
+        self._entries: dict[str, _Entry] = {}
+        self._dirty = False
+        self._building = False
+        self._lock = threading.Lock()
+
+    def candidates(
+        self, paths: list[str], query, prune: bool = False, budget=None
+    ) -> list[str] | None:
+        """The subset of ``paths`` (absolute) that may satisfy ``query``.
+
+        Changed files are re-indexed on the way. With ``prune``, ``paths``
+        is taken as the complete file list and entries for anything else
+        are dropped.
+
+        Returns None while the index is being built in the background, and
+        when re-indexing would take longer than ``budget`` seconds: the rest
+        of ``paths`` is then indexed in the background.
+        """
+        if self._building:
+            return None
+        deadline = time.monotonic() + budget if budget is not None else None
+        kept = []
+        for path in paths:
+            entry = self._fresh(path)
+            if entry is None:
+                if deadline is not None and time.monotonic() > deadline:
+                    self._build_in_background(paths, prune)
+                    return None
+                entry = self._update(path)
+            if entry.kind == _RAW or (
+                entry.kind == _TEXT and _satisfies(entry.trigrams, query)
+            ):
+                kept.append(path)
+        if prune:
+            self._prune(paths)
+        return kept
+
+    def refresh(self, path) -> None:
+        """Re-index ``path`` now; called after a tool writes it."""
+        self._update(str(path))
+
+    @property
+    def building(self) -> bool:
+        """True while a background build is running."""
+        return self._building
+
+    def _build_in_background(self, paths: list[str], prune: bool) -> None:
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(
+            target=self._build,
+            args=(paths, prune),
+            name="search-index-build",
+            daemon=True,
+        ).start()
+
+    def _build(self, paths: list[str], prune: bool) -> None:
+        try:
+            for path in paths:
+                if self._fresh(path) is None:
+                    self._update(path)
+            if prune:
+                self._prune(paths)
+            self.save()
+        except Exception as e:
+            logger.debug(f"Search index build failed: {e}")
+        finally:
+            self._building = False
+
+    def load(self) -> None:
+        """Read the saved index; a missing or unreadable one starts empty."""
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return
+        try:
+            entries = self._decode(data)
+        except Exception as e:
+            logger.debug(f"Discarding unreadable search index {self.path}: {e}")
+            return
+        with self._lock:
+            self._entries = entries
+
+    def save(self) -> None:
+        """Write the index if it changed since it was loaded or last saved."""
+        with self._lock:
+            if not self._dirty:
+                return
+            header = {}
+            blobs = []
+            for key, entry in self._entries.items():
+                header[key] = [entry.mtime_ns, entry.size, entry.kind, len(entry.trigrams)]
+                blobs.append(entry.trigrams.tobytes())
+            meta = {"byteorder": sys.byteorder, "itemsize": array("I").itemsize}
+            payload = b"".join(
+                [
+                    _MAGIC,
+                    json.dumps(meta).encode() + b"\n",
+                    json.dumps(header).encode() + b"\n",
+                    *blobs,
+                ]
+            )
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def _key(self, path: str) -> str:
+        if path.startswith(self.root + os.sep):
+            return path[len(self.root) + 1 :]
+        return os.path.relpath(path, self.root)
+
+    def _fresh(self, path: str) -> _Entry | None:
+        """The entry of ``path`` if it is up to date, else None."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return _Entry(0, 0, _RAW, array("I"))
+        entry = self._entries.get(self._key(path))
+        if entry is not None and (entry.mtime_ns, entry.size) == (st.st_mtime_ns, st.st_size):
+            return entry
+        return None
+
+    def _update(self, path: str) -> _Entry:
+        """Read and index ``path``; the file is read outside the lock."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return _Entry(0, 0, _RAW, array("I"))
+        entry = _index_file(path, st)
+        with self._lock:
+            self._entries[self._key(path)] = entry
+            self._dirty = True
+        return entry
+
+    def _prune(self, paths: list[str]) -> None:
+        keep = {self._key(path) for path in paths}
+        with self._lock:
+            for key in self._entries.keys() - keep:
+                del self._entries[key]
+                self._dirty = True
+
+    @staticmethod
+    def _decode(data: bytes) -> dict[str, _Entry]:
+        if not data.startswith(_MAGIC):
+            raise ValueError("unknown format")
+        pos = len(_MAGIC)
+        end = data.index(b"\n", pos)
+        meta = json.loads(data[pos:end])
+        itemsize = array("I").itemsize
+        if meta != {"byteorder": sys.byteorder, "itemsize": itemsize}:
+            raise ValueError("written on a different platform")
+        pos = end + 1
+        end = data.index(b"\n", pos)
+        header = json.loads(data[pos:end])
+        pos = end + 1
+        entries = {}
+        for key, (mtime_ns, size, kind, count) in header.items():
+            trigrams = array("I")
+            trigrams.frombytes(data[pos : pos + count * itemsize])
+            pos += count * itemsize
+            entries[key] = _Entry(mtime_ns, size, kind, trigrams)
+        if pos != len(data):
+            raise ValueError("truncated")
+        return entries
+
+
+def _index_file(path: str, st: os.stat_result) -> _Entry:
+    empty = array("I")
+    if st.st_size > _MAX_INDEXED_BYTES:
+        return _Entry(st.st_mtime_ns, st.st_size, _RAW, empty)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return _Entry(st.st_mtime_ns, st.st_size, _RAW, empty)
+    if data.startswith(_UNICODE_BOMS):
+        # rg transcodes these before matching; their bytes say nothing.
+        return _Entry(st.st_mtime_ns, st.st_size, _RAW, empty)
+    if b"\0" in data:
+        return _Entry(st.st_mtime_ns, st.st_size, _BINARY, empty)
+    return _Entry(st.st_mtime_ns, st.st_size, _TEXT, trigrams_of(data))
+
+
+_INDEXES: dict[str, TrigramIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_for(root) -> TrigramIndex:
+    """The loaded index of project ``root``, read from disk on first use."""
+    key = str(Path(root).resolve())
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = TrigramIndex(key)
+            index.load()
+            _INDEXES[key] = index
+        return index
+
+
+def note_write(path) -> None:
+    """Refresh ``path`` in every loaded index whose project contains it."""
+    if not _INDEXES:
+        return
+    path = str(path)
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        if path.startswith(index.root + os.sep):
+            try:
+                index.refresh(path)
+            except Exception as e:
+                logger.debug(f"Search index refresh failed for {path}: {e}")
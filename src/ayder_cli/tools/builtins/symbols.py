@@ -0,0 +1,669 @@
+"""
+Symbol index and the find_symbol tool.
+
+Finding a definition with ``search_codebase`` means guessing a regex
+(``def run\\b``, ``class ChatLoop``), reading noisy matches and often a second
+search. The symbol index parses source files instead: Python with ``ast``,
+and other languages with tree-sitter when ``tree_sitter_language_pack`` (or
+the older ``tree_sitter_languages``) is installed. For every file it keeps
+the definitions (qualified name, kind, line span, one-line signature) and the
+lines on which each identifier is referenced.
+
+The index is stored as ``.ayder/index/symbols.json``. Before each query the
+project is walked (honoring ignore files, like search_codebase) and only
+files whose mtime_ns or size changed are parsed again, so a query after an
+edit sees the edit. A query spends a bounded time parsing; the first one on
+a large tree leaves the rest to a background thread and answers from the
+files indexed so far, saying so.
+"""
+
+import ast
+import functools
+import importlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import NamedTuple
+
+from ayder_cli.core import gitignore, json_codec
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.file_cache import file_cache
+from ayder_cli.core.result import ToolError, ToolSuccess
+from ayder_cli.tools.builtins.search_index import INDEX_DIR
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "symbols.json"
+_FORMAT_VERSION = 1
+
+# Larger files are not parsed.
+_MAX_PARSED_BYTES = 2 * 1024 * 1024
+
+_SIGNATURE_CHARS = 120
+
+# Seconds a query may spend parsing changed files; past it the index is
+# finished in the background.
+_REFRESH_BUDGET = 2.0
+
+# Directories never walked, in addition to hidden and ignored ones.
+_SKIP_RULES = gitignore.IgnoreRules(
+    [
+        "__pycache__/",
+        "node_modules/",
+        "dist/",
+        "build/",
+        "htmlcov/",
+        "venv/",
+        "target/",
+        "*.egg-info/",
+    ]
+)
+
+# tree-sitter grammar names by file extension.
+_TREE_SITTER_LANGUAGES = {
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".c": "c",
+    ".h": "c",
+    ".cc": "cpp",
+    ".cpp": "cpp",
+    ".hpp": "cpp",
+    ".cs": "c_sharp",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".scala": "scala",
+}
+
+# Identifier node types counted as references in tree-sitter grammars.
+_TS_IDENTIFIERS = frozenset(
+    {
+        "identifier",
+        "type_identifier",
+        "field_identifier",
+        "property_identifier",
+        "constant",
+        "simple_identifier",
+    }
+)
+
+_ACTIONS = ("definition", "references", "outline")
+
+
+class Symbol(NamedTuple):
+    """One definition in a source file."""
+
+    qualname: str
+    kind: str
+    line: int
+    end_line: int
+    signature: str
+
+    @property
+    def name(self) -> str:
+        return self.qualname.rpartition(".")[2]
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+
+def python_symbols(source) -> tuple[list[Symbol], dict[str, list[int]]]:
+    """Definitions and identifier references of Python ``source``.
+
+    Raises SyntaxError (or ValueError for null bytes) like ``ast.parse``.
+    """
+    with warnings.catch_warnings():
+        # Invalid escapes and the like would print SyntaxWarnings over the TUI.
+        warnings.simplefilter("ignore")
+        tree = ast.parse(source)
+    symbols: list[Symbol] = []
+    refs: dict[str, set[int]] = {}
+
+    def visit(node, scope: str, in_class: bool) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{scope}.{child.name}" if scope else child.name
+                if isinstance(child, ast.ClassDef):
+                    kind = "class"
+                else:
+                    kind = "method" if in_class else "function"
+                symbols.append(
+                    Symbol(qualname, kind, child.lineno, child.end_lineno, _signature(child))
+                )
+                # Decorators, arguments and bases are children too.
+                visit(child, qualname, isinstance(child, ast.ClassDef))
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)) and (in_class or not scope):
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        qualname = f"{scope}.{target.id}" if scope else target.id
+                        kind = "attribute" if in_class else "variable"
+                        symbols.append(
+                            Symbol(qualname, kind, child.lineno, child.end_lineno, _signature(child))
+                        )
+                collect(child)
+            else:
+                collect(child)
+
+    def collect(node) -> None:
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name):
+                refs.setdefault(sub.id, set()).add(sub.lineno)
+            elif isinstance(sub, ast.Attribute):
+                refs.setdefault(sub.attr, set()).add(sub.end_lineno or sub.lineno)
+            elif isinstance(sub, ast.alias):
+                name = sub.name.rpartition(".")[2]
+                refs.setdefault(name, set()).add(sub.lineno)
+
+    visit(tree, "", False)
+    _nested_definitions(tree, symbols)
+    return symbols, {name: sorted(lines) for name, lines in refs.items()}
+
+
+def _nested_definitions(tree, symbols: list[Symbol]) -> None:
+    """Add definitions that visit() only collected references from: those
+    inside compound statements (``if TYPE_CHECKING:``, ``try:``, ...)."""
+    known = {(s.line, s.name) for s in symbols}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if (node.lineno, node.name) not in known:
+                kind = "class" if isinstance(node, ast.ClassDef) else "function"
+                symbols.append(
+                    Symbol(node.name, kind, node.lineno, node.end_lineno, _signature(node))
+                )
+    symbols.sort(key=lambda s: s.line)
+
+
+def _signature(node) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(b) for b in node.bases + node.keywords]
+        text = f"class {node.name}({', '.join(bases)})" if bases else f"class {node.name}"
+    elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+        text = f"{prefix} {node.name}({ast.unparse(node.args)})"
+        if node.returns is not None:
+            text += f" -> {ast.unparse(node.returns)}"
+    elif isinstance(node, ast.AnnAssign):
+        text = f"{ast.unparse(node.target)}: {ast.unparse(node.annotation)}"
+    else:
+        text = ast.unparse(node).split("\n", 1)[0]
+    if len(text) > _SIGNATURE_CHARS:
+        text = text[: _SIGNATURE_CHARS - 3] + "..."
+    return text
+
+
+@functools.lru_cache(maxsize=None)
+def _tree_sitter_parser(language: str):
+    """A tree-sitter parser for ``language``, or None when unavailable."""
+    for module_name in ("tree_sitter_language_pack", "tree_sitter_languages"):
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        try:
+            return module.get_parser(language)
+        except Exception:
+            return None
+    return None
+
+
+def tree_sitter_symbols(source: bytes, parser) -> tuple[list[Symbol], dict[str, list[int]]]:
+    """Definitions and identifier references from a tree-sitter parse.
+
+    A definition is any node with a ``name`` field whose type names a
+    declaration (``function_declaration``, ``class_definition``,
+    ``struct_item``, ``method_declaration``, ...).
+    """
+    tree = parser.parse(source)
+    symbols: list[Symbol] = []
+    refs: dict[str, set[int]] = {}
+    stack = [(tree.root_node, "")]
+    while stack:
+        node, scope = stack.pop()
+        child_scope = scope
+        name_node = node.child_by_field_name("name") if node.child_count else None
+        kind = _ts_kind(node.type) if name_node is not None else None
+        if kind is not None:
+            name = source[name_node.start_byte : name_node.end_byte].decode("utf-8", "replace")
+            child_scope = f"{scope}.{name}" if scope else name
+            first_line = source[node.start_byte :].split(b"\n", 1)[0]
+            signature = first_line.decode("utf-8", "replace").strip().rstrip("{").strip()
+            if len(signature) > _SIGNATURE_CHARS:
+                signature = signature[: _SIGNATURE_CHARS - 3] + "..."
+            symbols.append(
+                Symbol(child_scope, kind, node.start_point[0] + 1, node.end_point[0] + 1, signature)
+            )
+        elif node.type in _TS_IDENTIFIERS:
+            name = source[node.start_byte : node.end_byte].decode("utf-8", "replace")
+            refs.setdefault(name, set()).add(node.start_point[0] + 1)
+        for child in reversed(node.children):
+            if child is not name_node:
+                stack.append((child, child_scope))
+    symbols.sort(key=lambda s: s.line)
+    return symbols, {name: sorted(lines) for name, lines in refs.items()}
+
+
+def _ts_kind(node_type: str) -> str | None:
+    if not node_type.endswith(("_definition", "_declaration", "_item", "_specifier")):
+        return None
+    for word, kind in (
+        ("method", "method"),
+        ("function", "function"),
+        ("fn", "function"),
+        ("class", "class"),
+        ("struct", "class"),
+        ("interface", "class"),
+        ("trait", "class"),
+        ("enum", "class"),
+        ("module", "module"),
+        ("type", "type"),
+        ("const", "variable"),
+        ("variable", "variable"),
+    ):
+        if node_type.startswith(word) or f"_{word}" in node_type:
+            return kind
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+class _FileEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    symbols: list[Symbol]
+    refs: dict[str, list[int]]
+
+
+class SymbolIndex:
+    """The symbol index of one project root."""
+
+    def __init__(self, root) -> None:
+        self.root = Path(root).resolve()
+        self.path = self.root / INDEX_DIR / INDEX_FILE
+        self._files: dict[str, _FileEntry] = {}
+        self._dirty = False
+        self._building = False
+        self._lock = threading.Lock()
+
+    @property
+    def building(self) -> bool:
+        """True while a background build is running."""
+        return self._building
+
+    def refresh(self, budget: float | None = None) -> bool:
+        """Re-parse changed files, drop deleted ones, save if anything changed.
+
+        Returns False, leaving the index partial, while a background build
+        runs or when parsing takes longer than ``budget`` seconds: the rest
+        of the files are then parsed in the background.
+        """
+        if self._building:
+            return False
+        deadline = time.monotonic() + budget if budget is not None else None
+        files = list(self._source_files())
+        for rel, abs_path in files:
+            st = self._stale(rel, abs_path)
+            if st is None:
+                continue
+            if deadline is not None and time.monotonic() > deadline:
+                self._build_in_background(files)
+                return False
+            self._update(rel, abs_path, st)
+        self._prune(files)
+        self.save()
+        return True
+
+    def definitions(self, name: str, scope: str = "") -> list[tuple[str, Symbol]]:
+        """Definitions named ``name``; a dotted name matches qualified names."""
+        found = []
+        for rel, entry in self._in_scope(scope):
+            for symbol in entry.symbols:
+                if _names_match(symbol.qualname, name):
+                    found.append((rel, symbol))
+        return found
+
+    def references(self, name: str, scope: str = "") -> list[tuple[str, int]]:
+        """(file, line) of every reference to the last component of ``name``."""
+        short = name.rpartition(".")[2]
+        found = []
+        for rel, entry in self._in_scope(scope):
+            found.extend((rel, line) for line in entry.refs.get(short, ()))
+        return found
+
+    def outline(self, rel: str) -> list[Symbol] | None:
+        """Definitions of one file in line order; None if it is not indexed."""
+        entry = self._files.get(rel)
+        return None if entry is None else entry.symbols
+
+    def files_in(self, scope: str) -> list[str]:
+        return [rel for rel, _ in self._in_scope(scope)]
+
+    def _build_in_background(self, files: list[tuple[str, str]]) -> None:
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(
+            target=self._build, args=(files,), name="symbol-index-build", daemon=True
+        ).start()
+
+    def _build(self, files: list[tuple[str, str]]) -> None:
+        try:
+            for rel, abs_path in files:
+                st = self._stale(rel, abs_path)
+                if st is not None:
+                    self._update(rel, abs_path, st)
+            self._prune(files)
+            self.save()
+        except Exception as e:
+            logger.debug(f"Symbol index build failed: {e}")
+        finally:
+            self._building = False
+
+    def _stale(self, rel: str, abs_path: str) -> os.stat_result | None:
+        """The stat of ``abs_path`` if its entry is missing or out of date."""
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return None
+        entry = self._files.get(rel)
+        if entry is not None and (entry.mtime_ns, entry.size) == (st.st_mtime_ns, st.st_size):
+            return None
+        return st
+
+    def _update(self, rel: str, abs_path: str, st: os.stat_result) -> None:
+        """Parse one file; the parse runs outside the lock."""
+        entry = _parse_file(abs_path, st)
+        with self._lock:
+            self._files[rel] = entry
+            self._dirty = True
+
+    def _prune(self, files: list[tuple[str, str]]) -> None:
+        keep = {rel for rel, _ in files}
+        with self._lock:
+            for rel in self._files.keys() - keep:
+                del self._files[rel]
+                self._dirty = True
+
+    def load(self) -> None:
+        """Read the saved index; a missing or unreadable one starts empty."""
+        try:
+            data = json_codec.loads(self.path.read_bytes())
+            if data.get("version") != _FORMAT_VERSION:
+                return
+            files = {
+                rel: _FileEntry(
+                    mtime_ns,
+                    size,
+                    [Symbol(*s) for s in symbols],
+                    refs,
+                )
+                for rel, (mtime_ns, size, symbols, refs) in data["files"].items()
+            }
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Discarding unreadable symbol index {self.path}: {e}")
+            return
+        with self._lock:
+            self._files = files
+
+    def save(self) -> None:
+        """Write the index if it changed since it was loaded or last saved."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json_codec.dumps(
+                {
+                    "version": _FORMAT_VERSION,
+                    "files": {
+                        rel: [e.mtime_ns, e.size, [list(s) for s in e.symbols], e.refs]
+                        for rel, e in self._files.items()
+                    },
+                },
+                ensure_ascii=True,
+            )
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def _in_scope(self, scope: str):
+        prefix = f"{scope.rstrip('/')}/" if scope and scope != "." else ""
+        with self._lock:
+            files = dict(self._files)  # a background build may be adding
+        for rel in sorted(files):
+            if not prefix or rel.startswith(prefix) or rel == scope:
+                yield rel, files[rel]
+
+    def _source_files(self):
+        root = str(self.root)
+        for dirpath, _, filenames in gitignore.walk(root, rules=_SKIP_RULES):
+            for filename in filenames:
+                ext = os.path.splitext(filename)[1]
+                if ext != ".py" and ext not in _TREE_SITTER_LANGUAGES:
+                    continue
+                abs_path = os.path.join(dirpath, filename)
+                yield os.path.relpath(abs_path, root).replace(os.sep, "/"), abs_path
+
+
+def _names_match(qualname: str, name: str) -> bool:
+    return qualname == name or qualname.endswith("." + name)
+
+
+def _parse_file(abs_path: str, st: os.stat_result) -> _FileEntry:
+    empty = _FileEntry(st.st_mtime_ns, st.st_size, [], {})
+    if st.st_size > _MAX_PARSED_BYTES:
+        return empty
+    ext = os.path.splitext(abs_path)[1]
+    if ext == ".py":
+        parse = python_symbols
+    else:
+        parser = _tree_sitter_parser(_TREE_SITTER_LANGUAGES[ext])
+        if parser is None:
+            return empty
+
+        def parse(source):
+            return tree_sitter_symbols(source, parser)
+
+    try:
+        with open(abs_path, "rb") as f:
+            source = f.read()
+        symbols, refs = parse(source)
+    except (OSError, SyntaxError, ValueError, RecursionError) as e:
+        logger.debug(f"Symbol index skipped {abs_path}: {e}")
+        return empty
+    return _FileEntry(st.st_mtime_ns, st.st_size, symbols, refs)
+
+
+_INDEXES: dict[str, SymbolIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_for(root) -> SymbolIndex:
+    """The loaded symbol index of project ``root``, read from disk on first use."""
+    key = str(Path(root).resolve())
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = SymbolIndex(key)
+            index.load()
+            _INDEXES[key] = index
+        return index
+
+
+# ---------------------------------------------------------------------------
+# Tool
+# ---------------------------------------------------------------------------
+
+
+def find_symbol(
+    project_ctx: ProjectContext,
+    action: str,
+    name: str | None = None,
+    path: str = ".",
+    max_results: int = 50,
+) -> str:
+    """
+    Answer definition, reference and outline queries from the symbol index.
+    'path' scopes definition/references to a directory or file; for outline
+    it names the file (or directory) to outline.
+    """
+    if action not in _ACTIONS:
+        return ToolError(
+            f"Error: Invalid action '{action}'. Must be one of: {', '.join(_ACTIONS)}",
+            "validation",
+        )
+    if action != "outline" and not name:
+        return ToolError(f"Error: 'name' is required for action={action}.", "validation")
+    try:
+        abs_path = project_ctx.validate_path(path)
+        if not abs_path.exists():
+            return ToolError(
+                f"Error: '{project_ctx.to_relative(abs_path)}' does not exist.", "validation"
+            )
+        scope = "" if abs_path == project_ctx.root else project_ctx.to_relative(abs_path)
+        scope = scope.replace(os.sep, "/")
+        index = index_for(project_ctx.root)
+        complete = index.refresh(budget=_REFRESH_BUDGET)
+        if action == "definition":
+            text = _render_definitions(index, name, scope, max_results)
+        elif action == "references":
+            text = _render_references(index, project_ctx, name, scope, max_results)
+        else:
+            text = _render_outline(index, scope, abs_path.is_dir(), max_results)
+        if not complete:
+            text += (
+                f"\n[The symbol index is still being built ({len(index.files_in(''))} "
+                f"files so far); results may be incomplete. Query again shortly, "
+                f"or use search_codebase.]"
+            )
+        return ToolSuccess(text)
+    except ValueError as e:
+        return ToolError(f"Security Error: {str(e)}", "security")
+    except Exception as e:
+        return ToolError(f"Error querying symbols: {str(e)}", "execution")
+
+
+def _render_definitions(index: SymbolIndex, name: str, scope: str, max_results: int) -> str:
+    found = index.definitions(name, scope)
+    lines = ["=== SYMBOL DEFINITIONS ===", f'Symbol: "{name}"']
+    if not found:
+        lines.append("No definitions found in indexed files.")
+        lines.append(_COVERAGE_NOTE)
+        lines.append("=== END SYMBOL DEFINITIONS ===")
+        return "\n".join(lines)
+    lines.append(f"Definitions found: {len(found)}")
+    lines.append("")
+    for rel, symbol in found[:max_results]:
+        lines.append(f"{rel}:{symbol.line}-{symbol.end_line} ({symbol.kind} {symbol.qualname})")
+        lines.append(f"    {symbol.signature}")
+    if len(found) > max_results:
+        lines.append("")
+        lines.append(
+            f"[Results truncated: showing first {max_results} of {len(found)} "
+            f"definitions. Narrow with 'path' or a dotted name like 'Class.method'.]"
+        )
+    lines.append("\n=== END SYMBOL DEFINITIONS ===")
+    return "\n".join(lines)
+
+
+def _render_references(
+    index: SymbolIndex, project_ctx: ProjectContext, name: str, scope: str, max_results: int
+) -> str:
+    found = index.references(name, scope)
+    lines = ["=== SYMBOL REFERENCES ===", f'Symbol: "{name}"']
+    if not found:
+        lines.append("No references found in indexed files.")
+        lines.append(_COVERAGE_NOTE)
+        lines.append("=== END SYMBOL REFERENCES ===")
+        return "\n".join(lines)
+    files = sorted({rel for rel, _ in found})
+    lines.append(f"References found: {len(found)} in {len(files)} file(s)")
+    current = None
+    source: list[str] = []
+    for rel, line in found[:max_results]:
+        if rel != current:
+            current = rel
+            lines.append("")
+            lines.append(f"FILE: {rel}")
+            try:
+                source = file_cache.read_lines(project_ctx.root / rel)
+            except (OSError, UnicodeDecodeError):
+                source = []
+        text = source[line - 1].strip() if line <= len(source) else ""
+        lines.append(f"Line {line}: {text}")
+    if len(found) > max_results:
+        lines.append("")
+        lines.append(
+            f"[Results truncated: showing first {max_results} of {len(found)} "
+            f"references. Narrow with 'path'.]"
+        )
+    lines.append("\n=== END SYMBOL REFERENCES ===")
+    return "\n".join(lines)
+
+
+def _render_outline(index: SymbolIndex, scope: str, is_dir: bool, max_results: int) -> str:
+    lines = [f"=== OUTLINE: {scope or '.'} ==="]
+    if is_dir:
+        # One line per top-level definition of every file in the directory.
+        shown = 0
+        total = 0
+        for rel in index.files_in(scope):
+            top = [s for s in index.outline(rel) if "." not in s.qualname]
+            total += len(top)
+            if not top or shown >= max_results:
+                continue
+            lines.append(f"FILE: {rel}")
+            for symbol in top[: max_results - shown]:
+                lines.append(f"  {symbol.line}: {symbol.signature}")
+            shown += min(len(top), max_results - shown)
+        if total > shown:
+            lines.append(
+                f"[Outline truncated: showing {shown} of {total} top-level "
+                f"definitions. Outline a subdirectory or a single file.]"
+            )
+    else:
+        symbols = index.outline(scope)
+        if symbols is None:
+            lines.append("File is not indexed (not a Python source, or no parser for its language).")
+        elif not symbols:
+            lines.append("No definitions.")
+        for symbol in (symbols or [])[:max_results]:
+            indent = "  " * (symbol.qualname.count(".") + 1)
+            lines.append(f"{indent}{symbol.line}-{symbol.end_line}: {symbol.signature}")
+        if symbols and len(symbols) > max_results:
+            lines.append(f"[Outline truncated: showing {max_results} of {len(symbols)} definitions.]")
+    lines.append("=== END OUTLINE ===")
+    return "\n".join(lines)
+
+
+_COVERAGE_NOTE = (
+    "The index covers Python files, and other languages when tree-sitter "
+    "grammars are installed; use search_codebase for anything else."
+)
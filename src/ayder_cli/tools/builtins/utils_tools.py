@@ -4,93 +4,26 @@ Utility tools for ayder-cli.
 
 import logging
 import secrets
-import shutil
-import subprocess
-from pathlib import Path
 
 from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.project_tree import tree_for
 from ayder_cli.core.result import ToolSuccess, ToolError
 
 logger = logging.getLogger(__name__)
 
 
-def get_project_structure(project_ctx: ProjectContext, max_depth: int = 3) -> str:
-    """Generate a tree-style project structure summary using project root."""
-    tree_path = shutil.which("tree")
-
-    if tree_path:
-        cmd = [
-            tree_path,
-            "-L",
-            str(max_depth),
-            "-I",
-            "__pycache__|*.pyc|*.egg-info|.venv|.ayder|.claude|htmlcov|dist|build",
-            "--charset",
-            "ascii",
-            "--noreport",
-        ]
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=5,
-                cwd=str(project_ctx.root),
-            )
-            if result.returncode == 0:
-                return ToolSuccess(result.stdout.strip())
-        except Exception:
-            pass
-
-    # Fallback to manual tree generation
-    return ToolSuccess(_generate_manual_tree(project_ctx, max_depth))
-
-
-def _generate_manual_tree(project_ctx: ProjectContext, max_depth: int = 3) -> str:
-    """Fallback manual tree generator using project root."""
-    IGNORE_DIRS = {
-        "__pycache__",
-        ".venv",
-        ".ayder",
-        ".claude",
-        ".git",
-        "htmlcov",
-        "dist",
-        "build",
-        "node_modules",
-    }
-    IGNORE_PATTERNS = {".pyc", ".egg-info"}
-
-    def should_ignore(name):
-        return name in IGNORE_DIRS or any(name.endswith(p) for p in IGNORE_PATTERNS)
-
-    lines = [project_ctx.root.name or "."]
-
-    def walk_dir(path, prefix="", depth=0):
-        if depth >= max_depth:
-            return
-        try:
-            entries = sorted(Path(path).iterdir())
-        except (PermissionError, FileNotFoundError):
-            return
-
-        dirs = [e.name for e in entries if e.is_dir() and not should_ignore(e.name)]
-        files = [e.name for e in entries if e.is_file() and not should_ignore(e.name)]
-
-        for i, d in enumerate(dirs):
-            is_last_dir = (i == len(dirs) - 1) and len(files) == 0
-            connector = "`-- " if is_last_dir else "|-- "
-            lines.append(f"{prefix}{connector}{d}/")
-            new_prefix = prefix + ("    " if is_last_dir else "|   ")
-            walk_dir(Path(path) / d, new_prefix, depth + 1)
-
-        for i, f in enumerate(files):
-            is_last = i == len(files) - 1
-            connector = "`-- " if is_last else "|-- "
-            lines.append(f"{prefix}{connector}{f}")
-
-    walk_dir(project_ctx.root)
-    return "\n".join(lines)
+def get_project_structure(
+    project_ctx: ProjectContext,
+    max_depth: int = 3,
+    max_files_per_dir: int | None = None,
+) -> str:
+    """Generate a tree-style project structure summary using project root.
+
+    Served from the shared ProjectTree, which honors .gitignore and re-reads
+    only directories that changed since the last call.
+    """
+    tree = tree_for(project_ctx.root)
+    return ToolSuccess(tree.render(max_depth=max_depth, max_files=max_files_per_dir))
 
 
 def manage_environment_vars(
@@ -13,6 +13,8 @@ import pkgutil
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Tuple
 
+from ayder_cli.tools.validator import ToolArgumentValidator, compile_validator
+
 logger = logging.getLogger(__name__)
 
 
@@ -192,6 +194,11 @@ TOOL_DEFINITIONS_BY_NAME: Dict[str, ToolDefinition] = {
     td.name: td for td in TOOL_DEFINITIONS
 }
 
+# Argument schemas compiled once at discovery; see tools/validator.py.
+TOOL_VALIDATORS: Dict[str, ToolArgumentValidator] = {
+    td.name: compile_validator(td) for td in TOOL_DEFINITIONS
+}
+
 
 def register_dynamic_definition(td: ToolDefinition) -> None:
     """Add a dynamically registered tool to the name lookup.
@@ -200,3 +207,20 @@ def register_dynamic_definition(td: ToolDefinition) -> None:
     SchemaValidator can validate dynamic tools like agent.
     """
     TOOL_DEFINITIONS_BY_NAME[td.name] = td
+    TOOL_VALIDATORS[td.name] = compile_validator(td)
+
+
+def get_validator(tool_name: str) -> Optional[ToolArgumentValidator]:
+    """Return the compiled validator for the definition currently registered
+    under ``tool_name``, or None for unknown tools.
+
+    A definition swapped into TOOL_DEFINITIONS_BY_NAME directly is compiled
+    on first use.
+    """
+    td = TOOL_DEFINITIONS_BY_NAME.get(tool_name)
+    if td is None:
+        return None
+    validator = TOOL_VALIDATORS.get(tool_name)
+    if validator is None or validator.definition is not td:
+        validator = TOOL_VALIDATORS[tool_name] = compile_validator(td)
+    return validator
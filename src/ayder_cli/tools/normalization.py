@@ -4,7 +4,8 @@ Extracted from tools/registry.py. Single responsibility: transform raw LLM
 arguments into validated, absolute-path-resolved, correctly-typed dicts.
 """
 
-from ayder_cli.tools.definition import TOOL_DEFINITIONS, TOOL_DEFINITIONS_BY_NAME
+from ayder_cli.tools.definition import TOOL_DEFINITIONS, get_validator
+from ayder_cli.tools.validator import apply_aliases, resolve_paths
 from ayder_cli.core.context import ProjectContext
 
 # Generated at import time from ToolDefinitions — keyed by tool name
@@ -31,6 +32,9 @@ def normalize_arguments(
        (also validates the path is inside the project sandbox).
     3. Coerce string values to int for integer-typed parameters.
 
+    The steps run from the tool's compiled validator (tools/validator.py);
+    tools without a definition only get the alias and path steps.
+
     Args:
         tool_name: Name of the tool being called.
         arguments: Raw argument dict from the LLM.
@@ -42,45 +46,11 @@ def normalize_arguments(
     Raises:
         ValueError: If a path parameter resolves outside the project sandbox.
     """
-    normalized = dict(arguments)  # copy to avoid mutating caller's dict
-    td = TOOL_DEFINITIONS_BY_NAME.get(tool_name)
-    parameter_aliases = (
-        dict(td.parameter_aliases)
-        if td is not None
-        else PARAMETER_ALIASES.get(tool_name, {})
-    )
-    path_parameters = (
-        list(td.path_parameters)
-        if td is not None
-        else PATH_PARAMETERS.get(tool_name, [])
-    )
-
-    # Step 1: Apply aliases
-    for alias, canonical in parameter_aliases.items():
-        if alias in normalized and canonical not in normalized:
-            normalized[canonical] = normalized.pop(alias)
-
-    # Step 2: Resolve path parameters to absolute (validates sandbox)
-    for param_name in path_parameters:
-        if param_name in normalized and normalized[param_name]:
-            try:
-                validated_path = project_ctx.validate_path(normalized[param_name])
-                normalized[param_name] = str(validated_path)
-            except ValueError:
-                raise  # security error — propagate to caller
-
-    # Step 3: Type coercion (string → int for integer-typed parameters)
-    if td:
-        props = td.parameters.get("properties", {})
-        for key, schema in props.items():
-            if (
-                schema.get("type") == "integer"
-                and key in normalized
-                and isinstance(normalized[key], str)
-            ):
-                try:
-                    normalized[key] = int(normalized[key])
-                except ValueError:
-                    pass  # keep as string; validation will catch it later
+    validator = get_validator(tool_name)
+    if validator is not None:
+        return validator.normalize(arguments, project_ctx)
 
+    normalized = dict(arguments)  # copy to avoid mutating caller's dict
+    apply_aliases(normalized, tuple(PARAMETER_ALIASES.get(tool_name, {}).items()))
+    resolve_paths(normalized, tuple(PATH_PARAMETERS.get(tool_name, ())), project_ctx)
     return normalized
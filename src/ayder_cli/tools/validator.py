@@ -0,0 +1,135 @@
+"""Compiled per-tool argument validators.
+
+A ToolDefinition describes its arguments as an OpenAI JSON-schema dict plus
+alias and path-parameter tuples. Re-reading those on every call means walking
+``parameters["properties"]`` and rebuilding alias dicts once in the chat loop's
+required-argument check, once in SchemaValidator and once more in
+normalize_arguments. ``compile_validator`` does that walk once per definition
+(at discovery time, see ``definition.TOOL_VALIDATORS``) and keeps only what
+the checks need: the required names, the integer/string-typed properties,
+the aliases and the path parameters.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from ayder_cli.core.context import ProjectContext
+    from ayder_cli.tools.definition import ToolDefinition
+
+# Property types that are checked (and, for integers, coerced from strings).
+_CHECKED_TYPES = ("integer", "string")
+
+
+@dataclass(frozen=True)
+class ToolArgumentValidator:
+    """Pre-digested argument schema of one ToolDefinition."""
+
+    definition: "ToolDefinition"
+    required: Tuple[str, ...]
+    types: Dict[str, str]  # property name → "integer" | "string"
+    aliases: Tuple[Tuple[str, str], ...]
+    path_parameters: Tuple[str, ...]
+
+    def missing(self, arguments: dict) -> list[str]:
+        """Required arguments that are absent, None or blank strings."""
+        missing = []
+        for name in self.required:
+            value = arguments.get(name)
+            if value is None or (isinstance(value, str) and not value.strip()):
+                missing.append(name)
+        return missing
+
+    def coerce(self, arguments: dict) -> None:
+        """Convert numeric strings to int for integer-typed arguments, in place.
+
+        Unconvertible strings are left alone for ``check`` to report.
+        """
+        types = self.types
+        for name, value in arguments.items():
+            if isinstance(value, str) and types.get(name) == "integer":
+                try:
+                    arguments[name] = int(value)
+                except ValueError:
+                    pass
+
+    def check(self, arguments: dict) -> Optional[Tuple[str, str]]:
+        """Coerce and validate ``arguments`` in place in one pass.
+
+        Returns:
+            ``None`` when valid, else ``(field, message)`` for the first
+            problem found.
+        """
+        for name in self.required:
+            if arguments.get(name) is None:
+                return name, f"required argument '{name}' is missing or empty"
+
+        types = self.types
+        for name, value in arguments.items():
+            expected = types.get(name)
+            if expected is None:
+                continue
+            if expected == "integer":
+                if isinstance(value, str):
+                    try:
+                        value = arguments[name] = int(value)
+                    except ValueError:
+                        pass  # reported below
+                if not isinstance(value, int):
+                    return name, f"'{name}' must be integer, got {type(value).__name__}"
+            elif not isinstance(value, str):
+                return name, f"'{name}' must be string, got {type(value).__name__}"
+        return None
+
+    def normalize(self, arguments: dict, project_ctx: "ProjectContext") -> dict:
+        """Apply aliases, resolve path parameters and coerce integers.
+
+        Returns a copy; ``arguments`` is not mutated.
+
+        Raises:
+            ValueError: If a path parameter resolves outside the project sandbox.
+        """
+        normalized = dict(arguments)
+        apply_aliases(normalized, self.aliases)
+        resolve_paths(normalized, self.path_parameters, project_ctx)
+        self.coerce(normalized)
+        return normalized
+
+
+def apply_aliases(arguments: dict, aliases: Tuple[Tuple[str, str], ...]) -> None:
+    """Rename aliased keys to their canonical name unless it is already set."""
+    for alias, canonical in aliases:
+        if alias in arguments and canonical not in arguments:
+            arguments[canonical] = arguments.pop(alias)
+
+
+def resolve_paths(
+    arguments: dict, path_parameters: Tuple[str, ...], project_ctx: "ProjectContext"
+) -> None:
+    """Replace path arguments with absolute, sandbox-validated paths.
+
+    Raises:
+        ValueError: If a path resolves outside the project sandbox.
+    """
+    for name in path_parameters:
+        if arguments.get(name):
+            arguments[name] = str(project_ctx.validate_path(arguments[name]))
+
+
+def compile_validator(td: "ToolDefinition") -> ToolArgumentValidator:
+    """Build the validator for one ToolDefinition."""
+    params: Dict[str, Any] = td.parameters or {}
+    properties = params.get("properties", {})
+    return ToolArgumentValidator(
+        definition=td,
+        required=tuple(params.get("required", ())),
+        types={
+            name: schema["type"]
+            for name, schema in properties.items()
+            if isinstance(schema, dict) and schema.get("type") in _CHECKED_TYPES
+        },
+        aliases=tuple(td.parameter_aliases),
+        path_parameters=tuple(td.path_parameters),
+    )
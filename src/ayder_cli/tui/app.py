@@ -22,6 +22,7 @@ import uuid
 from ayder_cli.application.execution_policy import ExecutionPolicy, ToolRequest
 from ayder_cli.application.runtime_factory import create_runtime
 from ayder_cli.core.config import Config
+from ayder_cli.core.file_cache import file_cache
 from ayder_cli.logging_config import (
     get_effective_log_level,
     is_logging_configured,
@@ -52,6 +53,7 @@ from ayder_cli.tui.widgets import (
 )
 from ayder_cli.tui.commands import COMMAND_MAP, do_clear
 from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.loops.reasoning_budget import configured_efforts
 
 logger = logging.getLogger(__name__)
 
@@ -297,6 +299,7 @@ class AyderApp(App):
         self.registry = rt.tool_registry
         self.registry.app = self
         self.context_manager = rt.context_manager
+        self._residency = rt.residency
         self._pending_compact: dict | None = None
 
         # Wire up debug logging for verbose mode
@@ -367,6 +370,7 @@ class AyderApp(App):
                 max_concurrent_agents=getattr(self.config, 'max_concurrent_agents', 5),
                 on_progress=_agent_progress,
                 on_complete=_agent_complete,
+                residency=self._residency,
             )
 
             # Register agent tool
@@ -418,6 +422,7 @@ class AyderApp(App):
             raw_tags = getattr(self.config, "tool_tags", ["core", "metadata"])
             tool_tags_list = list(raw_tags) if raw_tags is not None else []
         tool_tags = frozenset(tool_tags_list) if tool_tags_list else None
+        user_turn_effort, tool_turn_effort = configured_efforts(self.config)
         # Auto-enable installed plugins so they work without a manual /plugin toggle.
         from ayder_cli.tools import plugin_status
         from ayder_cli.tools.definition import _GLOBAL_PLUGIN_DEFS
@@ -438,6 +443,10 @@ class AyderApp(App):
                 permissions=self.permissions,
                 tool_tags=tool_tags,
                 max_history=getattr(self.config, 'max_history_messages', 0),
+                pipelined_turns=getattr(self.config, 'pipelined_turns', True),
+                adaptive_output_tokens=getattr(self.config, 'adaptive_output_tokens', True),
+                user_turn_effort=user_turn_effort,
+                tool_turn_effort=tool_turn_effort,
             ),
             callbacks=self._callbacks,
             context_manager=self.context_manager,
@@ -614,7 +623,7 @@ class AyderApp(App):
                     return "\n".join(f"+{line}" for line in new_content.split("\n"))
                 return None
 
-            original = path.read_text(encoding="utf-8")
+            original = file_cache.read_text(path)
             original_lines = original.splitlines(keepends=True)
 
             if operation == "write":
@@ -639,6 +648,11 @@ class AyderApp(App):
                 if 0 <= idx < len(lines):
                     lines.pop(idx)
                 new_lines = lines
+            elif operation == "multi_edit":
+                from ayder_cli.tools.builtins.filesystem import apply_edits
+
+                new_content, _ = apply_edits(original, path.name, arguments.get("edits") or [])
+                new_lines = new_content.splitlines(keepends=True)
             else:
                 return None
 
@@ -709,6 +723,10 @@ class AyderApp(App):
             self._agent_registry.set_loop(asyncio.get_running_loop())
             self.set_interval(1.0, self._maybe_nudge)   # recovery fallback (spec §7)
 
+        if self._residency is not None:
+            agent_models = self._agent_registry.warm_models() if self._agent_registry else []
+            self._residency.warm_in_background([*agent_models, self.model])
+
         # Show the banner as scrollable content in the chat view
         chat_view = self.query_one("#chat-view", ChatView)
         banner = create_tui_banner(self.model)
@@ -954,6 +972,7 @@ class AyderApp(App):
         """UI teardown after a turn fully exits; the consumer pulls the next one."""
         self._maybe_stop_activity_timer()
         try:
+            self.query_one("#chat-view", ChatView).finish_assistant_message()
             self.query_one("#activity-bar", ActivityBar).clear()
             self.query_one("#input-bar", CLIInputBar).focus_input()
         except Exception:
@@ -10,6 +10,7 @@ import asyncio
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
+from ayder_cli.application.runtime_factory import residency_for
 from ayder_cli.core.config import list_provider_profiles, load_config_for_provider
 from ayder_cli.core.context import ProjectContext
 from ayder_cli.logging_config import LOG_LEVELS, setup_logging
@@ -116,8 +117,11 @@ def _apply_provider_switch(
         app.chat_loop.config.model = new_config.model
         app.chat_loop.config.num_ctx = new_config.num_ctx
         app.update_system_prompt_model()
+        app._residency = residency_for(new_config)
+        _warm_model(app, new_config.model)
         _agent_reg = getattr(app, "_agent_registry", None)
         if _agent_reg is not None:
+            _agent_reg.set_residency(app._residency)
             _agent_reg.new_generation()
 
         status_bar = app.query_one("#status-bar", StatusBar)
@@ -130,6 +134,13 @@ def _apply_provider_switch(
     app.request_turn(prepare=_prepare, run_loop=False)
 
 
+def _warm_model(app: "AyderApp", model: str) -> None:
+    """Preload a newly selected Ollama model so the next turn skips the cold load."""
+    residency = getattr(app, "_residency", None)
+    if residency is not None:
+        residency.warm_in_background([model])
+
+
 async def _list_and_show_models(app: AyderApp, chat_view: ChatView) -> None:
     """Async helper to list models and show selector."""
     try:
@@ -147,6 +158,7 @@ async def _list_and_show_models(app: AyderApp, chat_view: ChatView) -> None:
                     app.model = new_model
                     app.chat_loop.config.model = new_model
                     app.update_system_prompt_model()
+                    _warm_model(app, new_model)
                     _agent_reg = getattr(app, "_agent_registry", None)
                     if _agent_reg is not None:
                         _agent_reg.new_generation()
@@ -181,6 +193,7 @@ def handle_model(app: AyderApp, args: str, chat_view: ChatView) -> None:
             app.model = new_model
             app.chat_loop.config.model = new_model
             app.update_system_prompt_model()
+            _warm_model(app, new_model)
             _agent_reg = getattr(app, "_agent_registry", None)
             if _agent_reg is not None:
                 _agent_reg.new_generation()
@@ -10,15 +10,23 @@ from textual.message import Message
 from textual.reactive import reactive
 from textual.suggester import SuggestFromList
 from textual.widgets import Static, Input, Label, TextArea
+from textual.worker import get_current_worker
 from rich.text import Text
 from rich.markdown import Markdown
 from rich.spinner import Spinner
 from rich.style import Style
 
+from ayder_cli.core.display_filter import ALL_DISPLAY_TAGS, StreamingDisplayFilter
+from ayder_cli.core.path_index import index_for
+from ayder_cli.core.project_tree import tree_for
 from ayder_cli.parser import content_processor
 from ayder_cli.tui.rendering import markup_or_plain
 from ayder_cli.tui.types import MessageType
 
+# Characters of markup hidden while a message streams before an unclosed
+# block is shown as text; the final render cleans up whatever is left.
+_MAX_HIDDEN_MARKUP = 4096
+
 
 def _sanitize_for_assistant_render(content: str) -> str:
     """Strip tool-call XML markup from assistant content before it is rendered
@@ -29,12 +37,19 @@ def _sanitize_for_assistant_render(content: str) -> str:
     XML tags in msg.content. When a provider leaks such tags, this helper
     removes them from the rendered view so the chat display stays clean.
     Stored message history is never mutated — only the rendered form.
+
+    ChatView filters streamed messages chunk by chunk with a
+    StreamingDisplayFilter and renders the finished message with this.
     """
     if not content:
         return content
     return content_processor.strip_for_display(content)
 
 
+def _assistant_filter() -> StreamingDisplayFilter:
+    return StreamingDisplayFilter(ALL_DISPLAY_TAGS, max_hidden=_MAX_HIDDEN_MARKUP)
+
+
 class ChatView(VerticalScroll):
     """
     CLI-style chat display.
@@ -46,6 +61,8 @@ class ChatView(VerticalScroll):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._message_widgets: list[Static] = []
+        # Display filter of the assistant message currently streaming
+        self._assistant_filter: StreamingDisplayFilter | None = None
         self._thinking_visible: bool = False
         self._follow_mode: bool = True
 
@@ -125,9 +142,11 @@ class ChatView(VerticalScroll):
                 last_widget = self._message_widgets[-1]
 
                 if msg_type == MessageType.ASSISTANT:
-                    last_widget.update(
-                        Markdown(_sanitize_for_assistant_render(full_content).strip())
-                    )
+                    # Only the new chunk is filtered, not the whole message.
+                    if self._assistant_filter is None:
+                        self._assistant_filter = _assistant_filter()
+                    self.messages[-1]["display"] += self._assistant_filter.feed(content)[0]
+                    last_widget.update(Markdown(self.messages[-1]["display"].strip()))
                 else:
                     text = self._create_text(full_content, msg_type, metadata)
                     if text:
@@ -136,15 +155,18 @@ class ChatView(VerticalScroll):
                     self.scroll_end(animate=False)
                 return
 
+        self.finish_assistant_message()
         self.messages.append(
             {"content": content, "type": msg_type, "metadata": metadata}
         )
 
         if msg_type == MessageType.ASSISTANT:
-            content = _sanitize_for_assistant_render(content).strip()
+            self._assistant_filter = _assistant_filter()
+            display = self._assistant_filter.feed(content)[0]
+            self.messages[-1]["display"] = display
 
             content_widget = Static(
-                Markdown(content), classes=f"message {msg_type.value}"
+                Markdown(display.strip()), classes=f"message {msg_type.value}"
             )
             self._message_widgets.append(content_widget)
             self.mount(content_widget)
@@ -161,6 +183,18 @@ class ChatView(VerticalScroll):
         if self._follow_mode:
             self.scroll_end(animate=False)
 
+    def finish_assistant_message(self) -> None:
+        """Render the finished assistant message with the full cleanup pass."""
+        if self._assistant_filter is None:
+            return
+        self._assistant_filter = None
+        if self.messages and self.messages[-1]["type"] == MessageType.ASSISTANT:
+            message = self.messages[-1]
+            display = _sanitize_for_assistant_render(message["content"])
+            if display != message["display"]:
+                message["display"] = display
+                self._message_widgets[-1].update(Markdown(display.strip()))
+
     def add_user_message(self, content: str) -> None:
         """Add a user message."""
         self.add_message(content, MessageType.USER)
@@ -183,6 +217,7 @@ class ChatView(VerticalScroll):
             widget.remove()
         self._message_widgets.clear()
         self.messages.clear()
+        self._assistant_filter = None
 
 
 class ToolPanel(Container):
@@ -506,6 +541,8 @@ class _SubmitTextArea(TextArea):
 
     _PASTE_THRESHOLD = 3
     _FILE_PICKER_LIMIT = 8
+    # Seconds a fuzzy search trusts the path index before refreshing it.
+    _FILE_INDEX_MAX_AGE = 2.0
     _FILE_REFERENCE_STYLE = Style(color="cyan", bold=True, underline=True)
 
     def __init__(self, commands: list[str] | None = None, **kwargs):
@@ -519,6 +556,9 @@ class _SubmitTextArea(TextArea):
         self._file_picker_index = 0
         self._file_picker_token: tuple[int, int, str] | None = None
         self._file_picker_root = Path.cwd().resolve()
+        # Bumped on every picker refresh; fuzzy results for an older one are
+        # dropped.
+        self._file_picker_seq = 0
         # Ordered (marker, content) pairs for collapsed pastes. Markers are
         # shown inline in the textarea; on submit they are expanded back to
         # their full content in place, preserving any surrounding typed text.
@@ -532,6 +572,9 @@ class _SubmitTextArea(TextArea):
         self._file_picker_widget = Static("", id="file-picker")
         self._file_picker_widget.display = False
         self.mount(self._file_picker_widget)
+        self.run_worker(
+            self._build_file_index, thread=True, group="file-index", exit_on_error=False
+        )
 
     def on_text_area_changed(self, event: TextArea.Changed) -> None:
         if self._placeholder_widget:
@@ -690,28 +733,23 @@ class _SubmitTextArea(TextArea):
             parent_text = normalized.rstrip("/")
             filter_text = ""
 
-        parent = self._file_picker_root / parent_text if parent_text else self._file_picker_root
-        if not self._path_within_picker_root(parent) or not parent.is_dir():
+        parent_text = "/".join(p for p in parent_text.split("/") if p not in ("", "."))
+        listing = tree_for(self._file_picker_root).entries(parent_text)
+        if listing is None:
             return []
+        prefix = f"{parent_text}/" if parent_text else ""
 
         include_hidden = filter_text.startswith(".")
         entries: list[tuple[bool, str]] = []
-        try:
-            children = list(parent.iterdir())
-        except OSError:
-            return []
-
-        for child in children:
-            name = child.name
-            if name.startswith(".") and not include_hidden:
-                continue
-            if filter_text and not name.startswith(filter_text):
-                continue
-            if not self._path_within_picker_root(child):
-                continue
-            rel = child.relative_to(self._file_picker_root).as_posix()
-            is_dir = child.is_dir()
-            entries.append((is_dir, f"{rel}/" if is_dir else rel))
+        dirnames, filenames = listing
+        for is_dir, names in ((True, dirnames), (False, filenames)):
+            for name in names:
+                if name.startswith(".") and not include_hidden:
+                    continue
+                if filter_text and not name.startswith(filter_text):
+                    continue
+                rel = f"{prefix}{name}"
+                entries.append((is_dir, f"{rel}/" if is_dir else rel))
 
         entries.sort(key=lambda item: (not item[0], item[1].casefold()))
         return [entry for _is_dir, entry in entries[: self._FILE_PICKER_LIMIT]]
@@ -734,22 +772,117 @@ class _SubmitTextArea(TextArea):
 
     def _close_file_picker(self) -> None:
         """Close and reset the @ file picker."""
+        self._file_picker_seq += 1
         self._file_picker_suggestions = []
         self._file_picker_index = 0
         self._file_picker_token = None
         self._render_file_picker()
 
     def _refresh_file_picker(self) -> None:
-        """Refresh @ file suggestions based on the current cursor token."""
+        """Refresh @ file suggestions based on the current cursor token.
+
+        Entries of the token's directory are shown at once; fuzzy matches
+        from the whole project follow from a background search.
+        """
         token = self._file_token_at_cursor()
         if token is None:
             self._close_file_picker()
             return
         suggestions = self._file_picker_entries(token[2])
-        if not suggestions:
+        if suggestions:
+            self._file_picker_seq += 1
+            self._file_picker_token = token
+            self._file_picker_suggestions = suggestions
+            self._file_picker_index = min(
+                self._file_picker_index, len(suggestions) - 1
+            )
+            self._render_file_picker()
+        else:
             self._close_file_picker()
+        if len(suggestions) < self._FILE_PICKER_LIMIT:
+            self._start_file_search(token[2], suggestions)
+
+    @staticmethod
+    def _fuzzy_file_query(token: str) -> str | None:
+        """The path index query for an @ token, or None if it has none."""
+        normalized = token.replace("\\", "/")
+        if not normalized or normalized.endswith("/"):
+            return None
+        if normalized.startswith("/") or ".." in Path(normalized).parts:
+            return None
+        if normalized.rpartition("/")[2].startswith("."):
+            return None  # the index leaves hidden entries out
+        return normalized
+
+    def _start_file_search(self, token: str, entries: list[str]) -> None:
+        """Search the path index for ``token`` off the UI thread."""
+        query = self._fuzzy_file_query(token)
+        if query is None or not self.is_mounted:
+            return
+        seq = self._file_picker_seq
+        self.run_worker(
+            lambda: self._search_file_index(token, query, entries, seq),
+            thread=True,
+            exclusive=True,
+            group="file-picker",
+            exit_on_error=False,
+        )
+
+    def _build_file_index(self) -> None:
+        """Worker: build the path index before the first @ is typed."""
+        worker = get_current_worker()
+        index_for(self._file_picker_root).refresh(
+            cancelled=lambda: worker.is_cancelled
+        )
+
+    def _search_file_index(
+        self, token: str, query: str, entries: list[str], seq: int
+    ) -> None:
+        """Worker: post fuzzy matches for ``query`` as they are found.
+
+        The current index is searched first; a stale one is then refreshed
+        and, if any path changed, searched again.
+        """
+        worker = get_current_worker()
+
+        def cancelled() -> bool:
+            return worker.is_cancelled or seq != self._file_picker_seq
+
+        def post(matches: list[str]) -> None:
+            if not cancelled():
+                self.app.call_from_thread(
+                    self._show_file_matches, seq, token, entries, matches
+                )
+
+        index = index_for(self._file_picker_root)
+        limit = self._FILE_PICKER_LIMIT
+        searched = index.ready
+        if searched:
+            matches = index.search(query, limit, post, cancelled)
+            if matches is None:
+                return
+            post(matches)
+        changed = index.refresh(self._FILE_INDEX_MAX_AGE, cancelled)
+        if changed or not searched:
+            matches = index.search(query, limit, post, cancelled)
+            if matches is not None:
+                post(matches)
+
+    def _show_file_matches(
+        self, seq: int, token: str, entries: list[str], matches: list[str]
+    ) -> None:
+        """Add fuzzy ``matches`` after the directory ``entries`` shown for
+        ``token``, unless the picker has moved on since."""
+        if seq != self._file_picker_seq:
+            return
+        current = self._file_token_at_cursor()
+        if current is None or current[2] != token:
+            return
+        suggestions = entries + [m for m in matches if m not in entries]
+        suggestions = suggestions[: self._FILE_PICKER_LIMIT]
+        if not suggestions:
             return
-        self._file_picker_token = token
+        self._file_picker_token = current
         self._file_picker_suggestions = suggestions
         self._file_picker_index = min(self._file_picker_index, len(suggestions) - 1)
         self._render_file_picker()
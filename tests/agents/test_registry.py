@@ -553,3 +553,88 @@ def test_on_loop_raises_when_loop_unset(registry):
     assert registry._loop is None
     with pytest.raises(RuntimeError, match="loop not set"):
         registry._on_loop(lambda: "should not run")
+
+
+class TestResidencyScheduling:
+    """Agents on the parent's Ollama host wait for their model outside a slot."""
+
+    def _registry(self, residency, agents=None):
+        parent_config = MagicMock()
+        parent_config.model = "parent-model"
+        return AgentRegistry(
+            agents=agents or {
+                "local": AgentConfig(name="local", model="coder:7b"),
+                "inherit": AgentConfig(name="inherit"),
+                "remote": AgentConfig(name="remote", provider="anthropic", model="claude"),
+                "elsewhere": AgentConfig(name="elsewhere", base_url="http://gpu2:11434"),
+            },
+            parent_config=parent_config,
+            project_ctx=MagicMock(),
+            process_manager=MagicMock(),
+            permissions={"r"},
+            agent_timeout=300,
+            residency=residency,
+        )
+
+    def test_resident_model_only_for_agents_on_parent_host(self):
+        reg = self._registry(MagicMock())
+        assert reg.resident_model("local") == "coder:7b"
+        assert reg.resident_model("inherit") == "parent-model"
+        assert reg.resident_model("remote") is None
+        assert reg.resident_model("elsewhere") is None
+        assert reg.warm_models() == ["coder:7b", "parent-model"]
+
+    def test_no_residency_means_no_warm_models(self):
+        reg = self._registry(None)
+        assert reg.resident_model("local") is None
+        assert reg.warm_models() == []
+
+    def test_set_residency_follows_a_provider_switch(self):
+        reg = self._registry(MagicMock())
+        reg.set_residency(None)
+        assert reg.warm_models() == []
+        reg.set_residency(MagicMock())
+        assert reg.resident_model("local") == "coder:7b"
+
+    @pytest.mark.anyio
+    async def test_run_waits_for_model_before_taking_slot(self):
+        events: list[str] = []
+        residency = MagicMock()
+
+        async def wait_until_resident(model, timeout):
+            events.append(f"warm:{model}")
+            return True
+
+        residency.wait_until_resident = AsyncMock(side_effect=wait_until_resident)
+        reg = self._registry(residency)
+        reg.set_loop(asyncio.get_running_loop())
+
+        async def run(task):
+            events.append("run")
+            return AgentRunOutcome("done", "ok", None, None)
+
+        with patch("ayder_cli.agents.registry.AgentRunner") as MockRunner:
+            MockRunner.return_value.agent_name = "local"
+            MockRunner.return_value.run = AsyncMock(side_effect=run)
+            rid = reg.create_run("local", "do it")
+            await reg._runs[rid].done_event.wait()
+
+        assert events == ["warm:coder:7b", "run"]
+        assert reg._runs[rid].status == "done"
+
+    @pytest.mark.anyio
+    async def test_remote_agent_skips_residency_wait(self):
+        residency = MagicMock()
+        residency.wait_until_resident = AsyncMock(return_value=True)
+        reg = self._registry(residency)
+        reg.set_loop(asyncio.get_running_loop())
+
+        with patch("ayder_cli.agents.registry.AgentRunner") as MockRunner:
+            MockRunner.return_value.agent_name = "remote"
+            MockRunner.return_value.run = AsyncMock(
+                return_value=AgentRunOutcome("done", "ok", None, None)
+            )
+            rid = reg.create_run("remote", "do it")
+            await reg._runs[rid].done_event.wait()
+
+        residency.wait_until_resident.assert_not_awaited()
@@ -393,7 +393,11 @@ def test_agent_prompt_uses_final_message_contract_not_summary_block():
     from ayder_cli.agents.config import AgentConfig
     from ayder_cli.application import runtime_factory
     agent_cfg = AgentConfig(name="reporter", system_prompt="Produce a document.")
-    parent = MagicMock(provider="ollama", tool_tags=None, retry=MagicMock(enabled=False))
+    parent = MagicMock(
+        provider="ollama", tool_tags=None,
+        retry=MagicMock(enabled=False), hedge=MagicMock(enabled=False),
+        rate_limit=MagicMock(enabled=False),
+    )
     fake_reg = MagicMock()
     fake_reg.get_system_prompts.return_value = "\n[tools]\n"
     fake_reg.get_schemas.return_value = []
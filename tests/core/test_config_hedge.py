@@ -0,0 +1,53 @@
+"""Config: [hedge] section parses into HedgeConfigSection with defaults."""
+import tomllib
+from io import BytesIO
+
+import pytest
+
+from ayder_cli.core.config import Config, HedgeConfigSection
+
+
+def test_hedge_section_defaults_off():
+    cfg = Config()
+    assert cfg.hedge.enabled is False
+    assert cfg.hedge.fallback_profiles == ()
+    assert cfg.hedge.percentile == 0.95
+
+
+def test_hedge_section_parses_from_toml():
+    toml = b"""
+config_version = "2.0"
+[app]
+provider = "local"
+
+[hedge]
+enabled = true
+fallback_profiles = ["cloud", "backup"]
+percentile = 0.9
+min_delay_seconds = 2.0
+
+[llm.local]
+driver = "ollama"
+model = "x"
+"""
+    cfg = Config(**tomllib.load(BytesIO(toml)))
+    assert cfg.hedge.enabled is True
+    assert cfg.hedge.fallback_profiles == ("cloud", "backup")
+    assert cfg.hedge.percentile == 0.9
+    assert cfg.hedge.min_delay_seconds == 2.0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"percentile": 0.0},
+        {"percentile": 1.5},
+        {"min_samples": 0},
+        {"failure_threshold": 0},
+        {"cooldown_seconds": -1.0},
+        {"min_delay_seconds": 10.0, "max_delay_seconds": 5.0},
+    ],
+)
+def test_hedge_section_rejects_invalid_values(kwargs):
+    with pytest.raises(ValueError):
+        HedgeConfigSection(**kwargs)
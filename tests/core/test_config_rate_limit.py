@@ -0,0 +1,49 @@
+"""Config: [rate_limit] section parses into RateLimitConfigSection with defaults."""
+import tomllib
+from io import BytesIO
+
+import pytest
+
+from ayder_cli.core.config import Config, RateLimitConfigSection
+
+
+def test_rate_limit_section_defaults():
+    cfg = Config()
+    assert cfg.rate_limit.enabled is True
+    assert cfg.rate_limit.requests_per_minute == 0.0
+    assert cfg.rate_limit.initial_concurrency == 8
+
+
+def test_rate_limit_section_parses_from_toml():
+    toml = b"""
+config_version = "2.0"
+[app]
+provider = "openai"
+
+[rate_limit]
+requests_per_minute = 120
+initial_concurrency = 2
+max_concurrency = 4
+
+[llm.openai]
+driver = "openai"
+model = "x"
+"""
+    cfg = Config(**tomllib.load(BytesIO(toml)))
+    assert cfg.rate_limit.requests_per_minute == 120
+    assert cfg.rate_limit.initial_concurrency == 2
+    assert cfg.rate_limit.max_concurrency == 4
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"requests_per_minute": -1},
+        {"min_concurrency": 0},
+        {"initial_concurrency": 20, "max_concurrency": 16},
+        {"min_concurrency": 4, "initial_concurrency": 2},
+    ],
+)
+def test_rate_limit_section_rejects_invalid_bounds(kwargs):
+    with pytest.raises(ValueError):
+        RateLimitConfigSection(**kwargs)
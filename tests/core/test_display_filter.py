@@ -0,0 +1,105 @@
+"""Tests for StreamingDisplayFilter and the per-family tag tables."""
+
+import pytest
+
+from ayder_cli.core.display_filter import (
+    ALL_DISPLAY_TAGS,
+    DEEPSEEK_DISPLAY_TAGS,
+    MINIMAX_DISPLAY_TAGS,
+    THINK_DISPLAY_TAGS,
+    XML_DISPLAY_TAGS,
+    StreamingDisplayFilter,
+)
+
+_DSML = "\uff5c\uff24\uff33\uff2d\uff2c\uff5c"
+
+
+def _run(tags, text, size):
+    display_filter = StreamingDisplayFilter(tags)
+    content, thinking = "", ""
+    for i in range(0, len(text), size):
+        c, t = display_filter.feed(text[i:i + size])
+        content += c
+        thinking += t
+    c, t = display_filter.flush()
+    return content + c, thinking + t
+
+
+@pytest.mark.parametrize(
+    "tags,text,expected",
+    [
+        (
+            XML_DISPLAY_TAGS,
+            "Reading it.\n<tool_call><function=read_file><parameter=file_path>a.py"
+            "</parameter></function></tool_call>\nDone.",
+            "Reading it.\n\nDone.",
+        ),
+        (XML_DISPLAY_TAGS, "a <function=x>b</function> c </function> d", "a  c  d"),
+        (XML_DISPLAY_TAGS, "x <parameter=path>p</parameter> y", "x p y"),
+        (
+            DEEPSEEK_DISPLAY_TAGS,
+            f'Now.<{_DSML}tool_calls>\n<{_DSML}invoke name="x">\n'
+            f'<{_DSML}parameter name="a">1</{_DSML}parameter>\n</{_DSML}invoke>\n'
+            f"</{_DSML}tool_calls> ok",
+            "Now. ok",
+        ),
+        (DEEPSEEK_DISPLAY_TAGS, "leaks </function_calls> mid-prose", "leaks  mid-prose"),
+        (
+            MINIMAX_DISPLAY_TAGS,
+            "]<]minimax[>[hi ]~b]ai there[e~[<minimax:tool_call>x</minimax:tool_call>!",
+            "hi  there!",
+        ),
+        (XML_DISPLAY_TAGS, "if a <b and c > d", "if a <b and c > d"),
+        (XML_DISPLAY_TAGS, "ends with <functi", "ends with <functi"),
+        (ALL_DISPLAY_TAGS, "```python\nprint('<hi>')\n```", "```python\nprint('<hi>')\n```"),
+    ],
+)
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_filter_output_does_not_depend_on_chunking(tags, text, expected, size):
+    assert _run(tags, text, size) == (expected, "")
+
+
+@pytest.mark.parametrize("size", [1, 4, 1000])
+def test_think_body_moves_to_reasoning(size):
+    content, thinking = _run(THINK_DISPLAY_TAGS, "<think>plan it</think>The answer.", size)
+    assert (content, thinking) == ("The answer.", "plan it")
+
+
+def test_unclosed_think_runs_to_end_of_stream():
+    assert _run(THINK_DISPLAY_TAGS, "a<think>still thinking", 5) == ("a", "still thinking")
+
+
+def test_only_a_possible_tag_start_is_held_back():
+    display_filter = StreamingDisplayFilter(ALL_DISPLAY_TAGS)
+    assert display_filter.feed("x" * 5000 + " <tool_c") == ("x" * 5000 + " ", "")
+    assert display_filter.feed("all>hidden") == ("", "")
+    assert display_filter.feed("</tool_call>after") == ("after", "")
+
+
+def test_thinking_channel_passes_through():
+    display_filter = StreamingDisplayFilter(XML_DISPLAY_TAGS)
+    assert display_filter.feed("", "native reasoning") == ("", "native reasoning")
+
+
+def test_stray_tag_without_gt_is_released_as_prose():
+    content, _ = _run(XML_DISPLAY_TAGS, "<function" + " word" * 100, 10)
+    assert content.startswith("<function word")
+
+
+def test_unclosed_block_is_shown_past_max_hidden():
+    display_filter = StreamingDisplayFilter(ALL_DISPLAY_TAGS, max_hidden=20)
+    shown = [
+        display_filter.feed(piece)[0]
+        for piece in ["a <function=read_file>", "b" * 10, "c" * 15, " <tool_call>x</tool_call>!"]
+    ]
+    assert shown == ["a ", "", "<function=read_file>" + "b" * 10 + "c" * 15, " !"]
+
+
+@pytest.mark.parametrize("size", [1, 7, 1000])
+def test_block_unclosed_at_end_of_stream_is_shown_with_max_hidden(size):
+    display_filter = StreamingDisplayFilter(XML_DISPLAY_TAGS, max_hidden=1000)
+    text = "Let me <function=read_file> and more prose"
+    content = "".join(
+        display_filter.feed(text[i:i + size])[0] for i in range(0, len(text), size)
+    )
+    assert content + display_filter.flush()[0] == text
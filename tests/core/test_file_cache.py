@@ -0,0 +1,87 @@
+"""Tests for the shared file content cache."""
+
+import os
+
+import pytest
+
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.file_cache import FileContentCache, file_cache
+from ayder_cli.tools.builtins import filesystem
+
+
+def test_unchanged_file_is_served_from_memory(tmp_path):
+    cache = FileContentCache()
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+
+    assert cache.read_text(path) == "x = 1\n"
+    assert cache.read_text(str(path)) == "x = 1\n"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_file_is_reread(tmp_path):
+    cache = FileContentCache()
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    cache.read_text(path)
+    st = path.stat()
+
+    # Same size and mtime, new inode (an editor's atomic save).
+    replacement = tmp_path / "b.py"
+    replacement.write_text("x = 2\n")
+    os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(replacement, path)
+    assert cache.read_text(path) == "x = 2\n"
+
+    path.write_text("x = 333\n")
+    assert cache.read_text(path) == "x = 333\n"
+    assert cache.hits == 0
+
+
+def test_store_records_what_reading_back_returns(tmp_path):
+    cache = FileContentCache()
+    path = tmp_path / "w.txt"
+    path.write_bytes(b"a\r\nb\n")
+
+    cache.store(path, "a\r\nb\n")
+
+    assert cache.read_text(path) == "a\nb\n"
+    assert cache.hits == 1
+
+
+def test_size_bounds(tmp_path):
+    cache = FileContentCache(max_chars=10, max_entry_chars=6)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_text(name * 4)
+        cache.read_text(tmp_path / name)
+    (tmp_path / "big").write_text("z" * 7)
+    cache.read_text(tmp_path / "big")
+
+    cache.read_text(tmp_path / "c")  # still cached
+    cache.read_text(tmp_path / "a")  # evicted first
+    cache.read_text(tmp_path / "big")  # never cached
+    assert (cache.hits, cache.misses) == (1, 6)
+
+
+def test_undecodable_file_raises_and_is_not_cached(tmp_path):
+    cache = FileContentCache()
+    path = tmp_path / "bin"
+    path.write_bytes(b"\xff\xfe")
+    for _ in range(2):
+        with pytest.raises(UnicodeDecodeError):
+            cache.read_text(path)
+    assert cache.misses == 2
+
+
+def test_read_edit_read_touches_the_disk_once(tmp_path):
+    file_cache.clear()
+    ctx = ProjectContext(str(tmp_path))
+    (tmp_path / "m.py").write_text("def f():\n    return 1\n")
+
+    filesystem.read_file(ctx, "m.py")
+    filesystem.file_editor(ctx, "m.py", "replace", old_string="1", new_string="2")
+    filesystem.file_editor(ctx, "m.py", "insert", line_number=1, content="# top")
+    result = filesystem.read_file(ctx, "m.py")
+
+    assert "1: # top\n2: def f():\n3:     return 2\n" in result
+    assert (file_cache.hits, file_cache.misses) == (3, 1)
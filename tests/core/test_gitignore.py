@@ -0,0 +1,115 @@
+"""Tests for gitignore-style filtering in the built-in file walker."""
+
+import os
+
+import pytest
+
+from ayder_cli.core.gitignore import IgnoreRules, walk
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.log", "a.log", False, True),
+        ("*.log", "deep/dir/a.log", False, True),
+        ("*.log", "a.log.txt", False, None),
+        ("build/", "build", True, True),
+        ("build/", "build", False, None),
+        ("/top.txt", "top.txt", False, True),
+        ("/top.txt", "sub/top.txt", False, None),
+        ("doc/*.md", "doc/a.md", False, True),
+        ("doc/*.md", "doc/sub/a.md", False, None),
+        ("doc/*.md", "x/doc/a.md", False, None),
+        ("**/cache", "a/b/cache", True, True),
+        ("**/cache", "cache", True, True),
+        ("a/**/z", "a/z", False, True),
+        ("a/**/z", "a/b/c/z", False, True),
+        ("out/**", "out/x/y", False, True),
+        ("out/**", "out", True, None),
+        ("file?.[ch]", "file1.c", False, True),
+        ("file[!0-9].c", "file1.c", False, None),
+        ("\\#literal", "#literal", False, True),
+        ("# comment", "# comment", False, None),
+        ("trailing   ", "trailing", False, True),
+    ],
+)
+def test_pattern_semantics(pattern, path, is_dir, expected):
+    assert IgnoreRules([pattern]).match(path, is_dir) is expected
+
+
+def test_last_matching_rule_wins():
+    rules = IgnoreRules(["*.txt", "!keep.txt"])
+    assert rules.match("drop.txt", False) is True
+    assert rules.match("keep.txt", False) is False
+
+
+def _tree(root, files):
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def _listed(root, start=None, **kwargs):
+    found = []
+    for dirpath, _, filenames in walk(root, start, **kwargs):
+        rel = os.path.relpath(dirpath, root)
+        found.extend(name if rel == "." else f"{rel}/{name}" for name in filenames)
+    return found
+
+
+def test_walk_honors_nested_ignore_files_and_hidden_entries(tmp_path):
+    _tree(
+        tmp_path,
+        {
+            ".gitignore": "*.log\nvendor/\n",
+            ".hidden/x.py": "",
+            ".env": "",
+            "a.py": "",
+            "a.log": "",
+            "vendor/lib.py": "",
+            "pkg/.ignore": "!important.log\n",
+            "pkg/important.log": "",
+            "pkg/other.log": "",
+            "pkg/sub/.rgignore": "generated_*\n",
+            "pkg/sub/generated_x.py": "",
+            "pkg/sub/real.py": "",
+        },
+    )
+
+    assert _listed(tmp_path) == ["a.py", "pkg/important.log", "pkg/sub/real.py"]
+    assert ".env" in _listed(tmp_path, hidden=True)
+
+
+def test_walk_from_a_subdirectory_applies_ancestor_rules(tmp_path):
+    _tree(
+        tmp_path,
+        {
+            ".gitignore": "*.tmp\n",
+            ".git/info/exclude": "secret.py\n",
+            "src/a.py": "",
+            "src/a.tmp": "",
+            "src/secret.py": "",
+        },
+    )
+
+    assert _listed(tmp_path, tmp_path / "src") == ["src/a.py"]
+
+
+def test_excluded_directory_contents_cannot_be_reincluded(tmp_path):
+    _tree(tmp_path, {".gitignore": "dist/\n!dist/keep.py\n", "dist/keep.py": ""})
+    assert _listed(tmp_path) == []
+
+
+def test_caller_rules_override_ignore_files(tmp_path):
+    _tree(tmp_path, {".gitignore": "!*.pyc\n", "m.pyc": "", "m.py": ""})
+    assert _listed(tmp_path, rules=IgnoreRules(["*.pyc"])) == ["m.py"]
+
+
+def test_pruning_dirnames_skips_a_subtree(tmp_path):
+    _tree(tmp_path, {"a/x.py": "", "b/y.py": ""})
+    found = []
+    for dirpath, dirnames, filenames in walk(tmp_path):
+        dirnames[:] = [d for d in dirnames if d != "a"]
+        found.extend(filenames)
+    assert found == ["y.py"]
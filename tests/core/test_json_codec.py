@@ -0,0 +1,107 @@
+"""Tests for the JSON backend layer and truncated-JSON repair."""
+
+import json
+import time
+
+import pytest
+
+from ayder_cli.core import json_codec
+from ayder_cli.loops import chat_loop
+
+_DOC = {
+    "file_path": "src/a.py",
+    "edits": [
+        {"old": 'x\n"y"\\z é', "new": "ü" * 3, "n": [1, 2.5, -3e2, True, None]},
+        {"old": "", "new": "A😀", "nested": {"deep": [[], {}]}},
+    ],
+}
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec"])
+def backend(request):
+    previous = json_codec.BACKEND
+    if request.param != "json":
+        pytest.importorskip(request.param)
+    json_codec.use_backend(request.param)
+    yield request.param
+    json_codec.use_backend(previous)
+
+
+def test_backends_round_trip_and_agree_on_errors(backend):
+    assert json_codec.BACKEND == backend
+    text = json_codec.dumps(_DOC)
+    assert "é" in text  # never ASCII-escaped
+    assert json_codec.loads(text) == _DOC
+    assert json.loads(json_codec.dumps(_DOC, indent=2)) == _DOC
+    assert json_codec.loads("NaN") != json_codec.loads("NaN")  # accepted like stdlib
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads('{"a": ')
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        json_codec.use_backend("simplejson")
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ('{"file_path": "x.py", "content": "hel', {"file_path": "x.py", "content": "hel"}),
+        ('{"a": 1, "b', {"a": 1}),
+        ('{"a": 1, "b": ', {"a": 1}),
+        ('{"a": 1, "b": tru', {"a": 1}),
+        ('{"a": [1, 2, {"c": "d', {"a": [1, 2, {"c": "d"}]}),
+        ('{"a": {"b": {"c": [', {"a": {"b": {"c": []}}}),
+        ('{"a": "x\\', {"a": "x"}),
+        ('{"a": "x\\u00', {"a": "x"}),
+        ('{"a": "x\\\\', {"a": "x\\"}),
+        ('{"a": "x\\"y', {"a": 'x"y'}),
+        ('{"a": 12', {"a": 12}),
+        ('{"a": "q"}}}', {"a": "q"}),
+        ('["a", "b', ["a", "b"]),
+        ("", None),
+        ("not json", None),
+    ],
+)
+def test_repair_json(text, expected):
+    assert json_codec.repair_json(text) == expected
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_every_truncation_of_an_object_repairs_to_an_object(ensure_ascii):
+    text = json.dumps(_DOC, ensure_ascii=ensure_ascii)
+    for end in range(1, len(text) + 1):
+        repaired = json_codec.repair_json(text[:end])
+        assert isinstance(repaired, dict), text[:end]
+    assert json_codec.repair_json(text) == _DOC
+
+
+def test_repair_is_linear_in_payload_size():
+    content = "line of code \\\"quoted\\\" \\u00e9\\n" * 100_000
+    text = '{"file_path": "a.py", "content": "' + content + '", "mode": tr'
+    start = time.perf_counter()
+    repaired = json_codec.repair_json(text)
+    assert time.perf_counter() - start < 2.0
+    assert repaired["content"].endswith('"quoted" é\n')
+    assert "mode" not in repaired
+
+
+def test_chat_loop_decodes_arguments_once():
+    raw = json.dumps({"file_path": "a.py", "content": "x" * 1000})
+    chat_loop._DECODED_ARGUMENTS.clear()
+
+    assert chat_loop._expand_concatenated_tool_calls(
+        [{"id": "c1", "type": "function", "function": {"name": "write", "arguments": raw}}]
+    )[0]["function"]["arguments"] is raw
+    first = chat_loop._parse_arguments(raw)
+    first["content"] = "mutated by a validator"
+    second = chat_loop._parse_arguments(raw)
+
+    assert second["content"] == "x" * 1000  # callers get their own copy
+    assert list(chat_loop._DECODED_ARGUMENTS) == [raw]
+
+
+def test_chat_loop_repairs_truncated_arguments():
+    raw = '{"file_path": "a.py", "content": "partial'
+    assert chat_loop._parse_arguments(raw) == {"file_path": "a.py", "content": "partial"}
+    assert chat_loop._parse_arguments('["not", "an object"') == {}
@@ -0,0 +1,653 @@
+"""Parity fuzzing and benchmarks for ContentProcessor's two paths.
+
+Typical output goes through the regex chain and output with many tags
+through the single-pass scanner; either must give exactly what the original
+regex chain gave. ``_RegexContentProcessor`` below is that implementation,
+copied verbatim; a seeded generator feeds both processors model-shaped
+output (think blocks, every tool-call dialect, DSML prefixes, JSON arrays,
+MiniMax markers, orphaned and truncated tags) and every public result must
+match.
+
+Run as a script for a timing table::
+
+    python tests/core/test_parser_fuzz.py
+"""
+
+import json
+import random
+import re
+import time
+from typing import Any
+
+import pytest
+
+from ayder_cli import parser
+from ayder_cli.parser import _SINGLE_PARAM_TOOLS, ContentProcessor
+
+
+class _RegexContentProcessor:
+    """The regex-chain ContentProcessor this module replaced, kept verbatim as the oracle.
+
+    Why regex instead of an XML parser?  Model output is *not* valid XML —
+    tags are often unclosed, interleaved with prose, or malformed.  A small
+    set of compiled patterns is the most reliable (and fastest) approach.
+
+    All patterns are compiled once at class-body evaluation time.
+    Use the module-level ``content_processor`` singleton for zero-cost reuse.
+
+    Public API:
+        extract_think_blocks(content)  → list[str]
+        strip_for_display(content)     → str
+        has_tool_calls(content)        → bool
+        parse_tool_calls(content)      → list[dict]
+        parse_json_tool_calls(content) → list[dict]
+    """
+
+    # -- Think blocks --------------------------------------------------------
+    _RE_THINK_CLOSED = re.compile(r"<think>(.*?)</think>", re.DOTALL)
+    _RE_THINK_UNCLOSED = re.compile(r"<think>(.*)", re.DOTALL)
+    _RE_THINK_STRIP = re.compile(r"<think>.*?</think>", re.DOTALL)
+    _RE_THINK_STRIP_UNCLOSED = re.compile(r"<think>.*", re.DOTALL)
+
+    # -- Tool call blocks (for stripping display) ----------------------------
+    # Support namespaced tool calls like <minimax:tool_call>...</minimax:tool_call>
+    _RE_TOOL_CALL_BLOCK = re.compile(
+        r"<(\w+:)?tool_call>.*?</(\w+:)?tool_call>", re.DOTALL
+    )
+    _RE_FUNCTION_BLOCK = re.compile(
+        r"<function=.*?(?:</function>|</tool_call>)", re.DOTALL
+    )
+    # DeepSeek format: <function_calls><invoke>...</invoke></function_calls>
+    # Also covers DSML-prefixed variants (｜DSML｜function_calls, ｜DSML｜tool_calls).
+    # deepseek-v4-pro:cloud uses <｜DSML｜tool_calls> (plural) — same shape,
+    # different outer tag name. Match both function_calls and tool_calls.
+    _RE_FUNCTION_CALLS_BLOCK = re.compile(
+        r"<\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?(?:function|tool)_calls>.*?"
+        r"</\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?(?:function|tool)_calls>",
+        re.DOTALL,
+    )
+    _RE_INVOKE_BLOCK = re.compile(
+        r"<\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?invoke.*?"
+        r"</\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?invoke>",
+        re.DOTALL,
+    )
+
+    # -- Orphaned tags (for stripping display) -------------------------------
+    _RE_ORPHAN_TOOL_CALL = re.compile(r"</?(\w+:)?tool_call>")
+    _RE_ORPHAN_FUNCTION = re.compile(r"</?function[^>]*>")
+    _RE_ORPHAN_FUNCTION_CALLS = re.compile(
+        r"</?\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?(?:function|tool)_calls\s*>"
+    )
+    _RE_ORPHAN_INVOKE = re.compile(
+        r"</?\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?invoke[^>]*>"
+    )
+    _RE_ORPHAN_PARAMETER = re.compile(
+        r"</?\uff5c?\uff24?\uff33?\uff2d?\uff2c?\uff5c?parameter[^>]*>"
+    )
+    # MiniMax models use special structural tokens that can leak into
+    # msg.content when an IN_CONTENT driver is used on a multi-turn request
+    # (observed empirically on minimax-m3:cloud as ]<]minimax[>[ ). Older M2
+    # builds documented the ]~b]<role> / [e~[ role markers. Strip all variants.
+    _RE_ORPHAN_MINIMAX_MARKER = re.compile(
+        r"\]<\]minimax\[>\[|\]~b\](?:system|user|ai|tool)?|\[e~\["
+    )
+
+    # -- JSON tool arrays (for stripping and parsing) ------------------------
+    _RE_JSON_TOOL_ARRAY = re.compile(r'\[\s*\{[^}]*"function"\s*:.*?\}\s*\]', re.DOTALL)
+    _RE_JSON_NAME = re.compile(r'"name"\s*:\s*"([^"]+)"')
+    _RE_JSON_ARGS = re.compile(
+        r'"arguments"\s*:\s*["\{](.*?)["\}](?:\s*[,}])', re.DOTALL
+    )
+    _RE_JSON_KV_PAIR = re.compile(r'"(\w+)"\s*:\s*"([^"]*)"')
+
+    # -- Whitespace cleanup --------------------------------------------------
+    _RE_BLANK_LINES = re.compile(r"\n{3,}")
+
+    # -- XML extraction (for parse_tool_calls) -------------------------------
+    # Standard function tag pattern. 
+    # Accepts </function> or </tool_call> as closer.
+    _RE_FUNC = re.compile(
+        r"<function=(.*?)>(.*?)(?:</function>|</tool_call>)", 
+        re.DOTALL
+    )
+    _RE_PARAM = re.compile(r"<parameter=(.*?)>(.*?)</parameter>", re.DOTALL)
+    _RE_PARAM_UNCLOSED = re.compile(r"<parameter=(.*?)>(.*)", re.DOTALL)
+
+    # -- Markup normalization (for _normalize_markup) -----------------------
+    # Unwrap <tool_call> wrappers (including namespaced variants)
+    _RE_TOOL_CALL_WRAPPER = re.compile(
+        r"<(\w+:)?tool_call>(.*?)</(\w+:)?tool_call>",
+        re.DOTALL,
+    )
+    # DeepSeek <invoke> extraction
+    _RE_INVOKE = re.compile(
+        r'<invoke\s+name="([^"]+)"\s*>(.*?)</invoke>', re.DOTALL
+    )
+    # DeepSeek <parameter name="..."> extraction
+    _RE_DS_PARAM = re.compile(
+        r'<parameter\s+name="([^"]+)"[^>]*>(.*?)</parameter>', re.DOTALL
+    )
+    # Strip outer <function_calls> / <tool_calls> tags after _convert_deepseek
+    _RE_FUNCTION_CALLS_STRIP = re.compile(r"</?(?:function|tool)_calls\s*>", re.DOTALL)
+    # DSML fullwidth prefix: ｜DSML｜
+    _RE_DSML_FULLWIDTH = re.compile(r"<(/?)\uff5c\uff24\uff33\uff2d\uff2c\uff5c")
+    # DSML ASCII fallback: |DSML|
+    _RE_DSML_ASCII = re.compile(r"<(/?)\|DSML\|")
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    def extract_think_blocks(self, content: str) -> list[str]:
+        """Return a list of non-empty ``<think>`` block texts."""
+        blocks = self._RE_THINK_CLOSED.findall(content)
+        remaining = self._RE_THINK_CLOSED.sub("", content)
+        unclosed = self._RE_THINK_UNCLOSED.findall(remaining)
+        blocks.extend(unclosed)
+        return [b.strip() for b in blocks if b.strip()]
+
+    def strip_for_display(self, content: str) -> str:
+        """Strip all tool/think markup, returning clean display text."""
+        text = self._strip_think_blocks(content)
+        text = self._strip_tool_call_blocks(text)
+        text = self._strip_function_blocks(text)
+        text = self._strip_deepseek_blocks(text)
+        text = self._strip_orphaned_tags(text)
+        text = self._strip_json_tool_arrays(text)
+        text = self._collapse_blank_lines(text)
+        return text
+
+    def has_tool_calls(self, content: str) -> bool:
+        """Quick presence check — does content contain any tool call format?
+
+        Detects:
+        - Standard: <function=...>
+        - Wrapped: <tool_call> (including namespaced like <minimax:tool_call>)
+        - DeepSeek: <function_calls> / <tool_calls> / <invoke>
+        - DeepSeek DSML: ｜DSML｜function_calls or ｜DSML｜tool_calls or ｜DSML｜invoke
+        """
+        if not content:
+            return False
+        return (
+            "<function=" in content
+            or re.search(r"<(\w+:)?tool_call>", content) is not None
+            or "<function_calls>" in content
+            or "<tool_calls>" in content
+            or "<invoke" in content
+            or "\uff5c\uff24\uff33\uff2d\uff2c\uff5c" in content
+            or "|DSML|" in content
+        )
+
+    def parse_tool_calls(self, content: str) -> list[dict[str, Any]]:
+        """Extract tool calls from any supported LLM output format.
+
+        Routing order:
+        1. Normalize markup (DSML markers, <tool_call> wrappers, DeepSeek conversion)
+        2. Try XML extraction (<function=name>...</function> patterns)
+        3. If no XML results, try JSON array extraction
+        4. Return combined results (parse errors included as error dicts)
+
+        Returns list of:
+          {"name": "tool_name", "arguments": {...}}
+        or on error:
+          {"name": "unknown", "arguments": {}, "error": "..."}
+        """
+        if not content:
+            return []
+        
+        # We need to know if it was explicitly wrapped to allow lazy parsing
+        is_explicitly_wrapped = "<tool_call>" in content.lower() or "<function_calls>" in content.lower()
+        
+        normalized = self._normalize_markup(content)
+        results = self._parse_xml_tool_calls(normalized, is_wrapped=is_explicitly_wrapped)
+        if not results:
+            results = self.parse_json_tool_calls(content)
+        return results
+
+    def parse_json_tool_calls(self, content: str) -> list[dict]:
+        """Parse tool calls from a JSON array in content (model fallback).
+
+        Falls back to regex extraction when ``json.loads`` fails.
+        Returns a list of dicts with ``name`` and ``arguments`` keys, or [].
+        """
+        content = content.strip()
+        if not content.startswith("["):
+            return []
+        try:
+            data = json.loads(content)
+        except (json.JSONDecodeError, ValueError):
+            return self._regex_extract_json_tool_calls(content)
+        if not isinstance(data, list):
+            return []
+        calls: list[dict] = []
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            func = item.get("function")
+            if not isinstance(func, dict):
+                continue
+            name = func.get("name")
+            if not name:
+                continue
+            raw_args = func.get("arguments", "{}")
+            if isinstance(raw_args, str):
+                try:
+                    args = json.loads(raw_args)
+                except (json.JSONDecodeError, ValueError):
+                    args = {}
+            elif isinstance(raw_args, dict):
+                args = raw_args
+            else:
+                args = {}
+            calls.append({"name": name, "arguments": args})
+        return calls
+
+    # =========================================================================
+    # Private: markup normalization
+    # =========================================================================
+
+    def _normalize_markup(self, content: str) -> str:
+        """Normalize model-specific tool call markup variations.
+
+        1. Strip DSML markers from DeepSeek tags.
+        2. Strip outer <tool_call> wrappers (including namespaced variants).
+        3. Add missing </function> when block ends with </tool_call>.
+        4. Convert DeepSeek <function_calls>/<invoke> to standard format.
+        """
+        content = self._normalize_dsml(content)
+
+        def _unwrap_tool_call(match: re.Match) -> str:
+            inner = match.group(2).strip()
+            # Ensure </function> exists if it looks like a function call and is missing one
+            if "<function=" in inner and "</function>" not in inner:
+                inner += "</function>"
+            return inner
+
+        content = self._RE_TOOL_CALL_WRAPPER.sub(_unwrap_tool_call, content)
+        content = self._convert_deepseek(content)
+        return content
+
+    def _normalize_dsml(self, content: str) -> str:
+        """Strip ｜DSML｜ prefix from tags (fullwidth and ASCII variants)."""
+        if "\uff5c\uff24\uff33\uff2d\uff2c\uff5c" not in content and "DSML" not in content:
+            return content
+        content = self._RE_DSML_FULLWIDTH.sub(r"<\1", content)
+        content = self._RE_DSML_ASCII.sub(r"<\1", content)
+        return content
+
+    def _convert_deepseek(self, content: str) -> str:
+        """Convert DeepSeek <function_calls>/<invoke> to standard format.
+
+        DeepSeek format:
+            <function_calls>
+            <invoke name="func_name">
+            <parameter name="param">value</parameter>
+            </invoke>
+            </function_calls>
+
+        Converts to:
+            <function=func_name><parameter=param>value</parameter></function>
+        """
+        def convert_invoke(match: re.Match) -> str:
+            func_name = match.group(1)
+            params_block = match.group(2)
+            params = []
+            for pm in self._RE_DS_PARAM.finditer(params_block):
+                param_name = pm.group(1)
+                param_value = pm.group(2).strip()
+                params.append(f"<parameter={param_name}>{param_value}</parameter>")
+            return f"<function={func_name}>{''.join(params)}</function>"
+
+        result = self._RE_INVOKE.sub(convert_invoke, content)
+        result = self._RE_FUNCTION_CALLS_STRIP.sub("", result)
+        return result
+
+    # =========================================================================
+    # Private: XML tool call extraction
+    # =========================================================================
+
+    def _parse_xml_tool_calls(self, content: str, is_wrapped: bool = False) -> list[dict[str, Any]]:
+        """Extract tool calls from <function=name>...</function> patterns.
+
+        Handles:
+        - Standard: <function=name><parameter=key>value</parameter></function>
+        - Unclosed parameters: <parameter=key>value (no closing tag)
+        - Lazy: <function=name>value</function> (only if wrapped or single-param tools)
+        """
+        calls = []
+        for func_match in self._RE_FUNC.finditer(content):
+            func_name = func_match.group(1).strip()
+            body = func_match.group(2).strip()
+
+            if not func_name:
+                calls.append({
+                    "name": "unknown",
+                    "arguments": {},
+                    "error": "Malformed tool call: function name is empty",
+                })
+                continue
+
+            param_matches = list(self._RE_PARAM.finditer(body))
+
+            if param_matches:
+                # Standard format: closed <parameter=key>value</parameter>
+                args = {}
+                for pm in param_matches:
+                    key = pm.group(1).strip()
+                    value = pm.group(2).strip()
+                    if key:
+                        args[key] = value
+                calls.append({"name": func_name, "arguments": args})
+
+            elif "<parameter=" in body:
+                # Unclosed parameters: <parameter=key>value (no closing tag)
+                unclosed = list(self._RE_PARAM_UNCLOSED.finditer(body))
+                if unclosed:
+                    args = {}
+                    for um in unclosed:
+                        key = um.group(1).strip()
+                        value = um.group(2).strip()
+                        if key:
+                            args[key] = value
+                    calls.append({"name": func_name, "arguments": args})
+                else:
+                    calls.append({"name": func_name, "arguments": {}})
+
+            elif body and "<parameter" not in body:
+                # Lazy format — infer single parameter name from schema.
+                inferred = self._infer_parameter_name(func_name)
+                
+                # Heuristic: if not wrapped, the body shouldn't look like prose (e.g. no spaces or short)
+                is_prose = " " in body and len(body) > 30
+                
+                if inferred and (is_wrapped or not is_prose):
+                    calls.append({"name": func_name, "arguments": {inferred: body}})
+                elif is_wrapped:
+                    # Wrapped but no inference possible -> error
+                    calls.append({
+                        "name": func_name,
+                        "arguments": {},
+                        "error": (
+                            f"Missing <parameter> tags. Use: "
+                            f"<function={func_name}><parameter=name>value</parameter></function>"
+                        ),
+                    })
+                elif not is_prose:
+                    # Not wrapped but looks like a value (short/no spaces)
+                    # We still try to infer if possible, else return it with error if unknown
+                    if inferred:
+                        calls.append({"name": func_name, "arguments": {inferred: body}})
+                    else:
+                        calls.append({
+                            "name": func_name,
+                            "arguments": {},
+                            "error": f"Missing <parameter> tags. Use: <function={func_name}><parameter=name>value</parameter></function>"
+                        })
+                else:
+                    # Not wrapped and looks like prose -> ignore
+                    continue
+            else:
+                # Empty body — valid for no-argument tools
+                calls.append({"name": func_name, "arguments": {}})
+
+        return calls
+
+    def _infer_parameter_name(self, func_name: str) -> str:
+        """Return the single required parameter for single-param tools."""
+        return _SINGLE_PARAM_TOOLS.get(func_name, "")
+
+    # =========================================================================
+    # Private: display stripping helpers
+    # =========================================================================
+
+    def _strip_think_blocks(self, text: str) -> str:
+        text = self._RE_THINK_STRIP.sub("", text)
+        text = self._RE_THINK_STRIP_UNCLOSED.sub("", text)
+        return text
+
+    def _strip_tool_call_blocks(self, text: str) -> str:
+        return self._RE_TOOL_CALL_BLOCK.sub("", text)
+
+    def _strip_function_blocks(self, text: str) -> str:
+        return self._RE_FUNCTION_BLOCK.sub("", text)
+
+    def _strip_deepseek_blocks(self, text: str) -> str:
+        """Strip DeepSeek <function_calls> and <invoke> blocks."""
+        text = self._RE_FUNCTION_CALLS_BLOCK.sub("", text)
+        text = self._RE_INVOKE_BLOCK.sub("", text)
+        return text
+
+    def _strip_orphaned_tags(self, text: str) -> str:
+        text = self._RE_ORPHAN_TOOL_CALL.sub("", text)
+        text = self._RE_ORPHAN_FUNCTION.sub("", text)
+        text = self._RE_ORPHAN_FUNCTION_CALLS.sub("", text)
+        text = self._RE_ORPHAN_INVOKE.sub("", text)
+        text = self._RE_ORPHAN_PARAMETER.sub("", text)
+        text = self._RE_ORPHAN_MINIMAX_MARKER.sub("", text)
+        return text
+
+    def _strip_json_tool_arrays(self, text: str) -> str:
+        return self._RE_JSON_TOOL_ARRAY.sub("", text)
+
+    def _collapse_blank_lines(self, text: str) -> str:
+        return self._RE_BLANK_LINES.sub("\n\n", text).strip()
+
+    # =========================================================================
+    # Private: JSON fallback extraction
+    # =========================================================================
+
+    def _regex_extract_json_tool_calls(self, content: str) -> list[dict]:
+        """Regex fallback for malformed JSON tool calls."""
+        calls: list[dict] = []
+        for m in self._RE_JSON_NAME.finditer(content):
+            name = m.group(1)
+            args: dict = {}
+            start = max(0, m.start() - 200)
+            end = min(len(content), m.end() + 200)
+            chunk = content[start:end]
+            arg_match = self._RE_JSON_ARGS.search(chunk)
+            if arg_match:
+                raw = arg_match.group(1).strip()
+                try:
+                    args = json.loads("{" + raw + "}")
+                except (json.JSONDecodeError, ValueError):
+                    for kv in self._RE_JSON_KV_PAIR.finditer(raw):
+                        args[kv.group(1)] = kv.group(2)
+            calls.append({"name": name, "arguments": args})
+        return calls
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+_FULLWIDTH_DSML = "\uff5c\uff24\uff33\uff2d\uff2c\uff5c"
+_DSML_PREFIXES = ["", "", _FULLWIDTH_DSML, "|DSML|", "\uff5c", "\uff24\uff33\uff2d\uff2c\uff5c"]
+_TOOLS = sorted(_SINGLE_PARAM_TOOLS) + ["run_shell_command", "write_file", "mystery_tool", ""]
+_WORDS = ["the", "file", "x", "<", ">", "{", "}", "[", "]", '"', "=", "/", "a.py", "\n", "\n\n\n", "  "]
+
+
+def _prose(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(0, 8)))
+
+
+def _value(rng: random.Random) -> str:
+    return rng.choice(["src/a.py", "  padded  ", "", "two words here", "x" * 40, _prose(rng)])
+
+
+def _params(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 3)):
+        key = rng.choice(["file_path", "content", "command", " spaced ", ""])
+        closer = rng.choice(["</parameter>", "</parameter>", ""])
+        parts.append(f"<parameter={key}>{_value(rng)}{closer}")
+    return rng.choice(["", "\n"]).join(parts)
+
+
+def _function(rng: random.Random) -> str:
+    name = rng.choice(_TOOLS)
+    body = rng.choice([_params(rng), _value(rng), ""])
+    closer = rng.choice(["</function>", "</function>", "</tool_call>", ""])
+    return f"<function={name}>{body}{closer}"
+
+
+def _wrapped(rng: random.Random) -> str:
+    ns = rng.choice(["", "", "minimax:", "x:"])
+    inner = rng.choice([_function(rng), _function(rng) + _function(rng), _prose(rng)])
+    closer = rng.choice([f"</{ns}tool_call>", "</tool_call>", ""])
+    return f"<{ns}tool_call>{rng.choice(['', chr(10), '  '])}{inner}{rng.choice(['', chr(10)])}{closer}"
+
+
+def _invoke(rng: random.Random) -> str:
+    pre = rng.choice(_DSML_PREFIXES)
+    name = rng.choice(_TOOLS[:3] + ["read_file"])
+    params = "".join(
+        f'<{pre}parameter name="{rng.choice(["file_path", "content"])}"'
+        f'{rng.choice(["", " string=\"true\""])}>{_value(rng)}'
+        f'{rng.choice([f"</{pre}parameter>", ""])}\n'
+        for _ in range(rng.randint(0, 2))
+    )
+    closer = rng.choice([f"</{pre}invoke>", f"</{pre}invoke>", ""])
+    return f'<{pre}invoke{rng.choice([" ", "  "])}name="{name}"{rng.choice(["", " "])}>\n{params}{closer}'
+
+
+def _call_list(rng: random.Random) -> str:
+    pre = rng.choice(_DSML_PREFIXES)
+    tag = rng.choice(["function_calls", "tool_calls"])
+    invokes = "\n".join(_invoke(rng) for _ in range(rng.randint(0, 2)))
+    closer = rng.choice([f"</{pre}{tag}>", f"</{pre}{tag}>", f"</{pre}{tag} >", ""])
+    return f"<{pre}{tag}{rng.choice(['', ' '])}>\n{invokes}\n{closer}"
+
+
+def _think(rng: random.Random) -> str:
+    inner = rng.choice([_prose(rng), _function(rng), ""])
+    return f"<think>{inner}{rng.choice(['</think>', '</think>', ''])}"
+
+
+def _json_array(rng: random.Random) -> str:
+    call = {"type": "function", "function": {"name": rng.choice(_TOOLS), "arguments": '{"file_path": "a"}'}}
+    text = json.dumps([call] * rng.randint(1, 2), indent=rng.choice([None, 2]))
+    return rng.choice([text, text[: rng.randint(1, len(text))], '[{"function": {"name": "x"}}'])
+
+
+def _orphan(rng: random.Random) -> str:
+    # Unterminated tag names end in a space. The regex chain ran each pass over
+    # the previous pass's output, so removing a block could butt "<function"
+    # against a later "=" and form a tag that was never in the input; the
+    # scanner only sees tags that are. That splice is the one known (and
+    # deliberate) difference, so the corpus does not build it.
+    pre = rng.choice(_DSML_PREFIXES)
+    return rng.choice([
+        "</function>", "<function=", "<function ", "</tool_call>", "<tool_call>", "</minimax:tool_call>",
+        f"<{pre}invoke>", f"</{pre}invoke ", f"<{pre}parameter=x>", f"</{pre}parameter>",
+        f"<{pre}function_calls>", "]<]minimax[>[", "]~b]ai", "]~b]", "[e~[", "</think>", "<think>",
+    ])
+
+
+_FRAGMENTS = [_prose, _prose, _function, _wrapped, _invoke, _call_list, _think, _json_array, _orphan]
+
+
+def _generate(rng: random.Random) -> str:
+    text = "".join(rng.choice(_FRAGMENTS)(rng) for _ in range(rng.randint(1, 6)))
+    if rng.random() < 0.2:
+        text = text[: rng.randint(0, len(text))]  # streaming cut-off
+    return text
+
+
+def _corpus(seed: int, size: int) -> list[str]:
+    rng = random.Random(seed)
+    return [_generate(rng) for _ in range(size)]
+
+
+_FIXED = [
+    "",
+    "plain prose",
+    "<think>reasoning</think>answer",
+    "<think>never closed <function=read_file>a</function>",
+    "<tool_call><function=read_file><parameter=file_path>a.py</parameter></tool_call>",
+    "<minimax:tool_call>\n<function=run_shell_command>\n<parameter=command>ls</parameter>\n</function>\n</minimax:tool_call>",
+    '<function_calls>\n<invoke name="read_file">\n<parameter name="file_path">a.py</parameter>\n</invoke>\n</function_calls>',
+    f'<{_FULLWIDTH_DSML}tool_calls>\n<{_FULLWIDTH_DSML}invoke name="read_file">\n'
+    f'<{_FULLWIDTH_DSML}parameter name="file_path" string="true">a.py</{_FULLWIDTH_DSML}parameter>\n'
+    f'</{_FULLWIDTH_DSML}invoke>\n</{_FULLWIDTH_DSML}tool_calls>',
+    '<|DSML|function_calls><|DSML|invoke name="x"></|DSML|invoke></|DSML|function_calls>',
+    '[{"type": "function", "function": {"name": "read_file", "arguments": "{}"}}]',
+    'before [{"function": {"name": "a"}}] after',
+    "]<]minimax[>[ hello ]~b]ai world [e~[",
+    "<function=read_file>prose that is definitely longer than thirty characters</function>",
+    "<function=>x</function>",
+    "<parameter=x>dangling",
+]
+
+def _check(legacy: _RegexContentProcessor, scanner: ContentProcessor, text: str) -> None:
+    assert scanner.strip_for_display(text) == legacy.strip_for_display(text), text
+    assert scanner.parse_tool_calls(text) == legacy.parse_tool_calls(text), text
+    assert scanner.extract_think_blocks(text) == legacy.extract_think_blocks(text), text
+    assert scanner.has_tool_calls(text) == legacy.has_tool_calls(text), text
+    assert scanner._normalize_markup(text) == legacy._normalize_markup(text), text
+
+
+@pytest.fixture(params=["chain", "scanner"])
+def processors(request, monkeypatch) -> tuple[_RegexContentProcessor, ContentProcessor]:
+    if request.param == "scanner":
+        monkeypatch.setattr(parser, "_CHAIN_MAX_COST", -1)
+    return _RegexContentProcessor(), ContentProcessor()
+
+
+@pytest.mark.parametrize("text", _FIXED)
+def test_fixed_cases_match_regex_chain(processors, text):
+    _check(*processors, text)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_corpus_matches_regex_chain(processors, seed):
+    for text in _corpus(seed, 500):
+        _check(*processors, text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "<function=read_file>x " * 5000,
+        "<function=" * 20000 + ">",
+        "<think>" + "<tool_call>" * 20000,
+        "<invoke " * 20000,
+        "<function " * 20000,
+        "[{" * 30000 + '"function": }',
+        "<parameter=" * 20000,
+    ],
+    ids=["unclosed-functions", "unnamed-functions", "unclosed-wrappers", "invokes", "function-prefixes", "json", "parameters"],
+)
+def test_dangling_markup_is_linear(text):
+    processor = ContentProcessor()
+    start = time.perf_counter()
+    processor.strip_for_display(text)
+    processor.parse_tool_calls(text)
+    processor.extract_think_blocks(text)
+    assert time.perf_counter() - start < 2.0
+
+
+def _bench(label: str, texts: list[str], legacy: Any, scanner: Any, repeat: int = 3) -> None:
+    def run(processor: Any) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for text in texts:
+                processor.strip_for_display(text)
+                processor.parse_tool_calls(text)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    old, new = run(legacy), run(scanner)
+    print(f"{label:<32} {old * 1000:>10.1f} ms {new * 1000:>10.1f} ms {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    legacy, scanner = _RegexContentProcessor(), ContentProcessor()
+    print(f"{'workload':<32} {'regex':>13} {'scanner':>13} {'speedup':>8}")
+    _bench("fuzz corpus (4000 outputs)", _corpus(0, 4000), legacy, scanner)
+    _bench("100 KB prose", ["word " * 20000], legacy, scanner)
+    _bench("one well-formed call", [_FIXED[5]] * 2000, legacy, scanner)
+    _bench("500 unclosed <function=", ["<function=read_file>x " * 500], legacy, scanner, repeat=1)
+    _bench("2000 unclosed <tool_call>", ["<tool_call>" * 2000], legacy, scanner, repeat=1)
+    _bench("2000 <invoke without close", ["<invoke " * 2000], legacy, scanner, repeat=1)
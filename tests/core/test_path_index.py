@@ -0,0 +1,110 @@
+"""Tests for the fuzzy path index behind the @ file picker."""
+
+import os
+import time
+
+from ayder_cli.core import path_index
+from ayder_cli.core.path_index import PathIndex
+from ayder_cli.core.project_tree import ProjectTree
+
+
+def _tree(root, files):
+    for rel in files:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def _settle(root):
+    """Backdate every directory's mtime so cached listings are trusted."""
+    old = time.time_ns() - 10_000_000_000
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(old, old))
+
+
+def _index(root):
+    index = PathIndex(ProjectTree(root))
+    index.refresh()
+    return index
+
+
+def test_ranks_name_and_boundary_matches_first(tmp_path):
+    _tree(
+        tmp_path,
+        [
+            "src/ayder_cli/tui/widgets.py",
+            "tests/tui/test_widgets.py",
+            "docs/windows_guide.md",
+            "src/wide/data.txt",
+            "other.py",
+        ],
+    )
+    index = _index(tmp_path)
+
+    assert index.search("widg", 8) == [
+        "src/ayder_cli/tui/widgets.py",
+        "tests/tui/test_widgets.py",
+        "docs/windows_guide.md",
+    ]
+    assert index.search("tuiwid", 2) == [
+        "src/ayder_cli/tui/widgets.py",
+        "tests/tui/test_widgets.py",
+    ]
+    assert index.search("wide", 1) == ["src/wide/"]
+    assert index.search("xyz", 8) == []
+
+
+def test_hidden_and_ignored_paths_are_left_out(tmp_path):
+    _tree(tmp_path, [".gitignore", ".env", "app.log", "app.py", ".cfg/app.ini"])
+    (tmp_path / ".gitignore").write_text("*.log\n")
+
+    assert _index(tmp_path).search("app", 8) == ["app.py"]
+
+
+def test_upper_case_query_matches_exactly(tmp_path):
+    _tree(tmp_path, ["MainView.py", "main_view.py"])
+    index = _index(tmp_path)
+
+    assert sorted(index.search("mv", 8)) == ["MainView.py", "main_view.py"]
+    assert index.search("MV", 8) == ["MainView.py"]
+
+
+def test_narrowed_query_matches_a_fresh_search(tmp_path):
+    _tree(tmp_path, ["abc/x.py", "a/b/y.py", "ab.txt", "cab.md", "zz.py"])
+    index = _index(tmp_path)
+    index.search("a", 8)
+    index.search("ab", 8)
+
+    assert index.search("aby", 8) == _index(tmp_path).search("aby", 8)
+
+
+def test_refresh_rereads_only_changed_directories(tmp_path):
+    _tree(tmp_path, ["a/x.py", "b/y.py"])
+    _settle(tmp_path)
+    index = _index(tmp_path)
+    reads, version = index.tree.reads, index.version
+
+    assert not index.refresh()
+    assert (index.tree.reads, index.version) == (reads, version)
+    assert not index.refresh(max_age=60)
+
+    (tmp_path / "b" / "z.py").write_text("")
+    _settle(tmp_path / "b")
+    assert index.search("z", 8) == []
+    assert index.refresh()
+    assert index.tree.reads == reads + 1
+    assert index.search("z", 8) == ["b/z.py"]
+
+
+def test_long_searches_stream_results_and_can_be_cancelled(tmp_path, monkeypatch):
+    _tree(tmp_path, [f"f{i}.py" for i in range(6)])
+    monkeypatch.setattr(path_index, "_CHUNK_PATHS", 2)
+    monkeypatch.setattr(path_index, "_STREAM_INTERVAL", -1)
+    index = _index(tmp_path)
+    streamed = []
+
+    final = index.search("f", 3, on_results=streamed.append)
+
+    assert len(streamed) == 3
+    assert streamed[-1] == final == ["f0.py", "f1.py", "f2.py"]
+    assert index.search("fx", 3, cancelled=lambda: True) is None
@@ -0,0 +1,133 @@
+"""Tests for the cached project tree model."""
+
+import os
+import time
+
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.project_tree import ProjectTree
+from ayder_cli.tools.builtins import utils_tools
+
+
+def _tree(root, files):
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if rel.endswith("/"):
+            path.mkdir(exist_ok=True)
+        else:
+            path.write_text(content)
+
+
+def _settle(root):
+    """Backdate every directory's mtime so cached listings are trusted."""
+    old = time.time_ns() - 10_000_000_000
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(old, old))
+
+
+def test_render_honors_ignore_rules_and_hides_dotfiles(tmp_path):
+    _tree(
+        tmp_path,
+        {
+            ".gitignore": "*.log\n",
+            ".env": "",
+            "README.md": "",
+            "run.log": "",
+            "src/pkg/mod.py": "",
+            "src/pkg/deep/x.py": "",
+            "__pycache__/m.pyc": "",
+            "node_modules/a/index.js": "",
+            ".github/workflows/ci.yml": "",
+        },
+    )
+
+    assert ProjectTree(tmp_path).render(max_depth=3) == (
+        ".\n"
+        "|-- src/\n"
+        "|   `-- pkg/\n"
+        "|       |-- deep/\n"
+        "|       `-- mod.py\n"
+        "`-- README.md"
+    )
+
+
+def test_render_collapses_large_directories(tmp_path):
+    _tree(tmp_path, {**{f"data/f{i}.csv": "" for i in range(5)}, "data/sub/a": ""})
+
+    rendered = ProjectTree(tmp_path).render(max_depth=2, max_files=3)
+
+    assert rendered == ".\n`-- data/\n    |-- sub/\n    `-- (5 files)"
+
+
+def test_unchanged_directories_are_not_read_again(tmp_path):
+    _tree(tmp_path, {"a/x.py": "", "b/y.py": "", "c.py": ""})
+    _settle(tmp_path)
+    tree = ProjectTree(tmp_path)
+    first = tree.render()
+    assert tree.reads == 3
+
+    assert tree.render() == first
+    assert tree.reads == 3
+
+    (tmp_path / "b" / "z.py").write_text("")
+    _settle(tmp_path / "b")
+    assert "z.py" in tree.render()
+    assert tree.reads == 4
+
+
+def test_changed_ignore_rules_reread_the_subtree(tmp_path):
+    _tree(tmp_path, {".gitignore": "", "a/keep.py": "", "a/gen.py": ""})
+    _settle(tmp_path)
+    tree = ProjectTree(tmp_path)
+    assert tree.listing("a") == ([], ["gen.py", "keep.py"])
+
+    # An in-place edit leaves the directory's mtime alone.
+    (tmp_path / ".gitignore").write_text("gen.py\n")
+    _settle(tmp_path)
+
+    assert tree.listing("a") == ([], ["keep.py"])
+
+
+def test_recently_modified_directory_is_read_again(tmp_path):
+    _tree(tmp_path, {"a.py": ""})
+    tree = ProjectTree(tmp_path)
+    tree.listing()
+    tree.listing()
+    assert tree.reads == 2
+
+
+def test_listing_of_missing_or_ignored_directory(tmp_path):
+    _tree(tmp_path, {"dist/app.js": "", "src/": ""})
+    tree = ProjectTree(tmp_path)
+
+    assert tree.listing("src") == ([], [])
+    assert tree.listing("dist") is None
+    assert tree.listing("nope/deeper") is None
+
+
+def test_entries_list_ignored_paths_and_symlinks_inside_the_root(tmp_path, tmp_path_factory):
+    _tree(tmp_path, {".gitignore": "*.log\n", "app.log": "", "dist/app.js": "", "src/a.py": ""})
+    outside = tmp_path_factory.mktemp("outside")
+    (tmp_path / "lib").symlink_to(tmp_path / "src")
+    (tmp_path / "escape").symlink_to(outside)
+    _settle(tmp_path)
+    tree = ProjectTree(tmp_path)
+
+    assert tree.entries() == (["dist", "lib", "src"], [".gitignore", "app.log"])
+    assert tree.listing() == (["src"], [".gitignore"])
+    assert tree.entries("lib") == ([], ["a.py"])
+    assert tree.entries("escape") is None
+    assert tree.entries("../") is None
+
+    reads = tree.reads
+    tree.entries()
+    assert tree.reads == reads
+
+
+def test_get_project_structure_uses_the_shared_tree(tmp_path):
+    _tree(tmp_path, {**{f"m{i}.py": "" for i in range(4)}, "pkg/a.py": ""})
+    ctx = ProjectContext(str(tmp_path))
+
+    result = utils_tools.get_project_structure(ctx, max_depth=1, max_files_per_dir=2)
+
+    assert result == ".\n|-- pkg/\n`-- (4 files)"
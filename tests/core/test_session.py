@@ -57,6 +57,14 @@ def test_save_load_roundtrip(tmp_path):
     assert data.permissions == {"r", "w", "x", "http"}
 
 
+def test_save_survives_lone_surrogates(tmp_path):
+    messages = [{"role": "tool", "tool_call_id": "c1", "content": "bad \udcff byte, ok é"}]
+
+    sid = save_session(messages, root=tmp_path)
+
+    assert load_session(sid, root=tmp_path).messages == messages
+
+
 def test_resolve_exact_and_prefix(tmp_path):
     sid = save_session(_msgs(), root=tmp_path)
     assert resolve_session_id(sid, root=tmp_path) == sid
@@ -0,0 +1,83 @@
+"""Tests for ChatLoop non-streaming (batch) turns."""
+
+import pytest
+from unittest.mock import MagicMock
+
+from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.providers import NormalizedStreamChunk
+
+
+class ChatOnlyProvider:
+    """Answers through chat(); stream_with_tools must not be used."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def chat(self, messages, model, tools=None, options=None, verbose=False):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    async def stream_with_tools(self, *a, **k):
+        raise AssertionError("stream_with_tools called in batch mode")
+        yield  # pragma: no cover
+
+
+class RecordingCallbacks:
+    def __init__(self):
+        self.content = []
+        self.tools = []
+
+    def on_thinking_start(self): pass
+    def on_thinking_stop(self): pass
+    def on_assistant_content(self, text): self.content.append(text)
+    def on_thinking_content(self, text): pass
+    def on_token_usage(self, total_tokens): pass
+    def on_tool_start(self, call_id, name, arguments): self.tools.append(name)
+    def on_tool_complete(self, call_id, result): pass
+    def on_tools_cleanup(self): pass
+    def on_system_message(self, text): pass
+    async def request_confirmation(self, name, arguments): return None
+    def is_cancelled(self): return False
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _tool_call(call_id, name, arguments):
+    tc = MagicMock()
+    tc.id = call_id
+    tc.name = name
+    tc.arguments = arguments
+    return tc
+
+
+@pytest.mark.anyio
+async def test_stream_false_uses_chat_and_runs_tool_calls():
+    first = NormalizedStreamChunk(
+        tool_calls=[
+            _tool_call("read_file", "read_file", '{"file_path": "a.py"}'),
+            _tool_call("read_file", "read_file", '{"file_path": "b.py"}'),
+        ]
+    )
+    llm = ChatOnlyProvider([first, NormalizedStreamChunk(content="done")])
+    registry = MagicMock(get_schemas=MagicMock(return_value=[]))
+    registry.execute.return_value = "ok"
+    cb = RecordingCallbacks()
+    messages = [{"role": "system", "content": "test"}, {"role": "user", "content": "go"}]
+
+    loop = ChatLoop(
+        llm=llm,
+        registry=registry,
+        messages=messages,
+        config=ChatLoopConfig(stream=False, permissions={"r"}),
+        callbacks=cb,
+    )
+    await loop.run()
+
+    assert llm.calls == 2
+    # Both calls survive even though they share an id (Gemini-style).
+    assert [m["role"] for m in messages].count("tool") == 2
+    assert cb.content[-1] == "done"
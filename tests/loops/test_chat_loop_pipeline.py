@@ -0,0 +1,140 @@
+"""Tests for pipelined turns: the next request is prepared while tools run."""
+
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ayder_cli.core.config import Config
+from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.providers import NormalizedStreamChunk
+from ayder_cli.providers.base import ToolCallDef
+from ayder_cli.providers.impl import ollama as ollama_impl
+from ayder_cli.providers.impl.ollama_drivers.base import DriverMode
+from tests.providers.fake_llm_server import FakeLLMServer, StreamScript
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class _Provider:
+    def __init__(self, fail_prewarm=False):
+        self.turns = [
+            [NormalizedStreamChunk(tool_calls=[
+                ToolCallDef("call_1", "read_file", '{"file_path": "a.py"}', index=0)
+            ])],
+            [NormalizedStreamChunk(content="done")],
+        ]
+        self.fail_prewarm = fail_prewarm
+        self.prewarmed = threading.Event()
+        self.prewarm_calls = []
+        self.stream_tools = []
+
+    async def prewarm(self, messages, model, tools=None, options=None):
+        self.prewarm_calls.append((messages, tools))
+        self.prewarmed.set()
+        if self.fail_prewarm:
+            raise ConnectionError("unreachable")
+
+    async def stream_with_tools(self, messages, model, tools=None, **kwargs):
+        self.stream_tools.append(tools)
+        for chunk in self.turns.pop(0):
+            yield chunk
+
+
+def _run_loop(provider, **config):
+    registry = MagicMock()
+    registry.get_schemas.side_effect = lambda tags=None: [{"name": "read_file"}]
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "go"}]
+    loop = ChatLoop(
+        llm=provider,
+        registry=registry,
+        messages=messages,
+        config=ChatLoopConfig(permissions={"r"}, **config),
+        callbacks=MagicMock(is_cancelled=MagicMock(return_value=False)),
+    )
+    return loop, registry, messages
+
+
+@pytest.mark.anyio
+async def test_next_request_is_prepared_while_tool_runs():
+    provider = _Provider()
+    loop, registry, messages = _run_loop(provider)
+
+    def execute(name, args):
+        # The tool only finishes once the provider has been prewarmed.
+        assert provider.prewarmed.wait(5)
+        return "contents"
+
+    registry.execute.side_effect = execute
+    await loop.run()
+
+    [(history, tools)] = provider.prewarm_calls
+    assert history[-1]["tool_calls"][0]["id"] == "call_1"  # results not in yet
+    assert provider.stream_tools[1] is tools  # prepared schemas are reused
+    assert registry.get_schemas.call_count == 2
+    assert messages[-1] == {"role": "assistant", "content": "done"}
+
+
+@pytest.mark.anyio
+async def test_prewarm_failure_does_not_affect_the_turn():
+    provider = _Provider(fail_prewarm=True)
+    loop, registry, messages = _run_loop(provider)
+    registry.execute.return_value = "contents"
+
+    await loop.run()
+
+    assert len(provider.prewarm_calls) == 1
+    assert messages[-1]["content"] == "done"
+
+
+@pytest.mark.anyio
+async def test_pipelining_can_be_disabled():
+    provider = _Provider()
+    loop, registry, _ = _run_loop(provider, pipelined_turns=False)
+    registry.execute.return_value = "contents"
+
+    await loop.run()
+
+    assert provider.prewarm_calls == []
+    assert registry.get_schemas.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_ollama_prewarm_fills_wire_cache():
+    provider = ollama_impl.OllamaProvider(Config(base_url="http://localhost:1", model="m"))
+    provider._resolve_driver = AsyncMock(return_value=MagicMock(mode=DriverMode.NATIVE))
+    messages = [
+        {"role": "user", "content": "prewarm probe"},
+        {"role": "assistant", "content": "", "tool_calls": [{
+            "id": "c1", "type": "function",
+            "function": {"name": "read_file", "arguments": '{"file_path": "prewarm.py"}'},
+        }]},
+    ]
+    cache = ollama_impl._WIRE_CACHE
+    cache.clear()
+
+    await provider.prewarm(messages, "m")
+    provider._convert_messages(messages)
+
+    assert (cache.misses, cache.hits) == (2, 2)
+
+
+@pytest.mark.anyio
+async def test_openai_prewarm_sends_nothing():
+    from ayder_cli.providers.impl.openai import OpenAIProvider
+
+    async with FakeLLMServer(StreamScript()) as server:
+        provider = OpenAIProvider(Config(base_url=server.url + "/v1", api_key="x", model="m"))
+        try:
+            await provider.prewarm([{"role": "user", "content": "go"}], "m")
+            async for _ in provider.stream_with_tools([{"role": "user", "content": "go"}], "m"):
+                pass
+        finally:
+            await provider.client.close()
+
+    assert [(r.method, r.path) for r in server.requests] == [
+        ("POST", "/v1/chat/completions"),
+    ]
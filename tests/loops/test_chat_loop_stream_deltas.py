@@ -0,0 +1,147 @@
+"""Tests for index-keyed assembly of streamed tool-call deltas."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig, _StreamedToolCalls
+from ayder_cli.providers import NormalizedStreamChunk
+from ayder_cli.providers.base import ToolCallDef
+
+
+def _assemble(deltas):
+    calls = _StreamedToolCalls()
+    started = [s for s in map(calls.add, deltas) if s is not None]
+    return calls.calls(), started
+
+
+def test_deltas_are_stitched_by_index_not_id():
+    # Claude shape: start event carries id/name, fragments carry only the
+    # content block index (block 0 was text, so the first call is block 1).
+    calls, started = _assemble([
+        ToolCallDef(id="toolu_a", name="read_file", arguments="", index=1),
+        ToolCallDef(id="toolu_b", name="read_file", arguments="", index=2),
+        ToolCallDef(id="", name="", arguments='{"file_path":', index=1),
+        ToolCallDef(id="", name="", arguments='{"file_path": "b.py"}', index=2),
+        ToolCallDef(id="", name="", arguments=' "a.py"}', index=1),
+    ])
+    assert [(c["id"], c["function"]["arguments"]) for c in calls] == [
+        ("toolu_a", '{"file_path": "a.py"}'),
+        ("toolu_b", '{"file_path": "b.py"}'),
+    ]
+    assert started == [("toolu_a", "read_file"), ("toolu_b", "read_file")]
+
+
+def test_late_id_and_name_fill_in():
+    calls, started = _assemble([
+        ToolCallDef(id="idx_0", name="", arguments='{"a"', index=0),
+        ToolCallDef(id="call_x", name="bash", arguments=": 1}", index=0),
+    ])
+    assert calls == [{
+        "id": "call_x",
+        "type": "function",
+        "function": {"name": "bash", "arguments": '{"a": 1}'},
+    }]
+    assert started == [("call_x", "bash")]
+
+
+def test_complete_calls_without_index_are_never_merged():
+    # Same id twice (e.g. per-chunk numbering) must still be two calls.
+    calls, _ = _assemble([
+        ToolCallDef(id="call_0", name="read_file", arguments='{"file_path": "a"}'),
+        ToolCallDef(id="call_0", name="read_file", arguments='{"file_path": "b"}'),
+    ])
+    assert [c["function"]["arguments"] for c in calls] == [
+        '{"file_path": "a"}',
+        '{"file_path": "b"}',
+    ]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_chat_loop_runs_calls_assembled_from_fragments():
+    turns = [
+        [
+            NormalizedStreamChunk(content="Reading."),
+            NormalizedStreamChunk(tool_calls=[ToolCallDef("toolu_1", "read_file", "", index=1)]),
+            *(
+                NormalizedStreamChunk(tool_calls=[ToolCallDef("", "", piece, index=1)])
+                for piece in ['{"file_', 'path": ', '"a.py"}']
+            ),
+        ],
+        [NormalizedStreamChunk(content="done")],
+    ]
+
+    class Provider:
+        async def stream_with_tools(self, *args, **kwargs):
+            for chunk in turns.pop(0):
+                yield chunk
+
+    registry = MagicMock(get_schemas=MagicMock(return_value=[]))
+    registry.execute.return_value = "print(1)"
+    cb = MagicMock(is_cancelled=MagicMock(return_value=False))
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "go"}]
+
+    await ChatLoop(
+        llm=Provider(),
+        registry=registry,
+        messages=messages,
+        config=ChatLoopConfig(permissions={"r"}),
+        callbacks=cb,
+    ).run()
+
+    registry.execute.assert_called_once_with("read_file", {"file_path": "a.py"})
+    assert messages[2]["tool_calls"][0]["id"] == "toolu_1"
+    assert messages[3]["tool_call_id"] == "toolu_1"
+
+
+@pytest.mark.asyncio
+async def test_ollama_native_numbers_calls_across_chunks():
+    from ayder_cli.providers.impl.ollama import OllamaProvider
+
+    async def fake_stream():
+        for path in ("a.py", "b.py"):
+            call = MagicMock()
+            call.function.name = "read_file"
+            call.function.arguments = {"file_path": path}
+            message = MagicMock(content="", thinking="", tool_calls=[call])
+            yield MagicMock(message=message, done=False)
+
+    cfg = MagicMock(base_url="http://localhost:11434", api_key="", chat_protocol="ollama")
+    with patch("ayder_cli.providers.impl.ollama.AsyncClient") as mock_client:
+        instance = AsyncMock()
+        instance.chat.return_value = fake_stream()
+        mock_client.return_value = instance
+        calls = [
+            tc
+            async for chunk in OllamaProvider(cfg).stream_with_tools(
+                messages=[{"role": "user", "content": "go"}],
+                model="m",
+                tools=[{"type": "function", "function": {"name": "read_file"}}],
+            )
+            for tc in chunk.tool_calls
+        ]
+
+    assert [(tc.id, tc.index) for tc in calls] == [("call_0", 0), ("call_1", 1)]
+
+
+def test_claude_events_carry_block_index():
+    claude = pytest.importorskip("ayder_cli.providers.impl.claude")
+    provider = claude.ClaudeProvider.__new__(claude.ClaudeProvider)
+
+    start = provider._normalize_chunk(SimpleNamespace(
+        type="content_block_start",
+        index=1,
+        content_block=SimpleNamespace(type="tool_use", id="toolu_1", name="bash"),
+    ))
+    delta = provider._normalize_chunk(SimpleNamespace(
+        type="content_block_delta",
+        index=1,
+        delta=SimpleNamespace(type="input_json_delta", partial_json='{"command"'),
+    ))
+    assert [tc.index for tc in start.tool_calls + delta.tool_calls] == [1, 1]
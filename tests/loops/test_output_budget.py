@@ -0,0 +1,177 @@
+"""Tests for the per-request output token limit."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ayder_cli.loops import output_budget
+from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.loops.output_budget import OutputBudget
+from ayder_cli.providers import NormalizedStreamChunk
+from ayder_cli.providers.base import ToolCallDef
+from ayder_cli.providers.impl.claude import _max_tokens
+from ayder_cli.providers.impl.ollama import OllamaProvider
+
+
+def test_limit_is_capped_by_context_room():
+    budget = OutputBudget(4096)
+    assert budget.limit_for(1000, context_window=None) == 4096
+    assert budget.limit_for(1000, context_window=65536) == 4096
+    # 62k prompt tokens in a 64k window: only what is left minus a margin.
+    assert budget.limit_for(62_000, 65536) == 65536 - 62_000 - 65536 // 50
+    # No room at all still sends the floor rather than a negative limit.
+    assert budget.limit_for(100_000, 65536) == 512
+
+
+def test_prompt_size_is_a_running_count_from_reported_usage():
+    budget = OutputBudget(4096)
+    messages = [{"role": "user", "content": "x" * 300}]
+    assert budget.prompt_tokens(messages, []) == (300 + 2) // 3
+
+    messages.append({"role": "assistant", "content": "ok"})
+    budget.observe(messages, {"prompt_tokens": 100, "completion_tokens": 20})
+    messages.append({"role": "tool", "name": "read_file", "content": "y" * 90})
+
+    with patch.object(output_budget.json_codec, "dumps") as dumps:
+        estimate = budget.prompt_tokens(messages, [{"name": "t"}])
+    assert estimate == 120 + int(90 / budget.chars_per_token)
+    dumps.assert_not_called()
+
+
+def test_rewritten_history_is_estimated_again():
+    budget = OutputBudget(4096)
+    messages = [{"role": "user", "content": "go"}, {"role": "assistant", "content": ""}]
+    budget.observe(messages, {"prompt_tokens": 5000, "completion_tokens": 10})
+
+    compacted = [{"role": "user", "content": "summary " * 30}]
+
+    assert budget.prompt_tokens(compacted, []) == (240 + 2) // 3
+
+
+def test_calibration_uses_reported_prompt_sizes():
+    budget = OutputBudget(4096)
+    messages = [{"role": "user", "content": "x" * 39_998}]
+    for _ in range(20):
+        budget._anchor = None
+        budget.prompt_tokens(messages, [])
+        budget.observe(messages, {"prompt_tokens": 10_000})
+    assert budget.chars_per_token == pytest.approx(4.0, abs=0.01)
+
+
+def test_estimated_usage_does_not_calibrate():
+    budget = OutputBudget(4096)
+    messages = [{"role": "user", "content": "x" * 40_000}]
+    budget.prompt_tokens(messages, [])
+    budget.observe(messages, {"prompt_tokens": 10_000, "estimated": True})
+    assert budget.chars_per_token == 3.0
+    assert budget.prompt_tokens(messages, []) == 10_000
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _loop(turns, limits, registry):
+    class Provider:
+        async def stream_with_tools(self, messages, model, tools=None, options=None, **kwargs):
+            limits.append(options["max_output_tokens"])
+            for chunk in turns.pop(0):
+                yield chunk
+
+    context_manager = MagicMock(spec=["prepare_messages", "update_from_response"])
+    context_manager.prepare_messages.side_effect = lambda messages, **kw: list(messages)
+    return ChatLoop(
+        llm=Provider(),
+        registry=registry,
+        messages=[{"role": "system", "content": "s"}, {"role": "user", "content": "go"}],
+        config=ChatLoopConfig(max_output_tokens=4096),
+        callbacks=MagicMock(is_cancelled=MagicMock(return_value=False)),
+        context_manager=context_manager,
+    )
+
+
+@pytest.mark.anyio
+async def test_short_replies_do_not_lower_the_limit():
+    read = ToolCallDef("c1", "read_file", '{"file_path": "a"}', index=0)
+    usage = {"prompt_tokens": 100, "completion_tokens": 120}
+    turns = [[NormalizedStreamChunk(tool_calls=[read], usage=usage)]] * 4
+    turns = turns + [[NormalizedStreamChunk(content="done", usage=usage)]]
+    limits = []
+    registry = MagicMock(get_schemas=MagicMock(return_value=[]))
+    registry.execute.return_value = "contents"
+
+    await _loop(turns, limits, registry).run()
+
+    assert limits == [4096] * 5
+
+
+@pytest.mark.anyio
+async def test_prompt_is_sized_from_the_messages_sent():
+    read = ToolCallDef("c1", "read_file", '{"file_path": "a"}', index=0)
+    usage = {"prompt_tokens": 100, "completion_tokens": 20}
+    turns = [
+        [NormalizedStreamChunk(tool_calls=[read], usage=usage)],
+        [NormalizedStreamChunk(content="done", usage=usage)],
+    ]
+    limits = []
+    registry = MagicMock(get_schemas=MagicMock(return_value=[]))
+    registry.execute.return_value = "contents"
+    loop = _loop(turns, limits, registry)
+    # Far more history than the window holds; the context manager drops it
+    # (and copies what it keeps, like DefaultContextManager).
+    loop.messages.insert(1, {"role": "user", "content": "x" * 600_000})
+    loop.context_manager.prepare_messages.side_effect = lambda messages, **kw: [
+        dict(m) for i, m in enumerate(messages) if i != 1
+    ]
+
+    with patch.object(output_budget, "_chars", wraps=output_budget._chars) as chars:
+        await loop.run()
+
+    assert limits == [4096, 4096]
+    # The second request reused the first one's reported usage.
+    assert len(chars.call_args_list[1].args[0]) == 1
+
+
+@pytest.mark.anyio
+async def test_call_cut_off_at_the_limit_is_not_run():
+    cut = ToolCallDef("c1", "write_file", '{"file_path": "a", "content": "abc', index=0)
+    turns = [
+        [NormalizedStreamChunk(tool_calls=[cut], usage={"completion_tokens": 4096})],
+        [NormalizedStreamChunk(content="retrying", usage={"completion_tokens": 5})],
+    ]
+    registry = MagicMock(get_schemas=MagicMock(return_value=[]))
+    loop = _loop(turns, [], registry)
+
+    await loop.run()
+
+    registry.execute.assert_not_called()
+    result = next(m for m in loop.messages if m["role"] == "tool")
+    assert "output limit of 4096 tokens" in result["content"]
+
+
+def test_adaptive_limit_can_be_disabled():
+    loop = ChatLoop(
+        llm=MagicMock(),
+        registry=MagicMock(),
+        messages=[],
+        config=ChatLoopConfig(adaptive_output_tokens=False),
+        callbacks=MagicMock(),
+    )
+    assert loop.output_budget is None
+
+
+@pytest.mark.parametrize(
+    "limit,expected",
+    [(None, None), (4096, None), (1500, {"num_predict": 1500})],
+)
+def test_ollama_caps_generation_only_when_narrowed(limit, expected):
+    provider = OllamaProvider(MagicMock(base_url="http://localhost:1", max_output_tokens=4096))
+    options = {"max_output_tokens": limit} if limit else {}
+    assert provider._generation_options(options) == expected
+
+
+def test_claude_prefers_the_per_request_limit():
+    config = MagicMock(max_output_tokens=4096)
+    assert _max_tokens(config, None) == 4096
+    assert _max_tokens(config, {"max_output_tokens": 1024}) == 1024
@@ -0,0 +1,162 @@
+"""Tests for the per-turn reasoning budget and its provider mappings."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from ayder_cli.core.config import Config
+from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.loops.reasoning_budget import ReasoningBudget, configured_efforts
+from ayder_cli.providers import NormalizedStreamChunk
+from ayder_cli.providers.base import ToolCallDef
+from ayder_cli.providers.impl.claude import ClaudeProvider
+from ayder_cli.providers.impl.gemini import _thinking_budget
+from ayder_cli.providers.impl.ollama import OllamaProvider
+from ayder_cli.providers.impl.openai import OpenAIProvider
+from tests.providers.fake_llm_server import FakeLLMServer, StreamScript
+
+_USER = {"role": "user", "content": "go"}
+_CALL = {"role": "assistant", "content": "", "tool_calls": [{"id": "c1"}]}
+
+
+def _tool(content):
+    return {"role": "tool", "tool_call_id": "c1", "content": content}
+
+
+@pytest.mark.parametrize(
+    "history,expected",
+    [
+        ([_USER], "high"),
+        ([_USER, _CALL, _tool("file contents")], "low"),
+        ([_USER, _CALL, _tool("ok"), _tool("Error: no such file")], "high"),
+    ],
+)
+def test_effort_follows_the_history_tail(history, expected):
+    assert ReasoningBudget("high", "low").effort_for(history) == expected
+
+
+def test_savings_are_measured_against_full_effort_turns():
+    budget = ReasoningBudget("high", "off")
+    assert budget.record("off", 10) == 0  # no baseline yet
+    assert budget.record("high", 900) == 0
+    assert budget.record("high", 1100) == 0
+    assert budget.record("off", 50) == 950
+    assert budget.stats.turns == {"off": 2, "high": 2}
+    assert (budget.stats.reasoning_tokens, budget.stats.saved_tokens) == (2060, 950)
+
+
+def test_unknown_effort_is_rejected():
+    with pytest.raises(ValueError):
+        ReasoningBudget("extreme", "low")
+
+
+def test_configured_efforts_only_when_enabled():
+    assert configured_efforts(Config()) == (None, None)
+    config = Config(reasoning={"enabled": True, "tool_turn_effort": "off"})
+    assert configured_efforts(config) == ("high", "off")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_chat_loop_sends_effort_per_turn():
+    turns = [
+        [
+            NormalizedStreamChunk(reasoning="r" * 4000),
+            NormalizedStreamChunk(tool_calls=[ToolCallDef("c1", "read_file", '{"file_path": "a"}', index=0)]),
+        ],
+        [NormalizedStreamChunk(reasoning="r" * 400, content="done")],
+    ]
+    efforts = []
+
+    class Provider:
+        async def stream_with_tools(self, messages, model, tools=None, options=None, **kwargs):
+            efforts.append(options.get("reasoning_effort"))
+            for chunk in turns.pop(0):
+                yield chunk
+
+    registry = MagicMock(get_schemas=MagicMock(return_value=[]))
+    registry.execute.return_value = "contents"
+    loop = ChatLoop(
+        llm=Provider(),
+        registry=registry,
+        messages=[{"role": "system", "content": "s"}, _USER],
+        config=ChatLoopConfig(user_turn_effort="high", tool_turn_effort="low"),
+        callbacks=MagicMock(is_cancelled=MagicMock(return_value=False)),
+    )
+    await loop.run()
+
+    assert efforts == ["high", "low"]
+    assert loop.reasoning_budget.stats.saved_tokens == 900
+
+
+@pytest.mark.parametrize(
+    "configured,effort,expected",
+    [
+        (True, None, True),
+        (True, "off", False),
+        (True, "low", True),  # boolean profile: levels may be unsupported
+        ("high", "low", "low"),
+        (False, "high", False),  # never switched on
+    ],
+)
+def test_ollama_think_mapping(configured, effort, expected):
+    provider = OllamaProvider(MagicMock(base_url="http://localhost:1", think=configured))
+    options = {"reasoning_effort": effort} if effort else {}
+    assert provider._think_for(options) == expected
+
+
+def test_claude_thinking_budget_only_after_user_message():
+    kwargs = {"max_tokens": 4096}
+    ClaudeProvider._apply_thinking(kwargs, [_USER], {"reasoning_effort": "medium"})
+    assert kwargs == {"max_tokens": 8192, "thinking": {"type": "enabled", "budget_tokens": 4096}}
+
+    kwargs = {"max_tokens": 4096}
+    ClaudeProvider._apply_thinking(kwargs, [_USER, _CALL, _tool("x")], {"reasoning_effort": "high"})
+    ClaudeProvider._apply_thinking(kwargs, [_USER], {"reasoning_effort": "off"})
+    assert kwargs == {"max_tokens": 4096}
+
+
+@pytest.mark.parametrize(
+    "model,effort,expected",
+    [
+        ("gemini-2.5-flash", "off", 0),
+        ("gemini-2.5-flash", "low", 1024),
+        ("gemini-2.5-flash", None, None),
+        # Pro models cannot turn thinking off; 0 would be rejected.
+        ("gemini-2.5-pro", "off", 128),
+        ("models/gemini-2.5-pro-preview-06-05", "off", 128),
+        ("gemini-2.5-pro", "high", -1),
+    ],
+)
+def test_gemini_thinking_budget(model, effort, expected):
+    options = {"reasoning_effort": effort} if effort else {}
+    assert _thinking_budget(options, model) == expected
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "supported,expected", [(True, [None, "high"]), (False, [None, None])]
+)
+async def test_openai_sends_reasoning_effort_only_when_supported(supported, expected):
+    async with FakeLLMServer([StreamScript(), StreamScript()]) as server:
+        config = Config(
+            base_url=server.url + "/v1",
+            api_key="x",
+            model="m",
+            supports_reasoning_effort=supported,
+        )
+        provider = OpenAIProvider(config)
+        try:
+            for effort in ("off", "high"):
+                async for _ in provider.stream_with_tools(
+                    [_USER], "m", options={"reasoning_effort": effort}
+                ):
+                    pass
+        finally:
+            await provider.client.close()
+
+    assert [r.body.get("reasoning_effort") for r in server.requests] == expected
@@ -0,0 +1,179 @@
+"""Throughput benchmark for the provider adapters, run against FakeLLMServer.
+
+    python -m tests.providers.bench_providers [--tokens N] [--runs N]
+
+For each provider it reports:
+
+    ttft ms        request start to the first content chunk
+    cpu us/tok     adapter CPU per streamed token: process time of the
+                   provider stream minus a raw HTTP read of the same bytes
+                   (server and transport cost cancel out)
+    alloc B/chunk  tracemalloc peak per normalized chunk
+    loop ms        ChatLoop turn wall time minus the bare provider stream
+
+Medians over ``--runs``. Gemini, GLM and Qwen are not covered: their wire
+formats are not emulated by the fake server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable
+from unittest.mock import MagicMock
+
+import httpx
+from loguru import logger
+
+from ayder_cli.core.config import Config
+from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig
+from ayder_cli.providers.base import AIProvider
+from ayder_cli.providers.retry import RetryConfig, RetryingProvider
+from tests.providers.fake_llm_server import FakeLLMServer, text_script
+
+_MESSAGES = [{"role": "user", "content": "go"}]
+
+
+def _providers(url: str) -> dict[str, tuple[Callable[[], AIProvider], str, dict[str, Any]]]:
+    """name -> (factory, raw endpoint, raw request body)."""
+    from ayder_cli.providers.impl.ollama import OllamaProvider
+    from ayder_cli.providers.impl.openai import OpenAIProvider
+
+    openai_body = {"model": "m", "messages": _MESSAGES, "stream": True}
+    providers: dict[str, tuple[Callable[[], AIProvider], str, dict[str, Any]]] = {
+        "openai": (
+            lambda: OpenAIProvider(Config(base_url=url + "/v1", api_key="x", model="m", driver="openai")),
+            "/v1/chat/completions",
+            openai_body,
+        ),
+        "openai+retry": (
+            lambda: RetryingProvider(
+                OpenAIProvider(Config(base_url=url + "/v1", api_key="x", model="m", driver="openai")),
+                RetryConfig(),
+            ),
+            "/v1/chat/completions",
+            openai_body,
+        ),
+        "ollama": (
+            lambda: OllamaProvider(Config(base_url=url, api_key="x", model="m", chat_protocol="ollama")),
+            "/api/chat",
+            {"model": "m", "messages": _MESSAGES, "stream": True},
+        ),
+    }
+    try:
+        import anthropic
+    except ImportError:
+        pass
+    else:
+        from ayder_cli.providers.impl.claude import ClaudeProvider
+
+        def claude() -> AIProvider:
+            provider = ClaudeProvider(Config(api_key="x", model="m", driver="anthropic"))
+            # ClaudeProvider does not take base_url from Config.
+            provider.client = anthropic.AsyncAnthropic(api_key="x", base_url=url)
+            return provider
+
+        providers["anthropic"] = (
+            claude,
+            "/v1/messages",
+            {"model": "m", "messages": _MESSAGES, "stream": True, "max_tokens": 1},
+        )
+    return providers
+
+
+async def _timed(run: Callable[[], Awaitable[Any]]) -> tuple[float, float]:
+    """(wall seconds, CPU seconds) of one awaited run."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    await run()
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+async def _bench_provider(
+    provider: AIProvider, raw: Callable[[], Awaitable[Any]], tokens: int, runs: int
+) -> dict[str, float]:
+    chunks = 0
+    first: list[float] = []
+
+    async def stream() -> None:
+        nonlocal chunks
+        chunks = 0
+        start = time.perf_counter()
+        seen = False
+        async for chunk in provider.stream_with_tools(_MESSAGES, "m"):
+            chunks += 1
+            if not seen and chunk.content:
+                first.append(time.perf_counter() - start)
+                seen = True
+
+    async def turn() -> None:
+        await ChatLoop(
+            llm=provider,
+            registry=MagicMock(get_schemas=MagicMock(return_value=[])),
+            messages=[{"role": "system", "content": "s"}, *_MESSAGES],
+            config=ChatLoopConfig(model="m"),
+            callbacks=MagicMock(is_cancelled=MagicMock(return_value=False)),
+        ).run()
+
+    await stream()  # warm up connections and driver resolution
+    await raw()
+    first.clear()
+
+    raw_runs = [await _timed(raw) for _ in range(runs)]
+    stream_runs = [await _timed(stream) for _ in range(runs)]
+    turn_runs = [await _timed(turn) for _ in range(runs)]
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    await stream()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    def median(samples: list[tuple[float, float]], i: int) -> float:
+        return statistics.median(s[i] for s in samples)
+
+    return {
+        "ttft ms": statistics.median(first) * 1e3,
+        "cpu us/tok": max(0.0, median(stream_runs, 1) - median(raw_runs, 1)) / tokens * 1e6,
+        "alloc B/chunk": peak / max(chunks, 1),
+        "loop ms": (median(turn_runs, 0) - median(stream_runs, 0)) * 1e3,
+    }
+
+
+async def run(tokens: int, runs: int, first_token_delay: float) -> dict[str, dict[str, float]]:
+    script = text_script(tokens, first_token_delay=first_token_delay)
+    results: dict[str, dict[str, float]] = {}
+    async with FakeLLMServer(script, repeat=True) as server:
+        async with httpx.AsyncClient(base_url=server.url) as http:
+            for name, (factory, path, body) in _providers(server.url).items():
+
+                async def raw(path: str = path, body: dict[str, Any] = body) -> None:
+                    async with http.stream("POST", path, json=body) as response:
+                        async for _ in response.aiter_lines():
+                            pass
+
+                results[name] = await _bench_provider(factory(), raw, tokens, runs)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=2000, help="streamed chunks per response")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per measurement")
+    parser.add_argument("--ttft-delay", type=float, default=0.0, help="scripted server delay (s)")
+    args = parser.parse_args()
+
+    logger.remove()  # provider debug logging would dominate the measurement
+    results = asyncio.run(run(args.tokens, args.runs, args.ttft_delay))
+
+    columns = ["ttft ms", "cpu us/tok", "alloc B/chunk", "loop ms"]
+    print(f"{'provider':<14}" + "".join(f"{c:>15}" for c in columns))
+    for name, row in results.items():
+        print(f"{name:<14}" + "".join(f"{row[c]:>15.2f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Local fake LLM server speaking the OpenAI, Ollama and Anthropic streaming wires.
+
+Each request to a chat endpoint replays the next StreamScript: text pieces
+and tool calls (arguments split into fragments), with scripted delays before
+the first chunk and between chunks. Used by the provider conformance tests
+and by bench_providers to time the adapters without a model.
+
+Endpoints:
+    POST /v1/chat/completions   OpenAI SSE (or one JSON body when stream=false)
+    POST /api/chat              Ollama NDJSON (tool calls arrive whole)
+    POST /v1/messages           Anthropic SSE
+    POST /api/show              minimal Ollama model metadata
+    HEAD (any path)             empty 404, as a warm-up probe would get
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+
+
+@dataclass(frozen=True)
+class ScriptedToolCall:
+    name: str
+    arguments: dict[str, Any]
+    fragments: int = 4  # argument JSON is streamed in this many pieces
+
+    def argument_fragments(self) -> list[str]:
+        text = json.dumps(self.arguments)
+        count = max(1, min(self.fragments, len(text)))
+        step = -(-len(text) // count)
+        return [text[i:i + step] for i in range(0, len(text), step)]
+
+
+@dataclass(frozen=True)
+class StreamScript:
+    text: tuple[str, ...] = ("Hello", " world", ".")
+    tool_calls: tuple[ScriptedToolCall, ...] = ()
+    first_token_delay: float = 0.0
+    chunk_delay: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        """Streamed pieces: text chunks plus argument fragments."""
+        return len(self.text) + sum(len(tc.argument_fragments()) for tc in self.tool_calls)
+
+
+def text_script(tokens: int, **kwargs: Any) -> StreamScript:
+    """A script streaming ``tokens`` short words."""
+    return StreamScript(text=tuple(f"tok{i} " for i in range(tokens)), **kwargs)
+
+
+@dataclass
+class _Request:
+    method: str
+    path: str
+    body: dict[str, Any] = field(default_factory=dict)
+
+
+class FakeLLMServer:
+    """``async with FakeLLMServer(scripts) as server:`` — serves on ``server.url``.
+
+    ``scripts`` are replayed in order, one per chat request; with
+    ``repeat=True`` the sequence restarts when exhausted. Every request is
+    recorded in ``requests``.
+    """
+
+    def __init__(self, scripts: StreamScript | Iterable[StreamScript], *, repeat: bool = False):
+        self._scripts = [scripts] if isinstance(scripts, StreamScript) else list(scripts)
+        self._repeat = repeat
+        self._next = 0
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+        self.requests: list[_Request] = []
+        self.model = "fake-model"
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self) -> FakeLLMServer:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        assert self._server is not None
+        self._server.close()
+        # Clients keep connections alive; wait_closed would wait for them.
+        for writer in self._connections:
+            writer.close()
+        await self._server.wait_closed()
+
+    def _take_script(self) -> StreamScript:
+        if self._next >= len(self._scripts):
+            if not self._repeat:
+                raise RuntimeError("fake server ran out of scripts")
+            self._next = 0
+        script = self._scripts[self._next]
+        self._next += 1
+        return script
+
+    # -- HTTP ---------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                raw = await reader.readexactly(int(headers.get("content-length", 0)))
+                request = _Request(method, path.split("?")[0], json.loads(raw) if raw else {})
+                self.requests.append(request)
+                await self._respond(request, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _respond(self, request: _Request, writer: asyncio.StreamWriter) -> None:
+        if request.method == "HEAD":  # connection warm-up: headers only
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return await writer.drain()
+        if request.path == "/api/show":
+            return await self._send_json(writer, _OLLAMA_SHOW)
+        dialects = {
+            "/v1/chat/completions": (_openai_events, "text/event-stream"),
+            "/api/chat": (_ollama_events, "application/x-ndjson"),
+            "/v1/messages": (_anthropic_events, "text/event-stream"),
+        }
+        if request.path not in dialects:
+            return await self._send_json(writer, {"error": "not found"}, status="404 Not Found")
+
+        script = self._take_script()
+        model = request.body.get("model", self.model)
+        if request.path == "/v1/chat/completions" and not request.body.get("stream"):
+            return await self._send_json(writer, _openai_completion(script, model))
+
+        render, content_type = dialects[request.path]
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            + f"Content-Type: {content_type}\r\n".encode()
+            + b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        await writer.drain()
+        await asyncio.sleep(script.first_token_delay)
+        for i, event in enumerate(render(script, model)):
+            if i and script.chunk_delay:
+                await asyncio.sleep(script.chunk_delay)
+            data = event.encode()
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    async def _send_json(writer: asyncio.StreamWriter, payload: Any, status: str = "200 OK") -> None:
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+
+# -- Wire formats -----------------------------------------------------------
+
+_OLLAMA_SHOW = {
+    "modelfile": "",
+    "parameters": "",
+    "template": "",
+    "details": {"format": "gguf", "family": "llama", "quantization_level": "Q4_0"},
+    "model_info": {"llama.context_length": 8192},
+    "capabilities": ["completion", "tools"],
+}
+
+
+def _sse(payload: Any, event: str | None = None) -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(payload)}\n\n"
+
+
+def _openai_events(script: StreamScript, model: str) -> Iterator[str]:
+    def chunk(delta: dict[str, Any], finish: str | None = None) -> str:
+        return _sse({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        })
+
+    for piece in script.text:
+        yield chunk({"role": "assistant", "content": piece})
+    for index, call in enumerate(script.tool_calls):
+        for j, fragment in enumerate(call.argument_fragments()):
+            function = {"arguments": fragment}
+            delta: dict[str, Any] = {"index": index, "function": function}
+            if j == 0:
+                function["name"] = call.name
+                delta.update(id=f"call_{index}", type="function")
+            yield chunk({"tool_calls": [delta]})
+    yield chunk({}, "tool_calls" if script.tool_calls else "stop")
+    yield _sse({
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [],
+        "usage": {"prompt_tokens": 1, "completion_tokens": script.tokens,
+                  "total_tokens": script.tokens + 1},
+    })
+    yield "data: [DONE]\n\n"
+
+
+def _openai_completion(script: StreamScript, model: str) -> dict[str, Any]:
+    message: dict[str, Any] = {"role": "assistant", "content": "".join(script.text)}
+    if script.tool_calls:
+        message["tool_calls"] = [
+            {"id": f"call_{i}", "type": "function",
+             "function": {"name": call.name, "arguments": json.dumps(call.arguments)}}
+            for i, call in enumerate(script.tool_calls)
+        ]
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "message": message,
+                     "finish_reason": "tool_calls" if script.tool_calls else "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": script.tokens,
+                  "total_tokens": script.tokens + 1},
+    }
+
+
+def _ollama_events(script: StreamScript, model: str) -> Iterator[str]:
+    def line(message: dict[str, Any], **extra: Any) -> str:
+        payload = {"model": model, "created_at": "2024-01-01T00:00:00Z",
+                   "message": {"role": "assistant", "content": "", **message},
+                   "done": False, **extra}
+        return json.dumps(payload) + "\n"
+
+    for piece in script.text:
+        yield line({"content": piece})
+    for call in script.tool_calls:
+        yield line({"tool_calls": [{"function": {"name": call.name, "arguments": call.arguments}}]})
+    yield line({}, done=True, done_reason="stop", total_duration=0, load_duration=0,
+               prompt_eval_count=1, prompt_eval_duration=0,
+               eval_count=script.tokens, eval_duration=0)
+
+
+def _anthropic_events(script: StreamScript, model: str) -> Iterator[str]:
+    yield _sse({"type": "message_start", "message": {
+        "id": "msg_fake", "type": "message", "role": "assistant", "model": model,
+        "content": [], "stop_reason": None, "stop_sequence": None,
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }}, "message_start")
+    index = 0
+    if script.text:
+        yield _sse({"type": "content_block_start", "index": 0,
+                    "content_block": {"type": "text", "text": ""}}, "content_block_start")
+        for piece in script.text:
+            yield _sse({"type": "content_block_delta", "index": 0,
+                        "delta": {"type": "text_delta", "text": piece}}, "content_block_delta")
+        yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        index = 1
+    for i, call in enumerate(script.tool_calls, start=index):
+        yield _sse({"type": "content_block_start", "index": i, "content_block": {
+            "type": "tool_use", "id": f"toolu_{i}", "name": call.name, "input": {},
+        }}, "content_block_start")
+        for fragment in call.argument_fragments():
+            yield _sse({"type": "content_block_delta", "index": i, "delta": {
+                "type": "input_json_delta", "partial_json": fragment,
+            }}, "content_block_delta")
+        yield _sse({"type": "content_block_stop", "index": i}, "content_block_stop")
+    yield _sse({"type": "message_delta",
+                "delta": {"stop_reason": "tool_use" if script.tool_calls else "end_turn",
+                          "stop_sequence": None},
+                "usage": {"output_tokens": script.tokens}}, "message_delta")
+    yield _sse({"type": "message_stop"}, "message_stop")
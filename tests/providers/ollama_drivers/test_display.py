@@ -0,0 +1,63 @@
+"""Tests for the display filters of in-content drivers and their consumers."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ayder_cli.core.display_filter import StreamingDisplayFilter
+from ayder_cli.providers.base import NormalizedStreamChunk
+from ayder_cli.providers.impl.ollama import OllamaProvider
+from ayder_cli.providers.impl.ollama_drivers.deepseek import DeepSeekDriver
+from ayder_cli.providers.impl.ollama_drivers.generic_native import GenericNativeDriver
+from ayder_cli.providers.impl.ollama_drivers.generic_xml import GenericXMLDriver
+from ayder_cli.providers.impl.ollama_drivers.minimax import MiniMaxDriver
+from ayder_cli.providers.impl.ollama_drivers.qwen3 import Qwen3Driver
+
+
+def test_in_content_drivers_have_family_filters():
+    for driver in (GenericXMLDriver(), DeepSeekDriver(), MiniMaxDriver(), Qwen3Driver()):
+        assert isinstance(driver.display_filter(), StreamingDisplayFilter)
+    assert GenericNativeDriver().display_filter() is None
+
+
+@pytest.mark.asyncio
+async def test_in_content_stream_shows_prose_without_markup():
+    pieces = ["Let me <tool_", "call><function=read_file><parameter=file_path>a.py",
+              "</parameter></function></tool_call> ok <thi"]
+    cfg = MagicMock(base_url="http://localhost:11434", api_key="", chat_protocol="xml")
+
+    async def fake_stream():
+        for i, piece in enumerate(pieces):
+            message = MagicMock(content=piece, thinking="", tool_calls=[])
+            yield MagicMock(message=message, done=False)
+
+    with patch("ayder_cli.providers.impl.ollama.AsyncClient") as mock_client:
+        instance = AsyncMock()
+        instance.chat.return_value = fake_stream()
+        mock_client.return_value = instance
+        chunks = [
+            chunk async for chunk in OllamaProvider(cfg).stream_with_tools(
+                messages=[{"role": "user", "content": "go"}],
+                model="m",
+                tools=[{"type": "function", "function": {"name": "read_file"}}],
+            )
+        ]
+
+    assert "".join(c.content for c in chunks) == "Let me  ok <thi"
+    assert [tc.name for c in chunks for tc in c.tool_calls] == ["read_file"]
+
+
+@pytest.mark.asyncio
+async def test_deepseek_provider_moves_leaked_think_to_reasoning():
+    from ayder_cli.providers.impl.deepseek import DeepSeekProvider
+
+    async def base_stream(*args, **kwargs):
+        for piece in ["<thi", "nk>hmm</th", "ink>Hello"]:
+            yield NormalizedStreamChunk(content=piece)
+
+    provider = DeepSeekProvider.__new__(DeepSeekProvider)
+    provider.base_provider = MagicMock(stream_with_tools=base_stream)
+    chunks = [c async for c in provider.stream_with_tools([], "deepseek-chat")]
+
+    assert "".join(c.content for c in chunks) == "Hello"
+    assert "".join(c.reasoning for c in chunks) == "hmm"
@@ -0,0 +1,175 @@
+"""Tests for IncrementalToolCallParser and its use in the in-content stream."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ayder_cli.providers.impl.ollama import OllamaProvider
+from ayder_cli.providers.impl.ollama_drivers.deepseek import DeepSeekDriver
+from ayder_cli.providers.impl.ollama_drivers.generic_native import GenericNativeDriver
+from ayder_cli.providers.impl.ollama_drivers.generic_xml import GenericXMLDriver
+from ayder_cli.providers.impl.ollama_drivers.minimax import MiniMaxDriver
+from ayder_cli.providers.impl.ollama_drivers.qwen3 import Qwen3Driver
+
+_XML_CALL = (
+    "<tool_call><function=read_file>"
+    "<parameter=file_path>a.py</parameter>"
+    "</function></tool_call>"
+)
+
+
+def _feed_in_pieces(parser, text, size):
+    calls = []
+    for i in range(0, len(text), size):
+        calls.extend(parser.feed(text[i:i + size]))
+    return calls + parser.flush()
+
+
+def test_native_driver_has_no_incremental_parser():
+    assert GenericNativeDriver().tool_call_parser() is None
+
+
+def test_call_emitted_when_closing_tag_arrives():
+    parser = GenericXMLDriver().tool_call_parser()
+
+    assert parser.feed("Reading it now.\n" + _XML_CALL[:-5]) == []
+    calls = parser.feed(_XML_CALL[-5:] + "\ntrailing prose")
+
+    assert [c.name for c in calls] == ["read_file"]
+    assert json.loads(calls[0].arguments) == {"file_path": "a.py"}
+    assert calls[0].id == "call_0"
+
+
+@pytest.mark.parametrize(
+    ("driver", "content"),
+    [
+        (GenericXMLDriver(), "Let me look.\n" + _XML_CALL + "\nand\n" + _XML_CALL.replace("a.py", "b.py")),
+        (GenericXMLDriver(), "<function=list_files><parameter=path>.</parameter></function>"),
+        (
+            Qwen3Driver(),
+            'ok <tool_call>{"name": "read_file", "arguments": {"file_path": "x"}}</tool_call> '
+            '<tool_call>{"name": "list_files", "arguments": {}}</tool_call>',
+        ),
+        (
+            DeepSeekDriver(),
+            '<function_calls><invoke name="read_file"><parameter name="file_path">x'
+            "</parameter></invoke></function_calls>",
+        ),
+        (
+            DeepSeekDriver(),
+            '<{d}tool_calls><{d}invoke name="read_file"><{d}parameter name="file_path">'
+            'x</{d}parameter></{d}invoke></{d}tool_calls>'.format(
+                d="\uff5c\uff24\uff33\uff2d\uff2c\uff5c"
+            ),
+        ),
+        (
+            MiniMaxDriver(),
+            '<minimax:tool_call><invoke name="read_file"><parameter name="file_path">x'
+            "</parameter></invoke></minimax:tool_call>",
+        ),
+        # Wrapper never closed: recovered by flush() at end of stream.
+        (GenericXMLDriver(), "<tool_call><function=read_file><parameter=file_path>a.py</parameter></function>"),
+    ],
+)
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_parity_with_whole_content_parse(driver, content, size):
+    expected = driver.parse_tool_calls(content, "")
+    got = _feed_in_pieces(driver.tool_call_parser(), content, size)
+    assert got == expected
+    assert got
+
+
+def test_prose_with_angle_brackets_is_not_buffered_forever():
+    parser = GenericXMLDriver().tool_call_parser()
+    parser.feed("if a < b and " + "x" * 100 + " then <b>bold</b> ")
+    assert parser._buf == ""
+
+
+def test_finished_when_model_fabricates_tool_results():
+    parser = GenericXMLDriver().tool_call_parser()
+    parser.feed(_XML_CALL + "\n<tool_res")
+    assert not parser.finished
+    parser.feed("ults>fake output")
+    assert parser.finished
+    assert parser.feed(_XML_CALL) == []
+
+
+def test_tool_results_tag_without_prior_call_does_not_finish():
+    parser = GenericXMLDriver().tool_call_parser()
+    parser.feed("I will wait for the <tool_results> block.")
+    assert not parser.finished
+
+
+def _mock_chunk(content="", done=False):
+    message = MagicMock(content=content, thinking="", tool_calls=[])
+    response = MagicMock(message=message, done=done)
+    response.prompt_eval_count = 5 if done else None
+    response.prompt_eval_duration = 100 if done else None
+    response.eval_count = 3 if done else None
+    response.eval_duration = 50 if done else None
+    response.load_duration = 0 if done else None
+    return response
+
+
+async def _stream(pieces):
+    cfg = MagicMock(base_url="http://localhost:11434", api_key="", chat_protocol="xml")
+    produced: list[str] = []
+
+    async def fake_stream():
+        for i, piece in enumerate(pieces):
+            produced.append(piece)
+            yield _mock_chunk(content=piece, done=i == len(pieces) - 1)
+
+    with patch("ayder_cli.providers.impl.ollama.AsyncClient") as mock_client:
+        instance = AsyncMock()
+        instance.chat.return_value = fake_stream()
+        mock_client.return_value = instance
+        provider = OllamaProvider(cfg)
+        chunks = [
+            chunk async for chunk in provider.stream_with_tools(
+                messages=[{"role": "user", "content": "go"}],
+                model="m",
+                tools=[{"type": "function", "function": {"name": "read_file"}}],
+            )
+        ]
+    return chunks, produced
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_call_before_stream_ends():
+    chunks, _ = await _stream([_XML_CALL, " still talking", " done"])
+
+    call_positions = [i for i, c in enumerate(chunks) if c.tool_calls]
+    assert call_positions == [1]  # right after the chunk that closed it
+    assert chunks[1].tool_calls[0].name == "read_file"
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_generation_on_fabricated_results():
+    pieces = [_XML_CALL, "\n<tool_results>", "made up", " more made up", " end"]
+    chunks, produced = await _stream(pieces)
+
+    assert produced == pieces[:2]
+    assert sum(len(c.tool_calls) for c in chunks) == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_stopped_early_still_reports_usage():
+    pieces = [_XML_CALL, "\n<tool_results>", "made up", " end"]
+    chunks, _ = await _stream(pieces)
+
+    usages = [c.usage for c in chunks if c.usage]
+    assert len(usages) == 1
+    assert usages[0]["estimated"]
+    assert usages[0]["prompt_tokens"] > 0  # the rendered tool prompt
+    assert usages[0]["completion_tokens"] == len(_XML_CALL + pieces[1]) // 4
+
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_to_full_parse_for_json_array():
+    content = '[{"function": {"name": "read_file", "arguments": "{\\"file_path\\": \\"a\\"}"}}]'
+    chunks, _ = await _stream([content])
+
+    calls = [tc for c in chunks for tc in c.tool_calls]
+    assert [c.name for c in calls] == ["read_file"]
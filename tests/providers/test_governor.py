@@ -0,0 +1,194 @@
+"""Behavior tests for RateGovernor, GovernedProvider and rate-limit header parsing."""
+import asyncio
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import pytest
+
+from ayder_cli.providers.base import AIProvider, NormalizedStreamChunk
+from ayder_cli.providers.governor import (
+    GovernedProvider,
+    GovernorConfig,
+    RateGovernor,
+    is_rate_limited,
+    parse_rate_limit_headers,
+    parse_retry_after,
+)
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int, headers: Optional[Dict[str, str]] = None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Response(status_code, headers or {})
+
+
+class _ScriptedProvider(AIProvider):
+    def __init__(self, events: List[Any]):
+        self._events = events
+
+    async def chat(self, *args, **kwargs):
+        raise NotImplementedError
+
+    async def stream_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        verbose: bool = False,
+    ) -> AsyncGenerator[NormalizedStreamChunk, None]:
+        for event in self._events:
+            if isinstance(event, BaseException):
+                raise event
+            yield event
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _governor(**kw) -> RateGovernor:
+    return RateGovernor(GovernorConfig(**kw))
+
+
+@pytest.mark.anyio
+async def test_concurrency_limit_queues_excess_requests():
+    gov = _governor(initial_concurrency=2, max_concurrency=4)
+    await gov.acquire("main")
+    await gov.acquire("main")
+    waiter = asyncio.create_task(gov.acquire("main"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert gov.snapshot()["queued"] == {"main": 1}
+
+    gov.release(success=True)
+    await asyncio.wait_for(waiter, 1)
+    assert gov.in_flight == 2
+
+
+@pytest.mark.anyio
+async def test_aimd_grows_on_success_and_halves_on_429():
+    gov = _governor(initial_concurrency=4, max_concurrency=8)
+    await gov.acquire()
+    gov.release(success=True)
+    assert gov.limit == pytest.approx(4.25)
+
+    gov.on_rate_limited(0.0)
+    assert gov.limit == pytest.approx(2.125)
+    gov.on_rate_limited(0.0)  # same burst: no second decrease
+    assert gov.limit == pytest.approx(2.125)
+    assert gov.throttled == 2
+
+
+@pytest.mark.anyio
+async def test_retry_after_holds_every_caller():
+    gov = _governor()
+    gov.on_rate_limited(0.05)
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(gov.acquire("main"), gov.acquire("agent:a"))
+    assert asyncio.get_running_loop().time() - start >= 0.04
+
+
+@pytest.mark.anyio
+async def test_token_bucket_paces_requests():
+    gov = _governor(requests_per_minute=1200, initial_concurrency=1, max_concurrency=1)  # 20/s, burst 1
+    await gov.acquire()
+    gov.release()
+    start = asyncio.get_running_loop().time()
+    await gov.acquire()
+    assert asyncio.get_running_loop().time() - start >= 0.03
+
+
+@pytest.mark.anyio
+async def test_fair_queueing_interleaves_main_with_agents():
+    gov = _governor(initial_concurrency=1, max_concurrency=1)
+    await gov.acquire("agent:a")
+    order: List[str] = []
+
+    async def run(lane: str) -> None:
+        await gov.acquire(lane)
+        order.append(lane)
+
+    tasks = [asyncio.create_task(run(lane)) for lane in ("agent:a", "agent:b", "agent:a", "main")]
+    await asyncio.sleep(0)
+    for _ in tasks:
+        gov.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    # main has been served least, then agent:b (its group is busier than main's).
+    assert order[:2] == ["main", "agent:b"]
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_leaves_queue():
+    gov = _governor(initial_concurrency=1, max_concurrency=1)
+    await gov.acquire()
+    waiter = asyncio.create_task(gov.acquire("agent:x"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert gov.snapshot()["queued"] == {}
+    gov.release()
+    assert gov.in_flight == 0
+
+
+def test_observe_headers_adopts_server_quota():
+    gov = _governor()
+    gov.observe_headers({"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0",
+                         "x-ratelimit-reset-requests": "2s"})
+    snap = gov.snapshot()
+    assert snap["requests_per_minute"] == 60.0
+    assert 1.5 < snap["cooldown_seconds"] <= 2.0
+
+
+def test_header_parsing():
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"Retry-After-Ms": "250"}) == 0.25
+    assert parse_retry_after({}) is None
+    hint = parse_rate_limit_headers({"x-ratelimit-reset-requests": "1m30s",
+                                     "x-ratelimit-remaining-requests": "7"})
+    assert hint.reset_seconds == 90.0
+    assert hint.remaining == 7
+    assert parse_rate_limit_headers({"anthropic-ratelimit-requests-limit": "50"}).limit == 50
+
+
+def test_is_rate_limited():
+    assert is_rate_limited(_HTTPError(429))
+    assert not is_rate_limited(_HTTPError(500))
+    assert not is_rate_limited(ValueError("x"))
+
+
+@pytest.mark.anyio
+async def test_governed_provider_feeds_429_into_cooldown():
+    gov = _governor()
+    provider = GovernedProvider(_ScriptedProvider([_HTTPError(429, {"retry-after": "5"})]), gov, "agent:a")
+    with pytest.raises(_HTTPError):
+        async for _ in provider.stream_with_tools([], "m"):
+            pass
+    snap = gov.snapshot()
+    assert snap["in_flight"] == 0
+    assert snap["throttled"] == 1
+    assert snap["cooldown_seconds"] > 4.0
+
+
+@pytest.mark.anyio
+async def test_governed_provider_releases_slot_on_success_and_early_close():
+    gov = _governor()
+    chunks = [NormalizedStreamChunk(content="a"), NormalizedStreamChunk(content="b")]
+    provider = GovernedProvider(_ScriptedProvider(chunks), gov)
+
+    got = [c.content async for c in provider.stream_with_tools([], "m")]
+    assert got == ["a", "b"]
+    assert gov.in_flight == 0
+
+    stream = provider.stream_with_tools([], "m")
+    await stream.__anext__()
+    await stream.aclose()
+    assert gov.in_flight == 0
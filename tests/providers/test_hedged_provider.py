@@ -0,0 +1,233 @@
+"""Behavior tests for HedgedProvider, CircuitBreaker and TTFTTracker."""
+import asyncio
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import pytest
+
+from ayder_cli.providers.base import AIProvider, NormalizedStreamChunk
+from ayder_cli.providers.hedging import (
+    BreakerState,
+    CircuitBreaker,
+    EndpointHealth,
+    HedgeConfig,
+    HedgedProvider,
+    HedgeTarget,
+    TTFTTracker,
+)
+
+
+class _TransientError(Exception):
+    """Classified retryable via HedgeConfig.retry_on_names."""
+
+
+class _SlowProvider(AIProvider):
+    """Yields `chunks` after `delay` seconds; records calls and cancellation."""
+
+    def __init__(self, chunks: List[Any], delay: float = 0.0):
+        self._chunks = chunks
+        self._delay = delay
+        self.models: List[str] = []
+        self.cancelled = False
+
+    async def chat(self, messages, model, tools=None, options=None, verbose=False):
+        self.models.append(model)
+        for event in self._chunks:
+            if isinstance(event, BaseException):
+                raise event
+        return self._chunks[0]
+
+    async def stream_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        verbose: bool = False,
+    ) -> AsyncGenerator[NormalizedStreamChunk, None]:
+        self.models.append(model)
+        try:
+            await asyncio.sleep(self._delay)
+            for event in self._chunks:
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def _target(name: str, provider: AIProvider, model: Optional[str] = None) -> HedgeTarget:
+    return HedgeTarget(
+        name=name,
+        provider=provider,
+        health=EndpointHealth(ttft=TTFTTracker(), breaker=CircuitBreaker(2, 60.0)),
+        model=model,
+    )
+
+
+def _cfg(**kw) -> HedgeConfig:
+    base = dict(
+        enabled=True,
+        initial_delay_seconds=0.05,
+        min_delay_seconds=0.0,
+        retry_on_names=("_TransientError",),
+    )
+    base.update(kw)
+    return HedgeConfig(**base)
+
+
+async def _collect(provider: AIProvider) -> List[str]:
+    return [c.content async for c in provider.stream_with_tools([], "primary-model") if c.content]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_fast_primary_never_hedges():
+    primary = _SlowProvider([NormalizedStreamChunk(content="p")])
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f")])
+    hedged = HedgedProvider(_target("a", primary), [_target("b", fallback, "fb")], _cfg(initial_delay_seconds=5))
+
+    assert await _collect(hedged) == ["p"]
+    assert fallback.models == []
+    assert len(hedged._primary.health.ttft) == 1
+
+
+@pytest.mark.anyio
+async def test_slow_primary_is_hedged_and_cancelled():
+    primary = _SlowProvider([NormalizedStreamChunk(content="p")], delay=5.0)
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f1"), NormalizedStreamChunk(content="f2")])
+    hedged = HedgedProvider(_target("a", primary), [_target("b", fallback, "fb")], _cfg())
+
+    assert await _collect(hedged) == ["f1", "f2"]
+    assert fallback.models == ["fb"]  # the fallback profile's own model
+    assert primary.cancelled
+
+
+@pytest.mark.anyio
+async def test_primary_wins_if_it_commits_before_slow_fallback():
+    primary = _SlowProvider([NormalizedStreamChunk(content="p")], delay=0.1)
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f")], delay=5.0)
+    hedged = HedgedProvider(_target("a", primary), [_target("b", fallback, "fb")], _cfg())
+
+    assert await _collect(hedged) == ["p"]
+    assert fallback.models == ["fb"]
+    assert fallback.cancelled
+
+
+@pytest.mark.anyio
+async def test_transient_error_fails_over_immediately():
+    primary = _SlowProvider([_TransientError("overloaded")])
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f")])
+    hedged = HedgedProvider(_target("a", primary), [_target("b", fallback, "fb")], _cfg(initial_delay_seconds=5))
+
+    assert await _collect(hedged) == ["f"]
+
+
+@pytest.mark.anyio
+async def test_fatal_error_propagates_without_failover():
+    primary = _SlowProvider([ValueError("bad request")])
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f")])
+    hedged = HedgedProvider(_target("a", primary), [_target("b", fallback, "fb")], _cfg(initial_delay_seconds=5))
+
+    with pytest.raises(ValueError):
+        await _collect(hedged)
+    assert fallback.models == []
+
+
+@pytest.mark.anyio
+async def test_error_after_commit_propagates():
+    primary = _SlowProvider([NormalizedStreamChunk(content="p"), _TransientError("drop")])
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f")])
+    hedged = HedgedProvider(_target("a", primary), [_target("b", fallback, "fb")], _cfg(initial_delay_seconds=5))
+
+    got: List[str] = []
+    with pytest.raises(_TransientError):
+        async for c in hedged.stream_with_tools([], "m"):
+            got.append(c.content)
+    assert got == ["p"]
+    assert fallback.models == []
+
+
+@pytest.mark.anyio
+async def test_open_breaker_routes_straight_to_fallback():
+    primary = _SlowProvider([NormalizedStreamChunk(content="p")])
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f")])
+    p_target = _target("a", primary)
+    p_target.health.breaker.record_failure()
+    p_target.health.breaker.record_failure()
+    hedged = HedgedProvider(p_target, [_target("b", fallback, "fb")], _cfg(initial_delay_seconds=5))
+
+    assert await _collect(hedged) == ["f"]
+    assert primary.models == []
+
+
+@pytest.mark.anyio
+async def test_usage_only_prelude_is_flushed_with_winner():
+    usage = NormalizedStreamChunk(usage={"total_tokens": 3})
+    primary = _SlowProvider([usage, NormalizedStreamChunk(content="p")])
+    hedged = HedgedProvider(_target("a", primary), [_target("b", _SlowProvider([]), "fb")], _cfg(initial_delay_seconds=5))
+
+    chunks = [c async for c in hedged.stream_with_tools([], "m")]
+    assert chunks[0] is usage
+    assert chunks[1].content == "p"
+
+
+@pytest.mark.anyio
+async def test_chat_fails_over_on_transient_error():
+    primary = _SlowProvider([_TransientError("overloaded")])
+    fallback = _SlowProvider([NormalizedStreamChunk(content="f")])
+    p_target = _target("a", primary)
+    hedged = HedgedProvider(p_target, [_target("b", fallback, "fb")], _cfg())
+
+    result = await hedged.chat([], "m")
+    assert result.content == "f"
+    assert fallback.models == ["fb"]
+
+
+def test_hedge_delay_tracks_primary_percentile():
+    hedged = HedgedProvider(
+        _target("a", _SlowProvider([])),
+        [],
+        HedgeConfig(enabled=True, initial_delay_seconds=7.0, min_delay_seconds=0.5, max_delay_seconds=10.0),
+    )
+    assert hedged.hedge_delay() == 7.0  # too few samples yet
+    for s in (1.0, 1.0, 1.0, 2.0, 3.0):
+        hedged._primary.health.ttft.record(s)
+    assert hedged.hedge_delay() == 3.0
+    hedged._primary.health.ttft.record(60.0)
+    assert hedged.hedge_delay() == 10.0  # clamped
+
+
+def test_circuit_breaker_opens_then_probes():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=10.0, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.state is BreakerState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow()
+
+    now[0] = 11.0
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+
+    now[0] = 22.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_ttft_tracker_nearest_rank_percentile():
+    tracker = TTFTTracker(window=3)
+    assert tracker.percentile(0.9) is None
+    for s in (5.0, 1.0, 2.0, 3.0):  # 5.0 falls out of the window
+        tracker.record(s)
+    assert tracker.percentile(0.5) == 2.0
+    assert tracker.percentile(1.0) == 3.0
@@ -223,3 +223,30 @@ async def test_probe_native_tool_calling_handles_response_error(inspector, mock_
 
     assert probe.verdict == "stream_failed"
     assert "EOF" in probe.raw_error
+
+
+@pytest.mark.asyncio
+async def test_get_running_models_returns_every_loaded_model(inspector, mock_client):
+    """Should map each /api/ps entry, including its name and VRAM."""
+    first = MagicMock(model="qwen3:8b", context_length=8192, expires_at=None,
+                      size_vram=5_000, size=6_000)
+    second = MagicMock(model="llama3:latest", context_length=4096, expires_at=None,
+                       size_vram=0, size=3_000)
+    mock_client.ps.return_value = MagicMock(models=[first, second])
+
+    states = await inspector.get_running_models()
+
+    assert [s.name for s in states] == ["qwen3:8b", "llama3:latest"]
+    assert [s.vram_used for s in states] == [5_000, 0]
+    assert states[0].size == 6_000
+
+
+@pytest.mark.asyncio
+async def test_preload_model_issues_empty_generate(inspector, mock_client):
+    """Preload is an empty /api/generate that pins the model with keep_alive."""
+    mock_client.generate.return_value = MagicMock(load_duration=1_500_000_000)
+
+    load_ns = await inspector.preload_model("qwen3:8b")
+
+    assert load_ns == 1_500_000_000
+    mock_client.generate.assert_awaited_once_with(model="qwen3:8b", keep_alive=-1)
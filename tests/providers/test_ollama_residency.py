@@ -0,0 +1,141 @@
+"""Tests for ModelResidencyManager — Ollama model preloading and residency."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ayder_cli.providers.impl.ollama_inspector import RuntimeState
+from ayder_cli.providers.impl.ollama_residency import (
+    ModelResidencyManager,
+    get_residency_manager,
+    ollama_host,
+)
+
+
+def _inspector(loaded=None):
+    """Fake OllamaInspector whose /api/ps reflects every preloaded model."""
+    resident = list(loaded or [])
+    inspector = MagicMock()
+
+    async def running():
+        return [RuntimeState(name=m, vram_used=1_000) for m in resident]
+
+    async def preload(model, keep_alive=-1):
+        await asyncio.sleep(0)
+        resident.append(model)
+        return 2_000_000_000
+
+    inspector.get_running_models = AsyncMock(side_effect=running)
+    inspector.preload_model = AsyncMock(side_effect=preload)
+    return inspector
+
+
+def test_ollama_host_strips_legacy_v1_suffix():
+    assert ollama_host("http://box:11434/v1") == "http://box:11434"
+    assert ollama_host("http://box:11434/v1/") == "http://box:11434"
+    assert ollama_host(None) == "http://localhost:11434"
+
+
+def test_get_residency_manager_is_shared_per_host():
+    a = get_residency_manager("http://residency-test-a:11434")
+    assert get_residency_manager("http://residency-test-a:11434") is a
+    assert get_residency_manager("http://residency-test-b:11434") is not a
+
+
+@pytest.mark.asyncio
+async def test_ensure_loaded_skips_resident_model():
+    inspector = _inspector(loaded=["qwen3:latest"])
+    mgr = ModelResidencyManager(inspector=inspector)
+
+    assert await mgr.ensure_loaded("qwen3") is True  # untagged == :latest
+    inspector.preload_model.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ensure_loaded_preloads_cold_model_and_tracks_vram():
+    inspector = _inspector(loaded=["a:latest"])
+    mgr = ModelResidencyManager(inspector=inspector)
+
+    assert await mgr.ensure_loaded("b:7b") is True
+
+    inspector.preload_model.assert_awaited_once_with("b:7b")
+    assert mgr.is_resident("b:7b")
+    assert mgr.resident_models() == ["a:latest", "b:7b"]
+    assert mgr.vram_used == 2_000
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_preload():
+    inspector = _inspector()
+    mgr = ModelResidencyManager(inspector=inspector)
+
+    results = await asyncio.gather(*(mgr.ensure_loaded("m:1") for _ in range(4)))
+
+    assert results == [True] * 4
+    assert inspector.preload_model.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cloud_models_are_never_preloaded():
+    inspector = _inspector()
+    mgr = ModelResidencyManager(inspector=inspector)
+
+    assert await mgr.ensure_loaded("deepseek-v4-pro:cloud") is True
+    assert await mgr.ensure_loaded("gemma4:31b-cloud") is True
+    inspector.preload_model.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_preload_returns_false():
+    inspector = _inspector()
+    inspector.preload_model.side_effect = ConnectionError("refused")
+    mgr = ModelResidencyManager(inspector=inspector)
+
+    assert await mgr.ensure_loaded("m:1") is False
+    assert not mgr.is_resident("m:1")
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_previous_view_when_ps_fails():
+    inspector = _inspector(loaded=["a:latest"])
+    mgr = ModelResidencyManager(inspector=inspector)
+    await mgr.refresh()
+
+    inspector.get_running_models.side_effect = ConnectionError("refused")
+    await mgr.refresh()
+
+    assert mgr.is_resident("a")
+
+
+@pytest.mark.asyncio
+async def test_warm_loads_in_order_and_dedupes():
+    inspector = _inspector()
+    mgr = ModelResidencyManager(inspector=inspector)
+
+    await mgr.warm(["agent:1", "", "main:1", "agent:1"])
+
+    loaded = [c.args[0] for c in inspector.preload_model.await_args_list]
+    assert loaded == ["agent:1", "main:1"]
+
+
+@pytest.mark.asyncio
+async def test_wait_until_resident_times_out_without_cancelling_load():
+    inspector = _inspector()
+    release = asyncio.Event()
+
+    async def slow_preload(model, keep_alive=-1):
+        await release.wait()
+        return 0
+
+    inspector.preload_model.side_effect = slow_preload
+    mgr = ModelResidencyManager(inspector=inspector)
+
+    assert await mgr.wait_until_resident("m:1", timeout=0.01) is False
+    release.set()
+    assert await mgr.ensure_loaded("m:1") is True
+    assert inspector.preload_model.await_count == 1
+
+
+def test_warm_in_background_without_running_loop_is_noop():
+    mgr = ModelResidencyManager(inspector=_inspector())
+    assert mgr.warm_in_background(["m:1"]) is None
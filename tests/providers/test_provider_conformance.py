@@ -0,0 +1,135 @@
+"""Provider conformance against a local fake server speaking each wire format.
+
+Every provider must turn the same scripted stream into the same normalized
+output: the text in order and each tool call assembled intact.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from ayder_cli.core.config import Config
+from ayder_cli.loops.chat_loop import ChatLoop, ChatLoopConfig, _StreamedToolCalls
+from ayder_cli.providers.impl.ollama import OllamaProvider
+from ayder_cli.providers.impl.openai import OpenAIProvider
+from ayder_cli.providers.retry import RetryConfig, RetryingProvider
+from tests.providers.fake_llm_server import FakeLLMServer, ScriptedToolCall, StreamScript
+
+_TOOLS = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+_MESSAGES = [{"role": "user", "content": "go"}]
+
+_SCRIPT = StreamScript(
+    text=("Reading ", "both ", "files."),
+    tool_calls=(
+        ScriptedToolCall("read_file", {"file_path": "a.py", "note": 'say "hi" é'}),
+        ScriptedToolCall("read_file", {"file_path": "b.py"}, fragments=7),
+    ),
+)
+
+
+def _openai(server):
+    return OpenAIProvider(Config(base_url=server.url + "/v1", api_key="x", model="m", driver="openai"))
+
+
+def _ollama(server):
+    return OllamaProvider(Config(base_url=server.url, api_key="x", model="m", chat_protocol="ollama"))
+
+
+def _claude(server):
+    anthropic = pytest.importorskip("anthropic")
+    from ayder_cli.providers.impl.claude import ClaudeProvider
+
+    provider = ClaudeProvider(Config(api_key="x", model="m", driver="anthropic"))
+    # ClaudeProvider does not take base_url from Config.
+    provider.client = anthropic.AsyncAnthropic(api_key="x", base_url=server.url)
+    return provider
+
+
+@asynccontextmanager
+async def _opened(provider):
+    """Close the SDK's HTTP pool on this event loop, not at garbage collection."""
+    try:
+        yield provider
+    finally:
+        inner = getattr(provider, "_inner", provider)
+        if isinstance(inner, OllamaProvider):
+            await inner._client._client.aclose()
+        else:
+            await inner.client.close()
+
+
+async def _collect(provider):
+    text, calls = [], _StreamedToolCalls()
+    async for chunk in provider.stream_with_tools(_MESSAGES, "m", tools=_TOOLS):
+        text.append(chunk.content)
+        for tc in chunk.tool_calls:
+            calls.add(tc)
+    return "".join(text), [
+        (c["function"]["name"], c["function"]["arguments"]) for c in calls.calls()
+    ]
+
+
+def _expected(script):
+    return "".join(script.text), [(tc.name, json.dumps(tc.arguments)) for tc in script.tool_calls]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("make_provider", [_openai, _ollama, _claude])
+async def test_stream_is_normalized_identically(make_provider):
+    async with FakeLLMServer(_SCRIPT, repeat=True) as server:
+        async with _opened(make_provider(server)) as provider:
+            text, calls = await _collect(provider)
+
+    expected_text, expected_calls = _expected(_SCRIPT)
+    assert text == expected_text
+    # Compare decoded arguments: Ollama sends them pre-parsed and re-encodes.
+    assert [(n, json.loads(a)) for n, a in calls] == [
+        (n, json.loads(a)) for n, a in expected_calls
+    ]
+
+
+@pytest.mark.anyio
+async def test_retrying_provider_recovers_from_empty_stream():
+    async with FakeLLMServer([StreamScript(text=()), _SCRIPT]) as server:
+        provider = RetryingProvider(
+            _openai(server), RetryConfig(initial_delay_seconds=0), sleep=lambda _: _noop()
+        )
+        async with _opened(provider):
+            text, calls = await _collect(provider)
+
+    assert (text, [n for n, _ in calls]) == ("Reading both files.", ["read_file", "read_file"])
+    assert len(server.requests) == 2
+
+
+async def _noop():
+    return None
+
+
+@pytest.mark.anyio
+async def test_chat_loop_turn_round_trips_tool_results():
+    final = StreamScript(text=("done",))
+    async with FakeLLMServer([_SCRIPT, final]) as server:
+        registry = MagicMock(get_schemas=MagicMock(return_value=_TOOLS))
+        registry.execute.return_value = "contents"
+        messages = [{"role": "system", "content": "s"}, *_MESSAGES]
+        async with _opened(_openai(server)) as provider:
+            await ChatLoop(
+                llm=provider,
+                registry=registry,
+                messages=messages,
+                config=ChatLoopConfig(model="m", permissions={"r"}),
+                callbacks=MagicMock(is_cancelled=MagicMock(return_value=False)),
+            ).run()
+
+    assert [c.args[1]["file_path"] for c in registry.execute.call_args_list] == ["a.py", "b.py"]
+    chat = [r for r in server.requests if r.method == "POST"]
+    second = chat[1].body["messages"]
+    assert [m["tool_call_id"] for m in second if m["role"] == "tool"] == ["call_0", "call_1"]
+    assert messages[-1] == {"role": "assistant", "content": "done"}
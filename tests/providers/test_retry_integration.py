@@ -1,8 +1,11 @@
 """Integration: runtime_factory wraps the provider in RetryingProvider when
 retry.enabled is true, and wires CacheMonitor.reset() for OllamaContextManager."""
 
+from unittest.mock import patch
+
 from ayder_cli.application.runtime_factory import create_runtime
-from ayder_cli.core.config import Config, RetryConfigSection
+from ayder_cli.core.config import Config, HedgeConfigSection, RetryConfigSection
+from ayder_cli.providers.hedging import HedgedProvider
 from ayder_cli.providers.retry import RetryingProvider
 
 
@@ -57,3 +60,46 @@ def test_runtime_factory_no_cache_monitor_wiring_for_non_ollama(tmp_path):
     hook = rt.llm_provider._on_reconnect  # type: ignore[attr-defined]
     if hook is not None:
         hook()  # must not raise
+
+
+def _fallback_config() -> Config:
+    return Config(
+        provider="backup",
+        driver="openai",
+        base_url="http://backup:8000/v1",
+        api_key="test",
+        model="backup-model",
+    )
+
+
+def test_runtime_factory_wraps_hedged_provider_with_fallback_profile(tmp_path):
+    cfg = _minimal_config(retry_enabled=True, driver="ollama").model_copy(
+        update={"hedge": HedgeConfigSection(enabled=True, fallback_profiles=("backup", "missing"))}
+    )
+    with patch(
+        "ayder_cli.application.runtime_factory.list_provider_profiles",
+        return_value=["openai", "backup"],
+    ), patch(
+        "ayder_cli.application.runtime_factory.load_config_for_provider",
+        return_value=_fallback_config(),
+    ):
+        rt = create_runtime(config=cfg, project_root=str(tmp_path))
+
+    assert isinstance(rt.llm_provider, HedgedProvider)
+    primary = rt.llm_provider._primary  # type: ignore[attr-defined]
+    fallbacks = rt.llm_provider._fallbacks  # type: ignore[attr-defined]
+    assert isinstance(primary.provider, RetryingProvider)
+    assert [(f.name, f.model) for f in fallbacks] == [("backup", "backup-model")]
+    assert isinstance(fallbacks[0].provider, RetryingProvider)
+
+
+def test_runtime_factory_skips_hedging_without_usable_fallbacks(tmp_path):
+    cfg = _minimal_config(retry_enabled=True, driver="ollama").model_copy(
+        update={"hedge": HedgeConfigSection(enabled=True, fallback_profiles=("openai",))}
+    )
+    with patch(
+        "ayder_cli.application.runtime_factory.list_provider_profiles",
+        return_value=["openai"],
+    ):
+        rt = create_runtime(config=cfg, project_root=str(tmp_path))
+    assert isinstance(rt.llm_provider, RetryingProvider)
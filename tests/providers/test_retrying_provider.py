@@ -235,3 +235,40 @@ async def test_on_reconnect_exception_does_not_break_retry():
 
     got = [c async for c in wrapped.stream_with_tools(messages=[], model="m")]
     assert [g.content for g in got] == ["ok"]  # retry succeeded despite hook
+
+
+class _FlakyChatProvider(_FakeProvider):
+    def __init__(self, outcomes: List[Any]):
+        super().__init__([])
+        self._outcomes = outcomes
+
+    async def chat(self, *args, **kwargs) -> NormalizedStreamChunk:
+        outcome = self._outcomes[self.calls]
+        self.calls += 1
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+@pytest.mark.anyio
+async def test_chat_retries_retryable_errors():
+    import httpx
+
+    inner = _FlakyChatProvider([httpx.ConnectError("boom"), NormalizedStreamChunk(content="ok")])
+    wrapped = RetryingProvider(
+        inner, RetryConfig(max_attempts=3, jitter=False, initial_delay_seconds=0.0)
+    )
+    result = await wrapped.chat([], "m")
+    assert result.content == "ok"
+    assert inner.calls == 2
+
+
+@pytest.mark.anyio
+async def test_chat_does_not_retry_fatal_errors():
+    inner = _FlakyChatProvider([ValueError("bad"), NormalizedStreamChunk(content="ok")])
+    wrapped = RetryingProvider(
+        inner, RetryConfig(max_attempts=3, jitter=False, initial_delay_seconds=0.0)
+    )
+    with pytest.raises(ValueError):
+        await wrapped.chat([], "m")
+    assert inner.calls == 1
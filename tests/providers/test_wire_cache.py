@@ -0,0 +1,83 @@
+"""Behavior tests for MessageWireCache and the providers' memoized conversion."""
+import pytest
+
+from ayder_cli.providers.wire_cache import MessageWireCache, message_key
+
+
+def _history():
+    return [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "read a.py"},
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {"id": "c1", "type": "function",
+                 "function": {"name": "read_file", "arguments": '{"file_path": "a.py"}'}}
+            ],
+        },
+        {"role": "tool", "tool_call_id": "c1", "name": "read_file", "content": "print(1)"},
+    ]
+
+
+def test_copies_hit_and_edits_miss():
+    calls = []
+    cache = MessageWireCache(lambda m: calls.append(m) or dict(m))
+    msg = {"role": "user", "content": "hi"}
+
+    first = cache.convert(msg)
+    assert cache.convert(dict(msg)) is first  # context managers hand us copies
+    assert len(calls) == 1
+
+    msg["content"] = "hi (truncated)"
+    assert cache.convert(msg) == {"role": "user", "content": "hi (truncated)"}
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_lru_bound_evicts_oldest():
+    cache = MessageWireCache(dict, maxsize=2)
+    a, b, c = ({"role": "user", "content": x} for x in "abc")
+    cache.convert(a)
+    cache.convert(b)
+    cache.convert(a)  # a is now most recent
+    cache.convert(c)
+    assert len(cache) == 2
+    cache.convert(a)
+    assert cache.misses == 3  # b was evicted, a was not
+
+
+def test_unhashable_values_bypass_cache():
+    cache = MessageWireCache(lambda m: "converted")
+    msg = {"role": "user", "content": object()}
+    assert message_key(msg) is None
+    assert cache.convert(msg) == "converted"
+    assert len(cache) == 0
+
+
+def test_key_distinguishes_dict_from_pair_list():
+    assert message_key({"a": {"b": 1}}) != message_key({"a": [("b", 1)]})
+
+
+@pytest.mark.parametrize(
+    "module_name,cls_name",
+    [
+        ("ayder_cli.providers.impl.claude", "ClaudeProvider"),
+        ("ayder_cli.providers.impl.gemini", "GeminiProvider"),
+    ],
+)
+def test_provider_conversion_reuses_history(module_name, cls_name):
+    module = pytest.importorskip(module_name)
+    provider_cls = getattr(module, cls_name)
+    module._WIRE_CACHE.clear()
+
+    history = _history()
+    system, first = provider_cls._convert_messages(history)
+    assert system == "sys"
+    assert module._WIRE_CACHE.misses == 3
+
+    history.append({"role": "user", "content": "thanks"})
+    _, second = provider_cls._convert_messages([dict(m) for m in history])
+    assert module._WIRE_CACHE.misses == 4
+    assert second[: len(first)] == first
+    assert all(a is b for a, b in zip(first, second))
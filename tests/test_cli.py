@@ -29,7 +29,7 @@ class TestRunCommand:
         assert result == 0
         mock_run_loop.assert_called_once_with(
             "test prompt", permissions={"r"}, agent_mode=False,
-            system_prompt_override=None,
+            system_prompt_override=None, batch=False,
         )
 
     @patch('ayder_cli.cli_runner._run_loop', side_effect=Exception("Loop error"))
@@ -52,7 +52,7 @@ class TestRunCommand:
         assert result == 0
         mock_run_loop.assert_called_once_with(
             "test prompt", permissions={"r", "w"}, agent_mode=False,
-            system_prompt_override=None,
+            system_prompt_override=None, batch=False,
         )
 
     @patch('ayder_cli.cli_runner._run_loop', return_value=0)
@@ -65,7 +65,7 @@ class TestRunCommand:
         assert result == 0
         mock_run_loop.assert_called_once_with(
             "build X", permissions={"r"}, agent_mode=True,
-            system_prompt_override=None,
+            system_prompt_override=None, batch=False,
         )
 
 
@@ -118,6 +118,28 @@ class TestRunLoop:
         assert messages[0] == {"role": "system", "content": "You are a helpful assistant."}
         assert messages[1] == {"role": "user", "content": "test prompt"}
 
+    def test_run_batch_prints_each_result_and_reports_failures(self, capsys):
+        """_run_batch runs every prompt; one failure does not stop the others."""
+        from ayder_cli.cli_runner import _run_batch
+
+        def build(prompt, permissions=None, batch=False, callbacks=None):
+            assert batch is True
+
+            async def drive():
+                if prompt == "bad":
+                    raise RuntimeError("boom")
+                callbacks.on_assistant_content(f"answer to {prompt}")
+
+            return drive
+
+        with patch('ayder_cli.cli_runner._build_loop', side_effect=build):
+            code = _run_batch([("one", "good"), ("two", "bad")], concurrency=2)
+
+        out = capsys.readouterr()
+        assert code == 1
+        assert "=== one ===\nanswer to good\n" in out.out
+        assert "[two] Error: boom" in out.err
+
 
 class TestRunTasksCLI:
     """Test _run_tasks_cli function."""
@@ -258,6 +280,36 @@ class TestRunImplementAllCLI:
             assert result == 1
             assert "Build error" in mock_stderr.getvalue()
 
+    @patch('ayder_cli.cli_runner._run_batch', return_value=0)
+    def test_run_implement_all_batch_queues_pending_tasks(self, mock_run_batch, tmp_path, monkeypatch):
+        """--batch queues one prompt per pending task, in id order."""
+        from ayder_cli.cli_runner import _run_implement_all_cli
+
+        tasks = tmp_path / ".ayder" / "tasks"
+        tasks.mkdir(parents=True)
+        (tasks / "TASK-002-b.md").write_text("- **Status:** pending\n")
+        (tasks / "TASK-001-a.md").write_text("- **Status:** pending\n")
+        (tasks / "TASK-003-c.md").write_text("- **Status:** done\n")
+        monkeypatch.chdir(tmp_path)
+
+        with patch('ayder_cli.core.config.load_config', return_value=MagicMock(batch_concurrency=3)):
+            result = _run_implement_all_cli(permissions={"r"}, batch=True)
+
+        assert result == 0
+        prompts = mock_run_batch.call_args.args[0]
+        assert [label for label, _ in prompts] == ["TASK-001", "TASK-002"]
+        assert "TASK-001-a.md" in prompts[0][1]
+        assert mock_run_batch.call_args.kwargs == {"permissions": {"r"}, "concurrency": 3}
+
+    @patch('ayder_cli.cli_runner._run_batch')
+    def test_run_implement_all_batch_no_pending(self, mock_run_batch, tmp_path, monkeypatch, capsys):
+        from ayder_cli.cli_runner import _run_implement_all_cli
+
+        monkeypatch.chdir(tmp_path)
+        assert _run_implement_all_cli(batch=True) == 0
+        assert "No pending tasks." in capsys.readouterr().out
+        mock_run_batch.assert_not_called()
+
 
 class TestMainFunction:
     """Test main() function entry point."""
@@ -596,7 +648,7 @@ class TestMainTaskOptions:
             with pytest.raises(SystemExit):
                 main()
 
-            mock_run_implement.assert_called_once_with('1', permissions={'r'})
+            mock_run_implement.assert_called_once_with('1', permissions={'r'}, batch=False)
 
     def test_main_implement_all_flag(self):
         """Test --implement-all flag calls _run_implement_all_cli."""
@@ -619,7 +671,7 @@ class TestMainTaskOptions:
             with pytest.raises(SystemExit):
                 main()
 
-            mock_run_all.assert_called_once_with(permissions={'r'})
+            mock_run_all.assert_called_once_with(permissions={'r'}, batch=False)
 
 
 class TestMainTUIAndInteractive:
@@ -136,3 +136,25 @@ class TestCliCallbacksCancellation:
         cb = CliCallbacks()
         cb._cancelled = True
         assert cb.is_cancelled() is True
+
+
+class TestBatchCallbacks:
+    """BatchCallbacks buffers output for one prompt of a batch run."""
+
+    def test_buffers_content_and_renders_final_turn(self, capsys):
+        from ayder_cli.cli_callbacks import BatchCallbacks
+
+        cb = BatchCallbacks("TASK-001")
+        cb.on_assistant_content("Reading files.")
+        cb.on_assistant_content("All done.\n")
+        cb.on_token_usage(100)
+        assert capsys.readouterr().out == ""
+        assert cb.render() == "=== TASK-001 ===\nAll done.\n"
+
+    def test_system_messages_are_labelled(self, capsys):
+        from ayder_cli.cli_callbacks import BatchCallbacks
+
+        cb = BatchCallbacks("TASK-002")
+        cb.on_system_message("Error: boom")
+        assert capsys.readouterr().err == "[TASK-002] Error: boom\n"
+        assert cb.render() == "=== TASK-002 ===\n(no response)\n"
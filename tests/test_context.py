@@ -231,6 +231,7 @@ def test_stats_returns_token_and_cache_fields(project_ctx):
     assert payload["cache_state"] == "hot"
     assert payload["cache_hit_ratio"] == 0.87
     assert payload["saved_contexts_count"] == 0
+    assert isinstance(payload["rate_limits"], dict)
 
 
 def test_stats_cache_na_when_monitor_absent(project_ctx):
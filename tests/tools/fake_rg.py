@@ -0,0 +1,103 @@
+"""A stand-in for ``subprocess.Popen`` running ``rg --json``.
+
+search_codebase streams rg's JSON events for 'full' and 'locations' output;
+FakeRg produces those events for tests that run without ripgrep installed.
+Patch it in with::
+
+    @patch("ayder_cli.tools.builtins.search.subprocess.Popen", new_callable=FakeRg)
+"""
+
+import base64
+import io
+import json
+import threading
+
+
+def rg_events(matches):
+    """rg --json lines for ``{path: [(line_number, text[, "context"]), ...]}``.
+
+    A ``bytes`` text is sent base64-encoded, as rg does for invalid UTF-8.
+    """
+    lines = []
+    for path, entries in matches.items():
+        lines.append({"type": "begin", "data": {"path": {"text": path}}})
+        for line_number, text, *kind in entries:
+            lines.append(
+                {
+                    "type": kind[0] if kind else "match",
+                    "data": {
+                        "path": {"text": path},
+                        "lines": _lines_field(text),
+                        "line_number": line_number,
+                    },
+                }
+            )
+        lines.append({"type": "end", "data": {"path": {"text": path}}})
+    return b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+
+
+def _lines_field(text):
+    if isinstance(text, bytes):
+        return {"bytes": base64.b64encode(text + b"\n").decode()}
+    return {"text": text + "\n"}
+
+
+class _FakeProcess:
+    def __init__(self, output, returncode, hang):
+        self.killed = threading.Event()
+        self.lines_read = 0
+        self.returncode = None
+        self.stdout = self._lines(output, returncode, hang)
+
+    def _lines(self, output, returncode, hang):
+        """Yield the output like a pipe; the process exits once it is drained."""
+        if hang:
+            self.killed.wait(10)
+            return
+        for line in io.BytesIO(output):
+            if self.killed.is_set():
+                return
+            self.lines_read += 1
+            yield line
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        self.killed.set()
+        if self.returncode is None:
+            self.returncode = -9
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class FakeRg:
+    """Records each command and answers it with the configured matches."""
+
+    def __init__(self, matches=None, returncode=None, stderr="", hang=False):
+        self.calls = []
+        self.processes = []
+        self.configure(matches, returncode, stderr, hang)
+
+    def configure(self, matches=None, returncode=None, stderr="", hang=False):
+        self.matches = matches or {}
+        self.returncode = returncode
+        self.stderr = stderr
+        self.hang = hang
+
+    @property
+    def cmd(self):
+        return self.calls[-1]
+
+    def __call__(self, cmd, stdout=None, stderr=None):
+        self.calls.append(cmd)
+        if stderr is not None and self.stderr:
+            stderr.write(self.stderr.encode())
+        returncode = self.returncode
+        if returncode is None:
+            returncode = 0 if self.matches else 1
+        process = _FakeProcess(rg_events(self.matches), returncode, self.hang)
+        self.processes.append(process)
+        return process
@@ -1,14 +1,17 @@
 """Tests for file_editor hardening: match-failure hints, atomic writes,
 and per-file serialization of concurrent edits."""
 
+import difflib
 import os
+import random
 import threading
+import time
 
 import pytest
 
 from ayder_cli.core.context import ProjectContext
 from ayder_cli.core.result import ToolSuccess, ToolError
-from ayder_cli.tools.builtins.filesystem import file_editor
+from ayder_cli.tools.builtins.filesystem import _closest_match_hint, file_editor
 
 
 @pytest.fixture
@@ -71,6 +74,58 @@ class TestReplaceClosestMatchHint:
         assert "losest match" not in result  # no misleading hint
 
 
+def _scan_every_window(file_content, old_string):
+    """(line, ratio) of the best window, scoring every window in order."""
+    lines = file_content.splitlines()
+    size = max(1, len(old_string.splitlines()))
+    best = (0, 0.0)
+    if not lines:
+        return best
+    for i in range(max(1, len(lines) - size + 1)):
+        ratio = difflib.SequenceMatcher(
+            None, "\n".join(lines[i : i + size]), old_string, autojunk=False
+        ).ratio()
+        if ratio > best[1]:
+            best = (i + 1, ratio)
+    return best
+
+
+class TestClosestMatchSearch:
+    """The indexed search must pick the same window as a full scan."""
+
+    def test_matches_a_full_scan(self):
+        rng = random.Random(7)
+        words = ["def", "return", "self", "x", "if", "else:", "(", ")", "=", "  ", "\t", "value"]
+        for _ in range(150):
+            lines = [
+                " ".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+                for _ in range(rng.randint(1, 40))
+            ]
+            start = rng.randrange(len(lines))
+            target = list("\n".join(lines[start : start + rng.randint(1, 4)]))
+            for _ in range(rng.randint(0, 4)):
+                if target:
+                    target[rng.randrange(len(target))] = rng.choice("ab \t")
+            target = "".join(target)
+
+            line, ratio = _scan_every_window("\n".join(lines), target)
+            hint = _closest_match_hint("\n".join(lines), target)
+            if ratio < 0.6:
+                assert hint == ""
+            else:
+                assert f"line {line} ({ratio:.0%} similar)" in hint
+
+    def test_large_file_is_fast(self):
+        lines = [f"    value_{i} = compute(value_{i - 1}, {i % 7})" for i in range(20000)]
+        target = "\n".join(lines[14000:14010]).replace("    ", "\t")
+
+        started = time.monotonic()
+        hint = _closest_match_hint("\n".join(lines), target)
+
+        assert time.monotonic() - started < 2
+        assert "line 14001" in hint
+
+
 class TestAtomicWrite:
     """Mutations must never leave a truncated/partial file behind."""
 
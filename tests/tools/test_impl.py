@@ -8,6 +8,7 @@ import pytest
 from ayder_cli.core.context import ProjectContext
 from ayder_cli.core.result import ToolSuccess, ToolError
 from ayder_cli.tools.builtins import filesystem, search, shell, utils_tools
+from tests.tools.fake_rg import FakeRg
 
 # Create a namespace object that mimicks the old 'impl' module
 class ImplNamespace:
@@ -21,9 +22,7 @@ impl.MAX_FILE_SIZE = filesystem.MAX_FILE_SIZE
 
 impl.search_codebase = search.search_codebase
 impl._search_with_ripgrep = search._search_with_ripgrep
-impl._search_with_grep = search._search_with_grep
-impl._format_search_results = search._format_search_results
-impl._format_grep_results = search._format_grep_results
+impl._search_with_builtin = search._search_with_builtin
 impl._format_files_only = search._format_files_only
 impl._format_count_results = search._format_count_results
 
@@ -618,9 +617,7 @@ class TestSearchWithRipgrepErrors:
     def test_ripgrep_non_zero_exit(self, tmp_path, project_context):
         """Test ripgrep non-zero exit code handling - Line 283."""
         with patch('shutil.which', return_value='/usr/bin/rg'):
-            with patch('subprocess.run') as mock_run:
-                mock_run.return_value = MagicMock(returncode=2, stderr="Mocked error")
-                
+            with patch('subprocess.Popen', FakeRg(returncode=2, stderr="Mocked error")):
                 result = impl._search_with_ripgrep(
                     "pattern", None, True, 0, 50, tmp_path, project_context
                 )
@@ -629,16 +626,19 @@ class TestSearchWithRipgrepErrors:
                 assert "Error: ripgrep failed" in result
                 assert "exit code 2" in result
 
-    def test_ripgrep_timeout(self, tmp_path, project_context):
+    def test_ripgrep_timeout(self, tmp_path, project_context, monkeypatch):
         """Test ripgrep timeout handling - Lines 284-285."""
+        monkeypatch.setattr(search, "_SEARCH_TIMEOUT", 0.05)
+        rg = FakeRg(hang=True)
         with patch('shutil.which', return_value='/usr/bin/rg'):
-            with patch('subprocess.run', side_effect=subprocess.TimeoutExpired("cmd", 60)):
+            with patch('subprocess.Popen', rg):
                 result = impl._search_with_ripgrep(
                     "pattern", None, True, 0, 50, tmp_path, project_context
                 )
                 assert isinstance(result, ToolError)
                 assert result.category == "execution"
                 assert "Search timed out" in result
+                assert rg.processes[0].killed.is_set()
 
     def test_ripgrep_general_exception(self, tmp_path, project_context):
         """Test ripgrep general exception handling - Lines 286-287."""
@@ -652,79 +652,47 @@ class TestSearchWithRipgrepErrors:
                 assert "Error executing ripgrep" in result
 
 
-class TestSearchWithGrepFallback:
-    """Test _search_with_grep fallback - Lines 293-325."""
+class TestSearchWithBuiltinFallback:
+    """Test _search_with_builtin, the fallback when ripgrep is missing."""
 
-    def test_grep_fallback_used_when_no_ripgrep(self, tmp_path, project_context):
-        """Test grep fallback when ripgrep is not available - Lines 293-325."""
-        # Create a test file with content
+    def test_builtin_used_when_no_ripgrep(self, tmp_path, project_context):
+        """Test the built-in engine when ripgrep is not available."""
         test_file = tmp_path / "test.py"
         test_file.write_text("def hello():\n    print('hello')\n")
-        
-        # Mock shutil.which to return None for rg (ripgrep not found)
+
         with patch('shutil.which', return_value=None):
             result = impl.search_codebase(project_context, "hello", directory=str(tmp_path))
-            # Should use grep fallback and find the pattern
-            assert "SEARCH RESULTS" in result
+            assert "Matches found: 2" in result
 
-    def test_grep_no_matches(self, tmp_path, project_context):
-        """Test grep when no matches found - Line 319."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stdout="")
-
-            result = impl._search_with_grep(
-                "nonexistent_pattern", None, True, 0, 50, tmp_path, project_context
-            )
-            assert isinstance(result, ToolSuccess)
-            assert "No matches found" in result
+    def test_builtin_no_matches(self, tmp_path, project_context):
+        """Test the built-in engine when no matches are found."""
+        (tmp_path / "test.py").write_text("pass\n")
 
-    def test_grep_non_zero_exit(self, tmp_path, project_context):
-        """Test grep non-zero exit code handling - Line 321."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=2, stderr="Mocked grep error")
-
-            result = impl._search_with_grep(
-                "pattern", None, True, 0, 50, tmp_path, project_context
-            )
-            assert isinstance(result, ToolError)
-            assert result.category == "execution"
-            assert "Error: grep failed" in result
-            assert "exit code 2" in result
+        result = impl._search_with_builtin(
+            "nonexistent_pattern", None, True, 0, 50, tmp_path, project_context
+        )
+        assert isinstance(result, ToolSuccess)
+        assert "No matches found" in result
 
-    def test_grep_timeout(self, tmp_path, project_context):
-        """Test grep timeout handling - Lines 322-323."""
-        with patch('subprocess.run', side_effect=subprocess.TimeoutExpired("cmd", 60)):
-            result = impl._search_with_grep(
+    def test_builtin_timeout(self, tmp_path, project_context):
+        """Test built-in engine timeout handling."""
+        with patch.object(search.search_engine, "search", side_effect=TimeoutError):
+            result = impl._search_with_builtin(
                 "pattern", None, True, 0, 50, tmp_path, project_context
             )
             assert isinstance(result, ToolError)
             assert result.category == "execution"
             assert "Search timed out" in result
 
-    def test_grep_general_exception(self, tmp_path, project_context):
-        """Test grep general exception handling - Lines 324-325."""
-        with patch('subprocess.run', side_effect=OSError("Mocked error")):
-            result = impl._search_with_grep(
+    def test_builtin_general_exception(self, tmp_path, project_context):
+        """Test built-in engine general exception handling."""
+        with patch.object(search.search_engine, "search", side_effect=OSError("Mocked error")):
+            result = impl._search_with_builtin(
                 "pattern", None, True, 0, 50, tmp_path, project_context
             )
             assert isinstance(result, ToolError)
             assert result.category == "execution"
-            assert "Error executing grep" in result
-
-
-class TestFormatSearchResultsErrors:
-    """Test error handling in _format_search_results - Lines 351-352."""
-
-    def test_format_search_results_path_conversion_error(self, tmp_path, project_context):
-        """Test path conversion error handling in _format_search_results."""
-        # Create raw output with a path that will cause conversion issues
-        raw_output = "/some/random/path.py\n1: print('hello')\n"
-        
-        result = impl._format_search_results(raw_output, "pattern", 50, project_context)
-        
-        # Should still format without crashing
-        assert "SEARCH RESULTS" in result
-        assert "Pattern:" in result
+            assert "Error executing search" in result
 
 
 class TestFileEditorInsert:
@@ -855,6 +823,86 @@ class TestFileEditorDelete:
         assert result.category == "security"
 
 
+class TestFileEditorMultiEdit:
+    """multi_edit applies an ordered edit list with one write, all or nothing."""
+
+    def test_edits_apply_in_order(self, tmp_path, project_context):
+        test_file = tmp_path / "mod.py"
+        test_file.write_text("import os\n\ndef f():\n    return old()\n")
+
+        result = impl.file_editor(project_context, str(test_file), "multi_edit", edits=[
+            {"operation": "replace", "old_string": "old()", "new_string": "new()"},
+            {"operation": "insert", "line_number": 2, "content": "import sys"},
+            {"operation": "delete", "line_number": 1},
+            {"old_string": "def f", "new_string": "def g"},  # replace by default
+        ])
+
+        assert isinstance(result, ToolSuccess)
+        assert "applied 4 edits" in result
+        assert "3. deleted line 1" in result
+        assert test_file.read_text() == "import sys\n\ndef g():\n    return new()\n"
+
+    def test_failing_edit_writes_nothing(self, tmp_path, project_context):
+        test_file = tmp_path / "mod.py"
+        test_file.write_text("a = 1\nb = 2\n")
+
+        result = impl.file_editor(project_context, str(test_file), "multi_edit", edits=[
+            {"operation": "replace", "old_string": "a = 1", "new_string": "a = 10"},
+            {"operation": "replace", "old_string": "c = 3", "new_string": "c = 30"},
+        ])
+
+        assert isinstance(result, ToolError)
+        assert "edit 2 of 2 (replace) failed, nothing was written" in result
+        assert test_file.read_text() == "a = 1\nb = 2\n"
+
+    def test_invalid_edit_list_is_rejected_before_reading(self, tmp_path, project_context):
+        for edits in (None, [], [{"operation": "write"}], [{"operation": "delete"}]):
+            result = impl.file_editor(project_context, "missing.py", "multi_edit", edits=edits)
+            assert isinstance(result, ToolError)
+            assert result.category == "validation"
+
+    def test_edits_as_json_text_and_dry_run(self, tmp_path, project_context):
+        test_file = tmp_path / "t.txt"
+        test_file.write_text("one\ntwo\n")
+
+        result = impl.file_editor(
+            project_context, str(test_file), "multi_edit", dry_run=True,
+            edits='[{"operation": "replace", "old_string": "one", "new_string": "1"},'
+                  ' {"operation": "replace", "old_string": "two", "new_string": "2"}]',
+        )
+
+        assert "[DRY RUN]" in result
+        assert result.count("@@") == 2  # one hunk header: a single diff
+        assert "+1" in result and "+2" in result
+        assert test_file.read_text() == "one\ntwo\n"
+
+    def test_string_line_numbers_and_single_edit_wording(self, tmp_path, project_context):
+        test_file = tmp_path / "t.txt"
+        test_file.write_text("one\ntwo\n")
+
+        result = impl.file_editor(project_context, str(test_file), "multi_edit", edits=[
+            {"operation": "delete", "line_number": "2"},
+        ])
+
+        assert isinstance(result, ToolSuccess)
+        assert "applied 1 edit to" in result
+        assert test_file.read_text() == "one\n"
+
+        result = impl.file_editor(project_context, str(test_file), "multi_edit", edits=[
+            {"operation": "insert", "line_number": "first", "content": "zero"},
+        ])
+
+        assert isinstance(result, ToolError)
+        assert result.category == "validation"
+        assert "edit 1 of 1 (insert) failed" in result
+        assert test_file.read_text() == "one\n"
+
+    def test_multi_edit_in_schema(self):
+        props = _file_editor_def().parameters["properties"]
+        assert "multi_edit" in props["operation"]["enum"]
+        assert props["edits"]["type"] == "array"
+
+
 class TestFileExplorerFile:
     """Test get_file_info() function."""
 
@@ -905,21 +953,6 @@ class TestFileExplorerFile:
         assert info["extension"] is None or info["extension"] == ""
 
 
-class TestFormatGrepResultsErrors:
-    """Test error handling in _format_grep_results - Lines 391-392."""
-
-    def test_format_grep_results_path_conversion_error(self, tmp_path, project_context):
-        """Test path conversion error handling in _format_grep_results."""
-        # Create raw output with a path that will cause conversion issues
-        raw_output = "/some/random/path.py:1:print('hello')\n"
-
-        result = impl._format_grep_results(raw_output, "pattern", 50, project_context)
-
-        # Should still format without crashing
-        assert "SEARCH RESULTS" in result
-        assert "Pattern:" in result
-
-
 class TestSearchOutputFormats:
     """Test search_codebase output_format parameter."""
 
@@ -7,6 +7,7 @@ from unittest.mock import patch, Mock
 from ayder_cli.core.context import ProjectContext
 from ayder_cli.core.result import ToolSuccess, ToolError
 from ayder_cli.tools.builtins import search, filesystem, shell, utils_tools
+from tests.tools.fake_rg import FakeRg
 
 # Create a namespace object that mimicks the old 'impl' module
 class ImplNamespace:
@@ -15,14 +16,11 @@ class ImplNamespace:
 impl = ImplNamespace()
 impl.search_codebase = search.search_codebase
 impl._search_with_ripgrep = search._search_with_ripgrep
-impl._search_with_grep = search._search_with_grep
-impl._format_search_results = search._format_search_results
-impl._format_grep_results = search._format_grep_results
+impl._search_with_builtin = search._search_with_builtin
 impl._format_files_only = search._format_files_only
 impl._format_count_results = search._format_count_results
 
 impl.get_project_structure = utils_tools.get_project_structure
-impl._generate_manual_tree = utils_tools._generate_manual_tree
 impl.manage_environment_vars = utils_tools.manage_environment_vars
 
 impl.read_file = filesystem.read_file
@@ -37,11 +35,10 @@ class TestSearchCodebaseNoMatches:
     """Test search_codebase() with no matches found."""
 
     @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_search_no_matches_ripgrep(self, mock_run, mock_which, tmp_path):
+    @patch("ayder_cli.tools.builtins.search.subprocess.Popen", new_callable=FakeRg)
+    def test_search_no_matches_ripgrep(self, mock_rg, mock_which, tmp_path):
         """Test search with no matches using ripgrep."""
         mock_which.return_value = "/usr/bin/rg"
-        mock_run.return_value = Mock(returncode=1, stdout="", stderr="")
 
         # Set up project context with tmp_path as root
         ctx = ProjectContext(str(tmp_path))
@@ -52,18 +49,15 @@ class TestSearchCodebaseNoMatches:
         assert "No matches found" in result
         assert "nonexistent_pattern_xyz" in result
 
-    @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_search_no_matches_grep(self, mock_run, mock_which, tmp_path):
-        """Test search with no matches using grep fallback."""
-        mock_which.side_effect = lambda cmd: None if cmd == "rg" else "/usr/bin/grep"
-        mock_run.return_value = Mock(returncode=1, stdout="", stderr="")
-
-        # Set up project context with tmp_path as root
+    @patch("ayder_cli.tools.builtins.search.shutil.which", return_value=None)
+    def test_search_no_matches_builtin(self, mock_which, tmp_path):
+        """Test search with no matches using the built-in engine."""
+        (tmp_path / "a.py").write_text("print('hello')\n")
         ctx = ProjectContext(str(tmp_path))
 
         result = impl.search_codebase(ctx, "nonexistent_pattern_xyz")
 
+        assert isinstance(result, ToolSuccess)
         assert "No matches found" in result
 
 
@@ -71,40 +65,35 @@ class TestSearchCodebaseFilePatterns:
     """Test search_codebase() with various file pattern filters."""
 
     @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_search_with_file_pattern(self, mock_run, mock_which, tmp_path):
+    @patch("ayder_cli.tools.builtins.search.subprocess.Popen", new_callable=FakeRg)
+    def test_search_with_file_pattern(self, mock_rg, mock_which, tmp_path):
         """Test search with file pattern filter."""
         mock_which.return_value = "/usr/bin/rg"
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="test.py\n1:def hello():\n",
-            stderr=""
-        )
+        mock_rg.configure({"test.py": [(1, "def hello():")]})
 
         # Set up project context with tmp_path as root
         ctx = ProjectContext(str(tmp_path))
 
         result = impl.search_codebase(ctx, "def", file_pattern="*.py")
 
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
+        assert len(mock_rg.calls) == 1
+        call_args = mock_rg.cmd
         assert "--glob" in call_args
         assert "*.py" in call_args
         assert "Matches found" in result
 
     @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_search_case_insensitive(self, mock_run, mock_which, tmp_path):
+    @patch("ayder_cli.tools.builtins.search.subprocess.Popen", new_callable=FakeRg)
+    def test_search_case_insensitive(self, mock_rg, mock_which, tmp_path):
         """Test search with case insensitive flag."""
         mock_which.return_value = "/usr/bin/rg"
-        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
 
         # Set up project context with tmp_path as root
         ctx = ProjectContext(str(tmp_path))
 
         impl.search_codebase(ctx, "HELLO", case_sensitive=False)
 
-        call_args = mock_run.call_args[0][0]
+        call_args = mock_rg.cmd
         assert "--ignore-case" in call_args
 
 
@@ -112,14 +101,18 @@ class TestSearchCodebaseContextLines:
     """Test search_codebase() context lines functionality."""
 
     @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_search_with_context_lines(self, mock_run, mock_which, tmp_path):
+    @patch("ayder_cli.tools.builtins.search.subprocess.Popen", new_callable=FakeRg)
+    def test_search_with_context_lines(self, mock_rg, mock_which, tmp_path):
         """Test search with context lines."""
         mock_which.return_value = "/usr/bin/rg"
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="test.py\n1:def before():\n2:def target():\n3:def after():\n",
-            stderr=""
+        mock_rg.configure(
+            {
+                "test.py": [
+                    (1, "def before():", "context"),
+                    (2, "def target():"),
+                    (3, "def after():", "context"),
+                ]
+            }
         )
 
         # Set up project context with tmp_path as root
@@ -127,7 +120,7 @@ class TestSearchCodebaseContextLines:
 
         impl.search_codebase(ctx, "target", context_lines=2)
 
-        call_args = mock_run.call_args[0][0]
+        call_args = mock_rg.cmd
         assert "--context" in call_args
         assert "2" in call_args
 
@@ -136,11 +129,11 @@ class TestSearchCodebaseErrorHandling:
     """Test search_codebase() error handling paths."""
 
     @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_ripgrep_error_exit_code(self, mock_run, mock_which, tmp_path):
+    @patch("ayder_cli.tools.builtins.search.subprocess.Popen", new_callable=FakeRg)
+    def test_ripgrep_error_exit_code(self, mock_rg, mock_which, tmp_path):
         """Test ripgrep failing with error exit code."""
         mock_which.return_value = "/usr/bin/rg"
-        mock_run.return_value = Mock(returncode=2, stdout="", stderr="some error")
+        mock_rg.configure(returncode=2, stderr="some error")
 
         # Set up project context with tmp_path as root
         ctx = ProjectContext(str(tmp_path))
@@ -153,11 +146,11 @@ class TestSearchCodebaseErrorHandling:
         assert "some error" in result
 
     @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_ripgrep_timeout(self, mock_run, mock_which, tmp_path):
+    @patch("ayder_cli.tools.builtins.search.subprocess.Popen")
+    def test_ripgrep_timeout(self, mock_popen, mock_which, tmp_path):
         """Test ripgrep timeout handling."""
         mock_which.return_value = "/usr/bin/rg"
-        mock_run.side_effect = Exception("Timeout")
+        mock_popen.side_effect = Exception("Timeout")
 
         # Set up project context with tmp_path as root
         ctx = ProjectContext(str(tmp_path))
@@ -181,212 +174,115 @@ class TestSearchCodebaseErrorHandling:
         assert "Error during search" in result
 
 
-class TestSearchWithGrepFallback:
-    """Test _search_with_grep() fallback implementation."""
-
-    @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_grep_search_success(self, mock_run, mock_which, tmp_path):
-        """Test successful grep search."""
-        mock_which.side_effect = lambda cmd: None if cmd == "rg" else "/usr/bin/grep"
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="file.txt:1:hello world\nfile.txt:2:hello again",
-            stderr=""
-        )
+@patch("ayder_cli.tools.builtins.search.shutil.which", return_value=None)
+class TestSearchWithBuiltinFallback:
+    """Test the built-in engine used when ripgrep is not installed."""
 
-        # Set up project context with tmp_path as root
+    def test_builtin_search_success(self, mock_which, tmp_path):
+        """Test successful built-in search."""
+        (tmp_path / "file.txt").write_text("hello world\nbye\nhello again\n")
         ctx = ProjectContext(str(tmp_path))
 
         result = impl.search_codebase(ctx, "hello")
 
-        assert "SEARCH RESULTS" in result
-        assert "Matches found" in result
+        assert "Matches found: 2" in result
+        assert "FILE: file.txt" in result
+        assert "Line 3: hello again" in result
 
-    @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_grep_case_insensitive(self, mock_run, mock_which, tmp_path):
-        """Test grep with case insensitive flag."""
-        mock_which.side_effect = lambda cmd: None if cmd == "rg" else "/usr/bin/grep"
-        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
-
-        # Set up project context with tmp_path as root
+    def test_builtin_case_insensitive(self, mock_which, tmp_path):
+        """Test built-in search with case insensitive flag."""
+        (tmp_path / "file.txt").write_text("hello world\n")
         ctx = ProjectContext(str(tmp_path))
 
-        impl.search_codebase(ctx, "HELLO", case_sensitive=False)
+        assert "No matches found" in impl.search_codebase(ctx, "HELLO")
+        result = impl.search_codebase(ctx, "HELLO", case_sensitive=False)
+        assert "Line 1: hello world" in result
 
-        call_args = mock_run.call_args[0][0]
-        assert "-i" in call_args
-
-    @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_grep_with_context_lines(self, mock_run, mock_which, tmp_path):
-        """Test grep with context lines."""
-        mock_which.side_effect = lambda cmd: None if cmd == "rg" else "/usr/bin/grep"
-        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
-
-        # Set up project context with tmp_path as root
+    def test_builtin_with_context_lines(self, mock_which, tmp_path):
+        """Test built-in search with context lines."""
+        (tmp_path / "file.txt").write_text("one\ntwo\nthree\nfour\n")
         ctx = ProjectContext(str(tmp_path))
 
-        impl.search_codebase(ctx, "pattern", context_lines=3)
+        result = impl.search_codebase(ctx, "three", context_lines=1)
 
-        call_args = mock_run.call_args[0][0]
-        assert "-C" in call_args
-        assert "3" in call_args
+        assert "  2- two\nLine 3: three\n  4- four" in result
 
-    @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_grep_with_file_pattern(self, mock_run, mock_which, tmp_path):
-        """Test grep with file pattern."""
-        mock_which.side_effect = lambda cmd: None if cmd == "rg" else "/usr/bin/grep"
-        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
-
-        # Set up project context with tmp_path as root
+    def test_builtin_with_file_pattern(self, mock_which, tmp_path):
+        """Path globs are matched exactly, not approximated to a basename."""
+        for rel in ("src/a.py", "src/a.txt", "lib/src/b.py", "lib/a.py"):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("pattern\n")
         ctx = ProjectContext(str(tmp_path))
 
-        impl.search_codebase(ctx, "pattern", file_pattern="src/*.py")
-
-        call_args = mock_run.call_args[0][0]
-        assert "--include" in call_args
-        assert "*.py" in call_args
+        result = impl.search_codebase(
+            ctx, "pattern", file_pattern="src/*.py", output_format="files_only"
+        )
 
-    @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_grep_error_exit_code(self, mock_run, mock_which, tmp_path):
-        """Test grep failing with error exit code."""
-        mock_which.side_effect = lambda cmd: None if cmd == "rg" else "/usr/bin/grep"
-        mock_run.return_value = Mock(returncode=2, stdout="", stderr="grep error")
+        assert "Files with matches: 2" in result
+        assert "src/a.py" in result and "lib/src/b.py" in result
 
-        # Set up project context with tmp_path as root
+    def test_builtin_invalid_pattern(self, mock_which, tmp_path):
+        """Test an invalid regex is reported, not raised."""
         ctx = ProjectContext(str(tmp_path))
 
-        result = impl.search_codebase(ctx, "pattern")
+        result = impl.search_codebase(ctx, "foo(")
 
         assert isinstance(result, ToolError)
-        assert result.category == "execution"
-        assert "Error: grep failed" in result
-        assert "grep error" in result
-
-    @patch("ayder_cli.tools.builtins.search.shutil.which")
-    @patch("ayder_cli.tools.builtins.search.subprocess.run")
-    def test_grep_timeout(self, mock_run, mock_which, tmp_path):
-        """Test grep timeout handling."""
-        mock_which.side_effect = lambda cmd: None if cmd == "rg" else "/usr/bin/grep"
-        mock_run.side_effect = Exception("Timeout")
+        assert result.category == "validation"
+        assert "invalid search pattern" in result
 
-        # Set up project context with tmp_path as root
+    def test_builtin_general_exception(self, mock_which, tmp_path):
+        """Test unexpected engine failures."""
         ctx = ProjectContext(str(tmp_path))
+        with patch(
+            "ayder_cli.tools.builtins.search.search_engine.search",
+            side_effect=Exception("boom"),
+        ):
+            result = impl.search_codebase(ctx, "pattern")
 
-        result = impl.search_codebase(ctx, "pattern")
-
-        assert "Error executing grep" in result or "Error during search" in result
-
-
-class TestFormatGrepResults:
-    """Test _format_grep_results() function."""
-
-    def test_format_grep_results_basic(self):
-        """Test basic grep result formatting."""
-        from ayder_cli.core.context import ProjectContext
-        project = ProjectContext(".")
-        raw_output = "file1.txt:1:hello world\nfile1.txt:2:hello again\nfile2.txt:5:another match"
-        result = impl._format_grep_results(raw_output, "hello", 50, project)
-
-        assert "SEARCH RESULTS" in result
-        assert "Matches found: 3" in result
-        assert "FILE: file1.txt" in result
-        assert "FILE: file2.txt" in result
-
-    def test_format_grep_results_empty(self):
-        """Test formatting empty grep results."""
-        from ayder_cli.core.context import ProjectContext
-        project = ProjectContext(".")
-        result = impl._format_grep_results("", "pattern", 50, project)
-
-        assert "SEARCH RESULTS" in result
-        assert "Matches found: 0" in result
-
-    def test_format_grep_results_max_results(self):
-        """Hitting max_results reports the real total and says it truncated."""
-        from ayder_cli.core.context import ProjectContext
-        project = ProjectContext(".")
-        raw_output = "file.txt:1:line1\nfile.txt:2:line2\nfile.txt:3:line3"
-        result = impl._format_grep_results(raw_output, "line", 2, project)
-
-        assert "Matches found: 3 (showing first 2)" in result
-        assert "truncated" in result.lower()
-        assert "line3" not in result
+        assert isinstance(result, ToolError)
+        assert "Error executing search: boom" in result
 
 
 class TestGetProjectStructureEdgeCases:
     """Test get_project_structure() edge cases."""
 
-    @patch("ayder_cli.tools.builtins.utils_tools.shutil.which")
-    @patch("ayder_cli.tools.builtins.utils_tools.subprocess.run")
-    def test_tree_fallback_on_error(self, mock_run, mock_which, tmp_path):
-        """Test fallback to manual tree when tree command fails."""
-        mock_which.return_value = "/usr/bin/tree"
-        mock_run.side_effect = Exception("Tree failed")
-        
+    def test_empty_project(self, tmp_path):
+        """Test an empty project renders just the root."""
         ctx = ProjectContext(str(tmp_path))
         result = impl.get_project_structure(ctx, max_depth=2)
 
-        # Should return the manual tree fallback
-        assert isinstance(result, str)
-        assert len(result) > 0
+        assert result == "."
 
-    @patch("ayder_cli.tools.builtins.utils_tools.shutil.which")
-    def test_manual_tree_no_tree_command(self, mock_which, tmp_path):
-        """Test manual tree generation when tree not available."""
-        mock_which.return_value = None
-        
-        ctx = ProjectContext(str(tmp_path))
-        result = impl.get_project_structure(ctx, max_depth=2)
-
-        assert isinstance(result, str)
-
-    def test_manual_tree_max_depth_variations(self, tmp_path, monkeypatch):
-        """Test manual tree with different max_depth values."""
-        # Create nested structure
-        (tmp_path / "level1").mkdir()
-        (tmp_path / "level1" / "level2").mkdir()
-        (tmp_path / "level1" / "level2" / "level3").mkdir()
+    def test_max_depth_variations(self, tmp_path):
+        """Test the tree with different max_depth values."""
+        (tmp_path / "level1" / "level2" / "level3").mkdir(parents=True)
         (tmp_path / "file1.txt").write_text("content")
-
-        monkeypatch.chdir(tmp_path)
         ctx = ProjectContext(str(tmp_path))
 
-        # Test depth 1 - only root level
-        result_depth1 = impl._generate_manual_tree(ctx, max_depth=1)
-        lines_depth1 = result_depth1.split("\n")
-
-        # Test depth 3 - should show more levels
-        result_depth3 = impl._generate_manual_tree(ctx, max_depth=3)
-        lines_depth3 = result_depth3.split("\n")
+        result_depth1 = impl.get_project_structure(ctx, max_depth=1)
+        result_depth3 = impl.get_project_structure(ctx, max_depth=3)
 
-        # Depth 3 should have more lines than depth 1
-        assert len(lines_depth3) >= len(lines_depth1)
+        assert result_depth1 == ".\n|-- level1/\n`-- file1.txt"
+        assert "level3/" in result_depth3
 
-    def test_manual_tree_permission_error(self, tmp_path, monkeypatch):
-        """Test manual tree with permission errors."""
+    def test_permission_error(self, tmp_path):
+        """Test the tree with an unreadable directory."""
         # Skip on Windows
         if sys.platform == 'win32':
             pytest.skip("Permission tests not applicable on Windows")
 
-        # Create structure with restricted directory
         (tmp_path / "restricted").mkdir()
         (tmp_path / "public").mkdir()
         (tmp_path / "public" / "file.txt").write_text("content")
-
-        # Restrict access
         (tmp_path / "restricted").chmod(0o000)
 
         try:
-            monkeypatch.chdir(tmp_path)
             ctx = ProjectContext(str(tmp_path))
-            result = impl._generate_manual_tree(ctx, max_depth=3)
+            result = impl.get_project_structure(ctx, max_depth=3)
             # Should complete without error even with permission error
-            assert isinstance(result, str)
+            assert "restricted/" in result
+            assert "file.txt" in result
         finally:
             # Restore permissions
             (tmp_path / "restricted").chmod(0o755)
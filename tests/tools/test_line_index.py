@@ -0,0 +1,84 @@
+"""Tests for the line-offset index behind ranged read_file calls."""
+
+import os
+
+import pytest
+
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.result import ToolSuccess
+from ayder_cli.tools.builtins import filesystem, line_index
+from ayder_cli.tools.builtins.line_index import line_index_for
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    line_index._CACHE.clear()
+    yield
+    line_index._CACHE.clear()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"one",
+        b"one\ntwo\n",
+        b"one\ntwo",
+        b"\n\n\n",
+        b"a\r\nb\r\nc",
+        "café\n日本\n".encode(),
+    ],
+)
+def test_lines_match_readlines(tmp_path, data):
+    path = tmp_path / "f.txt"
+    path.write_bytes(data)
+    with open(path, "r", encoding="utf-8") as f:
+        expected = f.readlines()
+
+    index = line_index_for(path)
+
+    assert index.line_count == len(expected)
+    assert index.read_lines(0, len(expected)) == expected
+    assert index.read_lines(1, 2) == expected[1:2]
+
+
+def test_bare_carriage_returns_are_not_indexed(tmp_path, monkeypatch):
+    path = tmp_path / "mac.txt"
+    path.write_bytes(b"a\rb\rc")
+    assert line_index_for(path) is None
+
+    monkeypatch.setattr(filesystem.file_cache, "max_entry_chars", 0)
+    result = filesystem.read_file(ProjectContext(str(tmp_path)), "mac.txt")
+    assert "3: c" in result
+    assert "COMPLETE: 3 lines" in result
+
+
+def test_index_is_reused_until_the_file_changes(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text("a\nb\n")
+    first = line_index_for(path)
+    assert line_index_for(path) is first
+
+    path.write_text("a\nb\nc\n")
+    os.utime(path, ns=(0, first.mtime_ns + 1))
+
+    second = line_index_for(path)
+    assert second is not first
+    assert second.line_count == 3
+
+
+def test_ranged_read_decodes_only_the_requested_lines(tmp_path, monkeypatch):
+    # Files the shared content cache takes are read whole; this one is not.
+    monkeypatch.setattr(filesystem.file_cache, "max_entry_chars", 1024)
+    path = tmp_path / "big.log"
+    lines = [f"line {i}\n" for i in range(1, 20001)]
+    lines[5] = "\xff broken\n"  # undecodable as written below
+    path.write_bytes("".join(lines).encode("latin-1"))
+    ctx = ProjectContext(str(tmp_path))
+
+    result = filesystem.read_file(ctx, "big.log", start_line=10000, end_line=10002)
+
+    assert isinstance(result, ToolSuccess)
+    assert result.split("\n[FILE:")[0] == "10000: line 10000\n10001: line 10001\n10002: line 10002\n"
+    assert "20000 total lines" in result
+    assert "start_line=10003" in result
@@ -0,0 +1,116 @@
+"""Tests for the built-in search engine used when ripgrep is missing."""
+
+from unittest.mock import patch
+
+import pytest
+
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.tools.builtins import search, search_engine
+from ayder_cli.tools.builtins.search_engine import COUNT, FILES, LINES
+
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    if isinstance(data, str):
+        path.write_text(data, encoding="utf-8")
+    else:
+        path.write_bytes(data)
+    return str(path)
+
+
+def test_matches_are_line_oriented(tmp_path):
+    path = _write(tmp_path, "a.txt", "alpha\nbeta\r\ngamma beta\n")
+
+    results, complete = search_engine.search([path], "beta$")
+    assert results == [(path, [("3", "match", "gamma beta")])]
+    assert complete
+
+    # A whole-text hit that spans lines is not a line match.
+    assert search_engine.search([path], r"alpha\nbeta") == ([], True)
+
+
+def test_modes_and_context(tmp_path):
+    path = _write(tmp_path, "a.txt", "x\nhit\nx\nx\nx\nhit\nhit\nx\n")
+
+    assert search_engine.search([path], "hit", mode=FILES)[0] == [(path, True)]
+    assert search_engine.search([path], "hit", mode=COUNT)[0] == [(path, 3)]
+    entries = search_engine.search([path], "hit", context_lines=1)[0][0][1]
+    assert entries == [
+        ("1", "context", "x"),
+        ("2", "match", "hit"),
+        ("3", "context", "x"),
+        (None, "separator", ""),
+        ("5", "context", "x"),
+        ("6", "match", "hit"),
+        ("7", "match", "hit"),
+        ("8", "context", "x"),
+    ]
+
+
+def test_binary_files_are_skipped_and_utf16_is_decoded(tmp_path):
+    binary = _write(tmp_path, "b.bin", b"needle\0")
+    utf16 = _write(tmp_path, "w.txt", "needle\n".encode("utf-16"))
+    bom = _write(tmp_path, "bom.txt", "\ufeffneedle\n".encode("utf-8"))
+
+    results, _ = search_engine.search([binary, utf16, bom], "^needle", mode=FILES)
+
+    assert [path for path, _ in results] == [utf16, bom]
+
+
+def test_limit_stops_the_search(tmp_path):
+    paths = [_write(tmp_path, f"f{i}.txt", "hit\nhit\n") for i in range(10)]
+
+    with patch.object(
+        search_engine, "_read_text", wraps=search_engine._read_text
+    ) as read:
+        results, complete = search_engine.search(paths, "hit", limit=3)
+
+    assert not complete
+    assert [path for path, _ in results] == paths[:2]
+    assert read.call_count == 2
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    monkeypatch.setattr(search_engine, "_WORKERS", 2)
+    monkeypatch.setattr(search_engine, "_IN_PROCESS_FILES", 4)
+    monkeypatch.setattr(search_engine, "_CHUNK_FILES", 2)
+    monkeypatch.setattr(search_engine, "_pool_failed", False)
+    yield
+    search_engine._reset_pool()
+
+
+def test_process_pool_results_match_in_process_results(tmp_path, pooled):
+    paths = [
+        _write(tmp_path, f"f{i:02}.txt", "hit\n" if i % 3 else "miss\n")
+        for i in range(12)
+    ]
+    expected = [(p, [("1", "match", "hit")]) for i, p in enumerate(paths) if i % 3]
+
+    results, complete = search_engine.search(paths, "hit", mode=LINES)
+
+    assert search_engine._pool is not None
+    assert complete
+    assert results == expected
+    assert search_engine.search(paths, "hit", limit=5) == (expected[:5], False)
+
+
+def test_search_codebase_uses_the_engine_over_rg_ignore_semantics(tmp_path):
+    files = {
+        ".gitignore": "ignored/\n",
+        "src/app.py": "TOKEN = 1\n",
+        "ignored/app.py": "TOKEN = 2\n",
+        ".hidden/app.py": "TOKEN = 3\n",
+        "__pycache__/app.py": "TOKEN = 4\n",
+        "data.bin": "TOKEN\0",
+    }
+    for rel, content in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(content)
+    ctx = ProjectContext(str(tmp_path))
+
+    with patch("ayder_cli.tools.builtins.search.shutil.which", return_value=None):
+        result = search.search_codebase(ctx, "TOKEN", output_format="count")
+
+    assert "Total matches: 1" in result
+    assert "src/app.py: 1" in result
@@ -1,15 +1,15 @@
 """Tests for search_codebase hardening.
 
-Covers, against the real rg and grep binaries (no subprocess mocking):
+Covers, against the real rg binary and the built-in engine (no subprocess
+mocking):
 - single-file targets via the `directory` parameter
 - patterns that start with '-' (e.g. '-> str')
 - context_lines output integrity (the heading-parser rewrite), across the
   full engine x target x context x format matrix
 - honest truncation reporting when max_results is hit
 - the 'locations' output format (file:line pairs, no content)
-- glob semantics (basename vs path-anchored) and the grep-fallback
-  basename approximation note
-- zero-count filtering in 'count' output on the grep fallback
+- glob semantics (basename vs path-anchored)
+- zero-count filtering in 'count' output on the built-in engine
 - schema descriptions that teach the above
 """
 
@@ -68,9 +68,9 @@ def project(tmp_path):
     return ProjectContext(str(tmp_path))
 
 
-@pytest.fixture(params=["rg", "grep"])
+@pytest.fixture(params=["rg", "builtin"])
 def engine(request, monkeypatch):
-    """Run each test against ripgrep and against the grep fallback."""
+    """Run each test against ripgrep and against the built-in engine."""
     if request.param == "rg":
         if not shutil.which("rg"):
             pytest.skip("ripgrep not installed")
@@ -287,67 +287,25 @@ class TestLocationsFormat:
 
 
 class TestGlobSemantics:
-    def test_basename_glob_matches_any_directory(self, project):
-        if not shutil.which("rg"):
-            pytest.skip("ripgrep not installed")
+    def test_basename_glob_matches_any_directory(self, project, engine):
         result = search_codebase(project, "^def ", file_pattern="core.py")
         headers = _file_headers(result)
         assert set(headers) == {"src/core.py", "lib/core.py"}
 
-    def test_path_anchored_glob_matches_one_path(self, project):
-        if not shutil.which("rg"):
-            pytest.skip("ripgrep not installed")
+    def test_path_anchored_glob_matches_one_path(self, project, engine):
         result = search_codebase(project, "^def ", file_pattern="src/core.py")
         assert _file_headers(result) == ["src/core.py"]
 
-    def test_grep_include_precedes_excludes(self, project, monkeypatch):
-        """GNU grep >= 3.6 resolves --include/--exclude by position: a file
-        matching no glob is searched unless the FIRST such option is
-        --include. Emitting excludes first silently disables the include
-        filter on Linux (BSD grep is order-insensitive, so macOS hides it)."""
-        monkeypatch.setattr(
-            "ayder_cli.tools.builtins.search.shutil.which", lambda name: None
-        )
-        captured = {}
-
-        def fake_run(cmd, **kwargs):
-            captured["cmd"] = cmd
-
-            class R:
-                returncode = 1
-                stdout = ""
-                stderr = ""
-
-            return R()
-
-        monkeypatch.setattr(
-            "ayder_cli.tools.builtins.search.subprocess.run", fake_run
-        )
-        search_codebase(project, "^def ", file_pattern="core.py")
-        cmd = captured["cmd"]
-        include_at = cmd.index("--include")
-        exclude_ats = [
-            i for i, arg in enumerate(cmd) if str(arg).startswith("--exclude")
-        ]
-        assert exclude_ats, "expected --exclude options in grep command"
-        assert include_at < min(exclude_ats)
-
-    def test_grep_fallback_announces_basename_approximation(
-        self, project, monkeypatch
-    ):
-        monkeypatch.setattr(
-            "ayder_cli.tools.builtins.search.shutil.which", lambda name: None
+    def test_negated_glob_excludes(self, project, engine):
+        result = search_codebase(
+            project, "^def ", file_pattern="!bulk*/**", output_format="files_only"
         )
-        result = search_codebase(project, "^def ", file_pattern="src/core.py")
-        assert isinstance(result, ToolSuccess)
-        assert "approximate" in str(result).lower()
-        assert "core.py" in result
-        # The approximation widens the scope — both core.py files match.
-        assert set(_file_headers(result)) == {"src/core.py", "lib/core.py"}
+        assert "Files with matches: 3" in result
+        assert "bulk" not in result
 
 
 class TestCountZeroFiltering:
-    def test_grep_fallback_count_omits_zero_count_files(self, project, monkeypatch):
+    def test_builtin_count_omits_zero_count_files(self, project, monkeypatch):
         monkeypatch.setattr(
             "ayder_cli.tools.builtins.search.shutil.which", lambda name: None
         )
@@ -0,0 +1,183 @@
+"""Tests for the trigram index behind search_codebase."""
+
+import os
+import random
+import re
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.result import ToolSuccess
+from ayder_cli.tools.builtins import filesystem, search, search_index
+from ayder_cli.tools.builtins.search_index import TrigramIndex, query_for
+from tests.tools.fake_rg import FakeRg
+
+
+@pytest.fixture(autouse=True)
+def _no_loaded_indexes():
+    search_index._INDEXES.clear()
+    yield
+    search_index._INDEXES.clear()
+
+
+WORDS = ["foo", "bar", "Baz", "colour", "color", "def", "return", "héllo", "x", "QUUX", "\t"]
+
+PATTERNS = [
+    "foo",
+    "foo.*bar",
+    "(foo|baz)bar",
+    "colou?r",
+    r"def\s+\w+",
+    "(?i)BAZ",
+    "(?i:quux)x",
+    "(ret|colo)(urn|r)",
+    "héllo",
+    "o{2}ba",
+    "^return$",
+    r"\bdef\b",
+]
+
+
+@pytest.mark.parametrize("ignore_case", [False, True])
+def test_candidates_include_every_matching_file(tmp_path, ignore_case):
+    rng = random.Random(7)
+    paths = []
+    for i in range(60):
+        lines = [
+            "".join(rng.choice(WORDS) for _ in range(rng.randint(0, 5)))
+            for _ in range(rng.randint(0, 6))
+        ]
+        path = tmp_path / f"f{i}.txt"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        paths.append(str(path))
+    index = TrigramIndex(tmp_path)
+    flags = re.IGNORECASE if ignore_case else 0
+
+    for pattern in PATTERNS:
+        query = query_for(pattern, ignore_case=ignore_case)
+        assert query is not None, pattern
+        kept = set(index.candidates(paths, query))
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            if any(re.search(pattern, line, flags) for line in text.split("\n")):
+                assert path in kept, (pattern, text)
+        assert len(kept) < len(paths), pattern
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["ab", ".*", "a|foo", r"\<word\>", r"\b{start}word", "[[:alpha:]]word", r"\p{L}word"],
+)
+def test_unindexable_patterns_have_no_query(pattern):
+    assert query_for(pattern) is None
+
+
+def test_binary_files_are_never_candidates_and_big_ones_always_are(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index, "_MAX_INDEXED_BYTES", 100)
+    (tmp_path / "bin").write_bytes(b"needle\0")
+    (tmp_path / "big").write_text("x" * 200)
+    (tmp_path / "utf16").write_bytes("needle".encode("utf-16"))
+    paths = [str(tmp_path / name) for name in ("bin", "big", "utf16")]
+
+    kept = TrigramIndex(tmp_path).candidates(paths, query_for("needle"))
+
+    assert kept == paths[1:]
+
+
+def test_saved_index_is_reused_and_only_changed_files_are_read(tmp_path, monkeypatch):
+    for name in ("a.py", "b.py"):
+        (tmp_path / name).write_text(f"name = '{name}'\n")
+    paths = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    index = TrigramIndex(tmp_path)
+    index.candidates(paths, query_for("name"))
+    index.save()
+    assert (tmp_path / ".ayder" / "index" / "trigrams.bin").exists()
+
+    read = []
+    real = search_index._index_file
+    monkeypatch.setattr(
+        search_index, "_index_file", lambda path, st: read.append(path) or real(path, st)
+    )
+    (tmp_path / "b.py").write_text("changed = True\n")
+    os.utime(tmp_path / "b.py", ns=(0, 1))
+
+    reloaded = TrigramIndex(tmp_path)
+    reloaded.load()
+    assert reloaded.candidates(paths, query_for("changed")) == [paths[1]]
+    assert read == [paths[1]]
+
+
+def test_index_past_its_budget_is_built_in_the_background(tmp_path):
+    (tmp_path / "a.py").write_text("alpha = 1\n")
+    (tmp_path / "b.py").write_text("beta = 2\n")
+    paths = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    index = TrigramIndex(tmp_path)
+
+    assert index.candidates(paths, query_for("alpha"), budget=-1) is None
+    for _ in range(200):
+        if not index.building:
+            break
+        time.sleep(0.01)
+
+    assert not index.building
+    assert index.path.exists()
+    assert index.candidates(paths, query_for("alpha"), budget=-1) == [paths[0]]
+
+
+def test_corrupt_index_starts_empty(tmp_path):
+    target = tmp_path / ".ayder" / "index" / "trigrams.bin"
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"AYDER-TRIGRAMS 1\n{}\n{\"a\": [1, 2, \"t\", 9]}\n")
+    index = TrigramIndex(tmp_path)
+    index.load()
+    assert index._entries == {}
+
+
+def test_file_editor_writes_refresh_a_loaded_index(tmp_path):
+    ctx = ProjectContext(str(tmp_path))
+    (tmp_path / "m.py").write_text("x = 1\n")
+    path = str(tmp_path / "m.py")
+    index = search_index.index_for(tmp_path)
+    assert index.candidates([path], query_for("renamed")) == []
+
+    filesystem.file_editor(ctx, "m.py", "replace", old_string="x", new_string="renamed")
+
+    assert index._entries["m.py"].size == len("renamed = 1\n")
+    assert index.candidates([path], query_for("renamed")) == [path]
+
+
+@patch("ayder_cli.tools.builtins.search.shutil.which", return_value="/usr/bin/rg")
+@patch("ayder_cli.tools.builtins.search.subprocess.Popen", new_callable=FakeRg)
+@patch("ayder_cli.tools.builtins.search.subprocess.run")
+def test_search_codebase_runs_rg_over_candidates_only(mock_run, mock_rg, _which, tmp_path):
+    (tmp_path / "hit.py").write_text("def handle_request():\n    pass\n")
+    (tmp_path / "miss.py").write_text("def other():\n    pass\n")
+    hit, miss = str(tmp_path / "hit.py"), str(tmp_path / "miss.py")
+    mock_run.return_value = MagicMock(returncode=0, stdout=f"{hit}\n{miss}\n", stderr="")
+    mock_rg.configure({hit: [(1, "def handle_request():")]})
+    ctx = ProjectContext(str(tmp_path), search_index=True)
+
+    result = search.search_codebase(ctx, r"handle_\w+")
+
+    assert isinstance(result, ToolSuccess)
+    assert "FILE: hit.py" in result
+    assert "--files" in mock_run.call_args.args[0]
+    assert mock_rg.cmd[-1] == hit and miss not in mock_rg.cmd
+
+
+@patch("ayder_cli.tools.builtins.search.shutil.which", return_value="/usr/bin/rg")
+@patch("ayder_cli.tools.builtins.search.subprocess.run")
+def test_search_codebase_answers_from_the_index_when_nothing_can_match(
+    mock_run, _which, tmp_path
+):
+    (tmp_path / "a.py").write_text("pass\n")
+    mock_run.return_value = MagicMock(returncode=0, stdout=f"{tmp_path / 'a.py'}\n", stderr="")
+    ctx = ProjectContext(str(tmp_path), search_index=True)
+
+    result = search.search_codebase(ctx, "nowhere_to_be_found")
+
+    assert "No matches found." in result
+    mock_run.assert_called_once()
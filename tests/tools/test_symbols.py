@@ -0,0 +1,208 @@
+"""Tests for the symbol index behind find_symbol."""
+
+import os
+import time
+
+import pytest
+
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.core.result import ToolError, ToolSuccess
+from ayder_cli.tools.builtins import symbols
+from ayder_cli.tools.builtins.symbols import SymbolIndex, find_symbol, python_symbols
+
+SOURCE = '''\
+import os
+from typing import TYPE_CHECKING
+
+LIMIT = 3
+
+if TYPE_CHECKING:
+    def hinted() -> None: ...
+
+
+class Loop(Base, metaclass=Meta):
+    retries: int = LIMIT
+
+    def run(self, *, fast: bool = False) -> None:
+        def step():
+            return os.getcwd()
+        return step()
+
+
+async def main():
+    Loop().run()
+'''
+
+
+@pytest.fixture(autouse=True)
+def _no_loaded_indexes():
+    symbols._INDEXES.clear()
+    yield
+    symbols._INDEXES.clear()
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "loop.py").write_text(SOURCE)
+    (tmp_path / "pkg" / "use.py").write_text("from pkg.loop import Loop\n\nLoop().run()\n")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "skip.py").write_text("class Loop: pass\n")
+    return ProjectContext(str(tmp_path))
+
+
+def test_python_definitions_and_references():
+    defs, refs = python_symbols(SOURCE)
+
+    by_name = {s.qualname: s for s in defs}
+    assert by_name["Loop"].kind == "class"
+    assert by_name["Loop"].signature == "class Loop(Base, metaclass=Meta)"
+    assert by_name["Loop.run"].kind == "method"
+    assert (by_name["Loop.run"].line, by_name["Loop.run"].end_line) == (13, 16)
+    assert by_name["Loop.run"].signature == "def run(self, *, fast: bool=False) -> None"
+    assert by_name["Loop.run.step"].kind == "function"
+    assert by_name["Loop.retries"].kind == "attribute"
+    assert by_name["LIMIT"].kind == "variable"
+    assert by_name["main"].signature == "async def main()"
+    assert by_name["hinted"].line == 7
+    assert [s.line for s in defs] == sorted(s.line for s in defs)
+
+    assert refs["LIMIT"] == [4, 11]
+    assert refs["run"] == [20]
+    assert refs["getcwd"] == [15]
+    assert refs["os"] == [1, 15]
+
+
+def test_definition_lookup(project):
+    result = find_symbol(project, "definition", name="run")
+
+    assert isinstance(result, ToolSuccess)
+    assert "Definitions found: 1" in result
+    assert "pkg/loop.py:13-16 (method Loop.run)" in result
+    assert "def run(self, *, fast: bool=False) -> None" in result
+    # Hidden directories are not indexed.
+    assert ".venv" not in find_symbol(project, "definition", name="Loop")
+
+
+def test_dotted_names_and_scope(project):
+    assert "Definitions found: 1" in find_symbol(project, "definition", name="Loop.run.step")
+    assert "No definitions found" in find_symbol(project, "definition", name="Other.run")
+    assert "No definitions found" in find_symbol(
+        project, "definition", name="run", path="pkg/use.py"
+    )
+
+
+def test_references_show_source_lines(project):
+    result = find_symbol(project, "references", name="Loop.run")
+
+    assert "References found: 2 in 2 file(s)" in result
+    assert "FILE: pkg/loop.py\nLine 20: Loop().run()" in result
+    assert "FILE: pkg/use.py\nLine 3: Loop().run()" in result
+
+
+def test_outline(project):
+    result = find_symbol(project, "outline", path="pkg/loop.py")
+    assert "  10-16: class Loop(Base, metaclass=Meta)\n    11-11: retries: int\n" in result
+    assert "      14-15: def step()" in result
+
+    listing = find_symbol(project, "outline", path="pkg", max_results=2)
+    assert "FILE: pkg/loop.py\n  4: LIMIT = 3\n  7: def hinted() -> None" in listing
+    assert "[Outline truncated: showing 2 of 4 top-level definitions." in listing
+
+
+def test_only_changed_files_are_parsed_again(project, monkeypatch):
+    find_symbol(project, "definition", name="Loop")
+    assert (project.root / ".ayder" / "index" / "symbols.json").exists()
+    symbols._INDEXES.clear()  # a new session reads the saved index
+
+    parsed = []
+    real = symbols._parse_file
+    monkeypatch.setattr(
+        symbols, "_parse_file", lambda path, st: parsed.append(path) or real(path, st)
+    )
+    use = project.root / "pkg" / "use.py"
+    use.write_text("def helper():\n    pass\n")
+    os.utime(use, ns=(0, 1))
+
+    result = find_symbol(project, "definition", name="helper")
+
+    assert "pkg/use.py:1-2 (function helper)" in result
+    assert parsed == [str(use)]
+    assert "Definitions found: 1" in find_symbol(project, "definition", name="Loop")
+
+
+def test_deleted_files_leave_the_index(project):
+    find_symbol(project, "definition", name="Loop")
+    (project.root / "pkg" / "loop.py").unlink()
+    index = symbols.index_for(project.root)
+    index.refresh()
+    assert index.files_in("") == ["pkg/use.py"]
+
+
+def test_unparsable_file_is_indexed_empty(tmp_path):
+    (tmp_path / "bad.py").write_text("def broken(:\n")
+    index = SymbolIndex(tmp_path)
+    index.refresh()
+    assert index.outline("bad.py") == []
+
+
+def test_ignored_files_are_not_indexed(project):
+    (project.root / ".gitignore").write_text("generated/\n")
+    (project.root / "generated").mkdir()
+    (project.root / "generated" / "gen.py").write_text("class Loop: pass\n")
+    (project.root / "build").mkdir()
+    (project.root / "build" / "copy.py").write_text("class Loop: pass\n")
+    index = SymbolIndex(project.root)
+    index.refresh()
+    assert index.files_in("") == ["pkg/loop.py", "pkg/use.py"]
+
+
+def test_refresh_past_its_budget_finishes_in_the_background(project):
+    index = symbols.index_for(project.root)
+    assert index.refresh(budget=-1) is False
+    for _ in range(200):
+        if not index.building:
+            break
+        time.sleep(0.01)
+
+    assert not index.building
+    assert index.files_in("") == ["pkg/loop.py", "pkg/use.py"]
+    assert index.refresh(budget=-1) is True
+    assert (project.root / ".ayder" / "index" / "symbols.json").exists()
+
+
+def test_partial_index_is_flagged_in_the_result(project, monkeypatch):
+    monkeypatch.setattr(symbols, "_REFRESH_BUDGET", -1)
+    result = find_symbol(project, "definition", name="Loop")
+    assert "The symbol index is still being built" in result
+
+
+def test_syntax_warnings_are_not_printed(tmp_path, recwarn):
+    (tmp_path / "esc.py").write_text('PATTERN = "\\d+"\n')
+    index = SymbolIndex(tmp_path)
+    index.refresh()
+    assert [s.name for s in index.outline("esc.py")] == ["PATTERN"]
+    assert not [w for w in recwarn if issubclass(w.category, SyntaxWarning)]
+
+
+def test_validation(project):
+    assert isinstance(find_symbol(project, "rename", name="x"), ToolError)
+    assert isinstance(find_symbol(project, "definition"), ToolError)
+    assert isinstance(find_symbol(project, "outline", path="missing.py"), ToolError)
+    assert isinstance(find_symbol(project, "outline", path="../elsewhere"), ToolError)
+
+
+@pytest.mark.parametrize(
+    "node_type,kind",
+    [
+        ("function_declaration", "function"),
+        ("method_definition", "method"),
+        ("class_declaration", "class"),
+        ("struct_item", "class"),
+        ("type_alias_declaration", "type"),
+        ("call_expression", None),
+        ("variable_declarator", None),
+    ],
+)
+def test_tree_sitter_node_kinds(node_type, kind):
+    assert symbols._ts_kind(node_type) == kind
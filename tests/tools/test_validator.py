@@ -0,0 +1,113 @@
+"""Tests for compiled tool argument validators."""
+
+import os
+
+import pytest
+
+from ayder_cli.application.validation import SchemaValidator, ToolRequest
+from ayder_cli.core.context import ProjectContext
+from ayder_cli.tools.definition import (
+    TOOL_DEFINITIONS,
+    TOOL_DEFINITIONS_BY_NAME,
+    TOOL_VALIDATORS,
+    ToolDefinition,
+    get_validator,
+)
+from ayder_cli.tools.validator import compile_validator
+
+
+def _definition(**overrides):
+    fields = dict(
+        name="probe",
+        description="Probe",
+        parameters={
+            "type": "object",
+            "properties": {
+                "file_path": {"type": "string"},
+                "limit": {"type": "integer"},
+                "flags": {"type": "array"},
+            },
+            "required": ["file_path"],
+        },
+        parameter_aliases=(("path", "file_path"),),
+        path_parameters=("file_path",),
+    )
+    fields.update(overrides)
+    return ToolDefinition(**fields)
+
+
+def test_every_definition_is_compiled_at_discovery():
+    assert set(TOOL_VALIDATORS) >= {td.name for td in TOOL_DEFINITIONS}
+    read_file = TOOL_VALIDATORS["read_file"]
+    assert read_file.definition is TOOL_DEFINITIONS_BY_NAME["read_file"]
+    assert "file_path" in read_file.required
+    assert read_file.types["start_line"] == "integer"
+
+
+def test_compile_keeps_only_checked_types():
+    validator = compile_validator(_definition())
+    assert validator.types == {"file_path": "string", "limit": "integer"}
+    assert validator.required == ("file_path",)
+
+
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        ({"file_path": "a.py"}, []),
+        ({}, ["file_path"]),
+        ({"file_path": None}, ["file_path"]),
+        ({"file_path": "   "}, ["file_path"]),
+    ],
+)
+def test_missing_reports_absent_and_blank(args, expected):
+    assert compile_validator(_definition()).missing(args) == expected
+
+
+@pytest.mark.parametrize(
+    "args,problem,after",
+    [
+        ({"file_path": "a", "limit": "5"}, None, {"file_path": "a", "limit": 5}),
+        ({"file_path": "a", "limit": "five"}, ("limit", "'limit' must be integer, got str"), None),
+        ({"file_path": 3}, ("file_path", "'file_path' must be string, got int"), None),
+        ({"limit": 1}, ("file_path", "required argument 'file_path' is missing or empty"), None),
+        ({"file_path": "a", "flags": "anything", "extra": 1}, None, None),
+    ],
+)
+def test_check_coerces_and_reports_first_problem(args, problem, after):
+    assert compile_validator(_definition()).check(args) == problem
+    if after is not None:
+        assert args == after
+
+
+def test_normalize_matches_pipeline_and_does_not_mutate(tmp_path):
+    ctx = ProjectContext(str(tmp_path))
+    args = {"path": "a.py", "limit": "7"}
+    normalized = compile_validator(_definition()).normalize(args, ctx)
+    assert args == {"path": "a.py", "limit": "7"}
+    assert os.path.realpath(normalized["file_path"]) == os.path.realpath(tmp_path / "a.py")
+    assert normalized["limit"] == 7
+    with pytest.raises(ValueError):
+        compile_validator(_definition()).normalize({"file_path": "/etc/passwd"}, ctx)
+
+
+def test_get_validator_recompiles_replaced_definition():
+    td = _definition(name="validator_probe")
+    TOOL_DEFINITIONS_BY_NAME[td.name] = td
+    try:
+        first = get_validator(td.name)
+        assert first.definition is td and get_validator(td.name) is first
+
+        replaced = _definition(name="validator_probe", parameters={"required": ["x"]})
+        TOOL_DEFINITIONS_BY_NAME[td.name] = replaced
+        assert get_validator(td.name).required == ("x",)
+    finally:
+        TOOL_DEFINITIONS_BY_NAME.pop(td.name, None)
+        TOOL_VALIDATORS.pop(td.name, None)
+    assert get_validator(td.name) is None
+
+
+def test_schema_validator_uses_compiled_checks():
+    ok, err = SchemaValidator().validate(ToolRequest("read_file", {"file_path": "a", "start_line": "x"}))
+    assert not ok and err.field == "start_line"
+    ok, err = SchemaValidator().validate(ToolRequest("no_such_tool", {}))
+    assert not ok and "unknown tool" in err.message
@@ -1,5 +1,9 @@
 """Tests for paste collapsing in _SubmitTextArea."""
 
+import os
+import time
+
+from ayder_cli.core.project_tree import tree_for
 from ayder_cli.tui.widgets import _SubmitTextArea
 
 
@@ -195,6 +199,22 @@ class TestFilePickerHelpers:
         assert ".env" not in widget._file_picker_entries("")
         assert widget._file_picker_entries(".") == [".env"]
 
+    def test_entries_include_ignored_paths_and_reuse_listings(self, tmp_path):
+        (tmp_path / ".gitignore").write_text("*.log\n", encoding="utf-8")
+        (tmp_path / "app.log").write_text("", encoding="utf-8")
+        (tmp_path / "app.py").write_text("", encoding="utf-8")
+        (tmp_path / "build").mkdir()
+        old = time.time_ns() - 10_000_000_000
+        os.utime(tmp_path, ns=(old, old))
+        widget = _SubmitTextArea()
+        widget._file_picker_root = tmp_path
+
+        assert widget._file_picker_entries("a") == ["app.log", "app.py"]
+        assert widget._file_picker_entries("b") == ["build/"]
+        reads = tree_for(tmp_path).reads
+        assert widget._file_picker_entries("ap") == ["app.log", "app.py"]
+        assert tree_for(tmp_path).reads == reads
+
     def test_accept_directory_keeps_picker_open(self, tmp_path):
         (tmp_path / "src").mkdir()
         (tmp_path / "src" / "main.py").write_text("", encoding="utf-8")
@@ -222,3 +242,38 @@ class TestFilePickerHelpers:
 
         assert widget.text == "see @main.py"
         assert not widget._file_picker_active()
+
+    def test_fuzzy_matches_follow_directory_entries(self, tmp_path):
+        (tmp_path / "main.py").write_text("", encoding="utf-8")
+        widget = _SubmitTextArea()
+        widget._file_picker_root = tmp_path
+        widget.text = "@m"
+        widget.move_cursor((0, 2))
+        widget._refresh_file_picker()
+        seq = widget._file_picker_seq
+
+        widget._show_file_matches(seq, "m", ["main.py"], ["src/main.py", "main.py"])
+
+        assert widget._file_picker_suggestions == ["main.py", "src/main.py"]
+
+    def test_stale_fuzzy_matches_are_dropped(self, tmp_path):
+        widget = _SubmitTextArea()
+        widget._file_picker_root = tmp_path
+        widget.text = "@wid"
+        widget.move_cursor((0, 4))
+        widget._refresh_file_picker()
+        seq = widget._file_picker_seq
+
+        widget._show_file_matches(seq - 1, "wid", [], ["tui/widgets.py"])
+        widget._show_file_matches(seq, "wi", [], ["tui/widgets.py"])
+        assert not widget._file_picker_active()
+
+        widget._show_file_matches(seq, "wid", [], ["tui/widgets.py"])
+        assert widget._file_picker_active()
+        assert widget._file_picker_suggestions == ["tui/widgets.py"]
+
+    def test_fuzzy_query_skips_directories_and_hidden_names(self):
+        assert _SubmitTextArea._fuzzy_file_query("tui/wid") == "tui/wid"
+        assert _SubmitTextArea._fuzzy_file_query("src/") is None
+        assert _SubmitTextArea._fuzzy_file_query(".env") is None
+        assert _SubmitTextArea._fuzzy_file_query("../x") is None
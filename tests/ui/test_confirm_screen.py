@@ -304,6 +304,25 @@ class TestGenerateDiff:
         assert "-    pass" in diff
         assert "+    return 42" in diff
 
+    def test_multi_edit_diff(self, tmp_path):
+        """All edits of a multi_edit batch show up in one diff."""
+        from ayder_cli.tui import AyderApp
+
+        f = tmp_path / "test.py"
+        f.write_text("def foo():\n    pass\n")
+
+        app = AyderApp.__new__(AyderApp)
+        diff = app._generate_diff("file_editor", {
+            "operation": "multi_edit",
+            "file_path": str(f),
+            "edits": [
+                {"operation": "replace", "old_string": "foo", "new_string": "bar"},
+                {"operation": "replace", "old_string": "pass", "new_string": "return 42"},
+            ],
+        })
+        assert "+def bar():" in diff
+        assert "+    return 42" in diff
+
 
 class TestRunTuiPermissions:
     """Tests for run_tui permission passthrough."""
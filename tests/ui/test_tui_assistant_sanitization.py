@@ -2,7 +2,10 @@
 bare tool-call XML tags. If a provider leaks them (e.g. a new model family
 not yet in Ollama's XML-fallback matcher), the render path is the last
 chance to strip them before the user sees the mess."""
-from ayder_cli.tui.widgets import _sanitize_for_assistant_render
+from unittest.mock import patch
+
+from ayder_cli.tui.types import MessageType
+from ayder_cli.tui.widgets import ChatView, _sanitize_for_assistant_render
 
 
 def test_sanitize_passes_clean_prose_unchanged():
@@ -55,3 +58,41 @@ def test_sanitize_preserves_normal_markdown_code_fences():
 
 def test_sanitize_empty_string_returns_empty():
     assert _sanitize_for_assistant_render("") == ""
+
+
+@patch.object(ChatView, "scroll_end")
+@patch.object(ChatView, "mount")
+def test_chat_view_filters_streamed_chunks_incrementally(mock_mount, mock_scroll):
+    view = ChatView()
+    for piece in ["Reading <tool", "_call><function=read_file>", "a.py</function></tool_call>",
+                  " done <"]:
+        view.add_message(piece, MessageType.ASSISTANT)
+
+    assert view.messages[-1]["display"] == "Reading  done "
+    view.finish_assistant_message()
+    assert view.messages[-1]["display"] == "Reading  done <"
+    assert view.messages[-1]["content"].startswith("Reading <tool_call>")  # history untouched
+
+
+@patch.object(ChatView, "scroll_end")
+@patch.object(ChatView, "mount")
+def test_finished_message_gets_the_full_cleanup_pass(mock_mount, mock_scroll):
+    view = ChatView()
+    view.add_message(
+        'Reading.\n[{"function": {"name": "read_file", "arguments": {}}}]\nDone.',
+        MessageType.ASSISTANT,
+    )
+    view.finish_assistant_message()
+    assert '"function"' not in view.messages[-1]["display"]
+    assert view.messages[-1]["display"].startswith("Reading.")
+
+
+@patch.object(ChatView, "scroll_end")
+@patch.object(ChatView, "mount")
+def test_unclosed_tag_does_not_swallow_the_rest_of_the_message(mock_mount, mock_scroll):
+    view = ChatView()
+    view.add_message("Let me <function=read_file>\n", MessageType.ASSISTANT)
+    view.add_message("x" * 5000, MessageType.ASSISTANT)
+    assert "x" * 4000 in view.messages[-1]["display"]
+    view.finish_assistant_message()
+    assert view.messages[-1]["display"].endswith("x" * 5000)
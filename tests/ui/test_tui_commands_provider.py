@@ -148,3 +148,27 @@ def test_apply_provider_switch_rolls_back_on_invalid_driver():
     assert app.config is old_config
     chat_view.add_system_message.assert_called_once()
     assert "Cannot switch to broken" in chat_view.add_system_message.call_args[0][0]
+
+
+def test_apply_provider_switch_hands_the_new_residency_to_agents():
+    app = _make_app()
+    app._agent_registry = MagicMock()
+    residency = MagicMock()
+    new_config = Config(provider="ollama", driver="ollama", model="qwen3:8b")
+
+    with (
+        patch(
+            "ayder_cli.tui.commands.load_config_for_provider",
+            return_value=new_config,
+        ),
+        patch(
+            "ayder_cli.tui.commands.provider_orchestrator.create",
+            return_value=MagicMock(),
+        ),
+        patch("ayder_cli.tui.commands.residency_for", return_value=residency),
+    ):
+        _apply_provider_switch(app, "ollama", chat_view=MagicMock())
+
+    assert app._residency is residency
+    app._agent_registry.set_residency.assert_called_once_with(residency)
+    residency.warm_in_background.assert_called_once_with(["qwen3:8b"])